@@ -1,9 +1,12 @@
 """Database related helper functions."""
 
+from datetime import datetime, timezone
+
 from neomodel import db
 
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
 from clinical_mdr_api.models.concepts.concept import VersionProperties
+from common.utils import validate_max_skip_clause
 
 
 def acquire_write_lock_study_value(uid: str) -> None:
@@ -58,3 +61,41 @@ def is_codelist_in_final(ct_codelist_root_node) -> bool:
         latest_version = get_latest_version_properties(attributes_root)
         return latest_version and latest_version.status == LibraryItemStatus.FINAL.value
     return False
+
+
+# Helpers to restrict audit trail queries to a time window, given by the `$since` and `$until` parameters.
+# The window includes `since` and excludes `until`, either of them can be None.
+def audit_trail_window_params(
+    since: datetime | None = None, until: datetime | None = None
+) -> dict[str, datetime | None]:
+    """
+    Returns the `$since` and `$until` query parameters.
+    Dates without a timezone are taken as UTC, as the dates of the study actions are stored in UTC.
+    """
+    return {
+        name: (
+            value.replace(tzinfo=timezone.utc)
+            if value is not None and value.tzinfo is None
+            else value
+        )
+        for name, value in (("since", since), ("until", until))
+    }
+
+
+def audit_trail_window_filter(selection: str) -> str:
+    """
+    Returns a Cypher predicate keeping the versions of a study selection
+    which were created by a study action within the time window.
+    """
+    return f"""($since IS NULL AND $until IS NULL OR any(
+        window_date IN [({selection})<-[:AFTER]-(window_action:StudyAction) | window_action.date]
+        WHERE ($since IS NULL OR window_date >= $since) AND ($until IS NULL OR window_date < $until)
+    ))"""
+
+
+def audit_trail_page_clause(page_number: int, page_size: int) -> str:
+    """Returns the Cypher `SKIP` and `LIMIT` clauses of a page of an audit trail, all entries if `page_size` is 0."""
+    if not page_size:
+        return ""
+    validate_max_skip_clause(page_number=page_number, page_size=page_size)
+    return f" SKIP {(page_number - 1) * page_size} LIMIT {page_size}"
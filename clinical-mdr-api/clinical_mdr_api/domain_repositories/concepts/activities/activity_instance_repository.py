@@ -53,6 +53,7 @@ from clinical_mdr_api.models.concepts.activities.activity_item import (
 from clinical_mdr_api.models.concepts.unit_definitions.unit_definition import (
     UnitDefinitionSimpleModel,
 )
+from clinical_mdr_api.repositories._utils import FullTextField
 from common.config import REQUESTED_LIBRARY_NAME
 from common.exceptions import BusinessLogicException
 from common.utils import convert_to_datetime, version_string_to_tuple
@@ -64,6 +65,11 @@ class ActivityInstanceRepository(ConceptGenericRepository[ActivityInstanceAR]):
     aggregate_class = ActivityInstanceAR
     value_object_class = ActivityInstanceVO
     return_model = ActivityInstance
+    fulltext_fields = {
+        "name": FullTextField(
+            "fulltext_activity_instance_name", "concept_value", "name"
+        )
+    }
 
     def _create_new_value_node(self, ar: _AggregateRootType) -> ActivityInstanceValue:
         value_node: ActivityInstanceValue = super()._create_new_value_node(ar=ar)
@@ -27,6 +27,7 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
 )
 from clinical_mdr_api.models.concepts.activities.activity import Activity
 from clinical_mdr_api.models.utils import GenericFilteringReturn
+from clinical_mdr_api.repositories._utils import FullTextField
 from common.config import REQUESTED_LIBRARY_NAME
 from common.exceptions import BusinessLogicException
 from common.utils import convert_to_datetime, version_string_to_tuple
@@ -61,6 +62,9 @@ class ActivityRepository(ConceptGenericRepository[ActivityAR]):
     value_class = ActivityValue
     return_model = Activity
     filter_query_parameters = {}
+    fulltext_fields = {
+        "name": FullTextField("fulltext_activity_name", "concept_value", "name")
+    }
 
     def _create_aggregate_root_instance_from_cypher_result(
         self, input_dict: dict
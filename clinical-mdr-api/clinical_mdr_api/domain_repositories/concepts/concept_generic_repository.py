@@ -26,6 +26,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameterTermRoot,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    refresh_template_parameter_terms,
+)
 from clinical_mdr_api.domains._utils import ObjectStatus
 from clinical_mdr_api.domains.concepts.concept_base import ConceptARBase
 from clinical_mdr_api.repositories._utils import (
@@ -101,6 +104,9 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
     def generate_uid(self) -> str:
         return self.root_class.get_next_free_uid_and_increment_counter()
 
+    def generate_uids(self, count: int) -> list[str]:
+        return self.root_class.get_next_free_uids_and_increment_counter(count)
+
     # pylint: disable=unused-argument
     def generic_match_clause(
         self,
@@ -275,6 +281,36 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
         :param return_all_versions:
         :return GenericFilteringReturn[_AggregateRootType]:
         """
+        items, total, _ = self.find_all_by_cursor(
+            library=library,
+            sort_by=sort_by,
+            page_number=page_number,
+            page_size=page_size,
+            filter_by=filter_by,
+            filter_operator=filter_operator,
+            total_count=total_count,
+            return_all_versions=return_all_versions,
+            **kwargs,
+        )
+        return items, total
+
+    def find_all_by_cursor(
+        self,
+        library: str | None = None,
+        sort_by: dict | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+        filter_by: dict | None = None,
+        filter_operator: FilterOperator | None = FilterOperator.AND,
+        total_count: bool = False,
+        return_all_versions: bool = False,
+        cursor: str | None = None,
+        **kwargs,
+    ) -> tuple[list[_AggregateRootType], int, str | None]:
+        """
+        Same as find_all, but additionally supports keyset pagination through `cursor`
+        (see CypherQueryBuilder) and returns the cursor of the next page as third element.
+        """
         match_clause = (
             self.generic_match_clause(**kwargs)
             if not return_all_versions
@@ -296,6 +332,8 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
+            # The uid makes the order unique, which keyset pagination relies on
+            implicit_sort_by="uid" if cursor is not None else None,
             page_number=page_number,
             page_size=page_size,
             filter_by=FilterDict(elements=filter_by),
@@ -303,6 +341,8 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             total_count=total_count,
             return_model=self.return_model,
             format_filter_sort_keys=self.format_filter_sort_keys,
+            cursor=cursor,
+            fulltext_fields=self.fulltext_fields,
         )
 
         query.parameters.update(filter_query_parameters)
@@ -313,14 +353,14 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
             result_array, attributes_names
         )
 
-        count_result, _ = db.cypher_query(
-            query=query.count_query, params=query.parameters
-        )
-        total_amount = (
-            count_result[0][0] if len(count_result) > 0 and total_count else 0
-        )
+        total_amount = 0
+        if total_count:
+            count_result, _ = db.cypher_query(
+                query=query.count_query, params=query.parameters
+            )
+            total_amount = count_result[0][0] if len(count_result) > 0 else 0
 
-        return extracted_items, total_amount
+        return extracted_items, total_amount, query.next_cursor
 
     def _retrieve_concepts_from_cypher_res(
         self, result_array, attribute_names
@@ -398,6 +438,7 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
                 self.return_model
             ),
             format_filter_sort_keys=self.format_filter_sort_keys,
+            fulltext_fields=self.fulltext_fields,
         )
 
         query.parameters.update(filter_query_parameters)
@@ -414,6 +455,7 @@ class ConceptGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType]
         )
 
     @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @refresh_template_parameter_terms
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -86,7 +86,6 @@ class AliasRepository(OdmGenericRepository[OdmAliasAR]):
 
     def _create_new_value_node(self, ar: OdmAliasAR) -> OdmAliasValue:
         value_node = super()._create_new_value_node(ar=ar)
-        value_node.save()
 
         value_node.context = ar.concept_vo.context
 
@@ -105,7 +105,6 @@ class DescriptionRepository(OdmGenericRepository[OdmDescriptionAR]):
 
     def _create_new_value_node(self, ar: OdmDescriptionAR) -> OdmDescriptionValue:
         value_node = super()._create_new_value_node(ar=ar)
-        value_node.save()
 
         value_node.language = ar.concept_vo.language
         value_node.description = ar.concept_vo.description
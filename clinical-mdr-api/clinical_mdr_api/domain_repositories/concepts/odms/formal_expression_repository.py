@@ -99,8 +99,6 @@ class FormalExpressionRepository(OdmGenericRepository[OdmFormalExpressionAR]):
     ) -> OdmFormalExpressionValue:
         value_node = super()._create_new_value_node(ar=ar)
 
-        value_node.save()
-
         value_node.context = ar.concept_vo.context
         value_node.expression = ar.concept_vo.expression
 
@@ -1,279 +1,284 @@
-from neomodel import db
+from typing import Any
 
-from common.exceptions import NotFoundException
+from neomodel import db
 
 
 class MetadataRepository:
-    CSV_EXPORT_QUERY = """
-    CALL apoc.export.csv.query(query, null, {stream:true, params:{target_uid: $target_uid}})
-    YIELD data, rows
-    RETURN data, rows;"""
+    """
+    Fetches the ODM elements of an export with one query per element type.
+
+    Each query returns the values of all the requested elements together with the elements they refer to,
+    collected with pattern comprehensions, instead of traversing the relationships of every element separately.
 
-    OPTIONAL_FORM_MATCH = """
-    OPTIONAL MATCH (OdmStudyEventRoot)
-    -[:FORM_REF]->(OdmFormRoot:OdmFormRoot)
-    -[:LATEST_FINAL|LATEST_RETIRED]->(OdmFormValue:OdmFormValue)
-    CALL {
-        WITH OdmFormRoot, OdmFormValue
-        MATCH (OdmFormRoot)-[hv:HAS_VERSION]-(OdmFormValue)
-        WHERE hv.status in ['Final', 'Retired'] 
-        WITH hv
-        ORDER BY
-            toInteger(split(hv.version, '.')[0]) ASC,
-            toInteger(split(hv.version, '.')[1]) ASC,
-            hv.end_date ASC,
-            hv.start_date ASC
-        WITH collect(hv) as hvs
-        RETURN last(hvs) as OdmFormLatest
-    }
+    The `status` of the queries is the type of the relationship between the roots and the values,
+    e.g. `LATEST` or `LATEST_FINAL|LATEST_RETIRED`.
     """
-    OPTIONAL_ITEM_GROUP_MATCH = """
-    OPTIONAL MATCH (OdmFormRoot)
-    -[:ITEM_GROUP_REF]->(OdmItemGroupRoot:OdmItemGroupRoot)
-    -[:LATEST_FINAL|LATEST_RETIRED]->(OdmItemGroupValue:OdmItemGroupValue)
-    CALL {
-        WITH OdmItemGroupRoot, OdmItemGroupValue
-        MATCH (OdmItemGroupRoot)-[hv:HAS_VERSION]-(OdmItemGroupValue)
-        WHERE hv.status in ['Final', 'Retired'] 
-        WITH hv
-        ORDER BY
-            toInteger(split(hv.version, '.')[0]) ASC,
-            toInteger(split(hv.version, '.')[1]) ASC,
-            hv.end_date ASC,
-            hv.start_date ASC
-        WITH collect(hv) as hvs
-        RETURN last(hvs) as OdmItemGroupLatest
-    }
+
+    VERSIONS = """
+    versions: [(root)-[version:HAS_VERSION]->(value) |
+        version {.version, .status, .start_date, .end_date}]
     """
-    OPTIONAL_ITEM_MATCH = """
-    OPTIONAL MATCH (OdmItemGroupRoot)
-    -[:ITEM_REF]->(OdmItemRoot:OdmItemRoot)
-    -[:LATEST_FINAL|LATEST_RETIRED]->(OdmItemValue:OdmItemValue)
-    CALL {
-        WITH OdmItemRoot, OdmItemValue
-        MATCH (OdmItemRoot)-[hv:HAS_VERSION]-(OdmItemValue)
-        WHERE hv.status in ['Final', 'Retired']
-        WITH hv
-        ORDER BY
-            toInteger(split(hv.version, '.')[0]) ASC,
-            toInteger(split(hv.version, '.')[1]) ASC,
-            hv.end_date ASC,
-            hv.start_date ASC
-        WITH collect(hv) as hvs
-        RETURN last(hvs) as OdmItemLatest
-    }
+    DESCRIPTIONS = """
+    descriptions: [(root)-[:HAS_DESCRIPTION]->(description_root:OdmDescriptionRoot)
+        -[:LATEST]->(description_value:OdmDescriptionValue) |
+        description_value {
+            .name, .language, .description, .instruction, .sponsor_instruction,
+            uid: description_root.uid,
+            versions: [(description_root)-[description_version:HAS_VERSION]->(description_value) |
+                description_version.version]
+        }]
     """
-    OPTIONAL_UNIT_DEFINITION_MATCH = """
-    OPTIONAL MATCH (OdmItemRoot)
-    -[:HAS_UNIT_DEFINITION]->(UnitDefinitionRoot:UnitDefinitionRoot)
-    -[:LATEST]->(UnitDefinitionValue:UnitDefinitionValue)
+    ALIASES = """
+    aliases: [(root)-[:HAS_ALIAS]->(alias_root:OdmAliasRoot)-[:LATEST]->(alias_value:OdmAliasValue) |
+        alias_value {
+            .name, .context,
+            uid: alias_root.uid,
+            versions: [(alias_root)-[alias_version:HAS_VERSION]->(alias_value) | alias_version.version]
+        }]
     """
-    OPTIONAL_CODELIST_MATCH = """
-    OPTIONAL MATCH (OdmItemRoot)
-    -[:HAS_CODELIST]->(CTCodelistRoot:CTCodelistRoot)
-    -[:HAS_ATTRIBUTES_ROOT]->(CTCodelistAttributesRoot:CTCodelistAttributesRoot)
-    -[:LATEST]->(CTCodelistAttributesValue:CTCodelistAttributesValue)
+    FORMAL_EXPRESSIONS = """
+    formal_expressions: [(root)-[:HAS_FORMAL_EXPRESSION]->(formal_expression_root:OdmFormalExpressionRoot)
+        -[:LATEST]->(formal_expression_value:OdmFormalExpressionValue) |
+        formal_expression_value {
+            .context, .expression,
+            uid: formal_expression_root.uid,
+            versions: [(formal_expression_root)-[formal_expression_version:HAS_VERSION]->(formal_expression_value) |
+                formal_expression_version.version]
+        }]
     """
-    OPTIONAL_CODELIST_TERM_MATCH = """
-    OPTIONAL MATCH (OdmItemRoot)
-    -[:HAS_CODELIST_TERM]->(CTTermRoot:CTTermRoot)
-    -[:HAS_ATTRIBUTES_ROOT]->(CTTermAttributesRoot:CTTermAttributesRoot)
-    -[:LATEST]->(CTTermAttributesValue:CTTermAttributesValue)
+    VENDORS = """
+    vendor_elements: [(root)-[vendor_element_rel:HAS_VENDOR_ELEMENT]->(vendor_element_root:OdmVendorElementRoot)
+        -[:LATEST]->(vendor_element_value:OdmVendorElementValue) |
+        {uid: vendor_element_root.uid, name: vendor_element_value.name, value: vendor_element_rel.value}],
+    vendor_attributes: [(root)-[vendor_attribute_rel:HAS_VENDOR_ATTRIBUTE]->(vendor_attribute_root:OdmVendorAttributeRoot)
+        -[:LATEST]->(vendor_attribute_value:OdmVendorAttributeValue) |
+        {
+            uid: vendor_attribute_root.uid,
+            name: vendor_attribute_value.name,
+            data_type: vendor_attribute_value.data_type,
+            value_regex: vendor_attribute_value.value_regex,
+            value: vendor_attribute_rel.value,
+            vendor_namespace_uid: head([(vendor_namespace_root:OdmVendorNamespaceRoot)
+                -[:HAS_VENDOR_ATTRIBUTE]->(vendor_attribute_root) | vendor_namespace_root.uid])
+        }],
+    vendor_element_attributes: [(root)-[vendor_element_attribute_rel:HAS_VENDOR_ELEMENT_ATTRIBUTE]
+        ->(vendor_element_attribute_root:OdmVendorAttributeRoot)
+        -[:LATEST]->(vendor_element_attribute_value:OdmVendorAttributeValue) |
+        {
+            uid: vendor_element_attribute_root.uid,
+            name: vendor_element_attribute_value.name,
+            data_type: vendor_element_attribute_value.data_type,
+            value_regex: vendor_element_attribute_value.value_regex,
+            value: vendor_element_attribute_rel.value,
+            vendor_element_uid: head([(attribute_vendor_element_root:OdmVendorElementRoot)
+                -[:HAS_VENDOR_ATTRIBUTE]->(vendor_element_attribute_root) | attribute_vendor_element_root.uid])
+        }]
     """
-
-    STUDY_EVENT_NAME_RETURN = "OdmStudyEventValue.name AS StudyEvent_Name"
-    STUDY_EVENT_VERSION_RETURN = "OdmStudyEventLatest.version AS StudyEvent_Version"
-    FORM_NAME_RETURN = "OdmFormValue.name AS Form_Name"
-    FORM_REPEATING_RETURN = """
-    (CASE WHEN OdmFormValue.repeating IS NULL THEN ''
-    WHEN OdmFormValue.repeating THEN  'yes' ELSE 'no' END) AS Form_Repeating
+    FORM_REFS = """
+    forms: [(root)-[form_ref:FORM_REF]->(form_root:OdmFormRoot) |
+        form_ref {.order_number, .mandatory, .locked, .collection_exception_condition_oid, uid: form_root.uid}]
+    """
+    ITEM_GROUP_REFS = """
+    item_groups: [(root)-[item_group_ref:ITEM_GROUP_REF]->(item_group_root:OdmItemGroupRoot)
+        -[:LATEST]->(item_group_value:OdmItemGroupValue) |
+        item_group_ref {
+            .order_number, .mandatory, .collection_exception_condition_oid, .vendor,
+            uid: item_group_root.uid, oid: item_group_value.oid, name: item_group_value.name
+        }]
+    """
+    ITEM_REFS = """
+    items: [(root)-[item_ref:ITEM_REF]->(item_root:OdmItemRoot)-[:LATEST]->(item_value:OdmItemValue) |
+        item_ref {
+            .order_number, .mandatory, .key_sequence, .method_oid, .imputation_method_oid, .role,
+            .role_codelist_oid, .collection_exception_condition_oid, .vendor,
+            uid: item_root.uid, oid: item_value.oid, name: item_value.name
+        }]
+    """
+    SDTM_DOMAINS = """
+    sdtm_domains: [(root)-[:HAS_SDTM_DOMAIN]->(sdtm_domain_root:CTTermRoot)
+        -[:HAS_ATTRIBUTES_ROOT]->(:CTTermAttributesRoot)-[:LATEST]->(sdtm_domain_value:CTTermAttributesValue) |
+        sdtm_domain_value {.code_submission_value, .preferred_term, uid: sdtm_domain_root.uid}]
+    """
+    UNIT_DEFINITIONS = """
+    unit_definitions: [(root)-[unit_definition_rel:HAS_UNIT_DEFINITION]->(unit_definition_root:UnitDefinitionRoot)
+        -[:LATEST]->(unit_definition_value:UnitDefinitionValue) |
+        unit_definition_rel {
+            .mandatory, .order,
+            uid: unit_definition_root.uid,
+            name: unit_definition_value.name,
+            versions: [(unit_definition_root)-[unit_definition_version:HAS_VERSION]->(unit_definition_value) |
+                unit_definition_version.version]
+        }]
+    """
+    CODELIST = """
+    codelist: head([(root)-[:HAS_CODELIST]->(codelist_root:CTCodelistRoot)
+        -[:HAS_ATTRIBUTES_ROOT]->(codelist_attributes_root:CTCodelistAttributesRoot)
+        -[:LATEST]->(codelist_attributes_value:CTCodelistAttributesValue) |
+        codelist_attributes_value {
+            .name, .submission_value, .preferred_term,
+            uid: codelist_root.uid,
+            versions: [(codelist_attributes_root)-[codelist_version:HAS_VERSION]->(codelist_attributes_value) |
+                codelist_version.version]
+        }])
+    """
+    TERMS = """
+    terms: [(root)-[term_rel:HAS_CODELIST_TERM]->(term_root:CTTermRoot)
+        -[:HAS_ATTRIBUTES_ROOT]->(term_attributes_root:CTTermAttributesRoot)
+        -[:LATEST]->(term_attributes_value:CTTermAttributesValue) |
+        term_rel {
+            .mandatory, .order, .display_text,
+            term_uid: term_root.uid,
+            code_submission_value: term_attributes_value.code_submission_value,
+            name: head([(term_root)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)
+                -[:LATEST]->(term_name_value:CTTermNameValue) | term_name_value.name]),
+            has_latest_draft: exists((term_attributes_root)-[:LATEST_DRAFT]->()),
+            has_latest_final: exists((term_attributes_root)-[:LATEST_FINAL]->()),
+            versions: [(term_attributes_root)-[term_version:HAS_VERSION]->(term_attributes_value) |
+                term_version {.version, .status, .end_date}]
+        }]
     """
-    FORM_VERSION_RETURN = "OdmFormLatest.version AS Form_Version"
-    ITEM_GROUP_NAME_RETURN = "OdmItemGroupValue.name AS ItemGroup_Name"
-    ITEM_GROUP_VERSION_RETURN = "OdmItemGroupLatest.version AS ItemGroup_Version"
-    ITEM_NAME_RETURN = "OdmItemValue.name AS Item_Name"
-    ITEM_DATATYPE_RETURN = "OdmItemValue.datatype AS Item_Datatype"
-    ITEM_VERSION_RETURN = "OdmItemLatest.version AS Item_Version"
-    ITEM_UNIT_RETURN = (
-        "apoc.text.join(COLLECT(DISTINCT UnitDefinitionValue.name), '|') as Item_Units"
-    )
-    ITEM_CODELIST_RETURN = "CTCodelistAttributesValue.name AS Item_Codelist"
-    ITEM_TERM_RETURN = "apoc.text.join(COLLECT(DISTINCT CTTermAttributesValue.code_submission_value), '|') as Item_Terms"
 
-    def get_odm_study_event(self, target_uid: str):
-        query = (
-            f"""
-                WITH "
-                    MATCH (OdmStudyEventRoot:OdmStudyEventRoot {{uid: $target_uid}})
-                    -[:LATEST_FINAL|LATEST_RETIRED]->(OdmStudyEventValue:OdmStudyEventValue)
-                    CALL {{
-                        WITH OdmStudyEventRoot, OdmStudyEventValue
-                        MATCH (OdmStudyEventRoot)-[hv:HAS_VERSION]-(OdmStudyEventValue)
-                        WHERE hv.status in ['Final', 'Retired']
-                        WITH hv
-                        ORDER BY
-                            toInteger(split(hv.version, '.')[0]) ASC,
-                            toInteger(split(hv.version, '.')[1]) ASC,
-                            hv.end_date ASC,
-                            hv.start_date ASC
-                        WITH collect(hv) as hvs
-                        RETURN last(hvs) as OdmStudyEventLatest
-                    }}
-                    {self.OPTIONAL_FORM_MATCH}
-                    {self.OPTIONAL_ITEM_GROUP_MATCH}
-                    {self.OPTIONAL_ITEM_MATCH}
-                    {self.OPTIONAL_UNIT_DEFINITION_MATCH}
-                    {self.OPTIONAL_CODELIST_MATCH}
-                    {self.OPTIONAL_CODELIST_TERM_MATCH}
+    def _get_odm_elements(
+        self,
+        label: str,
+        status: str,
+        values: list[str],
+        projections: list[str],
+        match_by: str = "uid",
+    ) -> list[dict[str, Any]]:
+        if not values:
+            return []
 
-                    RETURN
-                    {self.STUDY_EVENT_NAME_RETURN},
-                    {self.STUDY_EVENT_VERSION_RETURN},
-                    {self.FORM_NAME_RETURN},
-                    {self.FORM_REPEATING_RETURN},
-                    {self.FORM_VERSION_RETURN},
-                    {self.ITEM_GROUP_NAME_RETURN},
-                    {self.ITEM_GROUP_VERSION_RETURN},
-                    {self.ITEM_NAME_RETURN},
-                    {self.ITEM_DATATYPE_RETURN},
-                    {self.ITEM_VERSION_RETURN},
-                    {self.ITEM_UNIT_RETURN},
-                    {self.ITEM_CODELIST_RETURN},
-                    {self.ITEM_TERM_RETURN}
-                " AS query
+        query = f"""
+            MATCH (root:{label}Root)-[:{status}]->(value:{label}Value)
+            WHERE {"value.oid" if match_by == "oid" else "root.uid"} IN $values
+            RETURN value {{
+                .*,
+                uid: root.uid,
+                {",".join([self.VERSIONS, *projections])}
+            }}
             """
-            + self.CSV_EXPORT_QUERY
-        )
-        result, _ = db.cypher_query(query, {"target_uid": target_uid})
+        rows, _ = db.cypher_query(query, {"values": list(values)})
 
-        NotFoundException.raise_if(result[0][1] == 0, "ODM Study Event", target_uid)
+        return [row[0] for row in rows]
 
-        return result[0][0]
+    def get_odm_study_events(self, uids: list[str], status: str):
+        return self._get_odm_elements("OdmStudyEvent", status, uids, [self.FORM_REFS])
 
-    def get_odm_form(self, target_uid: str):
-        query = (
-            f"""
-                WITH "
-                    MATCH (OdmFormRoot:OdmFormRoot {{uid: $target_uid}})-[:LATEST_FINAL|LATEST_RETIRED]->(OdmFormValue:OdmFormValue)
-                    CALL {{
-                        WITH OdmFormRoot, OdmFormValue
-                        MATCH (OdmFormRoot)-[hv:HAS_VERSION]-(OdmFormValue)
-                        WHERE hv.status in ['Final', 'Retired']
-                        WITH hv
-                        ORDER BY
-                            toInteger(split(hv.version, '.')[0]) ASC,
-                            toInteger(split(hv.version, '.')[1]) ASC,
-                            hv.end_date ASC,
-                            hv.start_date ASC
-                        WITH collect(hv) as hvs
-                        RETURN last(hvs) as OdmFormLatest
-                    }}
-                    {self.OPTIONAL_ITEM_GROUP_MATCH}
-                    {self.OPTIONAL_ITEM_MATCH}
-                    {self.OPTIONAL_UNIT_DEFINITION_MATCH}
-                    {self.OPTIONAL_CODELIST_MATCH}
-                    {self.OPTIONAL_CODELIST_TERM_MATCH}
+    def get_odm_forms(self, uids: list[str], status: str):
+        return self._get_odm_elements(
+            "OdmForm",
+            status,
+            uids,
+            [self.DESCRIPTIONS, self.ALIASES, self.VENDORS, self.ITEM_GROUP_REFS],
+        )
 
-                    RETURN
-                    {self.FORM_NAME_RETURN},
-                    {self.FORM_REPEATING_RETURN},
-                    {self.FORM_VERSION_RETURN},
-                    {self.ITEM_GROUP_NAME_RETURN},
-                    {self.ITEM_GROUP_VERSION_RETURN},
-                    {self.ITEM_NAME_RETURN},
-                    {self.ITEM_DATATYPE_RETURN},
-                    {self.ITEM_VERSION_RETURN},
-                    {self.ITEM_UNIT_RETURN},
-                    {self.ITEM_CODELIST_RETURN},
-                    {self.ITEM_TERM_RETURN}
-                " AS query
-            """
-            + self.CSV_EXPORT_QUERY
+    def get_odm_item_groups(self, uids: list[str], status: str):
+        return self._get_odm_elements(
+            "OdmItemGroup",
+            status,
+            uids,
+            [
+                self.DESCRIPTIONS,
+                self.ALIASES,
+                self.VENDORS,
+                self.ITEM_REFS,
+                self.SDTM_DOMAINS,
+            ],
         )
-        result, _ = db.cypher_query(query, {"target_uid": target_uid})
 
-        NotFoundException.raise_if(result[0][1] == 0, "ODM Form", target_uid)
+    def get_odm_items(self, uids: list[str], status: str):
+        return self._get_odm_elements(
+            "OdmItem",
+            status,
+            uids,
+            [
+                self.DESCRIPTIONS,
+                self.ALIASES,
+                self.VENDORS,
+                self.UNIT_DEFINITIONS,
+                self.CODELIST,
+                self.TERMS,
+            ],
+        )
 
-        return result[0][0]
+    def get_odm_conditions(self, oids: list[str], status: str):
+        return self._get_odm_elements(
+            "OdmCondition",
+            status,
+            oids,
+            [self.DESCRIPTIONS, self.ALIASES, self.FORMAL_EXPRESSIONS],
+            match_by="oid",
+        )
 
-    def get_odm_item_group(self, target_uid: str):
-        query = (
-            f"""
-                WITH "
-                    MATCH (OdmItemGroupRoot:OdmItemGroupRoot {{uid: $target_uid}})
-                    -[:LATEST_FINAL|LATEST_RETIRED]->(OdmItemGroupValue:OdmItemGroupValue)
-                    CALL {{
-                        WITH OdmItemGroupRoot, OdmItemGroupValue
-                        MATCH (OdmItemGroupRoot)-[hv:HAS_VERSION]-(OdmItemGroupValue)
-                        WHERE hv.status in ['Final', 'Retired']
-                        WITH hv
-                        ORDER BY
-                            toInteger(split(hv.version, '.')[0]) ASC,
-                            toInteger(split(hv.version, '.')[1]) ASC,
-                            hv.end_date ASC,
-                            hv.start_date ASC
-                        WITH collect(hv) as hvs
-                        RETURN last(hvs) as OdmItemGroupLatest
-                    }}
-                    {self.OPTIONAL_ITEM_MATCH}
-                    {self.OPTIONAL_UNIT_DEFINITION_MATCH}
-                    {self.OPTIONAL_CODELIST_MATCH}
-                    {self.OPTIONAL_CODELIST_TERM_MATCH}
+    def get_odm_methods(self, oids: list[str], status: str):
+        return self._get_odm_elements(
+            "OdmMethod",
+            status,
+            oids,
+            [self.DESCRIPTIONS, self.ALIASES, self.FORMAL_EXPRESSIONS],
+            match_by="oid",
+        )
 
-                    RETURN
-                    {self.ITEM_GROUP_NAME_RETURN},
-                    {self.ITEM_GROUP_VERSION_RETURN},
-                    {self.ITEM_NAME_RETURN},
-                    {self.ITEM_DATATYPE_RETURN},
-                    {self.ITEM_VERSION_RETURN},
-                    {self.ITEM_UNIT_RETURN},
-                    {self.ITEM_CODELIST_RETURN},
-                    {self.ITEM_TERM_RETURN}
-                " AS query
+    def get_odm_vendor_namespaces(self, status: str):
+        rows, _ = db.cypher_query(
+            f"""
+            MATCH (root:OdmVendorNamespaceRoot)-[:{status}]->(value:OdmVendorNamespaceValue)
+            RETURN value {{.name, .prefix, .url, uid: root.uid}}
             """
-            + self.CSV_EXPORT_QUERY
         )
-        result, _ = db.cypher_query(query, {"target_uid": target_uid})
 
-        NotFoundException.raise_if(result[0][1] == 0, "ODM Item Group", target_uid)
+        return [row[0] for row in rows]
 
-        return result[0][0]
+    def get_odm_vendor_elements(self, uids: list[str], status: str):
+        """Returns the vendor elements with the given uids, and the latest value of their vendor namespace."""
+        return self._get_odm_elements(
+            "OdmVendorElement",
+            status,
+            uids,
+            [
+                """
+                vendor_namespace: head([(root)<-[:HAS_VENDOR_ELEMENT]-(vendor_namespace_root:OdmVendorNamespaceRoot)
+                    -[:LATEST]->(vendor_namespace_value:OdmVendorNamespaceValue) |
+                    vendor_namespace_value {.name, .prefix, .url, uid: vendor_namespace_root.uid}])
+                """
+            ],
+        )
 
-    def get_odm_item(self, target_uid: str):
-        query = (
-            f"""
-                WITH "
-                    MATCH (OdmItemRoot:OdmItemRoot {{uid: $target_uid}})-[:LATEST_FINAL|LATEST_RETIRED]->(OdmItemValue:OdmItemValue)
-                    CALL {{
-                        WITH OdmItemRoot, OdmItemValue
-                        MATCH (OdmItemRoot)-[hv:HAS_VERSION]-(OdmItemValue)
-                        WHERE hv.status in ['Final', 'Retired']
-                        WITH hv
-                        ORDER BY
-                            toInteger(split(hv.version, '.')[0]) ASC,
-                            toInteger(split(hv.version, '.')[1]) ASC,
-                            hv.end_date ASC,
-                            hv.start_date ASC
-                        WITH collect(hv) as hvs
-                        RETURN last(hvs) as OdmItemLatest
-                    }}
-                    {self.OPTIONAL_UNIT_DEFINITION_MATCH}
-                    {self.OPTIONAL_CODELIST_MATCH}
-                    {self.OPTIONAL_CODELIST_TERM_MATCH}
+    def get_odm_vendor_attributes(self, uids: list[str], status: str):
+        """Returns the vendor attributes with the given uids, and the latest value of their vendor namespace."""
+        return self._get_odm_elements(
+            "OdmVendorAttribute",
+            status,
+            uids,
+            [
+                """
+                vendor_namespace: head([(root)<-[:HAS_VENDOR_ATTRIBUTE]-(vendor_namespace_root:OdmVendorNamespaceRoot)
+                    -[:LATEST]->(vendor_namespace_value:OdmVendorNamespaceValue) |
+                    vendor_namespace_value {.name, .prefix, .url, uid: vendor_namespace_root.uid}])
+                """
+            ],
+        )
+
+    def get_codelist_terms(self, codelist_uids: list[str]):
+        if not codelist_uids:
+            return []
 
-                    RETURN
-                    {self.ITEM_NAME_RETURN},
-                    {self.ITEM_DATATYPE_RETURN},
-                    {self.ITEM_VERSION_RETURN},
-                    {self.ITEM_UNIT_RETURN},
-                    {self.ITEM_CODELIST_RETURN},
-                    {self.ITEM_TERM_RETURN}
-                " AS query
+        rows, _ = db.cypher_query(
             """
-            + self.CSV_EXPORT_QUERY
+            MATCH (codelist:CTCodelistRoot)-[:HAS_TERM]->(term_root:CTTermRoot)
+            -[:HAS_ATTRIBUTES_ROOT]->(:CTTermAttributesRoot)-[:LATEST]->(term_attr_value:CTTermAttributesValue)
+            MATCH (term_root)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[:LATEST]->(term_name_value:CTTermNameValue)
+            WHERE codelist.uid IN $codelist_uids
+            RETURN {
+                name: term_name_value.name,
+                term_uid: term_root.uid,
+                codelist_uid: codelist.uid,
+                code_submission_value: term_attr_value.code_submission_value,
+                nci_preferred_name: term_attr_value.preferred_term
+            }
+            """,
+            {"codelist_uids": list(codelist_uids)},
         )
-        result, _ = db.cypher_query(query, {"target_uid": target_uid})
-
-        NotFoundException.raise_if(result[0][1] == 0, "ODM Item", target_uid)
 
-        return result[0][0]
+        return [row[0] for row in rows]
@@ -27,6 +27,7 @@ from clinical_mdr_api.domain_repositories.models.odm import (
 )
 from clinical_mdr_api.domains._utils import ObjectStatus
 from clinical_mdr_api.domains.concepts.utils import RelationType
+from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemMetadataVO
 from clinical_mdr_api.models.concepts.odms.odm_common_models import (
     OdmElementWithParentUid,
 )
@@ -38,6 +39,25 @@ from clinical_mdr_api.repositories._utils import (
 )
 from common.exceptions import BusinessLogicException
 
+# Formatted with the labels of the root and value nodes and the label of the relationship from the library
+SAVE_BATCH_QUERY = """
+UNWIND $items AS item
+MATCH (library:Library {{name: item.library_name}})
+CREATE (library)-[:{library_rel_label}]->(root:{root_labels} {{uid: item.uid}})
+CREATE (root)-[:LATEST]->(value:{value_labels})
+SET value = item.value
+FOREACH (version IN item.versions |
+    CREATE (root)-[has_version:HAS_VERSION]->(value)
+    SET has_version = version
+    FOREACH (_ IN CASE WHEN version.status = 'Draft' THEN [1] ELSE [] END |
+        CREATE (root)-[:LATEST_DRAFT]->(value)
+    )
+    FOREACH (_ IN CASE WHEN version.status = 'Final' THEN [1] ELSE [] END |
+        CREATE (root)-[:LATEST_FINAL]->(value)
+    )
+)
+"""
+
 
 class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
     def find_all(
@@ -187,6 +207,58 @@ class OdmGenericRepository(ConceptGenericRepository[_AggregateRootType], ABC):
         else:
             origin.disconnect(relation_node)
 
+    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    def save_batch(
+        self, items: list[_AggregateRootType], approve_author_id: str | None = None
+    ) -> None:
+        """
+        Creates the given new concepts with a single query,
+        leaving the same nodes and relationships as saving them one at a time.
+
+        When `approve_author_id` is given, the concepts are approved too,
+        with the same versions as approving them after they are saved.
+        The concepts can't be template parameter terms.
+        """
+        if not items:
+            return
+
+        params = []
+        for item in items:
+            versions = [self._version_properties(item.item_metadata)]
+            if approve_author_id is not None:
+                item.approve(author_id=approve_author_id)
+                versions.append(self._version_properties(item.item_metadata))
+                versions[0]["end_date"] = versions[1]["start_date"]
+            value = self._create_new_value_node(ar=item)
+            params.append(
+                {
+                    "uid": item.uid,
+                    "library_name": item.library.name,
+                    "value": self.value_class.deflate(value.__properties__),
+                    "versions": versions,
+                }
+            )
+
+        db.cypher_query(
+            SAVE_BATCH_QUERY.format(
+                library_rel_label=self.root_class.LIBRARY_REL_LABEL,
+                root_labels=":".join(self.root_class.inherited_labels()),
+                value_labels=":".join(self.value_class.inherited_labels()),
+            ),
+            {"items": params},
+        )
+
+    @staticmethod
+    def _version_properties(item_metadata: LibraryItemMetadataVO) -> dict[str, Any]:
+        return {
+            "author_id": item_metadata.author_id,
+            "change_description": item_metadata.change_description,
+            "version": item_metadata.version,
+            "status": item_metadata.status.value,
+            "start_date": item_metadata.start_date,
+            "end_date": item_metadata.end_date,
+        }
+
     def has_active_relationships(
         self, uid: str, relationships: list[Any], all_exist: bool = False
     ) -> bool:
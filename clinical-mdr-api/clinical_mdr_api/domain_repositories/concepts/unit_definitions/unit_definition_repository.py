@@ -1,5 +1,7 @@
+from threading import Lock
 from typing import cast
 
+from cachetools import TTLCache, cached
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.concepts.concept_generic_repository import (
@@ -22,6 +24,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameterTermRoot,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    ComplexTemplateParameterRepository,
+)
 from clinical_mdr_api.domains._utils import ObjectStatus
 from clinical_mdr_api.domains.concepts.unit_definitions.unit_definition import (
     CTTerm,
@@ -36,6 +41,9 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
 from clinical_mdr_api.models.concepts.unit_definitions.unit_definition import (
     UnitDefinitionModel,
 )
+from clinical_mdr_api.repositories._utils import sb_clear_cache
+from clinical_mdr_api.repositories.cache_invalidation import invalidate_cache
+from common import config
 from common.utils import convert_to_datetime
 
 
@@ -45,6 +53,36 @@ class UnitDefinitionRepository(ConceptGenericRepository[UnitDefinitionAR]):
     user: str
     return_model = UnitDefinitionModel
 
+    # The day and week units used by the study visits, see get_day_week_units
+    cache_store_day_week_units = TTLCache(maxsize=1, ttl=config.CACHE_TTL)
+    lock_store_day_week_units = Lock()
+
+    @sb_clear_cache(caches_after_commit=["cache_store_day_week_units"])
+    def save(self, item: UnitDefinitionAR) -> None:
+        super().save(item)
+        # The time, acidity and concentration units are template parameter concepts
+        invalidate_cache(
+            ComplexTemplateParameterRepository, "cache_store_parameter_concepts"
+        )
+
+    @cached(
+        cache=cache_store_day_week_units,
+        key=lambda _self: (config.DAY_UNIT_NAME, config.WEEK_UNIT_NAME),
+        lock=lock_store_day_week_units,
+    )
+    def get_day_week_units(
+        self,
+    ) -> tuple[UnitDefinitionAR | None, UnitDefinitionAR | None]:
+        units, _ = self.get_all_optimized()
+        day_unit = None
+        week_unit = None
+        for unit in units:
+            if unit.concept_vo.name == config.DAY_UNIT_NAME:
+                day_unit = unit
+            if unit.concept_vo.name == config.WEEK_UNIT_NAME:
+                week_unit = unit
+        return day_unit, week_unit
+
     def specific_alias_clause(
         self, only_specific_status: str = ObjectStatus.LATEST.name, **kwargs
     ) -> str:
@@ -8,6 +8,9 @@ from clinical_mdr_api.domain_repositories._generic_repository_interface import (
     _AggregateRootType,
 )
 from clinical_mdr_api.domain_repositories._utils.helpers import is_codelist_in_final
+from clinical_mdr_api.domain_repositories.controlled_terminologies import (
+    ct_lookup_cache,
+)
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_query_utils import (
     create_codelist_filter_statement,
     format_codelist_filter_sort_keys,
@@ -31,6 +34,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameterTermRoot,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    ComplexTemplateParameterRepository,
+)
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
 from clinical_mdr_api.models.controlled_terminologies.ct_codelist_attributes import (
     CTCodelistAttributes,
@@ -52,6 +58,9 @@ from common import exceptions
 class CTCodelistGenericRepository(
     LibraryItemRepositoryImplBase[_AggregateRootType], ABC
 ):
+    # Shared with the other CT repositories, see ct_lookup_cache
+    cache_store_ct_lookup = ct_lookup_cache.cache_store_ct_lookup
+
     root_class = type
     value_class = type
     relationship_from_root = type
@@ -386,7 +395,10 @@ class CTCodelistGenericRepository(
             return versions
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -407,7 +419,10 @@ class CTCodelistGenericRepository(
             return True
         return False
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
     def add_term(
         self, codelist_uid: str, term_uid: str, author_id: str, order: int
     ) -> None:
@@ -468,8 +483,12 @@ class CTCodelistGenericRepository(
         """
         db.cypher_query(query, {"codelist_uid": codelist_uid, "term_uid": term_uid})
         TemplateParameterTermRoot.generate_node_uids_if_not_present()
+        ComplexTemplateParameterRepository.evict_parameters_of_codelist(codelist_uid)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
     def remove_term(self, codelist_uid: str, term_uid: str, author_id: str) -> None:
         """
         Method removes term identified by term_uid from the codelist identified by codelist_uid.
@@ -516,6 +535,10 @@ class CTCodelistGenericRepository(
                     msg=f"Term with UID '{term_uid}' cannot be removed from Codelist with UID '{codelist_uid}' as the codelist is in a draft state.",
                 )
 
+                # The affected parameters are looked up before their term is unlinked
+                ComplexTemplateParameterRepository.evict_parameters_of_codelist(
+                    codelist_uid
+                )
                 query = """
                     MATCH (codelist_root:CTCodelistRoot {uid: $codelist_uid})-[:HAS_NAME_ROOT]->()-[:LATEST]->
                         (codelist_ver_value:TemplateParameter)-[r:HAS_PARAMETER_TERM]-(term_ver_root)
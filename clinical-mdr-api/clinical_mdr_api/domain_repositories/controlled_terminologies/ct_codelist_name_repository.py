@@ -20,6 +20,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameterTermRoot,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    ComplexTemplateParameterRepository,
+)
 from clinical_mdr_api.domains.controlled_terminologies.ct_codelist_name import (
     CTCodelistNameAR,
     CTCodelistNameVO,
@@ -144,6 +147,18 @@ class CTCodelistNameRepository(CTCodelistGenericRepository[CTCodelistNameAR]):
         :param value:
         :return None:
         """
+        was_template_parameter = False
+        # only when performing an update of a codelist
+        if versioned_object.repository_closure_data is not None:
+            (
+                _,
+                _,
+                _,
+                previous_versioned_object,
+            ) = versioned_object.repository_closure_data
+            was_template_parameter = (
+                previous_versioned_object.ct_codelist_vo.is_template_parameter
+            )
         if versioned_object.ct_codelist_vo.is_template_parameter:
             query = """
                 MATCH (codelist_root:CTCodelistRoot {uid: $codelist_uid})-[:HAS_NAME_ROOT]->()-[:LATEST]->(codelist_ver_value)
@@ -158,7 +173,15 @@ class CTCodelistNameRepository(CTCodelistGenericRepository[CTCodelistNameAR]):
             """
             db.cypher_query(query, {"codelist_uid": versioned_object.uid})
             TemplateParameterTermRoot.generate_node_uids_if_not_present()
+            # The parameter is only found once the codelist is labeled as a TemplateParameter
+            ComplexTemplateParameterRepository.evict_parameters_of_codelist(
+                versioned_object.uid, parameter_names_changed=not was_template_parameter
+            )
         else:
+            # The parameter is only found while the codelist is still labeled as a TemplateParameter
+            ComplexTemplateParameterRepository.evict_parameters_of_codelist(
+                versioned_object.uid, parameter_names_changed=was_template_parameter
+            )
             query = """
                 MATCH (codelist_root:CTCodelistRoot {uid: $codelist_uid})-[:HAS_NAME_ROOT]->()-[:LATEST]->(codelist_ver_value)
                 REMOVE codelist_ver_value:TemplateParameter
@@ -0,0 +1,82 @@
+"""
+Shared cache of the CT terms looked up by codelist name.
+
+Building study visits needs the terms of a few codelists (visit types, epoch types, contact modes...)
+resolved at the effective date of the CT package selected by the study.
+These terms only change when CT is written, so they are cached per `(codelist name, effective date)`
+and shared by all requests of the worker.
+
+The store is cleared through the cache invalidation bus by the CT term, codelist and package repositories,
+which expose it as their `cache_store_ct_lookup` class attribute, once their transaction is committed.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable
+
+from cachetools import TTLCache
+
+from common import config
+
+
+class VersionedTTLCache(TTLCache):
+    """`TTLCache` counting how many times it has been cleared."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.version = 0
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+
+@dataclass(frozen=True)
+class CTCodelistLookup:
+    """Terms of a codelist, `terms` holds the terms that could be resolved at the effective date."""
+
+    term_uids: tuple[str, ...] = ()
+    terms: dict[str, Any] = field(default_factory=dict)
+
+
+cache_store_ct_lookup = VersionedTTLCache(
+    maxsize=config.CT_LOOKUP_CACHE_MAX_SIZE, ttl=config.CT_LOOKUP_CACHE_TTL
+)
+lock_store_ct_lookup = Lock()
+
+
+def get_codelist_lookups(
+    codelist_names: list[str],
+    effective_date: datetime.datetime | None,
+    load: Callable[[list[str]], dict[str, CTCodelistLookup]],
+) -> dict[str, CTCodelistLookup]:
+    """
+    Returns the terms of the given codelists at the given effective date.
+
+    Codelists that are not cached yet are loaded together with a single call of `load`.
+    The loaded terms are not cached if the store was cleared meanwhile, as they may already be stale.
+    """
+
+    lookups: dict[str, CTCodelistLookup] = {}
+    missing: list[str] = []
+    with lock_store_ct_lookup:
+        version = cache_store_ct_lookup.version
+        for codelist_name in codelist_names:
+            lookup = cache_store_ct_lookup.get((codelist_name, effective_date))
+            if lookup is None:
+                missing.append(codelist_name)
+            else:
+                lookups[codelist_name] = lookup
+
+    if missing:
+        loaded = load(missing)
+        with lock_store_ct_lookup:
+            cacheable = cache_store_ct_lookup.version == version
+            for codelist_name in missing:
+                lookup = loaded.get(codelist_name) or CTCodelistLookup()
+                lookups[codelist_name] = lookup
+                if cacheable:
+                    cache_store_ct_lookup[(codelist_name, effective_date)] = lookup
+
+    return lookups
@@ -4,6 +4,9 @@ from typing import Collection
 from neomodel import db
 from neomodel.exceptions import UniqueProperty
 
+from clinical_mdr_api.domain_repositories.controlled_terminologies import (
+    ct_lookup_cache,
+)
 from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
     CTCatalogue,
     CTPackage,
@@ -12,11 +15,16 @@ from clinical_mdr_api.domains.controlled_terminologies.ct_package import CTPacka
 from clinical_mdr_api.models.controlled_terminologies.ct_package import (
     CTPackage as CTPackageModel,
 )
+from clinical_mdr_api.repositories.cache_invalidation import (
+    invalidate_cache_after_commit,
+)
 from clinical_mdr_api.services.user_info import UserInfoService
 from common.exceptions import AlreadyExistsException, NotFoundException
 
 
 class CTPackageRepository:
+    cache_store_ct_lookup = ct_lookup_cache.cache_store_ct_lookup
+
     def package_exists(self, package_name: str) -> bool:
         package_node = CTPackage.nodes.get_or_none(name=package_name)
         return bool(package_node)
@@ -211,6 +219,7 @@ class CTPackageRepository:
         # Connect the new package to its parent and the catalogue node
         sponsor_package.extends_package.connect(extends_package_node)
         catalogue_node.contains_package.connect(sponsor_package)
+        invalidate_cache_after_commit(self, "cache_store_ct_lookup")
 
         return CTPackageAR.from_repository_values(
             uid=sponsor_package.uid,
@@ -22,12 +22,18 @@ from clinical_mdr_api.repositories._utils import (
     CypherQueryBuilder,
     FilterDict,
     FilterOperator,
+    FullTextField,
     validate_filters_and_add_search_string,
 )
 from common.exceptions import ValidationException
 
 
 class CTTermAggregatedRepository:
+    fulltext_fields = {
+        "name.sponsor_preferred_name": FullTextField(
+            "fulltext_ct_term_name", "term_name_value", "name"
+        )
+    }
     generic_final_alias_clause = """
         CALL {
             WITH rel_data_attributes
@@ -154,6 +160,7 @@ class CTTermAggregatedRepository:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        cursor: str | None = None,
     ) -> GenericFilteringReturn[tuple[CTTermNameAR, CTTermAttributesAR]]:
         """
         Method runs a cypher query to fetch all data related to the CTTermName* and CTTermAttributes*.
@@ -173,6 +180,7 @@ class CTTermAggregatedRepository:
         :param filter_by:
         :param filter_operator:
         :param total_count:
+        :param cursor: keyset pagination cursor, see CypherQueryBuilder
         :return GenericFilteringReturn[tuple[CTTermNameAR, CTTermAttributesAR]]:
         """
         # Build match_clause
@@ -194,7 +202,8 @@ class CTTermAggregatedRepository:
             match_clause=match_clause,
             alias_clause=alias_clause,
             sort_by=sort_by,
-            implicit_sort_by="term_uid",
+            # A term is returned once per codelist it belongs to
+            implicit_sort_by=["term_uid", "codelist_uid"],
             page_number=page_number,
             page_size=page_size,
             filter_by=FilterDict(elements=filter_by),
@@ -202,6 +211,8 @@ class CTTermAggregatedRepository:
             total_count=total_count,
             wildcard_properties_list=list_term_wildcard_properties(),
             format_filter_sort_keys=format_term_filter_sort_keys,
+            cursor=cursor,
+            fulltext_fields=self.fulltext_fields,
         )
 
         query.parameters.update(filter_query_parameters)
@@ -226,7 +237,9 @@ class CTTermAggregatedRepository:
             if len(count_result) > 0:
                 total = count_result[0][0]
 
-        return GenericFilteringReturn.create(items=terms_ars, total=total)
+        return GenericFilteringReturn.create(
+            items=terms_ars, total=total, next_cursor=query.next_cursor
+        )
 
     def get_distinct_headers(
         self,
@@ -283,6 +296,7 @@ class CTTermAggregatedRepository:
             alias_clause=alias_clause,
             wildcard_properties_list=list_term_wildcard_properties(),
             format_filter_sort_keys=format_term_filter_sort_keys,
+            fulltext_fields=self.fulltext_fields,
         )
 
         query.full_query = query.build_header_query(
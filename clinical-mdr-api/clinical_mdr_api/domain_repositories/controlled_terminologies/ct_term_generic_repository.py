@@ -9,6 +9,9 @@ from neomodel import db
 from clinical_mdr_api.domain_repositories._generic_repository_interface import (
     _AggregateRootType,
 )
+from clinical_mdr_api.domain_repositories.controlled_terminologies import (
+    ct_lookup_cache,
+)
 from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_query_utils import (
     create_term_filter_statement,
     format_term_filter_sort_keys,
@@ -29,6 +32,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
     VersionRelationship,
 )
 from clinical_mdr_api.domain_repositories.models.syntax import SyntaxTemplateRoot
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    refresh_template_parameter_terms,
+)
 from clinical_mdr_api.domains.controlled_terminologies.utils import TermParentType
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryItemStatus
 from clinical_mdr_api.models.controlled_terminologies.ct_term import CTTermName
@@ -51,6 +57,9 @@ from common.exceptions import (
 
 
 class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType], ABC):
+    # Shared with the other CT repositories, see ct_lookup_cache
+    cache_store_ct_lookup = ct_lookup_cache.cache_store_ct_lookup
+
     root_class = type
     value_class = type
     relationship_from_root = type
@@ -485,7 +494,11 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
             return versions
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
+    @refresh_template_parameter_terms
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -498,7 +511,10 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
     def _is_repository_related_to_ct(self) -> bool:
         return True
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
     def add_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
     ) -> None:
@@ -531,7 +547,10 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
         else:
             ct_term_root_node.has_parent_subtype.connect(ct_term_root_parent_node)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"],
+        caches_after_commit=["cache_store_ct_lookup"],
+    )
     def remove_parent(
         self, term_uid: str, parent_uid: str, relationship_type: TermParentType
     ) -> None:
@@ -133,6 +133,7 @@ class CTTermNameRepository(
             total_count=total_count,
             wildcard_properties_list=list_term_wildcard_properties(),
             format_filter_sort_keys=format_term_filter_sort_keys,
+            fulltext_fields=CTTermAggregatedRepository.fulltext_fields,
         )
 
         query.parameters.update(filter_query_parameters)
@@ -28,6 +28,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameterTermRoot,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    ComplexTemplateParameterRepository,
+)
 from clinical_mdr_api.domains.dictionaries.dictionary_codelist import (
     DictionaryCodelistAR,
     DictionaryCodelistVO,
@@ -370,6 +373,7 @@ class DictionaryCodelistGenericRepository(
         :param value:
         :return None:
         """
+        was_template_parameter = False
         # only when performing an update of a codelist
         if versioned_object.repository_closure_data is not None:
             (
@@ -378,6 +382,9 @@ class DictionaryCodelistGenericRepository(
                 _,
                 previous_versioned_object,
             ) = versioned_object.repository_closure_data
+            was_template_parameter = (
+                previous_versioned_object.dictionary_codelist_vo.is_template_parameter
+            )
             added_terms = list(
                 set(versioned_object.dictionary_codelist_vo.current_terms)
                 - set(previous_versioned_object.dictionary_codelist_vo.current_terms)
@@ -426,6 +433,11 @@ class DictionaryCodelistGenericRepository(
                 # removing HAS_TERM relationship as term was removed from codelist
                 dictionary_codelist_node.has_term.disconnect(dictionary_term_node)
 
+        ComplexTemplateParameterRepository.evict_parameters_of_codelist(
+            versioned_object.uid,
+            parameter_names_changed=was_template_parameter
+            != versioned_object.dictionary_codelist_vo.is_template_parameter,
+        )
         if versioned_object.dictionary_codelist_vo.is_template_parameter:
             query = """
                 MATCH (dictionary_codelist_root:DictionaryCodelistRoot {uid: $codelist_uid})-[:LATEST]->(dictionary_codelist_value)
@@ -32,6 +32,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
     VersionRoot,
     VersionValue,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    refresh_template_parameter_terms,
+)
 from clinical_mdr_api.domains.dictionaries.dictionary_term import (
     DictionaryTermAR,
     DictionaryTermVO,
@@ -333,6 +336,7 @@ class DictionaryTermGenericRepository(
         return self.find_by_uid_2(uid=term_uid, for_update=for_update)
 
     @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @refresh_template_parameter_terms
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
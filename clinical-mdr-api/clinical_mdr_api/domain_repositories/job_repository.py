@@ -0,0 +1,301 @@
+# pylint: disable=invalid-name
+import datetime
+
+from neomodel import db
+
+from clinical_mdr_api.domain_repositories.models.job import Job as JobNode
+from clinical_mdr_api.models.job import Job, JobError, JobStatus
+from common.exceptions import NotFoundException
+
+
+class JobRepository:
+    """
+    Queue of the background jobs, each job is stored as a `Job` node.
+
+    Jobs are created `queued` and claimed by the worker pools of the API processes,
+    a worker pool refreshes `heartbeat_at` of its running jobs so that jobs of a dead process can be detected.
+    """
+
+    def _transform_to_model(self, item: JobNode) -> Job:
+        return Job(
+            uid=item.uid,
+            job_type=item.job_type,
+            status=JobStatus(item.status),
+            progress=item.progress or 0,
+            message=item.message,
+            idempotency_key=item.idempotency_key,
+            author_id=item.author_id,
+            error=(
+                JobError(
+                    status_code=item.error_status_code,
+                    type=item.error_type,
+                    message=item.error_message,
+                )
+                if item.error_status_code is not None
+                else None
+            ),
+            created_at=item.created_at,
+            started_at=item.started_at,
+            finished_at=item.finished_at,
+        )
+
+    def _find_node(self, uid: str) -> JobNode:
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {uid: $uid})
+            RETURN job
+            """,
+            params={"uid": uid},
+            resolve_objects=True,
+        )
+
+        NotFoundException.raise_if_not(rs[0], "Job", uid)
+
+        return rs[0][0][0]
+
+    def retrieve_job(self, uid: str) -> Job:
+        return self._transform_to_model(self._find_node(uid))
+
+    def retrieve_result(self, uid: str) -> str | None:
+        return self._find_node(uid).result
+
+    def retrieve_job_by_idempotency_key(
+        self, job_type: str, author_id: str, idempotency_key: str
+    ) -> Job | None:
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {
+                job_type: $job_type,
+                author_id: $author_id,
+                idempotency_key: $idempotency_key
+            })
+            RETURN job
+            """,
+            params={
+                "job_type": job_type,
+                "author_id": author_id,
+                "idempotency_key": idempotency_key,
+            },
+            resolve_objects=True,
+        )
+
+        return self._transform_to_model(rs[0][0][0]) if rs[0] else None
+
+    def create_job(
+        self,
+        job_type: str,
+        author_id: str,
+        access_token_claims: str,
+        params: str,
+        idempotency_key: str | None = None,
+    ) -> Job:
+        """
+        Creates a queued job.
+
+        When an `idempotency_key` is given and the author already submitted a job of this type with the same key,
+        the existing job is returned instead.
+        """
+        if idempotency_key is not None:
+            existing = self.retrieve_job_by_idempotency_key(
+                job_type, author_id, idempotency_key
+            )
+            if existing is not None:
+                return existing
+
+        uid = JobNode.get_next_free_uid_and_increment_counter()
+        set_clause = """
+                job.uid = $uid,
+                job.status = $status,
+                job.progress = 0.0,
+                job.access_token_claims = $access_token_claims,
+                job.params = $params,
+                job.created_at = datetime()
+            RETURN job
+            """
+        if idempotency_key is not None:
+            # With the uniqueness constraint on (job_type, author_id, idempotency_key) of the db schema,
+            # concurrent submissions with the same idempotency key MERGE into the same job
+            query = (
+                """
+            MERGE (job:Job {
+                job_type: $job_type,
+                author_id: $author_id,
+                idempotency_key: $idempotency_key
+            })
+            ON CREATE SET"""
+                + set_clause
+            )
+        else:
+            query = (
+                """
+            CREATE (job:Job {job_type: $job_type, author_id: $author_id})
+            SET"""
+                + set_clause
+            )
+        rs = db.cypher_query(
+            query,
+            params={
+                "uid": uid,
+                "job_type": job_type,
+                "author_id": author_id,
+                "idempotency_key": idempotency_key,
+                "status": JobStatus.QUEUED.value,
+                "access_token_claims": access_token_claims,
+                "params": params,
+            },
+            resolve_objects=True,
+        )
+
+        return self._transform_to_model(rs[0][0][0])
+
+    def claim_next_job(self, worker: str) -> JobNode | None:
+        """Marks the oldest queued job as running by the given worker and returns it."""
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {status: $queued})
+            WITH job ORDER BY job.created_at LIMIT 1
+            CALL apoc.lock.nodes([job])
+            // Another worker may have claimed the job while waiting for the lock
+            WITH job WHERE job.status = $queued
+            SET
+                job.status = $running,
+                job.worker = $worker,
+                job.started_at = datetime(),
+                job.heartbeat_at = datetime()
+            RETURN job
+            """,
+            params={
+                "queued": JobStatus.QUEUED.value,
+                "running": JobStatus.RUNNING.value,
+                "worker": worker,
+            },
+            resolve_objects=True,
+        )
+
+        return rs[0][0][0] if rs[0] else None
+
+    def update_running_jobs(
+        self, worker: str, progress: dict[str, tuple[float, str | None]]
+    ) -> None:
+        """Refreshes the heartbeat, progress and message of the given running jobs of the worker."""
+        db.cypher_query(
+            """
+            UNWIND $jobs AS item
+            MATCH (job:Job {uid: item.uid, worker: $worker, status: $running})
+            SET
+                job.progress = item.progress,
+                job.message = item.message,
+                job.heartbeat_at = datetime()
+            """,
+            params={
+                "jobs": [
+                    {"uid": uid, "progress": value, "message": message}
+                    for uid, (value, message) in progress.items()
+                ],
+                "worker": worker,
+                "running": JobStatus.RUNNING.value,
+            },
+        )
+
+    def complete_job(self, uid: str, worker: str, result: str) -> bool:
+        """
+        Records the result of a job running by the given worker.
+
+        Returns False if the worker lost its claim on the job, e.g. when the job was failed as stale meanwhile,
+        in which case the job is left untouched.
+        """
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {uid: $uid})
+            WHERE job.status = $running AND job.worker = $worker
+            SET
+                job.status = $succeeded,
+                job.progress = 1.0,
+                job.result = $result,
+                job.access_token_claims = null,
+                job.finished_at = datetime()
+            RETURN count(job)
+            """,
+            params={
+                "uid": uid,
+                "worker": worker,
+                "running": JobStatus.RUNNING.value,
+                "succeeded": JobStatus.SUCCEEDED.value,
+                "result": result,
+            },
+        )
+
+        return rs[0][0][0] > 0
+
+    def fail_job(self, uid: str, worker: str, error: JobError) -> bool:
+        """
+        Records the error of a job running by the given worker.
+
+        Returns False if the worker lost its claim on the job, in which case the job is left untouched.
+        """
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {uid: $uid})
+            WHERE job.status = $running AND job.worker = $worker
+            SET
+                job.status = $failed,
+                job.error_status_code = $status_code,
+                job.error_type = $type,
+                job.error_message = $message,
+                job.access_token_claims = null,
+                job.finished_at = datetime()
+            RETURN count(job)
+            """,
+            params={
+                "uid": uid,
+                "worker": worker,
+                "running": JobStatus.RUNNING.value,
+                "failed": JobStatus.FAILED.value,
+                "status_code": error.status_code,
+                "type": error.type,
+                "message": error.message,
+            },
+        )
+
+        return rs[0][0][0] > 0
+
+    def fail_stale_jobs(self, heartbeat_before: datetime.datetime) -> int:
+        """Fails the running jobs whose worker stopped refreshing their heartbeat, e.g. after a restart."""
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job {status: $running})
+            WHERE job.heartbeat_at < datetime($heartbeat_before)
+            SET
+                job.status = $failed,
+                job.error_status_code = 500,
+                job.error_type = "JobInterrupted",
+                job.error_message = "The job was interrupted, please submit it again.",
+                job.access_token_claims = null,
+                job.finished_at = datetime()
+            RETURN count(job)
+            """,
+            params={
+                "running": JobStatus.RUNNING.value,
+                "failed": JobStatus.FAILED.value,
+                "heartbeat_before": heartbeat_before.isoformat(),
+            },
+        )
+
+        return rs[0][0][0]
+
+    def delete_finished_jobs(self, finished_before: datetime.datetime) -> int:
+        rs = db.cypher_query(
+            """
+            MATCH (job:Job)
+            WHERE job.status IN $finished
+            AND job.finished_at < datetime($finished_before)
+            DETACH DELETE job
+            RETURN count(job)
+            """,
+            params={
+                "finished": [JobStatus.SUCCEEDED.value, JobStatus.FAILED.value],
+                "finished_before": finished_before.isoformat(),
+            },
+        )
+
+        return rs[0][0][0]
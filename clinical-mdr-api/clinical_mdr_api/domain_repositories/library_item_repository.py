@@ -31,6 +31,9 @@ from clinical_mdr_api.domain_repositories.models.generic import (
     VersionRoot,
     VersionValue,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    refresh_template_parameter_terms,
+)
 from clinical_mdr_api.domains.syntax_templates.template import InstantiationCountsVO
 from clinical_mdr_api.domains.versioned_object_aggregate import (
     LibraryItemAggregateRootBase,
@@ -40,6 +43,10 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
 from clinical_mdr_api.repositories._utils import (
     ComparisonOperator,
     FilterOperator,
+    FullTextField,
+    build_fulltext_seed,
+    get_fulltext_parameters,
+    raise_if_fulltext_limit_exceeded,
     sb_clear_cache,
 )
 from clinical_mdr_api.services.user_info import UserInfoService
@@ -69,6 +76,8 @@ class LibraryItemRepositoryImplBase(
     )
     lock_store_item_by_uid = Lock()
     has_library = True
+    # Fields which can be filtered with the `ft` operator, and the full-text index to use
+    fulltext_fields: dict[str, FullTextField] = {}
 
     @abc.abstractmethod
     def _create_aggregate_root_instance_from_version_root_relationship_and_value(
@@ -1075,6 +1084,7 @@ class LibraryItemRepositoryImplBase(
         )
 
     @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @refresh_template_parameter_terms
     def save(self, item: _AggregateRootType) -> None:
         if item.repository_closure_data is RETRIEVED_READ_ONLY_MARK:
             raise NotImplementedError(
@@ -1438,7 +1448,7 @@ class LibraryItemRepositoryImplBase(
 
         aggregates = []
 
-        where_stmt, params = self._where_stmt_optimized(
+        where_stmt, params, fulltext_seed = self._where_stmt_optimized(
             filter_by, filter_operator, version_specific_uids=version_specific_uids
         )
 
@@ -1450,6 +1460,7 @@ class LibraryItemRepositoryImplBase(
             with_at_specific_date=bool(at_specific_date),
             return_study_count=return_study_count,
             where_stmt=where_stmt,
+            fulltext_seed=fulltext_seed,
             sort_by=sort_by,
             for_audit_trail=for_audit_trail,
             include_retired_versions=include_retired_versions,
@@ -1477,6 +1488,7 @@ class LibraryItemRepositoryImplBase(
                 with_pagination=bool(page_size),
                 return_study_count=return_study_count,
                 where_stmt=where_stmt,
+                fulltext_seed=fulltext_seed,
                 for_audit_trail=for_audit_trail,
                 include_retired_versions=include_retired_versions,
             )
@@ -1498,6 +1510,9 @@ class LibraryItemRepositoryImplBase(
             raise NotFoundException(
                 msg="Resource doesn't exist - it was likely deleted in a concurrent transaction."
             ) from exc
+        except neo4j.exceptions.ClientError as exc:
+            raise_if_fulltext_limit_exceeded(exc)
+            raise
 
         if not result:
             NotFoundException.raise_if(
@@ -1659,22 +1674,29 @@ class LibraryItemRepositoryImplBase(
                 "op": ComparisonOperator.CONTAINS.value,
             }
 
-        where_stmt, params = self._where_stmt_optimized(filter_by, filter_operator)
+        where_stmt, params, fulltext_seed = self._where_stmt_optimized(
+            filter_by, filter_operator
+        )
 
         match_stmt, return_stmt = self._headers_cypher_query(
             cypher_field_name=cypher_field_name,
             with_status=bool(status),
             where_stmt=where_stmt,
+            fulltext_seed=fulltext_seed,
         )
 
         if status:
             params["status"] = status.value
 
-        result, _ = db.cypher_query(
-            match_stmt + return_stmt,
-            params=params | {"page_size": page_size},
-            resolve_objects=True,
-        )
+        try:
+            result, _ = db.cypher_query(
+                match_stmt + return_stmt,
+                params=params | {"page_size": page_size},
+                resolve_objects=True,
+            )
+        except neo4j.exceptions.ClientError as exc:
+            raise_if_fulltext_limit_exceeded(exc)
+            raise
 
         rs = []
         for item in result:
@@ -1834,7 +1856,7 @@ class LibraryItemRepositoryImplBase(
                     filter_by.pop(name, None)
 
         if not filter_by and not version_specific_uids:
-            return "", {}
+            return "", {}, ""
 
         mapping = self.basemodel_to_cypher_mapping_optimized()
 
@@ -1842,6 +1864,7 @@ class LibraryItemRepositoryImplBase(
         fields_non_generic = []
         params = {}
         where_stmt = ""
+        fulltext_seed = ""
 
         if filter_by:
             if "*" in filter_by:
@@ -1890,6 +1913,28 @@ END
                 )
 
                 op = items.get("op")
+                if (
+                    op == ComparisonOperator.FULL_TEXT.value
+                    and filter_name in self.fulltext_fields
+                    and not fulltext_seed
+                ):
+                    fulltext_params = get_fulltext_parameters(
+                        self.fulltext_fields[filter_name], items["v"]
+                    )
+                    if fulltext_params is not None:
+                        params |= fulltext_params
+                        # The roots with a version found by the index drive the match,
+                        # the returned version has to contain the searched words as well
+                        fulltext_seed = f"""
+                            {build_fulltext_seed("fulltext_value")}
+                            MATCH (root)-[:HAS_VERSION]->(fulltext_value)
+                            WITH DISTINCT root
+                        """
+                        fields_non_generic.append(
+                            f" all(word IN $fulltext_words WHERE toLower({mapping[filter_name]}) CONTAINS word) "
+                        )
+                        continue
+
                 if op == ComparisonOperator.EQUALS.value:
                     operator = "="
                 elif op == ComparisonOperator.IN.value:
@@ -1963,7 +2008,7 @@ END
                     " AND (" + " OR ".join(version_spec_uids_where_stmt_list) + ")"
                 )
 
-        return "WHERE " + where_stmt, params
+        return "WHERE " + where_stmt, params, fulltext_seed
 
     def _sort_stmt(self, sort_by: dict | None = None):
         if not sort_by:
@@ -1988,6 +2033,7 @@ END
         cypher_field_name: str,
         with_status: bool = False,
         where_stmt: str = "",
+        fulltext_seed: str = "",
     ):
         version_where_stmt = ""
         retire_exclusion = "WITH root as _root"
@@ -2005,6 +2051,7 @@ END
             """
 
         match_stmt = f"""
+            {fulltext_seed}
             MATCH (library:Library)-[:{self.root_class.LIBRARY_REL_LABEL}]->(root:{self.root_class.__label__})
             -[:LATEST]->(value:{self.value_class.__label__})
             CALL {{
@@ -2107,6 +2154,7 @@ END
         with_versions_in_where: bool = False,
         return_study_count: bool = False,
         where_stmt: str = "",
+        fulltext_seed: str = "",
         sort_by: dict | None = None,
         uid: str | None = None,
         for_audit_trail: bool = False,
@@ -2253,6 +2301,7 @@ END
             else ""
         )
         match_stmt = f"""
+            {fulltext_seed}
             MATCH (root:{self.root_class.__label__}){value_matching}
             {uid_where_stmt}
             {library__stmt}
@@ -89,6 +89,31 @@ class ClinicalMdrNodeWithUID(ClinicalMdrNode):
             )[0][0][0]
         )
 
+    @classmethod
+    def get_next_free_uids_and_increment_counter(cls, count: int) -> list[str]:
+        """
+        Same as `get_next_free_uid_and_increment_counter`, but reserves `count` UIDs at once.
+        """
+        if count <= 0:
+            return []
+
+        object_name = cls.__name__.removesuffix("Root")
+
+        rows, _ = db.cypher_query(
+            """
+        MERGE (m:Counter{{counterId:'{LABEL}Counter'}})
+        ON CREATE SET m:{LABEL}Counter, m.count=0
+        WITH m
+        CALL apoc.atomic.add(m,'count',$count,1) yield oldValue, newValue
+        UNWIND range(toInteger(oldValue) + 1, toInteger(newValue)) as uid_number
+        RETURN "{LABEL}_"+apoc.text.lpad(""+(uid_number), {number_of_digits}, "0")
+        """.format(
+                LABEL=object_name, number_of_digits=NUMBER_OF_UID_DIGITS
+            ),
+            {"count": count},
+        )
+        return [str(row[0]) for row in rows]
+
     @classmethod
     def generate_node_uids_if_not_present(cls) -> None:
         """
@@ -0,0 +1,26 @@
+from neomodel import FloatProperty, IntegerProperty, StringProperty
+
+from clinical_mdr_api.domain_repositories.models.generic import (
+    ClinicalMdrNodeWithUID,
+    ZonedDateTimeProperty,
+)
+
+
+class Job(ClinicalMdrNodeWithUID):
+    job_type = StringProperty()
+    status = StringProperty()
+    progress = FloatProperty()
+    message = StringProperty()
+    idempotency_key = StringProperty()
+    author_id = StringProperty()
+    access_token_claims = StringProperty()
+    params = StringProperty()
+    result = StringProperty()
+    error_status_code = IntegerProperty()
+    error_type = StringProperty()
+    error_message = StringProperty()
+    worker = StringProperty()
+    created_at = ZonedDateTimeProperty()
+    started_at = ZonedDateTimeProperty()
+    finished_at = ZonedDateTimeProperty()
+    heartbeat_at = ZonedDateTimeProperty()
@@ -1,4 +1,13 @@
-from neomodel import RelationshipFrom, RelationshipTo, StringProperty, ZeroOrMore
+from typing import Any
+
+from neomodel import (
+    RelationshipFrom,
+    RelationshipTo,
+    StringProperty,
+    StructuredNode,
+    StructuredRel,
+    ZeroOrMore,
+)
 
 from clinical_mdr_api.domain_repositories.models.generic import (
     ClinicalMdrNode,
@@ -178,6 +187,25 @@ class StudyValue(ClinicalMdrNode, AuditTrailMixin):
     )
 
 
+class StudyAuditTrail(ZeroOrMore):
+    """
+    Audit trail of a study, connecting an action also increments the `revision` counter of the StudyRoot node.
+
+    The counter is the token that changes whenever the data of the study changes, see
+    StudySoARepository.get_study_revision. It is not a property of the StudyRoot model,
+    so that saving a StudyRoot instance loaded before the action never writes back a stale counter.
+    """
+
+    def connect(
+        self, node: StructuredNode, properties: dict[str, Any] | None = None
+    ) -> StructuredRel | None:
+        rel = super().connect(node, properties)
+        self.source.cypher(
+            "MATCH (sr:StudyRoot) WHERE elementId(sr) = $self SET sr.revision = coalesce(sr.revision, 0) + 1"
+        )
+        return rel
+
+
 class StudyRoot(ClinicalMdrNodeWithUID):
     """
     Represents the root object for a given compound in the graph.
@@ -193,4 +221,6 @@ class StudyRoot(ClinicalMdrNodeWithUID):
     latest_released = RelationshipTo(
         StudyValue, "LATEST_RELEASED", model=VersionRelationship
     )
-    audit_trail = RelationshipTo(StudyAction, "AUDIT_TRAIL", model=ClinicalMdrRel)
+    audit_trail = RelationshipTo(
+        StudyAction, "AUDIT_TRAIL", cardinality=StudyAuditTrail, model=ClinicalMdrRel
+    )
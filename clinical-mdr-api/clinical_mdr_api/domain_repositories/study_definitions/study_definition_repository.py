@@ -877,7 +877,13 @@ return *
 
     @abstractmethod
     def _retrieve_fields_audit_trail(
-        self, uid: str
+        self,
+        uid: str,
+        field_names: list[str] | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyFieldAuditTrailEntryAR] | None:
         """
         Private method to retrieve an audit trail for a study by UID.
@@ -885,13 +891,28 @@ return *
         """
 
     def get_audit_trail_by_uid(
-        self, uid: str
+        self,
+        uid: str,
+        field_names: list[str] | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyFieldAuditTrailEntryAR] | None:
         """
         Public method which is to retrieve the audit trail for a given study identified by UID.
-        :return: A list of retrieved data in a form StudyAuditTrailAR instances.
+        The audit trail can be restricted to the given study fields and to the actions done
+        from `since` (included) until `until` (excluded), and is paged unless `page_size` is 0.
+        :return: A list of retrieved data in a form StudyAuditTrailAR instances, None if the study does not exist.
         """
-        return self._retrieve_fields_audit_trail(uid)
+        return self._retrieve_fields_audit_trail(
+            uid,
+            field_names=field_names,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
+        )
 
     @abstractmethod
     def _retrieve_study_subpart_with_history(
@@ -10,6 +10,10 @@ from neomodel.sync_.core import NodeMeta, db
 from neomodel.sync_.match import Collect, Last
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.generic_repository import RepositoryImpl
 from clinical_mdr_api.domain_repositories.models.concepts import UnitDefinitionRoot
 from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
@@ -2011,10 +2015,17 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
         return data
 
     def _retrieve_fields_audit_trail(
-        self, uid: str
+        self,
+        uid: str,
+        field_names: list[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyFieldAuditTrailEntryAR] | None:
         query = """
         MATCH (root:StudyRoot {uid: $studyuid})-[:AUDIT_TRAIL]->(action)
+        WHERE ($since IS NULL OR action.date >= $since) AND ($until IS NULL OR action.date < $until)
  
         OPTIONAL MATCH (action)-[:BEFORE]->(before)
         WHERE "StudyField" in labels(before) or "StudyValue" in labels(before)
@@ -2077,6 +2088,8 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
             AND NOT (field_with_value[1][0] IS NULL 
                     AND field_with_value[1][1] IS NULL
                 )
+            AND field_with_value[0] <> "study_id_prefix"
+            AND ($fields IS NULL OR field_with_value[0] IN $fields)
         RETURN study_uid, toString(date) as date, author_id, collect(
             distinct  {action:action, 
              field:field_with_value[0], 
@@ -2085,15 +2098,21 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
              }) as actions,
              author_username
 
-        ORDER BY date DESC
+        ORDER BY date DESC, author_id
 
-      """
+      """ + audit_trail_page_clause(
+            page_number=page_number, page_size=page_size
+        )
 
-        query_parameters = {"studyuid": uid}
+        query_parameters = {
+            "studyuid": uid,
+            "fields": field_names,
+            **audit_trail_window_params(since=since, until=until),
+        }
         result_array, _ = db.cypher_query(query, query_parameters)
 
         # if the study is not found, return None.
-        if len(result_array) == 0:
+        if len(result_array) == 0 and not self.study_exists_by_uid(uid):
             return None
         audit_trail = [
             StudyFieldAuditTrailEntryAR(
@@ -2110,7 +2129,6 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
                         after_value=action["after"],
                     )
                     for action in row[3]
-                    if action["field"] not in ["study_id_prefix"]
                 ],
             )
             for row in result_array
@@ -2133,31 +2151,49 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
                     field_name = "trial_intent_type"
         return field_name
 
+    # Logical sections of the study properties, in the order their fields are looked up.
+    STUDY_FIELD_SECTIONS = {
+        "identification_metadata": StudyIdentificationMetadataVO,
+        "registry_identifiers": RegistryIdentifiersVO,
+        "version_metadata": StudyVersionMetadataVO,
+        "high_level_study_design": HighLevelStudyDesignVO,
+        "study_population": StudyPopulationVO,
+        "study_intervention": StudyInterventionVO,
+        "study_description": StudyDescriptionVO,
+    }
+
     @classmethod
     def get_section_name_for_study_field(cls, field):
         """
         For a given field name, find what logical section of the study properties it belongs to.
         """
-        if (
-            field in [field.name for field in fields(StudyIdentificationMetadataVO)]
-            or field == "study_id"
-        ):
+        if field == "study_id":
             return "identification_metadata"
-        if field in [field.name for field in fields(RegistryIdentifiersVO)]:
-            return "registry_identifiers"
-        if field in [field.name for field in fields(StudyVersionMetadataVO)]:
-            return "version_metadata"
-        if field in [field.name for field in fields(HighLevelStudyDesignVO)]:
-            return "high_level_study_design"
-        if field in [field.name for field in fields(StudyPopulationVO)]:
-            return "study_population"
-        if field in [field.name for field in fields(StudyInterventionVO)]:
-            return "study_intervention"
-        if field in [field.name for field in fields(StudyDescriptionVO)]:
-            return "study_description"
+        for section, section_vo in cls.STUDY_FIELD_SECTIONS.items():
+            if field in [field.name for field in fields(section_vo)]:
+                return section
         # A study field was found in the audit trail that does not belong to any sections:
         return "Unknown"
 
+    @classmethod
+    def get_study_fields_of_sections(cls, sections: set[str]) -> list[str] | None:
+        """
+        Returns the names of the study fields, as stored in the audit trail, which belong to the given sections.
+        Returns None when the "Unknown" section is requested, as its fields can't be listed.
+        """
+        if "Unknown" in sections:
+            return None
+        study_fields = set()
+        for section_vo in cls.STUDY_FIELD_SECTIONS.values():
+            study_fields.update(field.name for field in fields(section_vo))
+        if "identification_metadata" in sections:
+            study_fields.add("study_id")
+        return sorted(
+            field
+            for field in study_fields
+            if cls.get_section_name_for_study_field(field) in sections
+        )
+
     def _build_snapshot_match_clause(
         self,
         study_selection_object_node_id,
@@ -5,6 +5,10 @@ from typing import Generic, TypeVar
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot, StudyValue
 from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     Create,
@@ -13,6 +17,7 @@ from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     StudyAction,
 )
 from clinical_mdr_api.domain_repositories.models.study_selections import StudySelection
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_base import (
     StudySelectionBaseAR,
     StudySelectionBaseVO,
@@ -169,7 +174,9 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         query += self._return_clause()
         all_activity_selections = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_activity_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_activity_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
@@ -408,7 +415,13 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         return audit_node
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str = None
+        self,
+        study_uid: str,
+        study_selection_uid: str = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study activity either for a specific selection or for all study activity for the study
@@ -416,10 +429,14 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
 
         audit_trail_query = self.get_audit_trail_query(
             study_selection_uid=study_selection_uid
-        )
+        ) + audit_trail_page_clause(page_number=page_number, page_size=page_size)
         specific_activity_selections_audit_trail = db.cypher_query(
             audit_trail_query,
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **audit_trail_window_params(since=since, until=until),
+            },
         )
         result = []
         for res in utils.db_result_to_list(specific_activity_selections_audit_trail):
@@ -438,13 +455,25 @@ class StudySelectionActivityBaseRepository(Generic[_AggregateRootType], abc.ABC)
         return result
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[dict | None]:
         if study_selection_uid:
             return self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
@@ -3,6 +3,9 @@ from dataclasses import dataclass
 
 from neomodel import db
 
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_window_filter,
+)
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -150,10 +153,11 @@ class StudySelectionActivityGroupRepository(
             WITH distinct(all_sa), study_activity
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityGroup)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityGroup)
                 <-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_GROUP]-(study_activity:StudyActivity)
             WITH DISTINCT all_sa, study_activity
+            WHERE {audit_trail_window_filter("all_sa")}
             """
         audit_trail_cypher += """
                     MATCH (all_sa)-[:HAS_SELECTED_ACTIVITY_GROUP]->(av:ActivityGroupValue)
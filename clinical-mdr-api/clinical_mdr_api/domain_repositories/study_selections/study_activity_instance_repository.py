@@ -1,6 +1,9 @@
 import datetime
 from dataclasses import dataclass
 
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_window_filter,
+)
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -247,9 +250,10 @@ class StudySelectionActivityInstanceRepository(
             WITH distinct(all_sa)
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityInstance)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sa:StudyActivityInstance)
             WITH DISTINCT all_sa
+            WHERE {audit_trail_window_filter("all_sa")}
             """
         audit_trail_cypher += """
 
@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import datetime
+from collections import Counter
+from dataclasses import dataclass, field
 
 from neomodel import db
 
@@ -17,6 +19,53 @@ from common import config
 from common.exceptions import BusinessLogicException, NotFoundException
 from common.utils import convert_to_datetime
 
+DUPLICATE_SCHEDULE_MSG = "There already exist a schedule for the same Activity and Visit in the Study with UID '{study_uid}'"
+
+
+# A deleted schedule is detached from the study value and replaced by a copy connected to its study activity and visit,
+# the Delete action links the schedule before and after the deletion, like `StudySelectionRepository.delete`
+SAVE_BATCH_DELETED_QUERY = """
+MATCH (sr:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+SET sr.revision = coalesce(sr.revision, 0) + 1
+WITH sr, sv
+UNWIND $deleted AS deleted
+MATCH (sv)-[old_rel:HAS_STUDY_ACTIVITY_SCHEDULE]->(old_sas:StudyActivitySchedule {uid: deleted.uid})
+CALL {
+    WITH sv, deleted
+    MATCH (sv)-[:HAS_STUDY_ACTIVITY]->(sa:StudyActivity {uid: deleted.study_activity_uid})
+    MATCH (sv)-[:HAS_STUDY_VISIT]->(svi:StudyVisit {uid: deleted.study_visit_uid})
+    RETURN sa, svi LIMIT 1
+}
+DELETE old_rel
+CREATE (new_sas:StudySelection:StudyActivitySchedule {uid: deleted.uid})
+CREATE (sa)-[:STUDY_ACTIVITY_HAS_SCHEDULE]->(new_sas)
+CREATE (svi)-[:STUDY_VISIT_HAS_SCHEDULE]->(new_sas)
+CREATE (sr)-[:AUDIT_TRAIL]->(action:StudyAction:Delete {author_id: $author_id, date: $date})
+CREATE (action)-[:BEFORE]->(old_sas)
+CREATE (action)-[:AFTER]->(new_sas)
+"""
+
+# The uids of the created schedules are reserved beforehand with `get_next_free_uids_and_increment_counter`,
+# the Create action links the new schedule, like `StudySelectionRepository.save`
+SAVE_BATCH_CREATED_QUERY = """
+MATCH (sr:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+SET sr.revision = coalesce(sr.revision, 0) + 1
+WITH sr, sv
+UNWIND $created AS created
+CALL {
+    WITH sv, created
+    MATCH (sv)-[:HAS_STUDY_ACTIVITY]->(sa:StudyActivity {uid: created.study_activity_uid})
+    MATCH (sv)-[:HAS_STUDY_VISIT]->(svi:StudyVisit {uid: created.study_visit_uid})
+    RETURN sa, svi LIMIT 1
+}
+CREATE (sas:StudySelection:StudyActivitySchedule {uid: created.uid})
+CREATE (sa)-[:STUDY_ACTIVITY_HAS_SCHEDULE]->(sas)
+CREATE (svi)-[:STUDY_VISIT_HAS_SCHEDULE]->(sas)
+CREATE (sv)-[:HAS_STUDY_ACTIVITY_SCHEDULE]->(sas)
+CREATE (sr)-[:AUDIT_TRAIL]->(action:StudyAction:Create {author_id: $author_id, date: $date})
+CREATE (action)-[:AFTER]->(sas)
+"""
+
 
 @dataclass
 class SelectionHistory(base.SelectionHistory):
@@ -27,6 +76,72 @@ class SelectionHistory(base.SelectionHistory):
     study_activity_instance_uid: str | None
 
 
+@dataclass
+class ScheduleBatch:
+    """
+    Schedules of the latest value of a study, to which a batch of operations is applied in memory.
+
+    Every operation is validated against the outcome of the previous ones, with the same checks and errors
+    as `StudyActivityScheduleRepository.save` and `delete`.
+    The accepted operations are then written at once with `StudyActivityScheduleRepository.save_batch`.
+    """
+
+    study_uid: str
+    # Study activity uid -> study activity instance uid
+    study_activities: dict[str, str | None]
+    study_visit_uids: set[str]
+    # Schedule uid -> (study activity uid, study visit uid)
+    schedules: dict[str, tuple[str, str]]
+    created: list[StudyActivityScheduleVO] = field(default_factory=list)
+    deleted: list[StudyActivityScheduleVO] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._scheduled = Counter(self.schedules.values())
+
+    def _validate_references(self, selection_vo: StudyActivityScheduleVO) -> None:
+        NotFoundException.raise_if(
+            selection_vo.study_activity_uid not in self.study_activities,
+            "Study Activity",
+            selection_vo.study_activity_uid,
+        )
+        NotFoundException.raise_if(
+            selection_vo.study_visit_uid not in self.study_visit_uids,
+            "Study Visit",
+            selection_vo.study_visit_uid,
+        )
+
+    def create(self, selection_vo: StudyActivityScheduleVO) -> None:
+        scheduled = (selection_vo.study_activity_uid, selection_vo.study_visit_uid)
+        BusinessLogicException.raise_if(
+            self._scheduled[scheduled] > 0,
+            msg=DUPLICATE_SCHEDULE_MSG.format(study_uid=self.study_uid),
+        )
+        self._validate_references(selection_vo)
+        self._scheduled[scheduled] += 1
+        self.created.append(selection_vo)
+
+    def delete(self, schedule_uid: str, author_id: str) -> None:
+        NotFoundException.raise_if(
+            schedule_uid not in self.schedules,
+            "Study Activity Schedule",
+            schedule_uid,
+        )
+        study_activity_uid, study_visit_uid = self.schedules[schedule_uid]
+        selection_vo = StudyActivityScheduleVO(
+            uid=schedule_uid,
+            study_uid=self.study_uid,
+            study_activity_uid=study_activity_uid,
+            study_activity_instance_uid=None,
+            study_visit_uid=study_visit_uid,
+            author_id=author_id,
+            start_date=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self._validate_references(selection_vo)
+        del self.schedules[schedule_uid]
+        self._scheduled[(study_activity_uid, study_visit_uid)] -= 1
+        self.deleted.append(selection_vo)
+
+
 class StudyActivityScheduleRepository(base.StudySelectionRepository):
     @staticmethod
     def _acquire_write_lock_study_value(uid: str) -> None:
@@ -78,7 +193,7 @@ class StudyActivityScheduleRepository(base.StudySelectionRepository):
                     study_activity_uid=selection_vo.study_activity_uid,
                     study_visit_uid=selection_vo.study_visit_uid,
                 ),
-                msg=f"There already exist a schedule for the same Activity and Visit in the Study with UID '{selection_vo.study_uid}'",
+                msg=DUPLICATE_SCHEDULE_MSG.format(study_uid=selection_vo.study_uid),
             )
 
         # Create new node
@@ -156,6 +271,116 @@ class StudyActivityScheduleRepository(base.StudySelectionRepository):
     def generate_uid(self) -> str:
         return StudyActivity.get_next_free_uid_and_increment_counter()
 
+    def start_batch(self, study_uid: str) -> ScheduleBatch:
+        """
+        Loads the schedules, study activities and study visits of the latest value of the study with a single query.
+
+        The study is locked first, so that no concurrent write can invalidate the checks done on the batch.
+        """
+        self._acquire_write_lock_study_value(study_uid)
+        rows, _ = db.cypher_query(
+            """
+            MATCH (:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+            CALL {
+                WITH sv
+                MATCH (sv)-[:HAS_STUDY_ACTIVITY]->(sa:StudyActivity)
+                OPTIONAL MATCH (sa)-[:STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_INSTANCE]->(sai:StudyActivityInstance)
+                WITH sa, head(collect(sai.uid)) AS study_activity_instance_uid
+                RETURN collect([sa.uid, study_activity_instance_uid]) AS study_activities
+            }
+            CALL {
+                WITH sv
+                MATCH (sv)-[:HAS_STUDY_VISIT]->(svi:StudyVisit)
+                RETURN collect(DISTINCT svi.uid) AS study_visit_uids
+            }
+            CALL {
+                WITH sv
+                MATCH (sv)-[:HAS_STUDY_ACTIVITY_SCHEDULE]->(sas:StudyActivitySchedule)
+                OPTIONAL MATCH (sas)<-[:STUDY_ACTIVITY_HAS_SCHEDULE]-(sa:StudyActivity)
+                OPTIONAL MATCH (sas)<-[:STUDY_VISIT_HAS_SCHEDULE]-(svi:StudyVisit)
+                WITH sas, head(collect(sa.uid)) AS study_activity_uid, head(collect(svi.uid)) AS study_visit_uid
+                RETURN collect([sas.uid, study_activity_uid, study_visit_uid]) AS schedules
+            }
+            RETURN study_activities, study_visit_uids, schedules
+            """,
+            {"study_uid": study_uid},
+        )
+
+        NotFoundException.raise_if(not rows, "Study", study_uid)
+
+        study_activities, study_visit_uids, schedules = rows[0]
+        return ScheduleBatch(
+            study_uid=study_uid,
+            study_activities=dict(study_activities),
+            study_visit_uids=set(study_visit_uids),
+            schedules={
+                uid: (study_activity_uid, study_visit_uid)
+                for uid, study_activity_uid, study_visit_uid in schedules
+            },
+        )
+
+    def save_batch(
+        self, batch: ScheduleBatch, author_id: str
+    ) -> list[StudyActivityScheduleVO]:
+        """
+        Writes the schedules deleted and created in the batch with one query each,
+        leaving the same nodes, relationships and audit trail as single `delete` and `save` operations.
+        Deletions go first, so that a schedule can be deleted and created again in the same batch.
+
+        Returns the created schedules, in the order of `batch.created`.
+        """
+        date = datetime.datetime.now(datetime.timezone.utc)
+        params = {"study_uid": batch.study_uid, "author_id": author_id, "date": date}
+        if batch.deleted:
+            db.cypher_query(
+                SAVE_BATCH_DELETED_QUERY,
+                params
+                | {
+                    "deleted": [
+                        {
+                            "uid": selection_vo.uid,
+                            "study_activity_uid": selection_vo.study_activity_uid,
+                            "study_visit_uid": selection_vo.study_visit_uid,
+                        }
+                        for selection_vo in batch.deleted
+                    ]
+                },
+            )
+        if not batch.created:
+            return []
+
+        uids = StudyActivitySchedule.get_next_free_uids_and_increment_counter(
+            len(batch.created)
+        )
+        db.cypher_query(
+            SAVE_BATCH_CREATED_QUERY,
+            params
+            | {
+                "created": [
+                    {
+                        "uid": uid,
+                        "study_activity_uid": selection_vo.study_activity_uid,
+                        "study_visit_uid": selection_vo.study_visit_uid,
+                    }
+                    for uid, selection_vo in zip(uids, batch.created)
+                ]
+            },
+        )
+        return [
+            StudyActivityScheduleVO(
+                uid=uid,
+                study_uid=batch.study_uid,
+                study_activity_uid=selection_vo.study_activity_uid,
+                study_activity_instance_uid=batch.study_activities[
+                    selection_vo.study_activity_uid
+                ],
+                study_visit_uid=selection_vo.study_visit_uid,
+                start_date=date,
+                author_id=author_id,
+            )
+            for uid, selection_vo in zip(uids, batch.created)
+        ]
+
     def _get_selection_with_history(
         self, study_uid: str, selection_uid: str | None = None
     ):
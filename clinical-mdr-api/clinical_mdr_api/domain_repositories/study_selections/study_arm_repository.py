@@ -18,6 +18,7 @@ from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     StudyAction,
 )
 from clinical_mdr_api.domain_repositories.models.study_selections import StudyArm
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_arm import (
     StudySelectionArmAR,
     StudySelectionArmVO,
@@ -163,7 +164,9 @@ class StudySelectionArmRepository:
         all_arm_selections = db.cypher_query(query, query_parameters)
         all_selections = []
 
-        for selection in utils.db_result_to_list(all_arm_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_arm_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
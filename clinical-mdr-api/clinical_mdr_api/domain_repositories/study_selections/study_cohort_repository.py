@@ -16,6 +16,7 @@ from clinical_mdr_api.domain_repositories.models.study_selections import (
     StudyBranchArm,
     StudyCohort,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_cohort import (
     StudySelectionCohortAR,
     StudySelectionCohortVO,
@@ -136,7 +137,9 @@ class StudySelectionCohortRepository:
         all_cohort_selections = db.cypher_query(query, query_parameters)
         all_selections = []
 
-        for selection in utils.db_result_to_list(all_cohort_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_cohort_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
@@ -21,6 +21,7 @@ from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
 from clinical_mdr_api.domain_repositories.models.study_selections import (
     StudyCompoundDosing,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_compound_dosing import (
     StudyCompoundDosingVO,
     StudySelectionCompoundDosingsAR,
@@ -291,7 +292,13 @@ class StudyCompoundDosingRepository:
         return compound_dosing
 
     def _get_selection_with_history(
-        self, study_uid: str, selection_uid: str | None = None
+        self,
+        study_uid: str,
+        selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study compound dosing either for a
@@ -305,9 +312,10 @@ class StudyCompoundDosingRepository:
             WITH distinct(all_scd)
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_scd:StudyCompoundDosing)
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_scd:StudyCompoundDosing)
             WITH DISTINCT all_scd
+            WHERE {helpers.audit_trail_window_filter("all_scd")}
             """
         specific_audit_trail = db.cypher_query(
             cypher
@@ -337,8 +345,15 @@ class StudyCompoundDosingRepository:
                 asa.date AS start_date,
                 bsa.date AS end_date,
                 asa.author_id AS author_id
-            """,
-            {"study_uid": study_uid, "selection_uid": selection_uid},
+            """
+            + helpers.audit_trail_page_clause(
+                page_number=page_number, page_size=page_size
+            ),
+            {
+                "study_uid": study_uid,
+                "selection_uid": selection_uid,
+                **helpers.audit_trail_window_params(since=since, until=until),
+            },
         )
         result = []
         for res in utils.db_result_to_list(specific_audit_trail):
@@ -370,11 +385,21 @@ class StudyCompoundDosingRepository:
         return result
 
     def find_selection_history(
-        self, study_uid: str, selection_uid: str | None = None
+        self,
+        study_uid: str,
+        selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[dict | None]:
         kwargs = {}
         if selection_uid:
             kwargs["selection_uid"] = selection_uid
+        else:
+            kwargs.update(
+                since=since, until=until, page_number=page_number, page_size=page_size
+            )
         return self._get_selection_with_history(study_uid=study_uid, **kwargs)
 
     def _retrieves_all_data(
@@ -427,7 +452,9 @@ class StudyCompoundDosingRepository:
 
         all_selections = db.cypher_query(query, query_parameters)
         result = []
-        for selection in utils.db_result_to_list(all_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_selections)
+        ):
             selection_vo = StudyCompoundDosingVO.from_input_values(
                 study_uid=selection["study_uid"],
                 study_selection_uid=selection["study_compound_dosing_uid"],
@@ -10,6 +10,11 @@ from neomodel.sync_.match import (
 )
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_filter,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.models.compounds import CompoundAliasRoot
 from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
     CTTermRoot,
@@ -25,6 +30,7 @@ from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     StudyAction,
 )
 from clinical_mdr_api.domain_repositories.models.study_selections import StudyCompound
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_compound import (
     StudySelectionCompoundsAR,
     StudySelectionCompoundVO,
@@ -149,7 +155,9 @@ class StudySelectionCompoundRepository:
             """
         all_compound_selections = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_compound_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_compound_selections)
+        ):
             selection_vo = StudySelectionCompoundVO.from_input_values(
                 study_uid=selection["study_uid"],
                 other_info=selection["other_information"],
@@ -571,7 +579,13 @@ class StudySelectionCompoundRepository:
         return StudyCompound.get_next_free_uid_and_increment_counter()
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study compounds either for a specific selection or for all study compounds for the study
@@ -582,9 +596,10 @@ class StudySelectionCompoundRepository:
             WITH distinct(sc) as all_sc
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sc:StudyCompound)
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sc:StudyCompound)
             WITH DISTINCT all_sc
+            WHERE {audit_trail_window_filter("all_sc")}
             """
         compound_selections_audit_trail = db.cypher_query(
             cypher
@@ -621,8 +636,13 @@ class StudySelectionCompoundRepository:
                 asa.status AS status,
                 labels(asa) AS change_type,
                 bsa.date AS end_date
-""",
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+"""
+            + audit_trail_page_clause(page_number=page_number, page_size=page_size),
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **audit_trail_window_params(since=since, until=until),
+            },
         )
         result = []
         for res in utils.db_result_to_list(compound_selections_audit_trail):
@@ -657,17 +677,30 @@ class StudySelectionCompoundRepository:
         return result
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[dict | None]:
         """
         Simple method to return all versions of a study objectives for a study.
         Optionally a specific selection uid is given to see only the response for a specific selection.
+        The versions of all study compounds can be restricted to the ones created from `since` until `until`, and paged.
         """
         if study_selection_uid:
             return self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
@@ -4,6 +4,11 @@ from dataclasses import dataclass
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_filter,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.models.study import StudyRoot, StudyValue
 from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     Create,
@@ -16,6 +21,7 @@ from clinical_mdr_api.domain_repositories.models.syntax import (
     CriteriaRoot,
     CriteriaTemplateRoot,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_criteria import (
     StudySelectionCriteriaAR,
     StudySelectionCriteriaVO,
@@ -143,7 +149,9 @@ class StudySelectionCriteriaRepository:
 
         all_criteria_selections = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_criteria_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_criteria_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
@@ -489,6 +497,10 @@ class StudySelectionCriteriaRepository:
         study_uid: str,
         criteria_type_uid: str | None = None,
         study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study criteria either for a specific selection or for all study criteria for the study
@@ -501,9 +513,10 @@ class StudySelectionCriteriaRepository:
             WITH DISTINCT(all_sc)
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sc:StudyCriteria)
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_sc:StudyCriteria)
             WITH DISTINCT all_sc
+            WHERE {audit_trail_window_filter("all_sc")}
             """
         specific_criteria_selections_audit_trail_query = (
             """
@@ -548,6 +561,7 @@ class StudySelectionCriteriaRepository:
                 is_instance AS is_instance,
                 all_sc.key_criteria as key_criteria
             """
+            + audit_trail_page_clause(page_number=page_number, page_size=page_size)
         )
         specific_criteria_selections_audit_trail = db.cypher_query(
             cypher + specific_criteria_selections_audit_trail_query,
@@ -555,6 +569,7 @@ class StudySelectionCriteriaRepository:
                 "study_uid": study_uid,
                 "study_selection_uid": study_selection_uid,
                 "criteria_type_uid": criteria_type_uid,
+                **audit_trail_window_params(since=since, until=until),
             },
         )
         result = []
@@ -590,10 +605,15 @@ class StudySelectionCriteriaRepository:
         study_uid: str,
         criteria_type_uid: str | None = None,
         study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[dict | None]:
         """
         Simple method to return all versions of a study criteria for a study.
         Optionally a specific selection uid is given to see only the response for a specific selection.
+        The versions of all study criteria can be restricted to the ones created from `since` until `until`, and paged.
         """
         if study_selection_uid is not None:
             return self._get_selection_with_history(
@@ -603,6 +623,10 @@ class StudySelectionCriteriaRepository:
         return self._get_selection_with_history(
             study_uid=study_uid,
             criteria_type_uid=criteria_type_uid,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
         )
 
     def close(self) -> None:
@@ -18,6 +18,7 @@ from clinical_mdr_api.domain_repositories.models.study_audit_trail import (
     StudyAction,
 )
 from clinical_mdr_api.domain_repositories.models.study_selections import StudyElement
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_element import (
     StudySelectionElementAR,
     StudySelectionElementVO,
@@ -162,7 +163,9 @@ class StudySelectionElementRepository:
         all_element_selections = db.cypher_query(query, query_parameters)
         all_selections = []
 
-        for selection in utils.db_result_to_list(all_element_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_element_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
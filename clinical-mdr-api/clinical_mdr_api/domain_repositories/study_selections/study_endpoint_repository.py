@@ -3,6 +3,11 @@ import datetime
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_filter,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.models.concepts import UnitDefinitionRoot
 from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
     CTTermRoot,
@@ -24,6 +29,7 @@ from clinical_mdr_api.domain_repositories.models.syntax import (
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameter,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_endpoint import (
     StudyEndpointSelectionHistory,
     StudySelectionEndpointsAR,
@@ -173,7 +179,9 @@ class StudySelectionEndpointRepository:
         all_endpoint_selections = db.cypher_query(query, query_parameters)
         all_selections = []
 
-        for selection in utils.db_result_to_list(all_endpoint_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_endpoint_selections)
+        ):
             if not selection["endpoint_uid"]:
                 continue
 
@@ -566,7 +574,13 @@ class StudySelectionEndpointRepository:
         return StudyEndpoint.get_next_free_uid_and_increment_counter()
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study endpoints either for a specific selection or for all study endpoints for the study
@@ -579,9 +593,10 @@ class StudySelectionEndpointRepository:
             WITH distinct all_se
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_se:StudyEndpoint)
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_se:StudyEndpoint)
             WITH DISTINCT all_se
+            WHERE {audit_trail_window_filter("all_se")}
             """
         specific_objective_selections_audit_trail = db.cypher_query(
             cypher
@@ -643,8 +658,14 @@ class StudySelectionEndpointRepository:
                 sa.status AS status,
                 sa.author_id AS author_id,
                 labels(sa) AS change_type,
-                bsa.date AS end_date""",
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+                bsa.date AS end_date
+            ORDER BY study_endpoint_uid, start_date DESC"""
+            + audit_trail_page_clause(page_number=page_number, page_size=page_size),
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **audit_trail_window_params(since=since, until=until),
+            },
         )
         result = []
         for res in utils.db_result_to_list(specific_objective_selections_audit_trail):
@@ -691,17 +712,30 @@ class StudySelectionEndpointRepository:
         return result
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyEndpointSelectionHistory]:
         """
         Simple method to return all versions of a study objectives for a study.
         Optionally a specific selection uid is given to see only the response for a specific selection.
+        The versions of all study endpoints can be restricted to the ones created from `since` until `until`, and paged.
         """
         if study_selection_uid:
             return self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
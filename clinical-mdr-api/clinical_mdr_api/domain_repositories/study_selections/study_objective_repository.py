@@ -4,6 +4,11 @@ from dataclasses import dataclass
 from neomodel import db
 
 from clinical_mdr_api import utils
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_filter,
+    audit_trail_window_params,
+)
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -22,6 +27,7 @@ from clinical_mdr_api.domain_repositories.models.syntax import (
     ObjectiveRoot,
     ObjectiveTemplateRoot,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_selections.study_selection_objective import (
     StudySelectionObjectivesAR,
     StudySelectionObjectiveVO,
@@ -143,7 +149,9 @@ class StudySelectionObjectiveRepository:
 
         all_objective_selections = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_objective_selections):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_objective_selections)
+        ):
             acv = selection.get("accepted_version", False)
             if acv is None:
                 acv = False
@@ -425,7 +433,13 @@ class StudySelectionObjectiveRepository:
         return StudyObjective.get_next_free_uid_and_increment_counter()
 
     def _get_selection_with_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ):
         """
         returns the audit trail for study objectives either for a specific selection or for all study objectives for the study
@@ -438,9 +452,10 @@ class StudySelectionObjectiveRepository:
             WITH distinct(all_so)
             """
         else:
-            cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_so:StudyObjective)
+            cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudyAction)-[:BEFORE|AFTER]->(all_so:StudyObjective)
             WITH DISTINCT all_so
+            WHERE {audit_trail_window_filter("all_so")}
             """
         specific_objective_selections_audit_trail = db.cypher_query(
             cypher
@@ -482,8 +497,13 @@ class StudySelectionObjectiveRepository:
                 all_so.order AS order,
                 ver.version AS objective_version,
                 author_username
-                """,
-            {"study_uid": study_uid, "study_selection_uid": study_selection_uid},
+                """
+            + audit_trail_page_clause(page_number=page_number, page_size=page_size),
+            {
+                "study_uid": study_uid,
+                "study_selection_uid": study_selection_uid,
+                **audit_trail_window_params(since=since, until=until),
+            },
         )
         result = []
         for res in utils.db_result_to_list(specific_objective_selections_audit_trail):
@@ -512,17 +532,30 @@ class StudySelectionObjectiveRepository:
         return result
 
     def find_selection_history(
-        self, study_uid: str, study_selection_uid: str | None = None
+        self,
+        study_uid: str,
+        study_selection_uid: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[dict | None]:
         """
         Simple method to return all versions of a study objectives for a study.
         Optionally a specific selection uid is given to see only the response for a specific selection.
+        The versions of all study objectives can be restricted to the ones created from `since` until `until`, and paged.
         """
         if study_selection_uid:
             return self._get_selection_with_history(
                 study_uid=study_uid, study_selection_uid=study_selection_uid
             )
-        return self._get_selection_with_history(study_uid=study_uid)
+        return self._get_selection_with_history(
+            study_uid=study_uid,
+            since=since,
+            until=until,
+            page_number=page_number,
+            page_size=page_size,
+        )
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
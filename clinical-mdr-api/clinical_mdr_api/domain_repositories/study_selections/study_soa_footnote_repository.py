@@ -21,6 +21,7 @@ from clinical_mdr_api.domain_repositories.models.syntax import (
     FootnoteTemplateValue,
     FootnoteValue,
 )
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
     StudyStatus,
 )
@@ -325,7 +326,9 @@ class StudySoAFootnoteRepository:
         query += self.order_by_footnote_number()
         all_study_soa_footnotes = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_study_soa_footnotes):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_study_soa_footnotes)
+        ):
             selection_vo = self.create_vo_from_db_output(selection=selection)
             all_selections.append(selection_vo)
         return all_selections
@@ -570,7 +573,9 @@ class StudySoAFootnoteRepository:
         query += self.order_by_date()
         all_study_soa_footnotes = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_study_soa_footnotes):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_study_soa_footnotes)
+        ):
             selection_vo = self.create_vo_history_from_db_output(selection=selection)
             all_selections.append(selection_vo)
         return all_selections
@@ -586,7 +591,9 @@ class StudySoAFootnoteRepository:
         query += self.order_by_date()
         all_study_soa_footnotes = db.cypher_query(query, query_parameters)
         all_selections = []
-        for selection in utils.db_result_to_list(all_study_soa_footnotes):
+        for selection in prime_author_usernames(
+            utils.db_result_to_list(all_study_soa_footnotes)
+        ):
             selection_vo = self.create_vo_history_from_db_output(selection=selection)
             all_selections.append(selection_vo)
         return all_selections
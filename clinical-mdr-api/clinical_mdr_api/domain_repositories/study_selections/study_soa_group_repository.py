@@ -3,6 +3,9 @@ from dataclasses import dataclass
 
 from neomodel import db
 
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_window_filter,
+)
 from clinical_mdr_api.domain_repositories.generic_repository import (
     manage_previous_connected_study_selection_relationships,
 )
@@ -134,10 +137,11 @@ class StudySoAGroupRepository(StudySelectionActivityBaseRepository[StudySoAGroup
             WITH distinct(all_sa), study_activity
             """
         else:
-            audit_trail_cypher = """
-            MATCH (sr:StudyRoot { uid: $study_uid})-[:AUDIT_TRAIL]->(:StudySoAGroup)-[:BEFORE|AFTER]->(all_sa:StudySoAGroup)
+            audit_trail_cypher = f"""
+            MATCH (sr:StudyRoot {{ uid: $study_uid}})-[:AUDIT_TRAIL]->(:StudySoAGroup)-[:BEFORE|AFTER]->(all_sa:StudySoAGroup)
                 <-[:STUDY_ACTIVITY_HAS_STUDY_SOA_GROUP]-(study_activity:StudyActivity)
             WITH DISTINCT all_sa, study_activity
+            WHERE {audit_trail_window_filter("all_sa")}
             """
         audit_trail_cypher += """
 
@@ -103,6 +103,28 @@ class StudySoARepository:
         )
         db.cypher_query(query, params)
 
+    @staticmethod
+    @trace_calls(args=[0], kwargs=["study_uid"])
+    def get_study_revision(study_uid: str) -> int | None:
+        """
+        Returns a token that changes whenever the data of the study changes, or None if the study doesn't exist.
+
+        Every write to a study (study selections, visits, epochs, footnotes, preferences, ...)
+        connects a StudyAction node to the audit trail of the study, which increments the `revision` counter
+        of the StudyRoot node (see StudyAuditTrail), so reading the counter doesn't depend on the length of the audit trail.
+        Studies without any action since the counter was introduced are at revision 0.
+        """
+
+        results, _ = db.cypher_query(
+            "MATCH (sr:StudyRoot {uid: $study_uid}) RETURN coalesce(sr.revision, 0)",
+            {"study_uid": study_uid},
+        )
+
+        if not results:
+            return None
+
+        return results[0][0]
+
     def load(
         self,
         study_uid: str,
@@ -119,16 +119,6 @@ def get_valid_time_references_for_study(
 class StudyVisitRepository:
     def __init__(self, author_id: str):
         self.author_id = author_id
-        unit_repository = UnitDefinitionRepository(self.author_id)
-        units, _ = unit_repository.get_all_optimized()
-        unit: UnitDefinitionAR
-        self._day_unit = None
-        self._week_unit = None
-        for unit in units:
-            if unit.concept_vo.name == "day":
-                self._day_unit = unit
-            if unit.concept_vo.name == "week":
-                self._week_unit = unit
 
     def generate_uid(self) -> str:
         return StudyVisit.get_next_free_uid_and_increment_counter()
@@ -136,8 +126,10 @@ class StudyVisitRepository:
     def fetch_ctlist(self, codelist_names: str, effective_date=None):
         return get_ctlist_terms_by_name(codelist_names, effective_date=effective_date)
 
-    def get_day_week_units(self):
-        return (self._day_unit, self._week_unit)
+    def get_day_week_units(
+        self,
+    ) -> tuple[UnitDefinitionAR | None, UnitDefinitionAR | None]:
+        return UnitDefinitionRepository(self.author_id).get_day_week_units()
 
     def save(self, visit: StudyVisitVO, create: bool = False):
         return self._update(visit, create)
@@ -15,6 +15,7 @@ from clinical_mdr_api.domain_repositories.models.template_parameter import (
 )
 from clinical_mdr_api.domains.syntax_templates.template import TemplateVO
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryVO
+from clinical_mdr_api.repositories._utils import FullTextField
 from clinical_mdr_api.utils import strip_html
 from common.config import (
     OPERATOR_PARAMETER_NAME,
@@ -36,6 +37,10 @@ _AggregateRootType = TypeVar("_AggregateRootType")
 class GenericSyntaxTemplateRepository(
     GenericSyntaxRepository[_AggregateRootType], abc.ABC
 ):
+    fulltext_fields = {
+        "name": FullTextField("fulltext_syntax_template_name", "value", "name")
+    }
+
     def next_available_sequence_id(
         self,
         uid: str,
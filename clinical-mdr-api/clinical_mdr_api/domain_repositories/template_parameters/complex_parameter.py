@@ -1,11 +1,70 @@
+import functools
 import logging
 from dataclasses import asdict, dataclass
+from threading import Lock
 
+from cachetools import TTLCache, cached
 from neo4j.exceptions import ServiceUnavailable
 from neomodel import db
 
+from clinical_mdr_api.repositories.cache_invalidation import (
+    invalidate_cache_after_commit,
+)
+from common import config
+
 log = logging.getLogger(__name__)
 
+# Number of terms returned with a parameter by get_parameter_including_terms
+PARAMETER_SAMPLE_TERMS_COUNT = 3
+
+_MISSING = object()
+
+PARAMETER_TERMS_QUERY = """
+MATCH (pt:TemplateParameter)
+WHERE $names IS NULL OR pt.name IN $names
+CALL {
+    WITH pt
+    MATCH (pt)<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
+    // Filter out the child template parameter values if theirs parent contains the same value.
+    // This ensures that the terms response will contain unique values.
+    // Also filter out items from the Requested library.
+    WHERE (pt=pt_parents OR NOT ((pt_parents)-[:HAS_PARAMETER_TERM]->(pr) AND (pt)-[:HAS_PARAMETER_TERM]->(pr))) AND NOT (pr)<-[:CONTAINS_CONCEPT]-(:Library {name: "Requested"})
+    WITH  pr, pv,  pt_parents
+    ORDER BY pv.name ASC
+    RETURN collect({uid: pr.uid, name: pv.name, type: pt_parents.name}) AS terms
+}
+RETURN
+    pt.name AS name,
+    terms
+"""
+
+# The parameters having a given library item among their terms, including through their child parameters
+PARAMETERS_OF_TERM_QUERY = """
+CALL {
+    MATCH (term:TemplateParameterTermRoot {uid: $uid})
+    RETURN term
+    UNION
+    // The parameter terms of the CT terms are their name roots
+    MATCH (:CTTermRoot {uid: $uid})-[:HAS_NAME_ROOT]->(term:TemplateParameterTermRoot)
+    RETURN term
+}
+MATCH (term)<-[:HAS_PARAMETER_TERM]-(:TemplateParameter)-[:HAS_PARENT_PARAMETER*0..]->(pt:TemplateParameter)
+RETURN DISTINCT pt.name
+"""
+
+# The template parameter of a given codelist and the parameters it is a child of
+PARAMETERS_OF_CODELIST_QUERY = """
+CALL {
+    MATCH (:CTCodelistRoot {uid: $uid})-[:HAS_NAME_ROOT]->()-[:LATEST]->(parameter:TemplateParameter)
+    RETURN parameter
+    UNION
+    MATCH (:DictionaryCodelistRoot {uid: $uid})-[:LATEST]->(parameter:TemplateParameter)
+    RETURN parameter
+}
+MATCH (parameter)-[:HAS_PARENT_PARAMETER*0..]->(pt:TemplateParameter)
+RETURN DISTINCT pt.name
+"""
+
 
 @dataclass
 class ParameterConcept:
@@ -35,16 +94,37 @@ def parameter_concept_create_factory(name, query):
 
 
 class ComplexTemplateParameterRepository:
+    """
+    The terms of the template parameters are flattened once per API worker into a catalogue
+    mapping each parameter name to its terms, which are then looked up by name.
+    When a library item is saved, the parameters having it among their terms are evicted
+    from the catalogue of all workers once the transaction is committed
+    (see `refresh_template_parameter_terms`), and are reloaded on their next use.
+    """
+
+    cache_store_parameter_terms = TTLCache(
+        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    )
+    lock_store_parameter_terms = Lock()
+    cache_store_parameter_names = TTLCache(maxsize=1, ttl=config.CACHE_TTL)
+    lock_store_parameter_names = Lock()
+    cache_store_parameter_concepts = TTLCache(maxsize=1, ttl=config.CACHE_TTL)
+    lock_store_parameter_concepts = Lock()
+
     def __init__(self):
         try:
-            self._fetch_concepts()
+            self.get_concepts()
         except ServiceUnavailable:
             log.error(
                 "The neo4j database is unavailable. API functionality will be severely limited."
             )
-            self.concepts = None
 
-    def _fetch_concepts(self):
+    @cached(
+        cache=cache_store_parameter_concepts,
+        key=lambda _self: "concepts",
+        lock=lock_store_parameter_concepts,
+    )
+    def get_concepts(self) -> list[ParameterConcept]:
         time_unit = parameter_concept_create_factory(
             name="TimeUnit",
             query="""
@@ -69,68 +149,129 @@ class ComplexTemplateParameterRepository:
             return n.uid as uid, v.name as name, 'ConcentrationUnit' as type
             """,
         )
-        self.concepts = [time_unit, acidity_unit, concentration_unit]
+        return [time_unit, acidity_unit, concentration_unit]
 
     def find_extended(self):
         values = self.find_all_with_samples()
-        if self.concepts is None:
-            self._fetch_concepts()
-        for concept in self.concepts:
+        for concept in self.get_concepts():
             values.append(concept.get_values())
         values.sort(key=lambda s: s["name"])
         return values
 
     def find_all_with_samples(self):
-        items, _ = db.cypher_query(
-            """
-            MATCH (pt:TemplateParameter)
-            CALL {
-                WITH pt
-                MATCH (pt)<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
-                // Filter out items from the Requested library.
-                WHERE NOT (pr)<-[:CONTAINS_CONCEPT]-(:Library {name: "Requested"})    
-                WITH  pr, pv,  pt_parents
-                ORDER BY pv.name ASC
-                LIMIT 3
-                RETURN collect({uid: pr.uid, name: pv.name, type: pt_parents.name}) AS terms
-            }
-            RETURN
-                pt.name AS name,
-                terms
-            ORDER BY name
+        parameters_terms = self.get_parameters_terms(self.get_parameter_names())
+        return [
+            {"name": name, "terms": (terms or [])[:PARAMETER_SAMPLE_TERMS_COUNT]}
+            for name, terms in parameters_terms.items()
+        ]
+
+    @staticmethod
+    def _fetch_parameter_terms(names: list[str] | None = None) -> dict[str, list]:
+        items, _ = db.cypher_query(PARAMETER_TERMS_QUERY, {"names": names})
+        return {item[0]: item[1] for item in items}
+
+    @cached(
+        cache=cache_store_parameter_names,
+        key=lambda _self: "names",
+        lock=lock_store_parameter_names,
+    )
+    def get_parameter_names(self) -> list[str]:
+        # The names are loaded along with the whole catalogue
+        parameters_terms = self._fetch_parameter_terms()
+        with self.lock_store_parameter_terms:
+            self.cache_store_parameter_terms.update(parameters_terms)
+        return sorted(parameters_terms)
+
+    def get_parameters_terms(self, names: list[str]) -> dict[str, list | None]:
         """
-        )
-        return_value = [{"name": item[0], "terms": item[1]} for item in items]
-        return return_value
+        Returns the terms of the given template parameters from the catalogue,
+        None for the names which are not template parameters.
+        The parameters missing from the catalogue are loaded with a single query.
+        """
+        catalogue = self.cache_store_parameter_terms
+        with self.lock_store_parameter_terms:
+            parameters_terms = {name: catalogue.get(name, _MISSING) for name in names}
+        missing = [
+            name for name, terms in parameters_terms.items() if terms is _MISSING
+        ]
+        if missing:
+            fetched = self._fetch_parameter_terms(missing)
+            with self.lock_store_parameter_terms:
+                for name in missing:
+                    parameters_terms[name] = catalogue[name] = fetched.get(name)
+        return parameters_terms
+
+    def get_parameter_terms(self, template_parameter_name: str) -> list | None:
+        """
+        Returns the terms of the given template parameter from the catalogue,
+        or None if there is no such template parameter.
+        """
+        # Loads the whole catalogue on first use
+        self.get_parameter_names()
+        return self.get_parameters_terms([template_parameter_name])[
+            template_parameter_name
+        ]
+
+    @classmethod
+    def evict_parameters_with_term(cls, term_uid: str) -> None:
+        items, _ = db.cypher_query(PARAMETERS_OF_TERM_QUERY, {"uid": term_uid})
+        if items:
+            invalidate_cache_after_commit(
+                cls,
+                "cache_store_parameter_terms",
+                keys=tuple(item[0] for item in items),
+            )
+
+    @classmethod
+    def evict_parameters_of_codelist(
+        cls, codelist_uid: str, parameter_names_changed: bool = False
+    ) -> None:
+        """
+        Evicts the parameter of the given codelist and its parent parameters, whose terms change
+        when terms are added to or removed from the codelist.
+        The parameter names are evicted as well when the codelist becomes or stops being a template parameter.
+        Must be called before the codelist stops being a template parameter, so that its parameter is found.
+        """
+        items, _ = db.cypher_query(PARAMETERS_OF_CODELIST_QUERY, {"uid": codelist_uid})
+        if items:
+            invalidate_cache_after_commit(
+                cls,
+                "cache_store_parameter_terms",
+                keys=tuple(item[0] for item in items),
+            )
+        if parameter_names_changed:
+            invalidate_cache_after_commit(cls, "cache_store_parameter_names")
 
     def find_values(self, template_parameter_name: str):
-        items, _ = db.cypher_query(
-            """
-            MATCH (pt:TemplateParameter {name: $name})
-            CALL {
-                WITH pt
-                MATCH (pt)<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
-                // Filter out the child template parameter values if theirs parent contains the same value.
-                // This ensures that the terms response will contain unique values.
-                // Also filter out items from the Requested library.
-                WHERE (pt=pt_parents OR NOT ((pt_parents)-[:HAS_PARAMETER_TERM]->(pr) AND (pt)-[:HAS_PARAMETER_TERM]->(pr))) AND NOT (pr)<-[:CONTAINS_CONCEPT]-(:Library {name: "Requested"})
-                WITH  pr, pv,  pt_parents
-                ORDER BY pv.name ASC
-                RETURN collect({uid: pr.uid, name: pv.name, type: pt_parents.name}) AS terms
-            }
-            RETURN
-                pt.name AS name,
-                terms
-            ORDER BY name
-        """,
-            {"name": template_parameter_name},
-        )
-        if len(items) > 0:
-            return items[0][1]
-        return []
+        return list(self.get_parameter_terms(template_parameter_name) or [])
 
     def get_parameter_including_terms(self, parameter_name: str):
-        for item in self.find_extended():
-            if item["name"] == parameter_name:
-                return item
+        terms = self.get_parameter_terms(parameter_name)
+        if terms is not None:
+            return {
+                "name": parameter_name,
+                "terms": terms[:PARAMETER_SAMPLE_TERMS_COUNT],
+            }
+        for concept in self.get_concepts():
+            if concept.name == parameter_name:
+                return concept.get_values()
         return None
+
+
+def refresh_template_parameter_terms(function):
+    """
+    Decorator for the `save` method of the repositories of library items that can be template parameter terms.
+
+    Evicts from the template parameter terms catalogue the parameters having the saved item among their terms,
+    as creating, approving or retiring the item changes their terms.
+    The parameters are evicted once the transaction is committed, so that other requests don't load their old terms again.
+    """
+
+    @functools.wraps(function)
+    def wrapper(self, item, *args, **kwargs):
+        result = function(self, item, *args, **kwargs)
+        if item.uid is not None:
+            ComplexTemplateParameterRepository.evict_parameters_with_term(item.uid)
+        return result
+
+    return wrapper
@@ -1,15 +1,24 @@
 # pylint: disable=invalid-name
 import json
+from collections.abc import Mapping
 from datetime import datetime
+from typing import Any, Iterable, TypeVar
 
 from cachetools import TTLCache, cached
-from neomodel import db
+from neo4j.graph import Entity
+from neomodel import StructuredNode, StructuredRel, db
+from starlette_context import context
 
 from clinical_mdr_api.domain_repositories.models.user import User as UserNode
 from clinical_mdr_api.models.user import UserInfo, UserInfoPatchInput
+from clinical_mdr_api.repositories.cache_invalidation import get_cache_invalidation_bus
 
 cache_get_user = TTLCache(maxsize=1000, ttl=10)
 
+AUTHOR_USERNAME_LOADER_CONTEXT_KEY = "author_username_loader"
+
+_T = TypeVar("_T")
+
 
 class UserRepository:
     def _transform_to_model(self, item: UserNode) -> UserInfo:
@@ -55,6 +64,24 @@ class UserRepository:
 
         return [self._transform_to_model(item[0]) for item in rs[0]]
 
+    def get_usernames_by_ids(self, ids: list[str]) -> dict[str, str]:
+        """Returns the usernames of the given user ids, users without username or User node are omitted"""
+
+        if not ids:
+            return {}
+
+        rs = db.cypher_query(
+            """
+            UNWIND $ids AS id
+            MATCH (n:User {user_id: id})
+            WHERE n.username IS NOT NULL
+            RETURN n.user_id, n.username
+            """,
+            params={"ids": ids},
+        )
+
+        return dict(rs[0])
+
     @cached(cache=cache_get_user, key=lambda _self, user_id: user_id)
     def get_user(self, user_id: str) -> UserInfo:
         rs = db.cypher_query(
@@ -99,6 +126,94 @@ class UserRepository:
             resolve_objects=True,
         )
 
+        get_cache_invalidation_bus().publish(f"{__name__}:cache_get_user", (user_id,))
+
         if rs[0]:
             return self._transform_to_model(rs[0][0][0])
         return None
+
+
+class AuthorUsernameLoader:
+    """
+    Request-scoped batch loader of author usernames.
+
+    Author ids of a page of query results are registered with `prime` without querying the database.
+    The first `load` of a username that isn't known yet resolves all registered author ids with a single query,
+    so building the models of a page does a constant number of user queries, whatever the page size.
+    """
+
+    def __init__(self, repo: UserRepository):
+        self.repo = repo
+        self._usernames: dict[str, str] = {}
+        self._pending: set[str] = set()
+
+    def prime(self, author_ids: Iterable[str | None]) -> None:
+        for author_id in author_ids:
+            if author_id and author_id not in self._usernames:
+                self._pending.add(author_id)
+
+    def load(self, author_id: str) -> str:
+        if author_id not in self._usernames:
+            self._pending.add(author_id)
+            self._resolve_pending()
+        return self._usernames[author_id]
+
+    def _resolve_pending(self) -> None:
+        author_ids = list(self._pending)
+        self._pending.clear()
+        usernames = self.repo.get_usernames_by_ids(author_ids)
+        for author_id in author_ids:
+            self._usernames[author_id] = usernames.get(author_id) or author_id
+
+
+def get_author_username_loader() -> AuthorUsernameLoader | None:
+    """Returns the author username loader of the current request, or None outside of a request"""
+
+    if not context.exists():
+        return None
+
+    loader = context.get(AUTHOR_USERNAME_LOADER_CONTEXT_KEY)
+    if loader is None:
+        loader = AuthorUsernameLoader(UserRepository())
+        context[AUTHOR_USERNAME_LOADER_CONTEXT_KEY] = loader
+    return loader
+
+
+def collect_author_ids(value: Any, author_ids: set[str] | None = None) -> set[str]:
+    """
+    Collects the values of all `author_id` properties found in a Cypher query result.
+
+    The result can be made of (nested) lists and dictionaries, neo4j nodes and relationships
+    or neomodel nodes and relationships.
+    """
+
+    if author_ids is None:
+        author_ids = set()
+
+    if isinstance(value, (Mapping, Entity)):
+        author_id = value.get("author_id")
+        if isinstance(author_id, str):
+            author_ids.add(author_id)
+        for item in value.values():
+            if isinstance(item, (Mapping, Entity, list, tuple)):
+                collect_author_ids(item, author_ids)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            collect_author_ids(item, author_ids)
+    elif isinstance(value, (StructuredNode, StructuredRel)):
+        author_id = getattr(value, "author_id", None)
+        if isinstance(author_id, str):
+            author_ids.add(author_id)
+
+    return author_ids
+
+
+def prime_author_usernames(rows: _T) -> _T:
+    """
+    Registers the author ids found in the given query result rows to the author username loader of the current request,
+    so that their usernames are fetched together with a single query. Returns the rows unchanged.
+    """
+
+    if loader := get_author_username_loader():
+        loader.prime(collect_author_ids(rows))
+    return rows
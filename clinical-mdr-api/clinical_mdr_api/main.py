@@ -16,6 +16,10 @@ from pydantic import ValidationError
 from starlette.middleware import Middleware
 from starlette_context.middleware import RawContextMiddleware
 
+from clinical_mdr_api.repositories.cache_invalidation import (
+    get_cache_invalidation_bus,
+    set_cache_invalidation_bus,
+)
 from clinical_mdr_api.utils.api_version import get_api_version
 from common import config, exceptions
 from common.auth.config import OAUTH_ENABLED, SWAGGER_UI_INIT_OAUTH
@@ -91,7 +95,11 @@ async def lifespan(_app: FastAPI):
     if OAUTH_ENABLED:
         # Reconfiguring Swagger UI settings with OpenID Connect discovery
         await reconfigure_with_openid_discovery()
+    get_cache_invalidation_bus()
+    get_job_worker_pool()
     yield
+    set_job_worker_pool(None)
+    set_cache_invalidation_bus(None)
 
 
 # Create app
@@ -189,6 +197,7 @@ def value_error_handler(request: Request, exception: ValueError):
 # Late import of routers, because they do run code on import, and we want monkey-patching like tracing to work
 # pylint: disable=wrong-import-position,ungrouped-imports
 from clinical_mdr_api import routers
+from clinical_mdr_api.services.jobs import get_job_worker_pool, set_job_worker_pool
 
 # Include routers here
 app.include_router(
@@ -201,6 +210,11 @@ app.include_router(
     prefix="/notifications",
     tags=["Notifications"],
 )
+app.include_router(
+    routers.jobs_router,
+    prefix="/jobs",
+    tags=["Jobs"],
+)
 app.include_router(
     routers.odm_study_events_router,
     prefix="/concepts/odms/study-events",
@@ -0,0 +1,47 @@
+from datetime import datetime
+from enum import Enum
+from typing import Annotated
+
+from pydantic import Field
+
+from clinical_mdr_api.models.utils import BaseModel
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobError(BaseModel):
+    status_code: Annotated[int, Field()]
+    type: Annotated[str, Field()]
+    message: Annotated[str, Field()]
+
+
+class Job(BaseModel):
+    uid: Annotated[str, Field()]
+    job_type: Annotated[str, Field()]
+    status: Annotated[JobStatus, Field()]
+    progress: Annotated[
+        float,
+        Field(ge=0, le=1, description="Completed fraction of the job, from 0 to 1"),
+    ] = 0
+    message: Annotated[str | None, Field(json_schema_extra={"nullable": True})] = None
+    idempotency_key: Annotated[
+        str | None, Field(json_schema_extra={"nullable": True})
+    ] = None
+    author_id: Annotated[str | None, Field(json_schema_extra={"nullable": True})] = None
+    error: Annotated[JobError | None, Field(json_schema_extra={"nullable": True})] = (
+        None
+    )
+    created_at: Annotated[
+        datetime | None, Field(json_schema_extra={"nullable": True})
+    ] = None
+    started_at: Annotated[
+        datetime | None, Field(json_schema_extra={"nullable": True})
+    ] = None
+    finished_at: Annotated[
+        datetime | None, Field(json_schema_extra={"nullable": True})
+    ] = None
@@ -8,7 +8,14 @@ from typing import Annotated, Any, Callable, Generic, Iterable, Self, TypeVar
 import nh3
 from annotated_types import MinLen
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import ConfigDict, Field, ValidationInfo, field_validator
+from pydantic import (
+    ConfigDict,
+    Field,
+    SerializerFunctionWrapHandler,
+    ValidationInfo,
+    field_validator,
+    model_serializer,
+)
 from pydantic.fields import PydanticUndefined
 from starlette.responses import Response
 
@@ -318,15 +325,47 @@ class CustomPage(BaseModel, Generic[T]):
         total (int): The total number of items that match the query.
         page (int): The number of the current page.
         size (int): The maximum number of items per page.
+        next_cursor (str | None): The cursor to retrieve the next page, only returned when cursor pagination is used.
     """
 
     items: Annotated[list[T], Field()]
     total: Annotated[int, Field(ge=0)]
     page: Annotated[int, Field(ge=0)]
     size: Annotated[int, Field(ge=0)]
+    next_cursor: Annotated[
+        str | None,
+        Field(
+            description="Opaque cursor to pass as `cursor` query parameter to retrieve the next page. "
+            "Only returned when cursor pagination is requested, null on the last page.",
+            json_schema_extra={"nullable": True},
+        ),
+    ] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_next_cursor_outside_cursor_mode(
+        self, handler: SerializerFunctionWrapHandler
+    ):
+        # `next_cursor` is only set by `create` in cursor mode, pages requested by page number keep their keys.
+        # No return annotation, so that the OpenAPI schema of the page stays the schema of its fields.
+        data = handler(self)
+        if "next_cursor" not in self.model_fields_set:
+            data.pop("next_cursor", None)
+        return data
 
     @classmethod
-    def create(cls, items: list[T], total: int, page: int, size: int) -> Self:
+    def create(
+        cls,
+        items: list[T],
+        total: int,
+        page: int,
+        size: int,
+        next_cursor: str | None = None,
+        cursor_mode: bool = False,
+    ) -> Self:
+        if cursor_mode:
+            return cls(
+                total=total, items=items, page=page, size=size, next_cursor=next_cursor
+            )
         return cls(total=total, items=items, page=page, size=size)
 
 
@@ -337,14 +376,16 @@ class GenericFilteringReturn(BaseModel, Generic[T]):
     Attributes:
         items (list[T]): The items returned by the query.
         total (int): The total number of items that match the query.
+        next_cursor (str | None): The cursor to retrieve the next page when cursor pagination is used.
     """
 
     items: Annotated[list[T], Field()]
     total: Annotated[int, Field(ge=0)]
+    next_cursor: Annotated[str | None, Field()] = None
 
     @classmethod
-    def create(cls, items: list[T], total: int) -> Self:
-        return cls(items=items, total=total)
+    def create(cls, items: list[T], total: int, next_cursor: str | None = None) -> Self:
+        return cls(items=items, total=total, next_cursor=next_cursor)
 
 
 EmptyGenericFilteringResult = GenericFilteringReturn.create([], 0)
@@ -1,22 +1,33 @@
+import base64
+import binascii
 import functools
+import hashlib
+import json
 import logging
 import re
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime
 from enum import Enum
 from typing import Annotated, Any, Callable
 
 from dateutil.parser import isoparse
-from neo4j.exceptions import CypherSyntaxError
+from neo4j.exceptions import ClientError, CypherSyntaxError
 from neomodel import Q, db
 from pydantic import BaseModel, Field, field_validator
 from pydantic.types import T
 
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
 from clinical_mdr_api.models.concepts.activities.activity import (
     ActivityGroupingHierarchySimpleModel,
 )
 from clinical_mdr_api.models.concepts.concept import VersionProperties
 from clinical_mdr_api.models.controlled_terminologies.ct_term import SimpleTermModel
 from clinical_mdr_api.models.standard_data_models.sponsor_model import SponsorModelBase
+from clinical_mdr_api.repositories.cache_invalidation import (
+    invalidate_cache,
+    invalidate_cache_after_commit,
+)
+from common import config
 from common.exceptions import ValidationException
 from common.utils import get_field_type, get_sub_fields, validate_max_skip_clause
 
@@ -36,6 +47,7 @@ class ComparisonOperator(Enum):
     LESS_THAN_OR_EQUAL_TO = "le"
     BETWEEN = "bw"
     IN = "in"
+    FULL_TEXT = "ft"
 
 
 comparison_operator_to_neomodel = {
@@ -47,6 +59,7 @@ comparison_operator_to_neomodel = {
     ComparisonOperator.LESS_THAN: "__lt",
     ComparisonOperator.LESS_THAN_OR_EQUAL_TO: "__lte",
     ComparisonOperator.IN: "__in",
+    ComparisonOperator.FULL_TEXT: "__contains",
 }
 
 
@@ -56,6 +69,7 @@ data_type_filters = {
         ComparisonOperator.NOT_EQUALS,
         ComparisonOperator.CONTAINS,
         ComparisonOperator.IN,
+        ComparisonOperator.FULL_TEXT,
     ],
     int: [
         ComparisonOperator.EQUALS,
@@ -423,6 +437,189 @@ class FilterDict(BaseModel):
         return val
 
 
+@dataclass(frozen=True)
+class FullTextField:
+    """
+    Full-text index which can be used to filter a field with the `ft` operator.
+
+    index_name: name of the full-text index, as defined in neo4j-mdr-db/db_schema.py
+    variable: Cypher variable of the indexed nodes, as bound in the match clause
+    property: indexed property of the nodes, the value of the filtered field
+    """
+
+    index_name: str
+    variable: str
+    property: str
+
+
+FULLTEXT_LIMIT_EXCEEDED = "Full-text search limit exceeded"
+fulltext_word_regex = re.compile(r"\w+")
+cypher_options_regex = re.compile(r"^\s*CYPHER(\s+\w+=\w+)*\s", re.IGNORECASE)
+
+
+def get_fulltext_words(values: list[Any]) -> list[str] | None:
+    """
+    Returns the lowercased words of the given values, or None if they can't be searched.
+    """
+    words = []
+    for value in values:
+        if not isinstance(value, str):
+            return None
+        value_words = fulltext_word_regex.findall(value.lower())
+        if not value_words:
+            return None
+        words.extend(value_words)
+    return words or None
+
+
+def build_fulltext_search(values: list[Any]) -> str | None:
+    """
+    Builds the Lucene query matching any of the given values, or None if they can't be searched.
+
+    Every word of a value must be found as a whole word (ranked first) or as a prefix.
+    Words of at least FULLTEXT_SEARCH_INFIX_MIN_LENGTH characters are also found inside words,
+    as leading wildcards make Lucene scan every term of the index.
+    """
+    if get_fulltext_words(values) is None:
+        return None
+
+    def _word_clause(word: str) -> str:
+        if len(word) >= config.FULLTEXT_SEARCH_INFIX_MIN_LENGTH:
+            return f"({word}^3 OR {word}*^2 OR *{word}*)"
+        return f"({word}^3 OR {word}*^2)"
+
+    return " OR ".join(
+        f"({' AND '.join(_word_clause(word) for word in fulltext_word_regex.findall(value.lower()))})"
+        for value in values
+    )
+
+
+def get_fulltext_parameters(
+    fulltext_field: FullTextField, values: list[Any]
+) -> dict[str, Any] | None:
+    """
+    Returns the parameters of the clause returned by `build_fulltext_seed`,
+    or None if the values can't be searched.
+    """
+    search = build_fulltext_search(values)
+    if search is None:
+        return None
+    return {
+        "fulltext_index": fulltext_field.index_name,
+        "fulltext_search": search,
+        "fulltext_limit": config.FULLTEXT_SEARCH_LIMIT,
+        "fulltext_words": get_fulltext_words(values),
+    }
+
+
+def build_fulltext_seed(variable: str) -> str:
+    """
+    Returns the clause binding the given variable to the nodes found by the full-text index.
+    Placed before a match clause using the same variable, the found nodes drive the match.
+    The query fails if the index finds more than FULLTEXT_SEARCH_LIMIT nodes,
+    see `raise_if_fulltext_limit_exceeded`.
+    """
+    return (
+        "CALL db.index.fulltext.queryNodes($fulltext_index, $fulltext_search, "
+        "{limit: $fulltext_limit + 1}) YIELD node "
+        "WITH collect(node) AS fulltext_nodes "
+        "CALL apoc.util.validate(size(fulltext_nodes) > $fulltext_limit, "
+        f"'{FULLTEXT_LIMIT_EXCEEDED}', []) "
+        f"UNWIND fulltext_nodes AS {variable}"
+    )
+
+
+def raise_if_fulltext_limit_exceeded(error: ClientError) -> None:
+    """
+    Raises a ValidationException if the given error was raised by the clause returned by `build_fulltext_seed`,
+    as the results of the search would be incomplete.
+    """
+    ValidationException.raise_if(
+        FULLTEXT_LIMIT_EXCEEDED in str(error),
+        msg=f"The full-text search matches more than {config.FULLTEXT_SEARCH_LIMIT} items, please refine the searched words.",
+    )
+
+
+def prepend_fulltext_seed(fulltext_seed: str, match_clause: str) -> str:
+    # Query options such as 'CYPHER runtime=slotted' must stay at the start of the query
+    options = cypher_options_regex.match(match_clause)
+    if options is None:
+        return f"{fulltext_seed} {match_clause}"
+    return f"{options.group(0)}{fulltext_seed} {match_clause[options.end():]}"
+
+
+def build_fulltext_rank(alias: str) -> str:
+    """
+    Returns the relevance of the value of the given alias for the searched words,
+    with the same boosts as `build_fulltext_search`.
+    """
+    tokens = f"apoc.text.split(toLower(toString({alias})), '\\\\W+')"
+    return (
+        "reduce(rank = 0.0, word IN $fulltext_words | rank + CASE"
+        f" WHEN word IN {tokens} THEN 3.0"
+        f" WHEN any(token IN {tokens} WHERE token STARTS WITH word) THEN 2.0"
+        " ELSE 1.0 END)"
+    )
+
+
+CURSOR_SORT_KEY_ALIAS = "cursor_sort_key"
+
+
+def _cursor_value_to_json(value: Any) -> Any:
+    if hasattr(value, "to_native"):
+        # neo4j.time temporal types
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _cursor_value_from_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+    return value
+
+
+def encode_cursor(values: list[Any], signature: str) -> str:
+    """
+    Encodes the sort key values of the last returned row into an opaque cursor.
+
+    The `signature` identifies the sort specification the cursor was created for.
+    """
+    payload = json.dumps(
+        {"s": signature, "k": [_cursor_value_to_json(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, signature: str, length: int) -> list[Any]:
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    Raises ValidationException if the cursor is malformed or was created for a different sort specification.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values = payload["k"]
+        cursor_signature = payload["s"]
+    except (ValueError, KeyError, TypeError, binascii.Error) as exc:
+        raise ValidationException(msg=f"Invalid cursor '{cursor}'.") from exc
+
+    ValidationException.raise_if(
+        cursor_signature != signature or len(values) != length,
+        msg="The cursor doesn't match the requested sorting.",
+    )
+    return [_cursor_value_from_json(value) for value in values]
+
+
 class CypherQueryBuilder:
     """
     This class builds two queries : items and total_count with filtering and pagination capabilities.
@@ -441,8 +638,9 @@ class CypherQueryBuilder:
     Optional inputs :
         sort_by: dictionary of Cypher aliases on which to apply sorting as keys, and
             boolean to define sort direction (true=ascending) as values.
-        implicit_sort_by: an alias on which to apply sorting, after the aliases given in
+        implicit_sort_by: an alias, or a list of aliases, on which to apply sorting, after the aliases given in
             sort_by are applied. Used to ensure a stable order when just sort_by is not sufficient.
+            In cursor mode, the aliases must identify a row uniquely.
         page_number : int, number of the page to return. 1-based (will be converted
             to 0-based for Cypher by class methods).
         page_size : int, number of results per page
@@ -460,6 +658,18 @@ class CypherQueryBuilder:
         format_filter_sort_keys: Callable. In some cases, the returned model property
             keys differ from the property keys defined in the database.
             To cover these cases, a conversion function can be provided.
+        cursor : str, opaque cursor returned as `next_cursor` by a previous page.
+            When provided (an empty string requests the first page), keyset pagination
+            is used instead of SKIP/LIMIT: the query only returns rows sorted after the cursor,
+            so the cost of a page doesn't depend on its position.
+            page_number is ignored and implicit_sort_by is required to guarantee a stable order.
+        fulltext_fields : dict, keys are field names as in filter_by and values are
+            the FullTextField to use for filters with the `ft` operator on these fields.
+            The nodes found by the index are bound before the match clause so that they drive it,
+            and the rows are ranked by relevance when no sort_by is given.
+            execute() raises a ValidationException if the index finds more than FULLTEXT_SEARCH_LIMIT nodes.
+            A single filter is searched with its index, other fields and filters,
+            and filters combined with the OR operator, fall back to the `co` operator.
 
     Output properties :
         full_query : Complete cypher query with all clauses. See build_full_query
@@ -467,6 +677,8 @@ class CypherQueryBuilder:
         count_query : Cypher query with match, filter clauses, and results count. See
             build_count_query method definition for more details.
         parameters : Parameters object to pass along with the cypher query.
+        next_cursor : str - Set by execute() in cursor mode if there might be more results,
+            to be passed as `cursor` to retrieve the next page.
 
     Internal properties :
         filter_clause : str - Generated on class init ; adds filtering on aliases as
@@ -474,6 +686,11 @@ class CypherQueryBuilder:
         sort_clause : str - Generated on class init ; adds sorting on aliases as
             defined in the sort_by dictionary.
         pagination_clause : str - Generated on class init ; adds pagination.
+        cursor_clause : str - Generated on class init in cursor mode ; keeps only rows after the cursor.
+        fulltext_seed : str - Generated on class init ; clause binding the indexed nodes found
+            by the full-text search, placed before the match clause.
+        fulltext_rank_expression : str - Generated on class init ; relevance of each row
+            for the full-text search.
     """
 
     def __init__(
@@ -483,7 +700,7 @@ class CypherQueryBuilder:
         page_number: int = 1,
         page_size: int = 0,
         sort_by: dict | None = None,
-        implicit_sort_by: str | None = None,
+        implicit_sort_by: str | list[str] | None = None,
         filter_by: FilterDict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
@@ -491,6 +708,8 @@ class CypherQueryBuilder:
         wildcard_properties_list: list[str] | None = None,
         format_filter_sort_keys: Callable | None = None,
         union_match_clause: str | None = None,
+        cursor: str | None = None,
+        fulltext_fields: dict[str, FullTextField] | None = None,
     ):
         if wildcard_properties_list is None:
             wildcard_properties_list = []
@@ -508,10 +727,22 @@ class CypherQueryBuilder:
         self.return_model = return_model
         self.wildcard_properties_list = wildcard_properties_list
         self.format_filter_sort_keys = format_filter_sort_keys
+        self.cursor = cursor
+        self.fulltext_fields = fulltext_fields if fulltext_fields is not None else {}
+        self.fulltext_seed = ""
+        self.fulltext_rank_expression: str | None = None
         self.filter_clause = ""
         self.sort_clause = ""
+        self.sort_expressions: list[tuple[str, bool]] = []
+        self.cursor_clause = ""
         self.pagination_clause = ""
         self.parameters = {}
+        self.next_cursor: str | None = None
+
+        ValidationException.raise_if(
+            self.cursor_mode and union_match_clause is not None,
+            msg="Cursor pagination is not supported for this query.",
+        )
 
         # Auto-generate internal clauses
         if filter_by is not None:
@@ -526,6 +757,10 @@ class CypherQueryBuilder:
         if self.sort_by:
             self.sort_by = validate_sort_by_is_dict(sort_by=self.sort_by)
             self.build_sort_clause()
+        elif self.cursor_mode or self.fulltext_rank_expression:
+            self.build_sort_clause()
+        if self.cursor_mode:
+            self.build_cursor_clause()
 
         # Auto-generate final queries
         self.build_full_query()
@@ -588,6 +823,12 @@ class CypherQueryBuilder:
             _predicate_operator = " OR "
             _parsed_operator = "="
 
+            if ComparisonOperator(_operator) == ComparisonOperator.FULL_TEXT:
+                if self.build_fulltext_filter(key, _values):
+                    continue
+                # Fields without a full-text index are searched with the 'contains' operator
+                _operator = ComparisonOperator.CONTAINS
+
             if _alias == "*":
                 # Parse operator to use in filter for wildcard
                 _parsed_operator = " CONTAINS "
@@ -829,12 +1070,60 @@ class CypherQueryBuilder:
                 filter_predicates.append(_predicate)
 
         # Set clause
-        self.filter_clause = (
-            _filter_clause
-            + f" {self.filter_operator.value.upper()} ".join(list(filter_predicates))
-        )
+        if filter_predicates:
+            self.filter_clause = (
+                _filter_clause
+                + f" {self.filter_operator.value.upper()} ".join(
+                    list(filter_predicates)
+                )
+            )
+
+    def build_fulltext_filter(self, key: str, values: list[Any]) -> bool:
+        """
+        Restricts the rows to the nodes found by the full-text index of the given field
+        and adds the relevance of the rows for the search.
+        Returns False if the filter can't be run against a full-text index.
+        """
+        fulltext_field = self.fulltext_fields.get(key)
+        if (
+            fulltext_field is None
+            or self.fulltext_seed
+            or (
+                self.filter_operator == FilterOperator.OR
+                and len(self.filter_by.elements) > 1
+            )
+        ):
+            return False
+
+        parameters = get_fulltext_parameters(fulltext_field, values)
+        if parameters is None:
+            return False
+
+        self.parameters.update(parameters)
+        self.fulltext_seed = build_fulltext_seed(fulltext_field.variable)
+        if key != "*":
+            self.fulltext_rank_expression = build_fulltext_rank(
+                self.format_filter_sort_keys(key)
+                if self.format_filter_sort_keys
+                else key
+            )
+        return True
+
+    def match_clause_with_fulltext_seed(self, match_clause: str) -> str:
+        if not self.fulltext_seed:
+            return match_clause
+        return prepend_fulltext_seed(self.fulltext_seed, match_clause)
+
+    @property
+    def cursor_mode(self) -> bool:
+        return self.cursor is not None and self.page_size > 0
 
     def build_pagination_clause(self) -> None:
+        if self.cursor_mode:
+            self.pagination_clause = "LIMIT $page_size"
+            self.parameters["page_size"] = self.page_size
+            return
+
         validate_max_skip_clause(page_number=self.page_number, page_size=self.page_size)
 
         # Set clause
@@ -866,19 +1155,94 @@ class CypherQueryBuilder:
                 ):
                     key = f"toLower({key})"
             sort_by_statements.append(key + sort_order)
+            self.sort_expressions.append((key, bool(value)))
 
-        if (
-            self.implicit_sort_by is not None
-            and self.implicit_sort_by not in self.sort_by
-        ):
-            sort_by_statements.append(
-                self.format_filter_sort_keys(self.implicit_sort_by)
+        # Full-text search results are ranked by relevance unless another order is requested
+        if not self.sort_by and self.fulltext_rank_expression:
+            sort_by_statements.append(f"{self.fulltext_rank_expression} DESC")
+            self.sort_expressions.append((self.fulltext_rank_expression, False))
+
+        implicit_sort_keys = (
+            [self.implicit_sort_by]
+            if isinstance(self.implicit_sort_by, str)
+            else self.implicit_sort_by or []
+        )
+        for implicit_sort_key in implicit_sort_keys:
+            if implicit_sort_key in self.sort_by:
+                continue
+            implicit_key = (
+                self.format_filter_sort_keys(implicit_sort_key)
                 if self.format_filter_sort_keys
-                else self.implicit_sort_by
+                else implicit_sort_key
             )
+            sort_by_statements.append(implicit_key)
+            self.sort_expressions.append((implicit_key, True))
+
+        ValidationException.raise_if(
+            self.cursor_mode
+            and (self.implicit_sort_by is None or not self.sort_expressions),
+            msg="Cursor pagination is not supported for this query.",
+        )
         # Set clause
         self.sort_clause = _sort_clause + ",".join(sort_by_statements)
 
+    @property
+    def cursor_signature(self) -> str:
+        return hashlib.sha1(
+            repr(self.sort_expressions).encode("utf-8"), usedforsecurity=False
+        ).hexdigest()[:12]
+
+    def build_cursor_clause(self) -> None:
+        """
+        Builds the keyset predicate selecting the rows sorted after the cursor,
+        i.e. `(k1, k2, ...) > ($cursor_0, $cursor_1, ...)` in the sort order of each key.
+
+        Neo4j sorts nulls last in ascending order and first in descending order,
+        and comparisons with null are never true, so nulls are handled explicitly.
+        """
+        if not self.cursor:
+            return
+
+        values = decode_cursor(
+            self.cursor, self.cursor_signature, len(self.sort_expressions)
+        )
+
+        def _equals(expression: str, index: int) -> str:
+            if values[index] is None:
+                return f"{expression} IS NULL"
+            return f"{expression} = $cursor_{index}"
+
+        def _after(expression: str, ascending: bool, index: int) -> str | None:
+            if values[index] is None:
+                return None if ascending else f"{expression} IS NOT NULL"
+            if ascending:
+                return f"({expression} > $cursor_{index} OR {expression} IS NULL)"
+            return f"{expression} < $cursor_{index}"
+
+        alternatives = []
+        for index, (expression, ascending) in enumerate(self.sort_expressions):
+            after = _after(expression, ascending, index)
+            if after is not None:
+                alternatives.append(
+                    " AND ".join(
+                        [
+                            _equals(prev_expression, prev_index)
+                            for prev_index, (prev_expression, _) in enumerate(
+                                self.sort_expressions[:index]
+                            )
+                        ]
+                        + [after]
+                    )
+                )
+            if values[index] is not None:
+                self.parameters[f"cursor_{index}"] = values[index]
+
+        self.cursor_clause = "WITH * WHERE " + (
+            " OR ".join(f"({alternative})" for alternative in alternatives)
+            if alternatives
+            else "false"
+        )
+
     def build_full_query(self) -> None:
         """
         The generated query will have the following pattern :
@@ -891,13 +1255,20 @@ class CypherQueryBuilder:
         """
         _with_alias_clause = f"WITH {self.alias_clause}"
         _return_clause = "RETURN *"
+        if self.cursor_mode:
+            # Sort key values of the last row are used to build the next cursor
+            _sort_keys = ", ".join(
+                expression for expression, _ in self.sort_expressions
+            )
+            _return_clause += f", [{_sort_keys}] AS {CURSOR_SORT_KEY_ALIAS}"
 
         # Set clause
         self.full_query = " ".join(
             [
-                self.match_clause,
+                self.match_clause_with_fulltext_seed(self.match_clause),
                 _with_alias_clause,
                 self.filter_clause,
+                self.cursor_clause,
                 _return_clause,
                 self.sort_clause,
                 self.pagination_clause,
@@ -907,7 +1278,7 @@ class CypherQueryBuilder:
             self.full_query += " UNION "
             self.full_query += " ".join(
                 [
-                    self.union_match_clause,
+                    self.match_clause_with_fulltext_seed(self.union_match_clause),
                     _with_alias_clause,
                     self.filter_clause,
                     _return_clause,
@@ -931,7 +1302,7 @@ class CypherQueryBuilder:
         if not self.union_match_clause:
             self.count_query = " ".join(
                 [
-                    self.match_clause,
+                    self.match_clause_with_fulltext_seed(self.match_clause),
                     _with_alias_clause,
                     self.filter_clause,
                     _return_count_clause,
@@ -940,12 +1311,12 @@ class CypherQueryBuilder:
         else:
             self.count_query = " ".join(
                 [
-                    self.match_clause,
+                    self.match_clause_with_fulltext_seed(self.match_clause),
                     _with_alias_clause,
                     self.filter_clause,
                     _return_count_clause,
                     "UNION",
-                    self.union_match_clause,
+                    self.match_clause_with_fulltext_seed(self.union_match_clause),
                     _with_alias_clause,
                     self.filter_clause,
                     _return_count_clause,
@@ -1004,7 +1375,7 @@ class CypherQueryBuilder:
 
         return " ".join(
             [
-                self.match_clause,
+                self.match_clause_with_fulltext_seed(self.match_clause),
                 _with_alias_clause,
                 self.filter_clause,
                 _return_header_clause,
@@ -1027,33 +1398,57 @@ class CypherQueryBuilder:
             raise ValidationException(
                 msg="Unsupported filtering or sort parameters specified"
             ) from _ex
+        except ClientError as _ex:
+            raise_if_fulltext_limit_exceeded(_ex)
+            raise
+
+        if self.cursor_mode:
+            attributes_names = list(attributes_names)
+            cursor_key_index = attributes_names.index(CURSOR_SORT_KEY_ALIAS)
+            attributes_names.pop(cursor_key_index)
+            cursor_keys = [row[cursor_key_index] for row in result_array]
+            result_array = [
+                [value for idx, value in enumerate(row) if idx != cursor_key_index]
+                for row in result_array
+            ]
+            self.next_cursor = (
+                encode_cursor(cursor_keys[-1], self.cursor_signature)
+                if len(result_array) == self.page_size
+                else None
+            )
+        prime_author_usernames(result_array)
         return result_array, attributes_names
 
 
-def sb_clear_cache(caches: list[str] | None = None):
+def sb_clear_cache(
+    caches: list[str] | None = None, caches_after_commit: list[str] | None = None
+):
     """
     Decorator that will clear the specified caches after the wrapped function execution.
+
+    The caches are cleared through the cache invalidation bus,
+    so that the same caches are also cleared in all other API workers.
+    `caches_after_commit` are only cleared once the active database transaction is committed,
+    so that other requests don't cache again the data being written, see `invalidate_cache_after_commit`.
     """
     if caches is None:
         caches = []
+    if caches_after_commit is None:
+        caches_after_commit = []
 
     def decorator(function):
         @functools.wraps(function)
         def wrapper(self, *args, **kwargs):
             try:
                 result = function(self, *args, **kwargs)
+                for cache_name in caches_after_commit:
+                    if getattr(self, cache_name, None) is not None:
+                        invalidate_cache_after_commit(self, cache_name)
                 return result
             finally:
                 for cache_name in caches:
-                    cache = getattr(self, cache_name, None)
-                    if cache:
-                        log.info(
-                            "Clear cache '%s.%s' of size: %s",
-                            type(self).__name__,
-                            cache_name,
-                            cache.currsize,
-                        )
-                        cache.clear()
+                    if getattr(self, cache_name, None) is not None:
+                        invalidate_cache(self, cache_name)
 
         return wrapper
 
@@ -0,0 +1,388 @@
+"""
+Cluster-coherent invalidation of the repository caches.
+
+Repositories keep per-process `cachetools.TTLCache` stores (e.g. `cache_store_item_by_uid`).
+When the API runs with several uvicorn workers, clearing a cache in the worker that served a write
+leaves the other workers serving stale items until the TTL expires.
+
+Every cache clear is published as a `CacheInvalidationEvent` on a `CacheInvalidationBus`.
+The bus applies the event locally and, depending on the implementation, forwards it to all other workers:
+
+* `InProcessCacheInvalidationBus` (default) - only the current process is affected
+* `FileCacheInvalidationBus` - events are appended to a shared file which is tailed by every worker,
+  the file is rotated once it grows over `CACHE_INVALIDATION_BUS_MAX_SIZE` bytes
+
+The bus is selected with the `CACHE_INVALIDATION_BUS` environment variable (`local` or `file`),
+see `common.config`.
+
+Caches holding data that other requests load again on a miss are cleared with `invalidate_cache_after_commit`,
+which waits for the active database transaction to be committed, so that the data being replaced is not cached again.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Iterator
+
+from neomodel import db
+
+from common import config
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheInvalidationEvent:
+    """
+    Describes a cache store that must be cleared.
+
+    `target` is the fully qualified location of the cache store in the form `module:Qualified.name`,
+    e.g. `clinical_mdr_api.domain_repositories.brands.brand_repository:BrandRepository.cache_store_item_by_uid`.
+    `keys` is an optional list of cache keys to evict, if not provided the whole store is cleared.
+    """
+
+    target: str
+    keys: tuple[Any, ...] | None = None
+    origin: str = field(default="", compare=False)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "target": self.target,
+                "keys": list(self.keys) if self.keys is not None else None,
+                "origin": self.origin,
+            },
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, value: str) -> "CacheInvalidationEvent":
+        data = json.loads(value)
+        keys = data.get("keys")
+        return cls(
+            target=data["target"],
+            keys=tuple(_to_hashable(key) for key in keys) if keys is not None else None,
+            origin=data.get("origin", ""),
+        )
+
+
+def _to_hashable(value: Any) -> Any:
+    # JSON turns tuples (e.g. `cachetools.keys.hashkey` results) into lists
+    if isinstance(value, list):
+        return tuple(_to_hashable(item) for item in value)
+    return value
+
+
+def cache_target_name(owner: Any, cache_name: str) -> str:
+    """
+    Returns the fully qualified name of a cache store.
+
+    Caches are declared as class attributes and shared by all subclasses,
+    so the name is built from the class in the MRO that actually declares the cache.
+    """
+    cls = owner if isinstance(owner, type) else type(owner)
+    for klass in cls.__mro__:
+        if cache_name in vars(klass):
+            return f"{klass.__module__}:{klass.__qualname__}.{cache_name}"
+    return f"{cls.__module__}:{cls.__qualname__}.{cache_name}"
+
+
+def resolve_cache_target(target: str) -> Any | None:
+    """
+    Resolves a fully qualified cache name to the cache store of the current process.
+
+    Modules that have not been imported yet are not imported, as their caches can't hold any items.
+    """
+    module_name, _, qualified_name = target.partition(":")
+    module = sys.modules.get(module_name)
+    if module is None:
+        return None
+    obj: Any = module
+    for part in qualified_name.split("."):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def clear_cache_store(cache: Any, keys: tuple[Any, ...] | None = None) -> None:
+    if keys is None:
+        cache.clear()
+        return
+    for key in keys:
+        cache.pop(key, None)
+
+
+class CacheInvalidationBus:
+    """
+    Base class of the cache invalidation buses.
+
+    `publish` always applies the event to the current process synchronously,
+    so the worker that served a write never observes its own stale cache entries.
+    """
+
+    def __init__(self) -> None:
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._listeners: list[Callable[[CacheInvalidationEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[CacheInvalidationEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def publish(self, target: str, keys: tuple[Any, ...] | None = None) -> None:
+        event = CacheInvalidationEvent(target=target, keys=keys, origin=self.origin)
+        self.apply(event)
+        self._send(event)
+
+    def apply(self, event: CacheInvalidationEvent) -> None:
+        cache = resolve_cache_target(event.target)
+        if cache is not None:
+            log.info(
+                "Clear cache '%s' of size: %s",
+                event.target,
+                getattr(cache, "currsize", None),
+            )
+            clear_cache_store(cache, event.keys)
+        for listener in self._listeners:
+            listener(event)
+
+    def _send(self, event: CacheInvalidationEvent) -> None:
+        """Forwards the event to the other processes."""
+
+    def start(self) -> None:
+        """Starts receiving events from other processes."""
+
+    def stop(self) -> None:
+        """Stops receiving events from other processes."""
+
+
+class InProcessCacheInvalidationBus(CacheInvalidationBus):
+    """Invalidates the caches of the current process only."""
+
+
+class FileCacheInvalidationBus(CacheInvalidationBus):
+    """
+    Shares the events through an append-only file.
+
+    Each event is written as a single JSON line with `O_APPEND`, which all workers on the host tail.
+    Only events published after the bus was started are applied, and events published by the bus itself are skipped.
+
+    Once the file grows over `max_size` bytes, the next publisher rotates it to `<path>.1`.
+    Appending and rotating are serialized by a `flock` on `<path>.lock` (shared for appending, exclusive for rotating),
+    and readers keep the file open, so they finish reading the rotated file before moving to the new one.
+    """
+
+    def __init__(
+        self, path: str, poll_interval: float = 0.5, max_size: int = 1024 * 1024
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.rotated_path = f"{path}.1"
+        self.poll_interval = poll_interval
+        self.max_size = max_size
+        self._poll_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._file: BinaryIO | None = None
+        self._pending = b""
+        self._open_file(at_end=True)
+
+    def _open_file(self, at_end: bool = False) -> bool:
+        try:
+            self._file = open(self.path, "rb")  # pylint: disable=consider-using-with
+        except OSError:
+            self._file = None
+            return False
+        if at_end:
+            self._file.seek(0, os.SEEK_END)
+        self._pending = b""
+        return True
+
+    def _is_rotated(self) -> bool:
+        """Tells whether the file at `path` is not the file being read anymore"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if self._file is None:
+            return True
+        return not os.path.samestat(stat, os.fstat(self._file.fileno()))
+
+    @contextmanager
+    def _flock(self, operation: int) -> Iterator[None]:
+        fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)
+
+    def _send(self, event: CacheInvalidationEvent) -> None:
+        line = (event.to_json() + "\n").encode("utf-8")
+        with self._flock(fcntl.LOCK_SH):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        if size > self.max_size:
+            self.rotate()
+
+    def rotate(self) -> None:
+        """Moves the file to `<path>.1` if it is larger than `max_size`"""
+        with self._flock(fcntl.LOCK_EX):
+            # another publisher may have rotated the file while waiting for the lock
+            try:
+                if os.path.getsize(self.path) <= self.max_size:
+                    return
+            except OSError:
+                return
+            os.replace(self.path, self.rotated_path)
+            log.info("Rotated cache invalidation events file: %s", self.path)
+
+    def poll(self) -> int:
+        """
+        Applies all events appended to the file by other processes since the last poll.
+
+        Returns the number of applied events.
+        """
+        applied = 0
+        with self._poll_lock:
+            # check rotation before reading, so no more events get appended to the file being read
+            rotated = self._is_rotated()
+            if self._file is not None:
+                applied += self._apply_lines(self._read())
+            if rotated:
+                if self._file is not None:
+                    self._file.close()
+                if self._open_file():
+                    applied += self._apply_lines(self._read())
+        return applied
+
+    def _read(self) -> bytes:
+        if os.fstat(self._file.fileno()).st_size < self._file.tell():
+            # The file was truncated
+            self._file.seek(0)
+            self._pending = b""
+        data = self._pending + self._file.read()
+        # Keep a partially written last line for the next poll
+        complete, _, self._pending = data.rpartition(b"\n")
+        return complete
+
+    def _apply_lines(self, data: bytes) -> int:
+        applied = 0
+        for raw_line in data.split(b"\n"):
+            if not raw_line.strip():
+                continue
+            try:
+                event = CacheInvalidationEvent.from_json(raw_line.decode("utf-8"))
+            except (ValueError, KeyError):
+                log.warning("Ignoring malformed cache invalidation event: %s", raw_line)
+                continue
+            if event.origin == self.origin:
+                continue
+            self.apply(event)
+            applied += 1
+        return applied
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Failed to process cache invalidation events")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation-bus", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+
+_bus: CacheInvalidationBus | None = None
+_bus_lock = threading.Lock()
+
+
+def create_cache_invalidation_bus(
+    kind: str | None = None, path: str | None = None
+) -> CacheInvalidationBus:
+    kind = (kind or config.CACHE_INVALIDATION_BUS).lower()
+    if kind == "file":
+        return FileCacheInvalidationBus(
+            path=path or config.CACHE_INVALIDATION_BUS_PATH,
+            poll_interval=config.CACHE_INVALIDATION_POLL_INTERVAL,
+            max_size=config.CACHE_INVALIDATION_BUS_MAX_SIZE,
+        )
+    if kind != "local":
+        log.warning("Unknown cache invalidation bus '%s', using 'local'", kind)
+    return InProcessCacheInvalidationBus()
+
+
+def get_cache_invalidation_bus() -> CacheInvalidationBus:
+    """Returns the cache invalidation bus of the current process, creating and starting it on first use."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                bus = create_cache_invalidation_bus()
+                bus.start()
+                _bus = bus
+    return _bus
+
+
+def set_cache_invalidation_bus(bus: CacheInvalidationBus | None) -> None:
+    """Replaces the cache invalidation bus of the current process, stopping the previous one."""
+    global _bus
+    with _bus_lock:
+        if _bus is not None and _bus is not bus:
+            _bus.stop()
+        _bus = bus
+
+
+def invalidate_cache(owner: Any, cache_name: str, keys: tuple[Any, ...] | None = None):
+    """Clears the given cache store of `owner` in all processes sharing the cache invalidation bus."""
+    get_cache_invalidation_bus().publish(cache_target_name(owner, cache_name), keys)
+
+
+def invalidate_cache_after_commit(
+    owner: Any, cache_name: str, keys: tuple[Any, ...] | None = None
+):
+    """
+    Clears the given cache store of `owner` in all processes once the active database transaction is committed.
+
+    The store is cleared immediately if there is no active transaction, and not at all if it is rolled back.
+    """
+    transaction = getattr(db, "_active_transaction", None)
+    if transaction is None:
+        invalidate_cache(owner, cache_name, keys)
+        return
+
+    pending = getattr(transaction, "pending_cache_invalidations", None)
+    if pending is None:
+        pending = transaction.pending_cache_invalidations = []
+        commit = transaction.commit
+
+        def commit_and_invalidate():
+            commit()
+            for args in pending:
+                invalidate_cache(*args)
+
+        transaction.commit = commit_and_invalidate
+    pending.append((owner, cache_name, keys))
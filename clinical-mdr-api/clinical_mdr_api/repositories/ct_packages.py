@@ -1,3 +1,7 @@
+import json
+from typing import Any
+
+from neo4j.time import Date, DateTime
 from neomodel import db
 
 CODELIST_DATA_RETRIEVAL_SPECIFIC_QUERY = """
@@ -309,8 +313,50 @@ def codelist_diff(left_cl, right_cl):
     return result
 
 
+PACKAGE_CHANGES_STORED_RETRIEVAL = """
+MATCH (:CTPackage {name:$old_package_name})-[rel:NEXT_PACKAGE]->(:CTPackage {name:$new_package_name})
+RETURN rel.changes AS changes
+"""
+
+
 @db.transaction
 def get_ct_packages_changes(old_package_name: str, new_package_name: str) -> dict:
+    # The changes between consecutive packages are stored on their NEXT_PACKAGE relationship
+    # by the CT import, other packages are compared on demand.
+    stored_changes = get_stored_ct_packages_changes(
+        old_package_name=old_package_name, new_package_name=new_package_name
+    )
+    if stored_changes is not None:
+        return stored_changes
+    return compute_ct_packages_changes(
+        old_package_name=old_package_name, new_package_name=new_package_name
+    )
+
+
+def get_stored_ct_packages_changes(
+    old_package_name: str, new_package_name: str
+) -> dict | None:
+    result, _ = db.cypher_query(
+        PACKAGE_CHANGES_STORED_RETRIEVAL,
+        {"old_package_name": old_package_name, "new_package_name": new_package_name},
+    )
+    if not result or result[0][0] is None:
+        return None
+
+    return json.loads(result[0][0], object_hook=_restore_stored_dates)
+
+
+def _restore_stored_dates(value: dict) -> Any:
+    # The CT import stores the dates tagged with their type, at any depth of the changes
+    if len(value) == 1:
+        if "$datetime" in value:
+            return DateTime.from_iso_format(value["$datetime"])
+        if "$date" in value:
+            return Date.from_iso_format(value["$date"])
+    return value
+
+
+def compute_ct_packages_changes(old_package_name: str, new_package_name: str) -> dict:
     output = {}
     # codelists query
     # Fetch the codelists and terms and do the comparison here.
@@ -405,6 +451,8 @@ def get_ct_packages_changes(old_package_name: str, new_package_name: str) -> dic
 
 @db.transaction
 def get_package_changes_by_year():
+    # The counters are stored on the NEXT_PACKAGE relationships by the CT import
+    # (and by update_ct_stats for the packages imported before), they are only read here.
     query = """
     MATCH (p1)-[rel:NEXT_PACKAGE]->(p2)
     WITH p2.effective_date.year as year,
@@ -69,7 +69,8 @@ In case the value is set to `0`, all rows will be returned.\n
 Errors: `page_number` not provided.
 """
 
-FILTERS = """
+FILTERS = (
+    """
 JSON dictionary of field names and search strings, with a choice of operators for building complex filtering queries.
 
 Default: `{}` (no filtering).
@@ -91,14 +92,19 @@ Format:
     - `le` (less or equal to)\n
     - `lt` (less than)\n
     - `bw` (between - exactly two values are required)\n
-    - `in` (value in list).\n
-
+    - `in` (value in list)\n
+    - `ft` (full-text search - results are ranked by relevance when no sorting is requested; falls back to `co` for fields without a full-text index).\n
+"""
+    + f"""
+A full-text search is limited to {config.FULLTEXT_SEARCH_LIMIT} matching items, a search matching more items fails with a validation error and has to be refined.\n
+"""
+    + """
 Note that filtering can also be performed on non-string field types. 
 For example, this works as filter on a boolean field: `{"is_global_standard": {"v": [false]}}`.\n
 
 Wildcard filtering is also supported. To do this, provide `*` value for `field_name`, for example: `{"*":{"v":["search_string"]}}`.
 
-Wildcard only supports string search (with implicit `contains` operator) on fields of type string.\n
+Wildcard only supports string search (with implicit `contains` operator, or the `eq`, `co` and `ft` operators) on fields of type string.\n
 
 Finally, you can filter on items that have an empty value for a field. To achieve this, set the value of `v` list to an empty array - `[]`.\n
 
@@ -106,6 +112,7 @@ Complex filtering example:\n
 `{"name":{"v": ["Jimbo", "Jumbo"], "op": "co"}, "start_date": {"v": ["2021-04-01T12:00:00+00.000"], "op": "ge"}, "*":{"v": ["wildcard_search"], "op": "co"}}`
 
 """
+)
 
 FILTER_OPERATOR = (
     "Specifies which logical operation - `and` or `or` - should be used in case filtering is done on several fields.\n\n"
@@ -146,11 +153,35 @@ FILTERS_EXAMPLE = {
     },
 }
 
+CURSOR = (
+    "Opaque cursor for keyset pagination.\n\n"
+    "Functionality: when provided, `page_number` is ignored and the page following the cursor is returned, "
+    "together with `next_cursor` to retrieve the next one. "
+    "Pass an empty value to retrieve the first page. "
+    "The cost of retrieving a page doesn't depend on its position, which makes it suitable to walk through entire libraries. "
+    "The cursor is only valid with the same `sort_by` value.\n\n"
+)
+
 TOTAL_COUNT = (
     "Boolean value specifying whether total count of entities should be included in the response.\n\n"
     "Functionality: retrieve total count of queried entities.\n\n"
 )
 
+AUDIT_TRAIL_SINCE = (
+    "Optionally, the date and time from which the audit trail is returned (included). "
+    "Dates and times without a timezone are taken as UTC.\n\n"
+)
+
+AUDIT_TRAIL_UNTIL = (
+    "Optionally, the date and time until which the audit trail is returned (excluded). "
+    "Dates and times without a timezone are taken as UTC.\n\n"
+)
+
+AUDIT_TRAIL_PAGE_SIZE = (
+    "Number of audit trail entries to return per page, starting from the most recent ones.\n\n"
+    "The whole audit trail is returned if it is set to 0 (default).\n\n"
+)
+
 HEADER_FIELD_NAME = (
     "The field name for which to lookup possible values in the database.\n\n"
     "Functionality: searches for possible values (aka 'headers') of this field in the database."
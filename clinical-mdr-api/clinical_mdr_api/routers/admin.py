@@ -4,6 +4,7 @@ from fastapi import APIRouter, Query
 
 from clinical_mdr_api.domain_repositories.user_repository import UserRepository
 from clinical_mdr_api.models.user import UserInfo, UserInfoPatchInput
+from clinical_mdr_api.repositories.cache_invalidation import invalidate_cache
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.services._meta_repository import MetaRepository
 from common import exceptions
@@ -16,6 +17,8 @@ CACHE_STORE_NAMES = [
     "cache_store_item_by_uid",
     "cache_store_item_by_study_uid",
     "cache_store_item_by_project_number",
+    "cache_store_ct_lookup",
+    "cache_store_day_week_units",
 ]
 
 
@@ -48,9 +51,8 @@ def clear_caches() -> list[dict]:
     all_repos = _get_all_repos()
     for repo in all_repos:
         for store_name in CACHE_STORE_NAMES:
-            cache_store = getattr(repo, store_name, None)
-            if cache_store is not None:
-                cache_store.clear()
+            if getattr(repo, store_name, None) is not None:
+                invalidate_cache(repo, store_name)
 
     return get_caches()
 
@@ -27,6 +27,7 @@ from clinical_mdr_api.services.concepts.activities.activity_service import (
 )
 from common import config
 from common.auth import rbac
+from common.exceptions import ValidationException
 from common.models.error import ErrorResponse
 
 # Prefixed with "/concepts/activities"
@@ -83,6 +84,8 @@ Possible errors:
             "text/xml",
             "application/json",
         ],
+        # Activities can only be walked with a cursor when grouped by groupings
+        "cursor_if": lambda kwargs: kwargs.get("group_by_groupings"),
     }
 )
 # pylint: disable=unused-argument
@@ -156,7 +159,14 @@ def get_activities(
     total_count: Annotated[
         bool | None, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    cursor: Annotated[
+        str | None, Query(description=_generic_descriptions.CURSOR)
+    ] = None,
 ) -> CustomPage[Activity]:
+    ValidationException.raise_if(
+        cursor is not None and not group_by_groupings,
+        msg="Cursor pagination requires activities to be grouped by groupings.",
+    )
     activity_service = ActivityService()
     results = activity_service.get_all_concepts(
         library=library_name,
@@ -166,6 +176,7 @@ def get_activities(
         total_count=total_count,
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
+        cursor=cursor,
         activity_subgroup_uid=activity_subgroup_uid,
         activity_group_uid=activity_group_uid,
         activity_names=activity_names,
@@ -174,7 +185,12 @@ def get_activities(
         group_by_groupings=group_by_groupings,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_cursor=results.next_cursor,
+        cursor_mode=cursor is not None,
     )
 
 
@@ -40,6 +40,14 @@ If `to_alias` is true `to_name` is ignored\n\n
 If `from_alias` is true `alias_context` must be provided\n\n
 If `parent` is empty or `*` is given then the mapping will apply to all occurrences in the entire XML file"""
 
+STREAMING_DESCRIPTION = """
+Parse the ODM XML file incrementally, keeping a single definition in memory at a time
+instead of the whole document. Recommended for large files, e.g. CRF libraries with thousands of ItemDefs.
+
+
+The mapping rules are applied to each definition, so the `parent` of a mapping rule must be a definition
+(e.g. `ItemDef`), an element inside a definition, or empty."""
+
 
 @router.post(
     "/xmls/export",
@@ -85,9 +93,9 @@ def get_odm_document(
         stylesheet,
         mapper_file,
     )
-    rs = odm_xml_export_service.get_odm_document()
 
     if pdf:
+        rs = odm_xml_export_service.get_odm_document()
         buffer_io = BytesIO()
         buffer_io.write(rs)
         pdf_bytes = buffer_io.getvalue()
@@ -100,7 +108,9 @@ def get_odm_document(
             media_type="application/pdf",
         )
 
-    return Response(content=rs, media_type="application/xml")
+    return StreamingResponse(
+        odm_xml_export_service.stream_odm_document(), media_type="application/xml"
+    )
 
 
 @router.post(
@@ -117,10 +127,9 @@ def get_odm_document(
 )
 def get_odm_csv(target_uid: str, target_type: TargetType):
     odm_csv_exporter_service = OdmCsvExporterService(target_uid, target_type)
-    csv_data = odm_csv_exporter_service.get_odm_csv()
 
     return StreamingResponse(
-        iter(csv_data),
+        odm_csv_exporter_service.get_odm_csv(),
         200,
         {"Content-Disposition": "attachment; filename=odm_metadata.csv"},
         "text/csv",
@@ -150,11 +159,16 @@ def store_odm_xml(
     mapper_file: Annotated[
         UploadFile | None, File(description=MAPPER_DESCRIPTION)
     ] = None,
+    streaming: Annotated[bool, Query(description=STREAMING_DESCRIPTION)] = False,
 ):
     if exporter == ExporterType.OSB:
-        odm_xml_importer_service = OdmXmlImporterService(xml_file, mapper_file)
+        odm_xml_importer_service = OdmXmlImporterService(
+            xml_file, mapper_file, streaming
+        )
     else:
-        odm_xml_importer_service = OdmClinicalXmlImporterService(xml_file, mapper_file)
+        odm_xml_importer_service = OdmClinicalXmlImporterService(
+            xml_file, mapper_file, streaming
+        )
 
     return odm_xml_importer_service.store_odm_xml()
 
@@ -165,6 +165,9 @@ def get_all_terms(
     total_count: Annotated[
         bool | None, Query(description=_generic_descriptions.TOTAL_COUNT)
     ] = False,
+    cursor: Annotated[
+        str | None, Query(description=_generic_descriptions.CURSOR)
+    ] = None,
 ) -> CustomPage[CTTermNameAndAttributes]:
     ct_term_service = CTTermService()
     results = ct_term_service.get_all_terms(
@@ -180,9 +183,15 @@ def get_all_terms(
         total_count=total_count,
         filter_by=filters,
         filter_operator=FilterOperator.from_str(operator),
+        cursor=cursor,
     )
     return CustomPage.create(
-        items=results.items, total=results.total, page=page_number, size=page_size
+        items=results.items,
+        total=results.total,
+        page=page_number,
+        size=page_size,
+        next_cursor=results.next_cursor,
+        cursor_mode=cursor is not None,
     )
 
 
@@ -2,8 +2,12 @@ import collections
 import csv
 import functools
 import io
+import itertools
+import json
+import tempfile
+import textwrap
 from copy import copy
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 import yaml
 from dict2xml import dict2xml
@@ -12,23 +16,51 @@ from openpyxl import Workbook
 
 from clinical_mdr_api.models import utils
 from clinical_mdr_api.models.utils import BaseModel
+from common import config
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Number of rows written to the response at once
+EXPORT_BUFFER_ROWS = 500
+# Size of the chunks in which binary exports are streamed
+EXPORT_BUFFER_BYTES = 64 * 1024
+# XLSX files larger than this are spooled to disk before being streamed
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
 
 REGISTERED_EXPORT_FORMATS = {}
+# Export formats which write items one by one and can be fed with items retrieved chunk by chunk
+CHUNKED_EXPORT_FORMATS = set()
 
 
-def register_export_format(name: str):
+def register_export_format(name: str, chunked: bool = False):
     """Decorator used to register an export function.
 
     Give a valid MIME type for name.
+    Export functions return an iterable of the chunks of the exported content.
+    If chunked is True, the export function accepts any iterable of items as data.
     """
 
     def decorator(func):
         REGISTERED_EXPORT_FORMATS[name] = func
+        if chunked:
+            CHUNKED_EXPORT_FORMATS.add(name)
         return func
 
     return decorator
 
 
+def _buffered(lines: Iterable[str]) -> Iterator[str]:
+    """Joins lines of text into chunks of EXPORT_BUFFER_ROWS lines."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) == EXPORT_BUFFER_ROWS:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
 def _convert_headers_to_dict(headers: list[Any]) -> dict:
     """
     Converts a list of headers to a dictionary.
@@ -128,7 +160,7 @@ def _convert_data_to_list(data: dict, headers: list[Any]) -> list[Any]:
     return result
 
 
-@register_export_format("text/csv")
+@register_export_format("text/csv", chunked=True)
 def _export_to_csv(data: dict, headers: list[Any]):
     """Export given data to CSV.
 
@@ -137,47 +169,81 @@ def _export_to_csv(data: dict, headers: list[Any]):
     """
     stream = io.StringIO()
     writer = csv.writer(stream, delimiter=",", quoting=csv.QUOTE_ALL)
-    for row in _convert_data_to_rows(data, headers):
-        writer.writerow(row)
-    return stream.getvalue()
+
+    def _lines():
+        for row in _convert_data_to_rows(data, headers):
+            writer.writerow(row)
+            yield stream.getvalue()
+            stream.seek(0)
+            stream.truncate()
+
+    return _buffered(_lines())
+
+
+@register_export_format(NDJSON_MEDIA_TYPE, chunked=True)
+def _export_to_ndjson(data: dict, headers: list[Any]):
+    """Export given data to newline delimited JSON, one object per item.
+
+    The generated content will only contain items listed in headers.
+    """
+    dict_headers = _convert_headers_to_dict(headers)
+    return _buffered(
+        json.dumps(value, default=str) + "\n"
+        for value in _extract_values_from_data(data, dict_headers)
+    )
 
 
 @register_export_format(
-    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    chunked=True,
 )
 def _export_to_xslx(data: dict, headers: list[Any]):
     """Export given data to XLSX.
 
     The generated content will only contain items listed in headers.
+    Rows are written with a write-only workbook, which doesn't keep them in memory.
     """
-    stream = io.BytesIO()
-    workbook = Workbook()
-    # grab the active worksheet
-    worksheet = workbook.active
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
     for row in _convert_data_to_rows(data, headers):
         worksheet.append(row)
-    workbook.save(stream)
-    return stream.getvalue()
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as stream:
+        workbook.save(stream)
+        stream.seek(0)
+        while chunk := stream.read(EXPORT_BUFFER_BYTES):
+            yield chunk
 
 
-@register_export_format("text/xml")
+@register_export_format("text/xml", chunked=True)
 def _export_to_xml(data: dict, headers: list[Any]):
     """Export given data to XML.
 
     The generated content will only contain items listed in headers.
     """
-    export_dict = {"item": _convert_data_to_list(data, headers)}
     # If data is a single BaseModel instance we don't won't to wrap the export into <items> tags
     if isinstance(data, BaseModel):
-        return dict2xml(export_dict, indent="  ")
-    return dict2xml(export_dict, wrap="items", indent="  ")
+        yield dict2xml({"item": _convert_data_to_list(data, headers)}, indent="  ")
+        return
+
+    dict_headers = _convert_headers_to_dict(headers)
+    items = _buffered(
+        "\n" + textwrap.indent(dict2xml({"item": value}, indent="  "), "  ")
+        for value in _extract_values_from_data(data, dict_headers)
+    )
+    first_chunk = next(items, None)
+    if first_chunk is None:
+        yield dict2xml({"item": []}, wrap="items", indent="  ")
+        return
+    yield "<items>" + first_chunk
+    yield from items
+    yield "\n</items>"
 
 
 @register_export_format("application/x-yaml")
 # pylint: disable=unused-argument
 def _export_to_yaml(data: BaseModel, headers: list[Any]):
     """Export given data to YAML."""
-    return yaml.dump(data.model_dump())
+    return [yaml.dump(data.model_dump())]
 
 
 def export(export_format: str, data: dict, export_definition: dict, *args, **kwargs):
@@ -196,24 +262,108 @@ def export(export_format: str, data: dict, export_definition: dict, *args, **kwa
             data = data.items
         extra_headers = export_definition.get("include_if_exists")
         headers = copy(headers)
-        if extra_headers and data:
-            headers += [
-                extra_header
-                for extra_header in extra_headers
-                if extra_header in data[0]
-            ]
+        if extra_headers and not isinstance(data, BaseModel):
+            items = iter(data)
+            first_item = next(items, None)
+            data = [] if first_item is None else itertools.chain([first_item], items)
+            if first_item is not None:
+                headers += [
+                    extra_header
+                    for extra_header in extra_headers
+                    if extra_header in first_item
+                ]
 
         result = REGISTERED_EXPORT_FORMATS[export_format](
             data, headers, *args, **kwargs
         )
-        response = StreamingResponse(iter([result]), media_type=export_format)
+        response = StreamingResponse(result, media_type=export_format)
         response.headers["Content-Disposition"] = "attachment; filename=export"
         return response
     return data
 
 
+def _exports_all_items(kwargs: dict) -> bool:
+    """Tells whether a list endpoint is called to return all its items at once."""
+    return kwargs.get("page_size") == 0 and (
+        "cursor" in kwargs or "page_number" in kwargs
+    )
+
+
+def _supports_cursor(export_definition: dict, kwargs: dict) -> bool:
+    """
+    Tells whether a list endpoint can be walked with a cursor for the given arguments.
+
+    The endpoint must have a `cursor` parameter. Endpoints accepting a cursor only for some of their arguments
+    tell which ones with the `cursor_if` callable of their export definition, called with the arguments of the endpoint.
+    """
+    if "cursor" not in kwargs:
+        return False
+    cursor_if = export_definition.get("cursor_if")
+    return cursor_if is None or bool(cursor_if(kwargs))
+
+
+def _retrieve_items_in_chunks(
+    func: Callable, args: tuple, kwargs: dict, use_cursor: bool
+) -> Iterator[Any]:
+    """
+    Retrieves all items of a list endpoint chunk by chunk, so that only one chunk of items
+    is held in memory while they are being exported.
+
+    Endpoints supporting cursor pagination for the given arguments are walked with the cursor,
+    other ones page by page.
+    The first chunk is retrieved before returning, so that errors are raised before the response starts.
+    """
+    chunk_size = config.EXPORT_CHUNK_SIZE
+    kwargs = {**kwargs, "page_size": chunk_size}
+    if "total_count" in kwargs:
+        kwargs["total_count"] = False
+    if use_cursor:
+        kwargs["cursor"] = ""
+    else:
+        kwargs["page_number"] = 1
+
+    def _items(chunk: Any) -> list[Any]:
+        if isinstance(chunk, utils.CustomPage | utils.GenericFilteringReturn):
+            return chunk.items
+        return chunk
+
+    def _chunks(chunk: Any) -> Iterator[Any]:
+        items = _items(chunk)
+        while True:
+            yield from items
+            if use_cursor:
+                next_cursor = getattr(chunk, "next_cursor", None)
+                if not next_cursor:
+                    return
+                kwargs["cursor"] = next_cursor
+            else:
+                # A shorter page is the last one, a longer one means that the endpoint isn't paginated
+                if len(items) != chunk_size:
+                    return
+                kwargs["page_number"] += 1
+            previous_first_item = items[0] if items else None
+            chunk = func(*args, **kwargs)
+            items = _items(chunk)
+            # Stop if the endpoint ignored the page number and returned the same page again
+            if not items or items[0] == previous_first_item:
+                return
+
+    return _chunks(func(*args, **kwargs))
+
+
 def allow_exports(export_definition: dict):
-    """Decorator used to add export functionality to list type endpoint."""
+    """Decorator used to add export functionality to list type endpoint.
+
+    When all items of a list endpoint are exported (`page_size=0`) to a format written item by item,
+    the items are retrieved and written chunk by chunk, which keeps the memory usage bounded.
+    The chunks are retrieved with the cursor of the endpoint when it has one and
+    the optional `cursor_if` callable of the export definition accepts the arguments of the call.
+    """
+
+    formats = [*export_definition.get("formats", []), *export_definition.keys()]
+    if "text/csv" in formats:
+        # NDJSON exports contain the same rows as CSV exports
+        formats.append(NDJSON_MEDIA_TYPE)
 
     def decorator(func):
         @functools.wraps(func)
@@ -222,12 +372,15 @@ def allow_exports(export_definition: dict):
             accept = None
             if request:
                 accept = request.headers.get("accept", "application/json")
-            result = func(*args, **kwargs)
-            formats = export_definition.get("formats", [])
-            formats.extend(export_definition.keys())
-            if accept and accept in formats:
-                result = export(accept, result, export_definition)
-            return result
+            if not accept or accept not in formats:
+                return func(*args, **kwargs)
+            if accept in CHUNKED_EXPORT_FORMATS and _exports_all_items(kwargs):
+                result = _retrieve_items_in_chunks(
+                    func, args, kwargs, _supports_cursor(export_definition, kwargs)
+                )
+            else:
+                result = func(*args, **kwargs)
+            return export(accept, result, export_definition)
 
         return wrapper
 
@@ -0,0 +1,185 @@
+# pylint: disable=invalid-name
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Body, File, Header, Path, Query, UploadFile
+
+from clinical_mdr_api.domains.concepts.utils import ExporterType
+from clinical_mdr_api.models.job import Job
+from clinical_mdr_api.models.study_selections.study import (
+    StatusChangeDescription,
+    StudyCloneInput,
+)
+from clinical_mdr_api.routers import _generic_descriptions
+from clinical_mdr_api.routers.concepts.odms.odm_metadata import (
+    MAPPER_DESCRIPTION,
+    STREAMING_DESCRIPTION,
+)
+from clinical_mdr_api.services.jobs import (
+    JOB_TYPE_ODM_XML_IMPORT,
+    JOB_TYPE_STUDY_CLONE,
+    JOB_TYPE_STUDY_LOCK,
+    JOB_TYPE_USDM_EXPORT,
+    JobService,
+    store_upload_file,
+)
+from common.auth import rbac
+
+# Prefixed with "/jobs"
+router = APIRouter()
+
+JobUID = Path(description="The unique id of the job.")
+StudyUID = Path(description="The unique id of the study.")
+IdempotencyKey = Header(
+    alias="Idempotency-Key",
+    description="Optional key identifying the submission. "
+    "Submitting again a job of the same type with the same key returns the job submitted first "
+    "instead of running the operation twice.",
+)
+
+JOB_SUBMISSION_DESCRIPTION = """
+The operation is queued as a background job and run by a worker of the API.
+
+The returned job can be polled with `GET /jobs/{job_uid}`,
+its result is returned by `GET /jobs/{job_uid}/result` once the job has succeeded.
+"""
+
+service = JobService()
+
+
+@router.get(
+    "/{job_uid}",
+    dependencies=[rbac.ANY],
+    summary="Returns the status and progress of the job identified by the provided uid.",
+    status_code=200,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+        404: _generic_descriptions.ERROR_404,
+    },
+)
+def get_job(job_uid: Annotated[str, JobUID]) -> Job:
+    return service.get_job(job_uid)
+
+
+@router.get(
+    "/{job_uid}/result",
+    dependencies=[rbac.ANY],
+    summary="Returns the result of the job identified by the provided uid.",
+    description="The result is the response the synchronous endpoint of the operation would have returned.",
+    status_code=200,
+    responses={
+        400: _generic_descriptions.ERROR_400,
+        403: _generic_descriptions.ERROR_403,
+        404: _generic_descriptions.ERROR_404,
+    },
+)
+def get_job_result(job_uid: Annotated[str, JobUID]) -> Any:
+    return service.get_job_result(job_uid)
+
+
+@router.post(
+    "/studies/{study_uid}/locks",
+    dependencies=[rbac.STUDY_WRITE],
+    summary="Submits a job locking the Study with specified uid, see `POST /studies/{study_uid}/locks`.",
+    description=JOB_SUBMISSION_DESCRIPTION,
+    status_code=202,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+    },
+)
+def submit_study_lock(
+    study_uid: Annotated[str, StudyUID],
+    lock_description: Annotated[
+        StatusChangeDescription,
+        Body(description="The description of the locked version."),
+    ],
+    idempotency_key: Annotated[str | None, IdempotencyKey] = None,
+) -> Job:
+    return service.submit(
+        JOB_TYPE_STUDY_LOCK,
+        params={
+            "study_uid": study_uid,
+            "change_description": lock_description.change_description,
+        },
+        idempotency_key=idempotency_key,
+    )
+
+
+@router.post(
+    "/studies/{study_uid}/clone",
+    dependencies=[rbac.STUDY_WRITE],
+    summary="Submits a job cloning the Study with specified uid, see `POST /studies/{study_uid}/clone`.",
+    description=JOB_SUBMISSION_DESCRIPTION,
+    status_code=202,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+    },
+)
+def submit_study_clone(
+    study_uid: Annotated[str, StudyUID],
+    clone_input: StudyCloneInput,
+    idempotency_key: Annotated[str | None, IdempotencyKey] = None,
+) -> Job:
+    return service.submit(
+        JOB_TYPE_STUDY_CLONE,
+        params={"study_uid": study_uid, "clone_input": clone_input.model_dump()},
+        idempotency_key=idempotency_key,
+    )
+
+
+@router.post(
+    "/concepts/odms/metadata/xmls/import",
+    dependencies=[rbac.LIBRARY_WRITE],
+    summary="Submits a job importing an ODM XML, see `POST /concepts/odms/metadata/xmls/import`.",
+    description=JOB_SUBMISSION_DESCRIPTION,
+    status_code=202,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+    },
+)
+def submit_odm_xml_import(
+    xml_file: Annotated[
+        UploadFile, File(description="The ODM XML file to upload. Supports ODM V1.")
+    ],
+    exporter: Annotated[
+        ExporterType,
+        Query(
+            description="The system that exported this ODM XML file.",
+        ),
+    ] = ExporterType.OSB,
+    mapper_file: Annotated[
+        UploadFile | None, File(description=MAPPER_DESCRIPTION)
+    ] = None,
+    streaming: Annotated[bool, Query(description=STREAMING_DESCRIPTION)] = False,
+    idempotency_key: Annotated[str | None, IdempotencyKey] = None,
+) -> Job:
+    return service.submit(
+        JOB_TYPE_ODM_XML_IMPORT,
+        params={
+            "xml_file": store_upload_file(xml_file),
+            "mapper_file": store_upload_file(mapper_file) if mapper_file else None,
+            "exporter": exporter.value,
+            "streaming": streaming,
+        },
+        idempotency_key=idempotency_key,
+    )
+
+
+@router.post(
+    "/usdm/v3/studyDefinitions/{study_uid}",
+    dependencies=[rbac.STUDY_READ],
+    summary="Submits a job exporting an entire study in DDF USDM format, see `GET /usdm/v3/studyDefinitions/{study_uid}`.",
+    description=JOB_SUBMISSION_DESCRIPTION,
+    status_code=202,
+    responses={
+        403: _generic_descriptions.ERROR_403,
+    },
+)
+def submit_usdm_export(
+    study_uid: Annotated[str, StudyUID],
+    idempotency_key: Annotated[str | None, IdempotencyKey] = None,
+) -> Job:
+    return service.submit(
+        JOB_TYPE_USDM_EXPORT,
+        params={"study_uid": study_uid},
+        idempotency_key=idempotency_key,
+    )
@@ -39,6 +39,7 @@ from clinical_mdr_api.routers._generic_descriptions import (
     study_fields_audit_trail_section_description,
     study_section_description,
 )
+from clinical_mdr_api.routers.studies import utils
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_pharma_cm import StudyPharmaCMService
 from common import config
@@ -794,7 +795,9 @@ def get_snapshot_history(
     dependencies=[rbac.STUDY_READ],
     summary="Returns the audit trail for the fields of a specific study definition identified by 'study_uid'.",
     description="Actions on the study are grouped by date of edit."
-    "Optionally select which subset of fields should be reflected in the audit trail.",
+    "Optionally select which subset of fields should be reflected in the audit trail."
+    " The whole audit trail can be streamed as newline delimited JSON, one entry per line,"
+    " by sending the `Accept: application/x-ndjson` http request header.",
     status_code=200,
     responses={
         403: _generic_descriptions.ERROR_403,
@@ -805,7 +808,15 @@ def get_snapshot_history(
         },
     },
 )
+@decorators.allow_exports(
+    {
+        "defaults": ["study_uid", "date", "author_username", "actions"],
+        "formats": ["application/x-ndjson"],
+    }
+)
+# pylint: disable=unused-argument
 def get_fields_audit_trail(
+    request: Request,  # request is actually required by the allow_exports decorator
     study_uid: Annotated[str, StudyUID],  # ,
     include_sections: Annotated[
         list[StudyComponentEnum] | None,
@@ -815,12 +826,20 @@ def get_fields_audit_trail(
         list[StudyComponentEnum] | None,
         Query(description=study_fields_audit_trail_section_description("exclude")),
     ] = None,
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudyFieldAuditTrailEntry]:
     study_service = StudyService()
     study_fields_audit_trail = study_service.get_fields_audit_trail_by_uid(
         uid=study_uid,
         include_sections=include_sections,
         exclude_sections=exclude_sections,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
     )
     return study_fields_audit_trail
 
@@ -82,6 +82,7 @@ from clinical_mdr_api.models.syntax_instances.criteria import (
 from clinical_mdr_api.models.utils import CustomPage, GenericFilteringReturn
 from clinical_mdr_api.repositories._utils import FilterOperator
 from clinical_mdr_api.routers import _generic_descriptions, decorators
+from clinical_mdr_api.routers.studies import utils
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_activity_group import (
     StudyActivityGroupService,
@@ -453,9 +454,19 @@ The following values should be return for all study objectives.
 )
 def get_all_objectives_audit_trail(
     study_uid: Annotated[str, studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionObjectiveCore]:
     service = StudyObjectiveSelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -1103,9 +1114,19 @@ Returned data:
 )
 def get_all_endpoints_audit_trail(
     study_uid: Annotated[str, studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionEndpoint]:
     service = StudyEndpointSelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -1842,9 +1863,19 @@ Returned data:
 )
 def get_all_compounds_audit_trail(
     study_uid: Annotated[str, studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionCompound]:
     service = StudyCompoundSelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -2639,10 +2670,19 @@ def get_all_criteria_audit_trail(
             description="Optionally, the uid of the criteria_type for which to return study criteria audit trial.",
         ),
     ] = None,
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionCriteriaCore]:
     service = StudyCriteriaSelectionService()
     return service.get_all_selection_audit_trail(
-        study_uid=study_uid, criteria_type_uid=criteria_type_uid
+        study_uid=study_uid,
+        criteria_type_uid=criteria_type_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
     )
 
 
@@ -3555,9 +3595,19 @@ The following values should be returned for all study activity instances:
 )
 def get_all_study_activity_instance_audit_trail(
     study_uid: Annotated[str, studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionActivityInstance]:
     service = StudyActivityInstanceSelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -3958,9 +4008,19 @@ The following values should be returned for all study activities:
 )
 def get_all_activity_audit_trail(
     study_uid: Annotated[str, studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudySelectionActivityCore]:
     service = StudyActivitySelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -238,9 +238,19 @@ Returned data:
 )
 def get_all_compound_dosings_audit_trail(
     study_uid: Annotated[str, utils.studyUID],
+    since: utils.AuditTrailSince = None,
+    until: utils.AuditTrailUntil = None,
+    page_number: utils.AuditTrailPageNumber = config.DEFAULT_PAGE_NUMBER,
+    page_size: utils.AuditTrailPageSize = 0,
 ) -> list[StudyCompoundDosing]:
     service = StudyCompoundDosingSelectionService()
-    return service.get_all_selection_audit_trail(study_uid=study_uid)
+    return service.get_all_selection_audit_trail(
+        study_uid=study_uid,
+        since=since,
+        until=until,
+        page_number=page_number,
+        page_size=page_size,
+    )
 
 
 @router.get(
@@ -1,6 +1,12 @@
 """Common utility constants / functions used by router functions."""
 
-from fastapi import Path
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Path, Query
+
+from clinical_mdr_api.routers import _generic_descriptions
+from common import config
 
 # Useful type declarations
 
@@ -23,3 +29,26 @@ study_compound_dosing_uid = Path(
 )
 
 study_soa_footnote_uid = Path(description="The unique id of the study soa footnote.")
+
+# Query parameters of the study audit trail endpoints
+
+AuditTrailSince = Annotated[
+    datetime | None, Query(description=_generic_descriptions.AUDIT_TRAIL_SINCE)
+]
+
+AuditTrailUntil = Annotated[
+    datetime | None, Query(description=_generic_descriptions.AUDIT_TRAIL_UNTIL)
+]
+
+AuditTrailPageNumber = Annotated[
+    int, Query(ge=1, description=_generic_descriptions.PAGE_NUMBER)
+]
+
+AuditTrailPageSize = Annotated[
+    int,
+    Query(
+        ge=0,
+        le=config.MAX_PAGE_SIZE,
+        description=_generic_descriptions.AUDIT_TRAIL_PAGE_SIZE,
+    ),
+]
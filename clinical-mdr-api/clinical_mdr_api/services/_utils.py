@@ -475,6 +475,9 @@ def generic_item_filtering(
     """
     Filters and sorts a list of items based on the provided filter and sort criteria.
 
+    The filters are compiled once into a `FilterPlan` (attribute paths resolved, filter values normalized)
+    which is then evaluated in a single pass over the items, and sort keys are computed once per item.
+
     Args:
         items (list[Any]): The list of items to filter and sort.
         filter_by (dict | None, optional): A dictionary of filter criteria.
@@ -510,85 +513,299 @@ def generic_item_filtering(
     validate_is_dict("sort_by", sort_by)
     validate_is_dict("filter_by", filter_by)
 
-    filters = FilterDict(elements=filter_by)
-    if filter_operator == FilterOperator.AND:
-        # Start from full list, then only keep items that match filter elements, one by one
-        filtered_items = items
-        # The list will decrease after each step (aka filtering out)
-        for key in filters.elements:
-            _values = filters.elements[key].v
-            _operator = filters.elements[key].op
-            filtered_items = list(
-                filter(
-                    lambda x, k=key, v=_values, o=_operator: filter_aggregated_items(
-                        x, k, v, o
-                    ),
-                    filtered_items,
-                )
+    plan = FilterPlan.compile(
+        filters=FilterDict(elements=filter_by), filter_operator=filter_operator
+    )
+    filtered_items = plan.apply(items)
+    return sort_items(filtered_items, sort_by)
+
+
+def compile_attribute_getter(path: str) -> Callable[[Any], Any]:
+    """
+    Returns a function equivalent to `rgetattr(obj, path)`, with the path split only once.
+    """
+    parts = tuple(path.split("."))
+
+    def _getattr(obj, attr):
+        if isinstance(obj, list):
+            return [_getattr(element, attr) for element in obj]
+        if isinstance(obj, dict):
+            return [_getattr(element, attr) for element in obj.values()]
+        return getattr(obj, attr, None)
+
+    if len(parts) == 1:
+        attr = parts[0]
+
+        def _get_single(obj):
+            if isinstance(obj, (list, dict)):
+                return _getattr(obj, attr)
+            return getattr(obj, attr, None)
+
+        return _get_single
+
+    def _get(obj):
+        for attr in parts:
+            obj = _getattr(obj, attr)
+        return obj
+
+    return _get
+
+
+# Operators comparing the value, as a string, with the first filter value
+_BOUND_COMPARISONS: dict[ComparisonOperator, Callable[[str, Any], bool]] = {
+    ComparisonOperator.GREATER_THAN: lambda value, bound: value > bound,
+    ComparisonOperator.GREATER_THAN_OR_EQUAL_TO: lambda value, bound: value >= bound,
+    ComparisonOperator.LESS_THAN: lambda value, bound: value < bound,
+    ComparisonOperator.LESS_THAN_OR_EQUAL_TO: lambda value, bound: value <= bound,
+}
+
+
+def compile_filter_operator(
+    operator: ComparisonOperator, filter_values: list[Any]
+) -> Callable[[Any], bool]:
+    """
+    Returns a predicate equivalent to `apply_filter_operator(value, operator, filter_values)`,
+    with the filter values normalized only once.
+    """
+    operator = ComparisonOperator(operator)
+    if operator == ComparisonOperator.FULL_TEXT:
+        # Full-text search runs in the database, filtering in memory uses the 'contains' operator
+        operator = ComparisonOperator.CONTAINS
+
+    if not filter_values:
+        # An empty filter_values list means that the returned item's property value should be null
+        def _is_null(value) -> bool:
+            ValidationException.raise_if(
+                operator != ComparisonOperator.EQUALS,
+                msg="Filtering on a null value can only be used with the 'equal' operator.",
             )
-    elif filter_operator == FilterOperator.OR:
-        # Start from empty list then add element one by one
-        _filtered_items = []
-        # The list will increase after each step
-        for key in filters.elements:
-            _values = filters.elements[key].v
-            _operator = filters.elements[key].op
-            matching_items = list(
-                filter(
-                    lambda x, k=key, v=_values, o=_operator: filter_aggregated_items(
-                        x, k, v, o
-                    ),
-                    items,
-                )
+            return value is None
+
+        return _is_null
+
+    if operator in (ComparisonOperator.EQUALS, ComparisonOperator.NOT_EQUALS):
+        negate = operator == ComparisonOperator.NOT_EQUALS
+        try:
+            value_set = frozenset(filter_values)
+        except TypeError:
+            value_set = None
+
+        def _in(value) -> bool:
+            if value_set is not None:
+                try:
+                    return value in value_set
+                except TypeError:
+                    pass
+            return value in filter_values
+
+        if negate:
+            return lambda value: not _in(value)
+        return _in
+
+    if operator == ComparisonOperator.CONTAINS:
+        lowered = tuple(str(_v).lower() for _v in filter_values)
+        return lambda value: any(_v in str(value).lower() for _v in lowered)
+
+    if operator == ComparisonOperator.BETWEEN:
+        filter_values.sort()
+        lower_bound = filter_values[0].lower()
+        upper_bound = filter_values[1].lower()
+        return lambda value: lower_bound <= str(value).lower() <= upper_bound
+
+    if (compare := _BOUND_COMPARISONS.get(operator)) is not None:
+        bound = filter_values[0]
+        return lambda value: compare(str(value), bound)
+
+    # The other operators, such as 'in', are not supported when filtering in memory
+    def _unsupported(_value) -> bool:
+        raise ValidationException(
+            msg=f"Filtering with the '{operator.value}' operator is not supported."
+        )
+
+    return _unsupported
+
+
+class FilterPlan:
+    """
+    Compiled form of a `FilterDict`, evaluated in a single pass over a list of items.
+
+    Each filter element is compiled once into a predicate: the attribute path is split and
+    turned into a getter, and the filter values are normalized for the comparison operator.
+    The semantics are those of `filter_aggregated_items` and `apply_filter_operator`.
+    """
+
+    def __init__(
+        self,
+        predicates: list[Callable[[Any], bool]],
+        filter_operator: FilterOperator,
+    ):
+        self.predicates = predicates
+        self.filter_operator = filter_operator
+
+    @classmethod
+    def compile(cls, filters: FilterDict, filter_operator: FilterOperator) -> Self:
+        if filter_operator not in (FilterOperator.AND, FilterOperator.OR):
+            raise ValidationException(msg=f"Invalid filter_operator: {filter_operator}")
+
+        predicates = [
+            cls._compile_predicate(key, element.v, element.op)
+            for key, element in filters.elements.items()
+        ]
+        return cls(predicates=predicates, filter_operator=filter_operator)
+
+    @classmethod
+    def _compile_predicate(
+        cls, filter_key: str, filter_values: list[Any], operator: ComparisonOperator
+    ) -> Callable[[Any], bool]:
+        if filter_key == "*":
+            # Only accept requests with default operator (set to equal by FilterDict class) or specified contains operator
+            ValidationException.raise_if(
+                ComparisonOperator(operator)
+                not in (
+                    ComparisonOperator.EQUALS,
+                    ComparisonOperator.CONTAINS,
+                    ComparisonOperator.FULL_TEXT,
+                ),
+                msg="Only the default 'contains' operator is supported for wildcard filtering.",
             )
-            _filtered_items += matching_items
-        # if passed filter dict is empty we should return all elements without any filtering
-        if not filters.elements:
-            filtered_items = items
-        else:
-            # Finally, deduplicate list
-            uids = set()
-            filtered_items = []
-            for item in _filtered_items:
+            return cls._compile_wildcard_predicate(filter_values)
+
+        getter = compile_attribute_getter(filter_key)
+        matches = compile_filter_operator(operator, filter_values)
+        return cls._compile_value_predicate(getter, matches, bool(filter_values))
+
+    @staticmethod
+    def _compile_value_predicate(
+        getter: Callable[[Any], Any],
+        matches: Callable[[Any], bool],
+        has_filter_values: bool,
+    ) -> Callable[[Any], bool]:
+        def _predicate(item) -> bool:
+            value = getter(item)
+            # The property associated with the filter key can be inside a list
+            # e.g., categories.name.sponsor_preferred_name for Objective Templates
+            # Filtering then becomes "if any of the values matches with the operator"
+            if isinstance(value, list):
+                if not has_filter_values:
+                    return not value
+                return any(matches(_val) for _val in value)
+            if isinstance(value, Enum):
+                return matches(value.value)
+            return matches(value)
+
+        return _predicate
+
+    @classmethod
+    def _compile_wildcard_predicate(
+        cls, filter_values: list[Any]
+    ) -> Callable[[Any], bool]:
+        matches = compile_filter_operator(ComparisonOperator.CONTAINS, filter_values)
+        has_filter_values = bool(filter_values)
+        # The wildcard properties depend on the values of each item (e.g. empty nested objects),
+        # but the compiled predicate of each property path is shared by all items
+        property_predicates: dict[str, Callable[[Any], bool]] = {}
+
+        def _predicate(item) -> bool:
+            for key in extract_properties_for_wildcard(item):
+                predicate = property_predicates.get(key)
+                if predicate is None:
+                    predicate = cls._compile_value_predicate(
+                        compile_attribute_getter(key), matches, has_filter_values
+                    )
+                    property_predicates[key] = predicate
+                if predicate(item):
+                    return True
+            return False
+
+        return _predicate
+
+    def apply(self, items: list[Any], deduplicate: bool = True) -> list[Any]:
+        """
+        Returns the items matching the plan, in the order of `items`.
+
+        With the OR operator, items are grouped by the first filter element they match
+        and, unless `deduplicate` is False, items with an already returned uid are skipped.
+        """
+        if not self.predicates:
+            return list(items)
+
+        if self.filter_operator == FilterOperator.AND:
+            predicates = self.predicates
+            return [item for item in items if all(p(item) for p in predicates)]
+
+        # Grouping by the first matching filter element gives the same order as applying the filter elements one by one
+        buckets: list[list[Any]] = [[] for _ in self.predicates]
+        for item in items:
+            for index, predicate in enumerate(self.predicates):
+                if predicate(item):
+                    buckets[index].append(item)
+                    break
+        if not deduplicate:
+            return [item for bucket in buckets for item in bucket]
+        uids = set()
+        filtered_items = []
+        for bucket in buckets:
+            for item in bucket:
                 if item.uid not in uids:
                     filtered_items.append(item)
                     uids.add(item.uid)
-    else:
-        raise ValidationException(msg=f"Invalid filter_operator: {filter_operator}")
+        return filtered_items
+
+
+def sort_items(items: list[Any], sort_by: dict) -> list[Any]:
+    """
+    Sorts items by the given sort keys, computing each sort key only once per item.
 
-    # Do sorting
-    distinct_sort_orders = set(list(sort_by.values()))
+    Null values are replaced by "-1" for string properties and -1 for other properties.
+    When all sort orders are the same, items are sorted once on the tuple of sort keys.
+    Otherwise items are sorted once per sort key, in the order of the sort keys.
+    """
+    if not sort_by or not items:
+        return items
+
+    null_replacements: dict[tuple[type, str], Any] = {}
+
+    def _null_replacement(item, sort_key):
+        # The type of a nested property can depend on which parent objects are set,
+        # so only the replacements of top level properties are shared by items of the same type
+        cache_key = (type(item), sort_key)
+        if cache_key in null_replacements:
+            return null_replacements[cache_key]
+        replacement = (
+            "-1" if issubclass(extract_nested_key_type(item, sort_key), str) else -1
+        )
+        if "." not in sort_key:
+            null_replacements[cache_key] = replacement
+        return replacement
+
+    def _column(sort_key: str) -> list[Any]:
+        getter = compile_attribute_getter(sort_key)
+        column = []
+        for item in items:
+            value = getter(item)
+            column.append(
+                value if value is not None else _null_replacement(item, sort_key)
+            )
+        return column
+
+    columns = {sort_key: _column(sort_key) for sort_key in sort_by}
+    indexes = list(range(len(items)))
+
+    distinct_sort_orders = set(sort_by.values())
     # If all orders for SortKeys are the same we can order the list in a single sort function call
     if len(distinct_sort_orders) == 1:
-        filtered_items.sort(
-            key=lambda x: [
-                (
-                    elm
-                    if (elm := extract_nested_key_value(x, sort_key)) is not None
-                    else (
-                        "-1"
-                        if issubclass(extract_nested_key_type(x, sort_key), str)
-                        else -1
-                    )
-                )
-                for sort_key in sort_by.keys()
-            ],
+        key_columns = list(columns.values())
+        indexes.sort(
+            key=lambda idx: [column[idx] for column in key_columns],
             reverse=not distinct_sort_orders.pop(),
         )
     # If orders for SortKeys are different we have to order list calling sort function a few times, once per each SortKey
-    elif len(distinct_sort_orders) > 1:
+    else:
         for sort_key, sort_order in sort_by.items():
-            filtered_items.sort(
-                key=lambda x, s=sort_key: (
-                    elm
-                    if (elm := extract_nested_key_value(x, s)) is not None
-                    else (
-                        "-1" if issubclass(extract_nested_key_type(x, s), str) else -1
-                    )
-                ),
-                reverse=not sort_order,
-            )
-    return filtered_items
+            column = columns[sort_key]
+            indexes.sort(key=column.__getitem__, reverse=not sort_order)
+
+    return [items[idx] for idx in indexes]
 
 
 def generic_pagination(
@@ -690,38 +907,18 @@ def service_level_generic_header_filtering(
             "op": ComparisonOperator.CONTAINS,
         }
     filters = FilterDict(elements=filter_by)
-    if filter_operator == FilterOperator.AND:
-        # Start from full list, then only keep items that match filter elements, one by one
-        filtered_items = items
-        # The list will decrease after each step (aka filtering out)
-        for key in filters.elements:
-            _values = filters.elements[key].v
-            _operator = filters.elements[key].op
-            filtered_items = list(
-                filter(
-                    lambda x, k=key, v=_values, o=_operator: filter_aggregated_items(
-                        x, k, v, o
-                    ),
-                    filtered_items,
-                )
-            )
+    if filter_operator != FilterOperator.AND and not filters.elements:
+        # Items are added to an empty list for each matching filter element, so no filter elements means no items
+        filtered_items = []
     else:
-        # Start from full list, then add items that match filter elements, one by one
-        _filtered_items = []
-        # The list will increase after each step
-        for key in filters.elements:
-            _values = filters.elements[key].v
-            _operator = filters.elements[key].op
-            matching_items = list(
-                filter(
-                    lambda x, k=key, v=_values, o=_operator: filter_aggregated_items(
-                        x, k, v, o
-                    ),
-                    items,
-                )
-            )
-            _filtered_items += matching_items
-        filtered_items = _filtered_items
+        filtered_items = FilterPlan.compile(
+            filters=filters,
+            filter_operator=(
+                FilterOperator.AND
+                if filter_operator == FilterOperator.AND
+                else FilterOperator.OR
+            ),
+        ).apply(items, deduplicate=False)
 
     # Return values for field_name
     extracted_values = []
@@ -740,16 +937,23 @@ def service_level_generic_header_filtering(
             extracted_values.append(extracted_value)
 
     return_values = []
-    # Transform into a set in order to remove duplicates, then cast back to list
+    # Remove duplicates while keeping the order in which the values were found
     is_hashable = bool(extracted_values and isinstance(extracted_values[0], Hashable))
+    seen_values = set()
     for extracted_value in extracted_values:
         if is_hashable:
             value_to_return = extracted_value
         else:
             value_to_return = extracted_value.name
 
-        if value_to_return not in return_values:
-            return_values.append(value_to_return)
+        try:
+            if value_to_return in seen_values:
+                continue
+            seen_values.add(value_to_return)
+        except TypeError:
+            if value_to_return in return_values:
+                continue
+        return_values.append(value_to_return)
 
     # Limit results returned
     return_values = return_values[:page_size]
@@ -807,8 +1011,12 @@ def filter_aggregated_items(item, filter_key, filter_values, filter_operator):
     if filter_key == "*":
         # Only accept requests with default operator (set to equal by FilterDict class) or specified contains operator
         ValidationException.raise_if(
-            ComparisonOperator(filter_operator) != ComparisonOperator.EQUALS
-            and ComparisonOperator(filter_operator) != ComparisonOperator.CONTAINS,
+            ComparisonOperator(filter_operator)
+            not in (
+                ComparisonOperator.EQUALS,
+                ComparisonOperator.CONTAINS,
+                ComparisonOperator.FULL_TEXT,
+            ),
             msg="Only the default 'contains' operator is supported for wildcard filtering.",
         )
 
@@ -866,7 +1074,10 @@ def apply_filter_operator(
             return value in filter_values
         if ComparisonOperator(operator) == ComparisonOperator.NOT_EQUALS:
             return value not in filter_values
-        if ComparisonOperator(operator) == ComparisonOperator.CONTAINS:
+        if ComparisonOperator(operator) in (
+            ComparisonOperator.CONTAINS,
+            ComparisonOperator.FULL_TEXT,
+        ):
             return any(str(_v).lower() in str(value).lower() for _v in filter_values)
         if ComparisonOperator(operator) == ComparisonOperator.GREATER_THAN:
             return str(value) > filter_values[0]
@@ -189,6 +189,7 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         only_specific_status: str = ObjectStatus.LATEST.name,
+        cursor: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         return self.non_transactional_get_all_concepts(
@@ -200,6 +201,7 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
             filter_operator,
             total_count,
             only_specific_status,
+            cursor=cursor,
             **kwargs,
         )
 
@@ -213,23 +215,39 @@ class ConceptGenericService(Generic[_AggregateRootType], ABC):
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
         only_specific_status: str = ObjectStatus.LATEST.name,
+        cursor: str | None = None,
         **kwargs,
     ) -> GenericFilteringReturn[BaseModel]:
         self.enforce_library(library)
 
-        items, total = self.repository.find_all(
-            library=library,
-            total_count=total_count,
-            sort_by=sort_by,
-            filter_by=filter_by,
-            filter_operator=filter_operator,
-            page_number=page_number,
-            page_size=page_size,
-            only_specific_status=only_specific_status,
-            **kwargs,
-        )
+        next_cursor = None
+        if cursor is not None:
+            items, total, next_cursor = self.repository.find_all_by_cursor(
+                library=library,
+                total_count=total_count,
+                sort_by=sort_by,
+                filter_by=filter_by,
+                filter_operator=filter_operator,
+                page_number=page_number,
+                page_size=page_size,
+                only_specific_status=only_specific_status,
+                cursor=cursor,
+                **kwargs,
+            )
+        else:
+            items, total = self.repository.find_all(
+                library=library,
+                total_count=total_count,
+                sort_by=sort_by,
+                filter_by=filter_by,
+                filter_operator=filter_operator,
+                page_number=page_number,
+                page_size=page_size,
+                only_specific_status=only_specific_status,
+                **kwargs,
+            )
 
-        all_concepts = GenericFilteringReturn.create(items, total)
+        all_concepts = GenericFilteringReturn.create(items, total, next_cursor)
         all_concepts.items = [
             self._transform_aggregate_root_to_pydantic_model(concept_ar)
             for concept_ar in all_concepts.items
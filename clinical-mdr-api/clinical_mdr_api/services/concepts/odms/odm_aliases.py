@@ -1,3 +1,5 @@
+from typing import Callable
+
 from fastapi import status
 from neomodel import db
 
@@ -32,7 +34,11 @@ class OdmAliasService(OdmGenericService[OdmAliasAR]):
         return OdmAlias.from_odm_alias_ar(odm_alias_ar=item_ar)
 
     def _create_aggregate_root(
-        self, concept_input: OdmAliasPostInput, library
+        self,
+        concept_input: OdmAliasPostInput,
+        library,
+        *,
+        generate_uid_callback: Callable[[], str | None] | None = None,
     ) -> OdmAliasAR:
         return OdmAliasAR.from_input_values(
             author_id=self.author_id,
@@ -41,7 +47,7 @@ class OdmAliasService(OdmGenericService[OdmAliasAR]):
                 context=concept_input.context,
             ),
             library=library,
-            generate_uid_callback=self.repository.generate_uid,
+            generate_uid_callback=generate_uid_callback or self.repository.generate_uid,
             odm_object_exists_callback=self._repos.odm_alias_repository.odm_object_exists,
         )
 
@@ -1,4 +1,5 @@
 from typing import Any
+from xml.dom import minidom
 
 from fastapi import UploadFile
 
@@ -47,7 +48,12 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
 
     db_ct_codelist_attributes: list[CTCodelistAttributes]
 
-    def __init__(self, xml_file: UploadFile, mapper_file: UploadFile | None):
+    def __init__(
+        self,
+        xml_file: UploadFile,
+        mapper_file: UploadFile | None,
+        streaming: bool = False,
+    ):
         self.ct_term_name_service = CTTermNameService()
         self.ct_codelist_attributes_service = CTCodelistAttributesService()
         self.ct_codelist_name_service = CTCodelistNameService()
@@ -58,7 +64,7 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
         self.unit_definition_uids_by = {}
         self.measurement_unit_names_by_oid = {}
 
-        super().__init__(xml_file, mapper_file)
+        super().__init__(xml_file, mapper_file, streaming)
 
     def store_odm_xml(self):
         self._set_unit_definitions()
@@ -318,27 +324,19 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
                 msg=f"MeasurementUnit with OID '{exc}' was not provided."
             )
 
-    def _get_odm_item_post_input(self, item_def):
-        descriptions = self._extract_descriptions(item_def)
-
+    def _get_odm_item_post_input(
+        self,
+        item_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         plausible_duplicates = self.odm_item_service.non_transactional_get_all_concepts(
             filter_by={"name": {"v": [item_def.getAttribute("Name")], "op": "co"}}
         ).items
 
         item_unit_definitions = self._get_item_unit_definition_inputs(item_def)
 
-        codelist = next(
-            (
-                codelist
-                for codelist in self.codelists
-                if item_def.getElementsByTagName("CodeListRef")
-                and codelist.getAttribute("OID")
-                == item_def.getElementsByTagName("CodeListRef")[0].getAttribute(
-                    "CodeListOID"
-                )
-            ),
-            None,
-        )
+        codelist = self._get_codelist(item_def)
 
         codelist_uid = next(
             (
@@ -386,15 +384,8 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
                 sds_var_name=item_def.getAttribute("SDSVarName"),
                 origin=item_def.getAttribute("Origin"),
                 comment=None,
-                descriptions=[
-                    self._create_description(
-                        name=description["name"],
-                        description=description["description"],
-                        lang=description["lang"],
-                    ).uid
-                    for description in descriptions
-                ],
-                alias_uids=[],
+                descriptions=description_uids,
+                alias_uids=alias_uids,
                 unit_definitions=item_unit_definitions,
                 codelist_uid=codelist_uid,
                 terms=input_terms,
@@ -403,9 +394,12 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
             item_unit_definitions,
         )
 
-    def _get_odm_item_group_post_input(self, item_group_def):
-        descriptions = self._extract_descriptions(item_group_def)
-
+    def _get_odm_item_group_post_input(
+        self,
+        item_group_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         plausible_duplicates = (
             self.odm_item_group_service.non_transactional_get_all_concepts(
                 filter_by={
@@ -425,21 +419,17 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
             purpose=item_group_def.getAttribute("Purpose"),
             sas_dataset_name=item_group_def.getAttribute("SASDatasetName"),
             comment=None,
-            descriptions=[
-                self._create_description(
-                    name=description["name"],
-                    description=description["description"],
-                    lang=description["lang"],
-                ).uid
-                for description in descriptions
-            ],
-            alias_uids=[],
+            descriptions=description_uids,
+            alias_uids=alias_uids,
             sdtm_domain_uids=[],
         )
 
-    def _get_odm_form_post_input(self, form_def):
-        descriptions = self._extract_descriptions(form_def)
-
+    def _get_odm_form_post_input(
+        self,
+        form_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         plausible_duplicates = self.odm_form_service.non_transactional_get_all_concepts(
             filter_by={"name": {"v": [form_def.getAttribute("Name")], "op": "co"}}
         ).items
@@ -452,17 +442,14 @@ class OdmClinicalXmlImporterService(OdmXmlImporterService):
             sdtm_version="",
             repeating=form_def.getAttribute("Repeating"),
             scope_uid=None,
-            descriptions=[
-                self._create_description(
-                    name=description["name"],
-                    description=description["description"],
-                    lang=description["lang"],
-                ).uid
-                for description in descriptions
-            ],
-            alias_uids=[],
+            descriptions=description_uids,
+            alias_uids=alias_uids,
         )
 
+    def _get_alias_elements(self, def_element: minidom.Element):
+        # The aliases of ClinSpark exports are not imported
+        return []
+
     @staticmethod
     def get_next_available_name(name: str, objs: list[Any]):
         duplicates = []
@@ -1,14 +1,42 @@
-from clinical_mdr_api.domain_repositories.concepts.odms.metadata_repository import (
-    MetadataRepository,
-)
+import csv
+from collections.abc import Iterator
+from io import StringIO
+
 from clinical_mdr_api.domains.concepts.utils import TargetType
-from common.exceptions import BusinessLogicException
+from clinical_mdr_api.models.concepts.odms.odm_form import OdmForm
+from clinical_mdr_api.models.concepts.odms.odm_item import OdmItem
+from clinical_mdr_api.models.concepts.odms.odm_item_group import OdmItemGroup
+from clinical_mdr_api.services.concepts.odms.odm_data_extractor import OdmDataExtractor
 
 
 class OdmCsvExporterService:
-    repo: MetadataRepository
+    """
+    Exports the ODM metadata of a study event, form, item group or item as CSV,
+    with one row per item of the target, from the same extraction as the ODM XML export.
+
+    Only the Final and Retired versions of the ODM elements are exported.
+    """
+
+    STATUS = "LATEST_FINAL|LATEST_RETIRED"
+    VERSION_STATUSES = ("Final", "Retired")
+
+    STUDY_EVENT_COLUMNS = ["StudyEvent_Name", "StudyEvent_Version"]
+    FORM_COLUMNS = ["Form_Name", "Form_Repeating", "Form_Version"]
+    ITEM_GROUP_COLUMNS = ["ItemGroup_Name", "ItemGroup_Version"]
+    ITEM_COLUMNS = [
+        "Item_Name",
+        "Item_Datatype",
+        "Item_Version",
+        "Item_Units",
+        "Item_Codelist",
+        "Item_Terms",
+    ]
+
+    odm_data_extractor: OdmDataExtractor
     target_uid: str
     target_type: TargetType
+    item_groups_by_uid: dict[str, OdmItemGroup]
+    items_by_uid: dict[str, OdmItem]
 
     def __init__(
         self,
@@ -17,16 +45,123 @@ class OdmCsvExporterService:
     ):
         self.target_uid = target_uid
         self.target_type = target_type
-        self.repo = MetadataRepository()
+        self.odm_data_extractor = OdmDataExtractor(
+            target_uid,
+            target_type,
+            self.STATUS,
+            target_status=self.STATUS,
+            version_statuses=self.VERSION_STATUSES,
+        )
+        self.item_groups_by_uid = {
+            item_group.uid: item_group
+            for item_group in self.odm_data_extractor.odm_item_groups
+        }
+        self.items_by_uid = {
+            item.uid: item for item in self.odm_data_extractor.odm_items
+        }
+
+    def get_odm_csv(self) -> Iterator[str]:
+        """
+        Streams the CSV export, line by line.
+
+        Yields:
+            str: The next line of the CSV export, the header first.
+        """
+        buffer = StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+
+        for row in self._get_rows():
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def _get_rows(self) -> Iterator[list[str]]:
+        extractor = self.odm_data_extractor
 
-    def get_odm_csv(self):
         if self.target_type == TargetType.STUDY_EVENT:
-            return self.repo.get_odm_study_event(self.target_uid)
-        if self.target_type == TargetType.FORM:
-            return self.repo.get_odm_form(self.target_uid)
-        if self.target_type == TargetType.ITEM_GROUP:
-            return self.repo.get_odm_item_group(self.target_uid)
-        if self.target_type == TargetType.ITEM:
-            return self.repo.get_odm_item(self.target_uid)
-
-        raise BusinessLogicException(msg="Requested target type not supported.")
+            yield (
+                self.STUDY_EVENT_COLUMNS
+                + self.FORM_COLUMNS
+                + self.ITEM_GROUP_COLUMNS
+                + self.ITEM_COLUMNS
+            )
+            study_event = [extractor.target_name, extractor.target_version]
+            for row in self._get_rows_of_forms(extractor.odm_forms):
+                yield study_event + row
+        elif self.target_type == TargetType.FORM:
+            yield self.FORM_COLUMNS + self.ITEM_GROUP_COLUMNS + self.ITEM_COLUMNS
+            yield from self._get_rows_of_forms(extractor.odm_forms)
+        elif self.target_type == TargetType.ITEM_GROUP:
+            yield self.ITEM_GROUP_COLUMNS + self.ITEM_COLUMNS
+            yield from self._get_rows_of_item_groups(extractor.odm_item_groups)
+        else:
+            yield self.ITEM_COLUMNS
+            yield from self._get_rows_of_items(extractor.odm_items)
+
+    def _get_rows_of_forms(self, forms: list[OdmForm]) -> Iterator[list[str]]:
+        if not forms:
+            yield self._empty(
+                self.FORM_COLUMNS + self.ITEM_GROUP_COLUMNS + self.ITEM_COLUMNS
+            )
+
+        for form in forms:
+            form_row = [
+                form.name,
+                form.repeating.lower() if form.repeating else "",
+                form.version,
+            ]
+            for row in self._get_rows_of_item_groups(
+                [
+                    self.item_groups_by_uid[item_group_ref.uid]
+                    for item_group_ref in form.item_groups
+                    if item_group_ref.uid in self.item_groups_by_uid
+                ]
+            ):
+                yield form_row + row
+
+    def _get_rows_of_item_groups(
+        self, item_groups: list[OdmItemGroup]
+    ) -> Iterator[list[str]]:
+        if not item_groups:
+            yield self._empty(self.ITEM_GROUP_COLUMNS + self.ITEM_COLUMNS)
+
+        for item_group in item_groups:
+            item_group_row = [item_group.name, item_group.version]
+            for row in self._get_rows_of_items(
+                [
+                    self.items_by_uid[item_ref.uid]
+                    for item_ref in item_group.items
+                    if item_ref.uid in self.items_by_uid
+                ]
+            ):
+                yield item_group_row + row
+
+    def _get_rows_of_items(self, items: list[OdmItem]) -> Iterator[list[str]]:
+        if not items:
+            yield self._empty(self.ITEM_COLUMNS)
+
+        for item in items:
+            yield [
+                item.name,
+                item.datatype,
+                item.version,
+                "|".join(
+                    unit_definition.name for unit_definition in item.unit_definitions
+                ),
+                item.codelist.name if item.codelist else None,
+                "|".join(
+                    code_submission_value
+                    for code_submission_value in dict.fromkeys(
+                        self.odm_data_extractor.term_code_submission_values.get(
+                            term.term_uid
+                        )
+                        for term in item.terms
+                    )
+                    if code_submission_value
+                ),
+            ]
+
+    @staticmethod
+    def _empty(columns: list[str]) -> list[None]:
+        return [None] * len(columns)
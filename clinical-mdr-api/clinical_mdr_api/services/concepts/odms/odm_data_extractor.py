@@ -1,47 +1,99 @@
+import json
+from collections import defaultdict
+from typing import Any, Callable
+
+from clinical_mdr_api.domain_repositories.concepts.odms.metadata_repository import (
+    MetadataRepository,
+)
+from clinical_mdr_api.domains._utils import ObjectStatus
 from clinical_mdr_api.domains.concepts.utils import TargetType
+from clinical_mdr_api.models.concepts.odms.odm_alias import OdmAliasSimpleModel
+from clinical_mdr_api.models.concepts.odms.odm_common_models import (
+    OdmRefVendor,
+    OdmRefVendorAttributeModel,
+)
 from clinical_mdr_api.models.concepts.odms.odm_condition import OdmCondition
-from clinical_mdr_api.models.concepts.odms.odm_form import OdmForm
-from clinical_mdr_api.models.concepts.odms.odm_item import OdmItem
-from clinical_mdr_api.models.concepts.odms.odm_item_group import OdmItemGroup
-from clinical_mdr_api.models.concepts.odms.odm_method import OdmMethod
-from clinical_mdr_api.models.concepts.unit_definitions.unit_definition import (
-    UnitDefinitionModel,
+from clinical_mdr_api.models.concepts.odms.odm_description import (
+    OdmDescriptionSimpleModel,
 )
-from clinical_mdr_api.models.controlled_terminologies.ct_codelist_attributes import (
-    CTCodelistAttributes,
+from clinical_mdr_api.models.concepts.odms.odm_form import OdmForm
+from clinical_mdr_api.models.concepts.odms.odm_formal_expression import (
+    OdmFormalExpressionSimpleModel,
 )
-from clinical_mdr_api.services.concepts.odms.odm_conditions import OdmConditionService
-from clinical_mdr_api.services.concepts.odms.odm_forms import OdmFormService
-from clinical_mdr_api.services.concepts.odms.odm_item_groups import OdmItemGroupService
-from clinical_mdr_api.services.concepts.odms.odm_items import OdmItemService
-from clinical_mdr_api.services.concepts.odms.odm_methods import OdmMethodService
-from clinical_mdr_api.services.concepts.odms.odm_study_events import (
-    OdmStudyEventService,
+from clinical_mdr_api.models.concepts.odms.odm_item import (
+    OdmItem,
+    OdmItemRefModel,
+    OdmItemTermRelationshipModel,
+    OdmItemUnitDefinitionWithRelationship,
 )
-from clinical_mdr_api.services.concepts.odms.odm_vendor_attributes import (
-    OdmVendorAttributeService,
+from clinical_mdr_api.models.concepts.odms.odm_item_group import (
+    OdmItemGroup,
+    OdmItemGroupRefModel,
 )
-from clinical_mdr_api.services.concepts.odms.odm_vendor_elements import (
-    OdmVendorElementService,
+from clinical_mdr_api.models.concepts.odms.odm_method import OdmMethod
+from clinical_mdr_api.models.concepts.odms.odm_vendor_attribute import (
+    OdmVendorAttributeRelationModel,
+    OdmVendorElementAttributeRelationModel,
 )
-from clinical_mdr_api.services.concepts.odms.odm_vendor_namespaces import (
-    OdmVendorNamespaceService,
+from clinical_mdr_api.models.concepts.odms.odm_vendor_element import (
+    OdmVendorElementRelationModel,
 )
-from clinical_mdr_api.services.concepts.unit_definitions.unit_definition import (
-    UnitDefinitionService,
+from clinical_mdr_api.models.concepts.unit_definitions.unit_definition import (
+    UnitDefinitionModel,
 )
-from clinical_mdr_api.services.controlled_terminologies.ct_codelist_attributes import (
-    CTCodelistAttributesService,
+from clinical_mdr_api.models.controlled_terminologies.ct_codelist_attributes import (
+    CTCodelistAttributes,
+    CTCodelistAttributesSimpleModel,
 )
-from clinical_mdr_api.services.controlled_terminologies.ct_term_attributes import (
-    CTTermAttributesService,
+from clinical_mdr_api.models.controlled_terminologies.ct_term import (
+    SimpleCTTermAttributes,
 )
-from common.exceptions import BusinessLogicException
+from common.exceptions import BusinessLogicException, NotFoundException
+from common.utils import booltostr, version_string_to_tuple
+
+
+def _latest_version(
+    versions: list[dict[str, Any]], statuses: tuple[str, ...] | None = None
+) -> str | None:
+    """
+    Returns the version of the latest `HAS_VERSION` relationship,
+    ordered like the concept repositories order them, optionally only among the given statuses.
+    """
+    versions = [
+        version
+        for version in versions
+        if statuses is None or version["status"] in statuses
+    ]
+    if not versions:
+        return None
+
+    return max(
+        versions,
+        key=lambda version: (
+            version_string_to_tuple(version["version"]),
+            version.get("end_date") is None,
+            version.get("end_date") or version.get("start_date"),
+            version.get("start_date"),
+        ),
+    )["version"]
+
+
+def _max_version(versions: list[str]) -> str | None:
+    return max(versions, key=version_string_to_tuple, default=None)
 
 
 class OdmDataExtractor:
+    """
+    Extracts the ODM elements of a study event, form, item group or item, and all the elements they refer to.
+
+    The elements are fetched level by level through the `MetadataRepository`,
+    which issues one query per element type whatever the number of elements.
+    The models are built with the fields used by the exporters only.
+    """
+
     target_uid: str
     target_name: str
+    target_version: str | None
     status: str
 
     odm_vendor_namespaces: dict[str, dict]
@@ -53,39 +105,47 @@ class OdmDataExtractor:
     odm_methods: list[OdmMethod]
     codelists: list[CTCodelistAttributes]
     ct_terms: list[dict[str, str]]
+    term_code_submission_values: dict[str, str]
     unit_definitions: list[UnitDefinitionModel]
 
-    vendor_namespace_service: OdmVendorNamespaceService
-    vendor_element_service: OdmVendorElementService
-    vendor_attribute_service: OdmVendorAttributeService
-    study_event_service: OdmStudyEventService
-    form_service: OdmFormService
-    item_group_service: OdmItemGroupService
-    item_service: OdmItemService
-    condition_service: OdmConditionService
-    method_service: OdmMethodService
-    ct_codelist_attributes_service: CTCodelistAttributesService
-    ct_term_attributes_service: CTTermAttributesService
-    unit_definition_service: UnitDefinitionService
+    repository: MetadataRepository
 
     def __init__(
         self,
         target_uid: str,
         target_type: TargetType,
         status: str,
+        target_status: str = ObjectStatus.LATEST.name,
+        version_statuses: tuple[str, ...] | None = None,
     ):
-        self.unit_definition_service = UnitDefinitionService()
-        self.vendor_namespace_service = OdmVendorNamespaceService()
-        self.vendor_element_service = OdmVendorElementService()
-        self.vendor_attribute_service = OdmVendorAttributeService()
-        self.study_event_service = OdmStudyEventService()
-        self.form_service = OdmFormService()
-        self.item_group_service = OdmItemGroupService()
-        self.item_service = OdmItemService()
-        self.condition_service = OdmConditionService()
-        self.method_service = OdmMethodService()
-        self.ct_codelist_attributes_service = CTCodelistAttributesService()
-        self.ct_term_attributes_service = CTTermAttributesService()
+        """
+        Args:
+            target_uid (str): The UID of the ODM element to extract.
+            target_type (TargetType): The type of the ODM element to extract.
+            status (str): The status of the ODM elements the target refers to, e.g. `LATEST_FINAL`,
+                or several statuses separated by `|`.
+            target_status (str): The status of the target itself.
+            version_statuses (tuple[str, ...] | None): The statuses of the versions to report, all statuses if `None`.
+
+        Raises:
+            BusinessLogicException: If the target type is not supported.
+            NotFoundException: If the target doesn't exist with the requested status.
+        """
+        BusinessLogicException.raise_if(
+            target_type
+            not in (
+                TargetType.STUDY_EVENT,
+                TargetType.FORM,
+                TargetType.ITEM_GROUP,
+                TargetType.ITEM,
+            ),
+            msg="Requested target type not supported.",
+        )
+
+        self.repository = MetadataRepository()
+        self.target_uid = target_uid
+        self.status = status
+        self.version_statuses = version_statuses
 
         self.odm_vendor_namespaces = {}
         self.odm_vendor_elements = {}
@@ -98,30 +158,43 @@ class OdmDataExtractor:
         self.codelists = []
         self.ct_terms = []
         self.unit_definitions = []
-
-        self.status = status
+        self.term_code_submission_values = {}
+        self._items_by_codelist_uid = None
+        self._terms_by_codelist_uid = None
 
         if target_type == TargetType.STUDY_EVENT:
-            study_event = self.study_event_service.get_by_uid(target_uid)
-            self.target_name = study_event.name
-            self.set_forms_of_target(study_event)
+            study_event = self._get_target(
+                self.repository.get_odm_study_events, target_status, "ODM Study Event"
+            )
+            self.target_name = study_event["name"]
+            self.target_version = self._version(study_event)
+            self.set_forms([form["uid"] for form in study_event["forms"]])
         elif target_type == TargetType.FORM:
-            self.odm_forms.append(self.form_service.get_by_uid(target_uid))
-            self.target_name = self.odm_forms[0].name
+            form = self._create_form(
+                self._get_target(
+                    self.repository.get_odm_forms, target_status, "ODM Form"
+                )
+            )
+            self.target_name, self.target_version = form.name, form.version
+            self.odm_forms = [form]
             self.set_item_groups_of_forms(self.odm_forms)
         elif target_type == TargetType.ITEM_GROUP:
-            self.odm_item_groups.append(self.item_group_service.get_by_uid(target_uid))
-            self.target_name = self.odm_item_groups[0].name
+            item_group = self._create_item_group(
+                self._get_target(
+                    self.repository.get_odm_item_groups, target_status, "ODM Item Group"
+                )
+            )
+            self.target_name, self.target_version = item_group.name, item_group.version
+            self.odm_item_groups = [item_group]
             self.set_items_of_item_groups(self.odm_item_groups)
-        elif target_type == TargetType.ITEM:
-            self.odm_items.append(self.item_service.get_by_uid(target_uid))
-            self.target_name = self.odm_items[0].name
-            self.set_unit_definitions_of_items(self.odm_items)
-            self.set_codelists_of_items(self.odm_items)
         else:
-            raise BusinessLogicException(msg="Requested target type not supported.")
-
-        self.target_uid = target_uid
+            row = self._get_target(
+                self.repository.get_odm_items, target_status, "ODM Item"
+            )
+            item = self._create_item(row)
+            self.target_name, self.target_version = item.name, item.version
+            self.odm_items = [item]
+            self.set_codelists_and_unit_definitions_of_items([row])
 
         self.set_conditions(self.odm_forms, self.odm_item_groups)
         self.set_methods(self.odm_item_groups)
@@ -129,101 +202,363 @@ class OdmDataExtractor:
         self.set_vendor_elements()
         self.set_ref_vendor_attributes()
 
+    def _get_target(
+        self,
+        get_elements: Callable[[list[str], str], list[dict[str, Any]]],
+        target_status: str,
+        resource_name: str,
+    ) -> dict[str, Any]:
+        targets = get_elements([self.target_uid], target_status)
+
+        NotFoundException.raise_if(not targets, resource_name, self.target_uid)
+
+        return targets[0]
+
+    def _version(self, row: dict[str, Any]) -> str | None:
+        return _latest_version(row["versions"], self.version_statuses)
+
+    def _create_descriptions(self, rows: list[dict[str, Any]]):
+        return sorted(
+            [
+                OdmDescriptionSimpleModel(
+                    uid=row["uid"],
+                    name=row["name"],
+                    language=row["language"],
+                    description=row["description"],
+                    instruction=row["instruction"],
+                    sponsor_instruction=row["sponsor_instruction"],
+                    version=_max_version(row["versions"]),
+                )
+                for row in rows
+            ],
+            key=lambda elm: elm.name,
+        )
+
+    def _create_aliases(self, rows: list[dict[str, Any]]):
+        return sorted(
+            [
+                OdmAliasSimpleModel(
+                    uid=row["uid"],
+                    name=row["name"],
+                    context=row["context"],
+                    version=_max_version(row["versions"]),
+                )
+                for row in rows
+            ],
+            key=lambda elm: elm.name,
+        )
+
+    def _create_formal_expressions(self, rows: list[dict[str, Any]]):
+        return sorted(
+            [
+                OdmFormalExpressionSimpleModel(
+                    uid=row["uid"],
+                    context=row["context"],
+                    expression=row["expression"],
+                    version=_max_version(row["versions"]),
+                )
+                for row in rows
+            ],
+            key=lambda elm: elm.expression,
+        )
+
+    def _create_vendors(self, row: dict[str, Any]) -> dict[str, list]:
+        return {
+            "vendor_elements": sorted(
+                [
+                    OdmVendorElementRelationModel(**vendor_element)
+                    for vendor_element in row["vendor_elements"]
+                ],
+                key=lambda elm: elm.name,
+            ),
+            "vendor_attributes": sorted(
+                [
+                    OdmVendorAttributeRelationModel(**vendor_attribute)
+                    for vendor_attribute in row["vendor_attributes"]
+                ],
+                key=lambda elm: elm.name,
+            ),
+            "vendor_element_attributes": sorted(
+                [
+                    OdmVendorElementAttributeRelationModel(**vendor_element_attribute)
+                    for vendor_element_attribute in row["vendor_element_attributes"]
+                ],
+                key=lambda elm: elm.name,
+            ),
+        }
+
+    def _create_ref_vendor(self, vendor: str | dict | None) -> OdmRefVendor:
+        if isinstance(vendor, str):
+            vendor = json.loads(vendor)
+
+        return OdmRefVendor(
+            attributes=[
+                OdmRefVendorAttributeModel(
+                    uid=attribute["uid"], value=attribute["value"]
+                )
+                for attribute in (vendor or {}).get("attributes", [])
+            ]
+        )
+
+    def _create_form(self, row: dict[str, Any]) -> OdmForm:
+        return OdmForm.model_construct(
+            uid=row["uid"],
+            oid=row.get("oid"),
+            name=row["name"],
+            repeating=booltostr(row.get("repeating")),
+            sdtm_version=row.get("sdtm_version"),
+            version=self._version(row),
+            descriptions=self._create_descriptions(row["descriptions"]),
+            aliases=self._create_aliases(row["aliases"]),
+            item_groups=sorted(
+                [
+                    OdmItemGroupRefModel(
+                        uid=item_group["uid"],
+                        oid=item_group["oid"],
+                        name=item_group["name"],
+                        order_number=item_group["order_number"],
+                        mandatory=booltostr(item_group["mandatory"]),
+                        collection_exception_condition_oid=item_group[
+                            "collection_exception_condition_oid"
+                        ],
+                        vendor=self._create_ref_vendor(item_group["vendor"]),
+                    )
+                    for item_group in row["item_groups"]
+                ],
+                key=lambda elm: elm.order_number,
+            ),
+            **self._create_vendors(row),
+        )
+
+    def _create_item_group(self, row: dict[str, Any]) -> OdmItemGroup:
+        return OdmItemGroup.model_construct(
+            uid=row["uid"],
+            oid=row.get("oid"),
+            name=row["name"],
+            repeating=booltostr(row.get("repeating")),
+            is_reference_data=booltostr(row.get("is_reference_data")),
+            sas_dataset_name=row.get("sas_dataset_name"),
+            origin=row.get("origin"),
+            purpose=row.get("purpose"),
+            comment=row.get("comment"),
+            version=self._version(row),
+            descriptions=self._create_descriptions(row["descriptions"]),
+            aliases=self._create_aliases(row["aliases"]),
+            sdtm_domains=sorted(
+                [
+                    SimpleCTTermAttributes(**sdtm_domain)
+                    for sdtm_domain in row["sdtm_domains"]
+                ],
+                key=lambda elm: elm.code_submission_value,
+            ),
+            items=sorted(
+                [
+                    OdmItemRefModel(
+                        uid=item["uid"],
+                        oid=item["oid"],
+                        name=item["name"],
+                        order_number=item["order_number"],
+                        mandatory=booltostr(item["mandatory"]),
+                        key_sequence=item["key_sequence"],
+                        method_oid=item["method_oid"],
+                        imputation_method_oid=item["imputation_method_oid"],
+                        role=item["role"],
+                        role_codelist_oid=item["role_codelist_oid"],
+                        collection_exception_condition_oid=item[
+                            "collection_exception_condition_oid"
+                        ],
+                        vendor=self._create_ref_vendor(item["vendor"]),
+                    )
+                    for item in row["items"]
+                ],
+                key=lambda elm: elm.order_number,
+            ),
+            **self._create_vendors(row),
+        )
+
+    def _create_item(self, row: dict[str, Any]) -> OdmItem:
+        codelist = row["codelist"]
+        for term in row["terms"]:
+            self.term_code_submission_values[term["term_uid"]] = term[
+                "code_submission_value"
+            ]
+
+        return OdmItem.model_construct(
+            uid=row["uid"],
+            oid=row.get("oid"),
+            name=row["name"],
+            prompt=row.get("prompt"),
+            datatype=row.get("datatype"),
+            length=row.get("length"),
+            significant_digits=row.get("significant_digits"),
+            sas_field_name=row.get("sas_field_name"),
+            sds_var_name=row.get("sds_var_name"),
+            origin=row.get("origin"),
+            comment=row.get("comment"),
+            version=self._version(row),
+            descriptions=self._create_descriptions(row["descriptions"]),
+            aliases=self._create_aliases(row["aliases"]),
+            unit_definitions=sorted(
+                [
+                    OdmItemUnitDefinitionWithRelationship(
+                        uid=unit_definition["uid"],
+                        name=unit_definition["name"],
+                        mandatory=unit_definition["mandatory"],
+                        order=unit_definition["order"],
+                    )
+                    for unit_definition in row["unit_definitions"]
+                ],
+                key=lambda elm: elm.uid,
+            ),
+            codelist=(
+                CTCodelistAttributesSimpleModel(
+                    uid=codelist["uid"],
+                    name=codelist["name"],
+                    submission_value=codelist["submission_value"],
+                    preferred_term=codelist["preferred_term"],
+                )
+                if codelist
+                else None
+            ),
+            terms=sorted(
+                [
+                    OdmItemTermRelationshipModel(
+                        term_uid=term["term_uid"],
+                        name=term["name"],
+                        mandatory=term["mandatory"],
+                        order=term["order"],
+                        display_text=term["display_text"],
+                        version=self._get_term_version(term),
+                    )
+                    for term in row["terms"]
+                ],
+                key=lambda elm: (elm.order is not None, elm.order),
+            ),
+            **self._create_vendors(row),
+        )
+
+    def _get_term_version(self, term: dict[str, Any]) -> str | None:
+        """
+        Returns the version of the latest draft of a CT Term if it's not ended, or else of its latest final version.
+        """
+        for has_latest, status in (
+            ("has_latest_draft", "Draft"),
+            ("has_latest_final", "Final"),
+        ):
+            if not term[has_latest]:
+                continue
+            versions = [
+                version for version in term["versions"] if version["status"] == status
+            ]
+            if versions:
+                version = max(
+                    versions,
+                    key=lambda version: version_string_to_tuple(version["version"]),
+                )
+                if not version["end_date"]:
+                    return version["version"]
+
+        raise NotFoundException(
+            msg=f"No DRAFT or FINAL found for CT Term with UID '{term['term_uid']}'."
+        )
+
+    def _create_condition(self, row: dict[str, Any]) -> OdmCondition:
+        return OdmCondition.model_construct(
+            uid=row["uid"],
+            oid=row.get("oid"),
+            name=row["name"],
+            version=self._version(row),
+            formal_expressions=self._create_formal_expressions(
+                row["formal_expressions"]
+            ),
+            descriptions=self._create_descriptions(row["descriptions"]),
+            aliases=self._create_aliases(row["aliases"]),
+        )
+
+    def _create_method(self, row: dict[str, Any]) -> OdmMethod:
+        return OdmMethod.model_construct(
+            uid=row["uid"],
+            oid=row.get("oid"),
+            name=row["name"],
+            method_type=row.get("method_type"),
+            version=self._version(row),
+            formal_expressions=self._create_formal_expressions(
+                row["formal_expressions"]
+            ),
+            descriptions=self._create_descriptions(row["descriptions"]),
+            aliases=self._create_aliases(row["aliases"]),
+        )
+
     def set_ref_vendor_attributes(self):
-        vendor_attributes = self.vendor_attribute_service.get_all_concepts(
-            filter_by={
-                "uid": {
-                    "v": (
-                        {
-                            attribute.uid
-                            for form in self.odm_forms
-                            for item_group in form.item_groups
-                            if item_group.vendor
-                            for attribute in item_group.vendor.attributes
-                        }
-                        | {
-                            attribute.uid
-                            for item_group in self.odm_item_groups
-                            for item in item_group.items
-                            if item.vendor
-                            for attribute in item.vendor.attributes
-                        }
-                    ),
-                    "op": "eq",
+        vendor_attributes = self.repository.get_odm_vendor_attributes(
+            list(
+                {
+                    attribute.uid
+                    for form in self.odm_forms
+                    for item_group in form.item_groups
+                    if item_group.vendor
+                    for attribute in item_group.vendor.attributes
+                }
+                | {
+                    attribute.uid
+                    for item_group in self.odm_item_groups
+                    for item in item_group.items
+                    if item.vendor
+                    for attribute in item.vendor.attributes
                 }
-            },
-            only_specific_status=self.status,
-        ).items
+            ),
+            self.status,
+        )
 
         self.ref_odm_vendor_attributes = {
-            vendor_attribute.uid: {
-                "name": vendor_attribute.name,
-                "vendor_namespace": vars(vendor_attribute.vendor_namespace),
+            vendor_attribute["uid"]: {
+                "name": vendor_attribute["name"],
+                "vendor_namespace": vendor_attribute["vendor_namespace"],
             }
             for vendor_attribute in vendor_attributes
-            if vendor_attribute.vendor_namespace
+            if vendor_attribute["vendor_namespace"]
         }
 
     def set_vendor_elements(self):
-        vendor_elements = self.vendor_element_service.get_all_concepts(
-            filter_by={
-                "uid": {
-                    "v": (
-                        {
-                            element.uid
-                            for form in self.odm_forms
-                            for element in form.vendor_elements
-                        }
-                        | {
-                            element.uid
-                            for item_group in self.odm_item_groups
-                            for element in item_group.vendor_elements
-                        }
-                        | {
-                            element.uid
-                            for item in self.odm_items
-                            for element in item.vendor_elements
-                        }
-                    ),
-                    "op": "eq",
+        vendor_elements = self.repository.get_odm_vendor_elements(
+            list(
+                {
+                    element.uid
+                    for odm_element in self.odm_forms
+                    + self.odm_item_groups
+                    + self.odm_items
+                    for element in odm_element.vendor_elements
                 }
-            },
-            only_specific_status=self.status,
-        ).items
+            ),
+            self.status,
+        )
 
         self.odm_vendor_elements = {
-            vendor_element.uid: {
-                "name": vendor_element.name,
-                "vendor_namespace": vars(vendor_element.vendor_namespace),
+            vendor_element["uid"]: {
+                "name": vendor_element["name"],
+                "vendor_namespace": vendor_element["vendor_namespace"],
             }
             for vendor_element in vendor_elements
         }
 
     def set_vendor_namespaces(self):
-        vendor_namespaces = self.vendor_namespace_service.get_all_concepts(
-            only_specific_status=self.status
-        ).items
-
         self.odm_vendor_namespaces = {
-            vendor_namespace.uid: {
-                "name": vendor_namespace.name,
-                "prefix": vendor_namespace.prefix,
-                "url": vendor_namespace.url,
+            vendor_namespace["uid"]: {
+                "name": vendor_namespace["name"],
+                "prefix": vendor_namespace["prefix"],
+                "url": vendor_namespace["url"],
             }
-            for vendor_namespace in vendor_namespaces
+            for vendor_namespace in self.repository.get_odm_vendor_namespaces(
+                self.status
+            )
         }
 
-    def set_forms_of_target(self, target):
+    def set_forms(self, form_uids: list[str]):
         self.odm_forms = sorted(
-            self.form_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [form.uid for form in target.forms],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
+            [
+                self._create_form(row)
+                for row in self.repository.get_odm_forms(form_uids, self.status)
+            ],
             key=lambda elm: elm.name,
         )
 
@@ -231,111 +566,105 @@ class OdmDataExtractor:
 
     def set_item_groups_of_forms(self, forms: list[OdmForm]):
         self.odm_item_groups = sorted(
-            self.item_group_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [
+            [
+                self._create_item_group(row)
+                for row in self.repository.get_odm_item_groups(
+                    list(
+                        {
                             item_group.uid
                             for form in forms
                             for item_group in form.item_groups
-                        ],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
+                        }
+                    ),
+                    self.status,
+                )
+            ],
             key=lambda elm: elm.name,
         )
 
         self.set_items_of_item_groups(self.odm_item_groups)
 
     def set_items_of_item_groups(self, item_groups: list[OdmItemGroup]):
+        rows = self.repository.get_odm_items(
+            list({item.uid for item_group in item_groups for item in item_group.items}),
+            self.status,
+        )
         self.odm_items = sorted(
-            self.item_service.get_all_concepts(
-                filter_by={
-                    "uid": {
-                        "v": [
-                            item.uid
-                            for item_group in item_groups
-                            for item in item_group.items
-                        ],
-                        "op": "eq",
-                    }
-                },
-                only_specific_status=self.status,
-            ).items,
-            key=lambda elm: elm.name,
+            [self._create_item(row) for row in rows], key=lambda elm: elm.name
         )
 
-        self.set_unit_definitions_of_items(self.odm_items)
-        self.set_codelists_of_items(self.odm_items)
-        self.set_conditions(self.odm_forms, self.odm_item_groups)
+        self.set_codelists_and_unit_definitions_of_items(rows)
 
-    def set_conditions(self, forms, item_groups):
-        oids = [
+    def set_conditions(self, forms: list[OdmForm], item_groups: list[OdmItemGroup]):
+        oids = {
             item_group.collection_exception_condition_oid
             for form in forms
             for item_group in form.item_groups
-        ] + [
+        } | {
             item.collection_exception_condition_oid
             for item_group in item_groups
             for item in item_group.items
-        ]
-
-        if oids:
-            self.odm_conditions = sorted(
-                self.condition_service.get_all_concepts(
-                    filter_by={"oid": {"v": oids, "op": "eq"}},
-                    only_specific_status=self.status,
-                ).items,
-                key=lambda elm: elm.name,
-            )
+        }
+        oids.discard(None)
 
-    def set_methods(self, item_groups):
-        oids = [
+        self.odm_conditions = sorted(
+            [
+                self._create_condition(row)
+                for row in self.repository.get_odm_conditions(list(oids), self.status)
+            ],
+            key=lambda elm: elm.name,
+        )
+
+    def set_methods(self, item_groups: list[OdmItemGroup]):
+        oids = {
             item.method_oid for item_group in item_groups for item in item_group.items
-        ]
-
-        if oids:
-            self.odm_methods = sorted(
-                self.method_service.get_all_concepts(
-                    filter_by={"oid": {"v": oids, "op": "eq"}},
-                    only_specific_status=self.status,
-                ).items,
-                key=lambda elm: elm.name,
-            )
+        }
+        oids.discard(None)
 
-    def set_unit_definitions_of_items(self, items: list[OdmItem]):
-        self.unit_definitions = sorted(
-            self.unit_definition_service.get_all(
-                library_name=None,
-                filter_by={
-                    "uid": {
-                        "v": [
-                            unit_definition.uid
-                            for item in items
-                            for unit_definition in item.unit_definitions
-                        ],
-                        "op": "eq",
-                    }
-                },
-            ).items,
+        self.odm_methods = sorted(
+            [
+                self._create_method(row)
+                for row in self.repository.get_odm_methods(list(oids), self.status)
+            ],
             key=lambda elm: elm.name,
         )
 
-    def set_codelists_of_items(self, items: list[OdmItem]):
+    def set_codelists_and_unit_definitions_of_items(
+        self, item_rows: list[dict[str, Any]]
+    ):
+        """
+        Sets the codelists and unit definitions of the items, which are fetched together with the items,
+        and the terms of the codelists.
+        """
+        codelists = {}
+        unit_definitions = {}
+        for row in item_rows:
+            if row["codelist"]:
+                codelists[row["codelist"]["uid"]] = row["codelist"]
+            for unit_definition in row["unit_definitions"]:
+                unit_definitions[unit_definition["uid"]] = unit_definition
+
         self.codelists = sorted(
-            self.ct_codelist_attributes_service.get_all_ct_codelists(
-                catalogue_name=None,
-                library=None,
-                package=None,
-                filter_by={
-                    "codelist_uid": {
-                        "v": [item.codelist.uid for item in items if item.codelist],
-                        "op": "eq",
-                    }
-                },
-            ).items,
+            [
+                CTCodelistAttributes.model_construct(
+                    codelist_uid=codelist["uid"],
+                    name=codelist["name"],
+                    submission_value=codelist["submission_value"],
+                    version=_max_version(codelist["versions"]),
+                )
+                for codelist in codelists.values()
+            ],
+            key=lambda elm: elm.name,
+        )
+        self.unit_definitions = sorted(
+            [
+                UnitDefinitionModel.model_construct(
+                    uid=unit_definition["uid"],
+                    name=unit_definition["name"],
+                    version=_max_version(unit_definition["versions"]),
+                )
+                for unit_definition in unit_definitions.values()
+            ],
             key=lambda elm: elm.name,
         )
 
@@ -343,18 +672,25 @@ class OdmDataExtractor:
 
     def set_terms_of_codelists(self, codelists: list[CTCodelistAttributes]):
         self.ct_terms = sorted(
-            self.ct_term_attributes_service.get_term_name_and_attributes_by_codelist_uids(
+            self.repository.get_codelist_terms(
                 [codelist.codelist_uid for codelist in codelists]
             ),
             key=lambda elm: elm["nci_preferred_name"],
         )
 
-    def get_items_by_codelist_uid(self, codelist_uid: str):
-        return sorted(
-            [
-                item
-                for item in self.odm_items
-                if item.codelist and item.codelist.uid == codelist_uid
-            ],
-            key=lambda elm: elm.name,
-        )
+    def get_items_by_codelist_uid(self, codelist_uid: str) -> list[OdmItem]:
+        if self._items_by_codelist_uid is None:
+            self._items_by_codelist_uid = defaultdict(list)
+            for item in self.odm_items:
+                if item.codelist:
+                    self._items_by_codelist_uid[item.codelist.uid].append(item)
+
+        return self._items_by_codelist_uid.get(codelist_uid, [])
+
+    def get_terms_by_codelist_uid(self, codelist_uid: str) -> list[dict[str, str]]:
+        if self._terms_by_codelist_uid is None:
+            self._terms_by_codelist_uid = defaultdict(list)
+            for term in self.ct_terms:
+                self._terms_by_codelist_uid[term["codelist_uid"]].append(term)
+
+        return self._terms_by_codelist_uid.get(codelist_uid, [])
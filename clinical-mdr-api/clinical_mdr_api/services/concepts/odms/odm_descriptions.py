@@ -1,3 +1,5 @@
+from typing import Callable
+
 from fastapi import status
 from neomodel import db
 
@@ -35,7 +37,11 @@ class OdmDescriptionService(OdmGenericService[OdmDescriptionAR]):
         return OdmDescription.from_odm_description_ar(odm_description_ar=item_ar)
 
     def _create_aggregate_root(
-        self, concept_input: OdmDescriptionPostInput, library
+        self,
+        concept_input: OdmDescriptionPostInput,
+        library,
+        *,
+        generate_uid_callback: Callable[[], str | None] | None = None,
     ) -> OdmDescriptionAR:
         return OdmDescriptionAR.from_input_values(
             author_id=self.author_id,
@@ -47,7 +53,7 @@ class OdmDescriptionService(OdmGenericService[OdmDescriptionAR]):
                 sponsor_instruction=concept_input.sponsor_instruction,
             ),
             library=library,
-            generate_uid_callback=self.repository.generate_uid,
+            generate_uid_callback=generate_uid_callback or self.repository.generate_uid,
         )
 
     def _edit_aggregate(
@@ -1,3 +1,5 @@
+from typing import Callable
+
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.concepts.odms.formal_expression_repository import (
@@ -32,7 +34,11 @@ class OdmFormalExpressionService(OdmGenericService[OdmFormalExpressionAR]):
         )
 
     def _create_aggregate_root(
-        self, concept_input: OdmFormalExpressionPostInput, library
+        self,
+        concept_input: OdmFormalExpressionPostInput,
+        library,
+        *,
+        generate_uid_callback: Callable[[], str | None] | None = None,
     ) -> OdmFormalExpressionAR:
         return OdmFormalExpressionAR.from_input_values(
             author_id=self.author_id,
@@ -41,7 +47,7 @@ class OdmFormalExpressionService(OdmGenericService[OdmFormalExpressionAR]):
                 expression=concept_input.expression,
             ),
             library=library,
-            generate_uid_callback=self.repository.generate_uid,
+            generate_uid_callback=generate_uid_callback or self.repository.generate_uid,
             odm_object_exists_callback=self._repos.odm_formal_expression_repository.odm_object_exists,
         )
 
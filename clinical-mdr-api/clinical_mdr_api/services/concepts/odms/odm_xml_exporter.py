@@ -1,4 +1,6 @@
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from io import StringIO
 from time import time
 from typing import Any
 from xml.dom.minidom import Document
@@ -51,7 +53,10 @@ from clinical_mdr_api.services.concepts.odms.odm_data_extractor import OdmDataEx
 from clinical_mdr_api.services.concepts.odms.odm_xml_stylesheets import (
     OdmXmlStylesheetService,
 )
-from clinical_mdr_api.services.utils.odm_xml_mapper import map_xml
+from clinical_mdr_api.services.utils.odm_xml_mapper import (
+    apply_mapping_rules,
+    read_mapping_rules,
+)
 from common.exceptions import BusinessLogicException
 
 
@@ -65,6 +70,12 @@ class OdmXmlExporterService:
     stylesheet: str | None
 
     mapper_file: UploadFile | None = None
+    mapping_rules: list[dict[str, str]]
+
+    # Elements written as a start tag, their children one by one, and an end tag
+    STREAMED_ELEMENTS = (ODM, Study, BasicDefinitions, MetaDataVersion)
+    XML_INDENT = "\t"
+    XML_NEWLINE = "\n"
 
     XML_LANG = "xml:lang"
     OSB_VERSION = "osb:version"
@@ -100,6 +111,7 @@ class OdmXmlExporterService:
         """
         self.odm_data_extractor = OdmDataExtractor(target_uid, target_type, status.name)
         self.mapper_file = mapper_file
+        self.mapping_rules = read_mapping_rules(mapper_file)
         self.allowed_namespaces = allowed_namespaces
         self.used_vendor_namespaces = {}
         self.pdf = pdf
@@ -132,11 +144,7 @@ class OdmXmlExporterService:
         Raises:
             BusinessLogicException: If an error occurs while generating the PDF.
         """
-        doc = self._generate_odm_xml(self.odm, self.xml_document)
-
-        map_xml(self.xml_document, self.mapper_file)
-
-        rs = doc.toprettyxml(encoding="utf-8")
+        rs = b"".join(self.stream_odm_document())
 
         if self.pdf:
             try:
@@ -157,6 +165,129 @@ class OdmXmlExporterService:
 
         return rs
 
+    def stream_odm_document(self) -> Iterator[bytes]:
+        """
+        Streams the ODM XML document, with the mapper file applied to it, as UTF-8 encoded chunks.
+
+        The definitions are generated, mapped and written one at a time,
+        so the whole document is never held in memory.
+        The output is the same as the pretty-printed XML of the whole document.
+        The document can be streamed only once.
+
+        Yields:
+            bytes: The next chunk of the pretty-printed XML document.
+        """
+        writer = StringIO()
+        writer.write('<?xml version="1.0" encoding="utf-8"?>' + self.XML_NEWLINE)
+        for node in self.xml_document.childNodes:
+            node.writexml(writer, "", self.XML_INDENT, self.XML_NEWLINE)
+        yield self._encode(writer.getvalue())
+
+        yield from self._stream_odm_element(self.odm, [], 0)
+
+    def _stream_odm_element(
+        self, odm_element, ancestors: list, depth: int
+    ) -> Iterator[bytes]:
+        """
+        Streams an ODM element and its children.
+
+        The children of the elements in `STREAMED_ELEMENTS` are streamed one by one,
+        any other element is generated and written as a whole.
+        The mapping rules are applied to each element within a copy of its ancestors,
+        so that rules matching a parent element apply as they do to the whole document.
+
+        Args:
+            odm_element: The ODM element to stream.
+            ancestors (list[Element]): The XML elements of the ancestors of the ODM element, without their children.
+            depth (int): The depth of the ODM element in the document.
+
+        Yields:
+            bytes: The XML of the element.
+        """
+        indent = self.XML_INDENT * depth
+
+        if not isinstance(odm_element, self.STREAMED_ELEMENTS):
+            self.remove_none_attributes(odm_element)
+            xml_element = self._map_xml_element(
+                self._create_xml_element(odm_element), ancestors
+            )
+            writer = StringIO()
+            xml_element.writexml(writer, indent, self.XML_INDENT, self.XML_NEWLINE)
+            xml_element.unlink()
+            yield self._encode(writer.getvalue())
+            return
+
+        xml_element = self._create_xml_element(odm_element, with_children=False)
+        mapped_xml_element = self._map_xml_element(
+            xml_element.cloneNode(False), ancestors
+        )
+        writer = StringIO()
+        mapped_xml_element.cloneNode(False).writexml(
+            writer, indent, self.XML_INDENT, self.XML_NEWLINE
+        )
+        empty_element = writer.getvalue()
+        start_tag = empty_element.removesuffix("/>" + self.XML_NEWLINE) + ">"
+
+        has_children = False
+        for value in vars(odm_element).values():
+            if isinstance(value, Attribute | str):
+                continue
+            for child in value if isinstance(value, list | Iterator) else [value]:
+                for chunk in self._stream_odm_element(
+                    child, ancestors + [xml_element], depth + 1
+                ):
+                    if not has_children:
+                        has_children = True
+                        yield self._encode(start_tag + self.XML_NEWLINE)
+                    yield chunk
+
+        # Children added to the element by the mapping rules
+        if mapped_xml_element.childNodes:
+            writer = StringIO()
+            for node in mapped_xml_element.childNodes:
+                node.writexml(
+                    writer, indent + self.XML_INDENT, self.XML_INDENT, self.XML_NEWLINE
+                )
+            if not has_children:
+                has_children = True
+                yield self._encode(start_tag + self.XML_NEWLINE)
+            yield self._encode(writer.getvalue())
+
+        if has_children:
+            yield self._encode(
+                f"{indent}</{mapped_xml_element.tagName}>{self.XML_NEWLINE}"
+            )
+        else:
+            yield self._encode(empty_element)
+
+    def _map_xml_element(self, xml_element, ancestors: list):
+        """
+        Applies the mapping rules to an XML element placed within copies of its ancestors.
+
+        Args:
+            xml_element (Element): The XML element to map, modified in place.
+            ancestors (list[Element]): The XML elements of the ancestors, without their children.
+
+        Returns:
+            Element: The mapped XML element.
+        """
+        if not self.mapping_rules:
+            return xml_element
+
+        document = Document()
+        parent = document
+        for ancestor in ancestors:
+            parent = parent.appendChild(document.importNode(ancestor, False))
+        parent.appendChild(xml_element)
+
+        apply_mapping_rules(document, self.mapping_rules)
+
+        return xml_element
+
+    @staticmethod
+    def _encode(xml: str) -> bytes:
+        return xml.encode("utf-8", "xmlcharrefreplace")
+
     def _generate_odm_xml(self, odm_element, current_xml_element):
         """
         Generates an ODM XML document from an ODM element.
@@ -168,6 +299,21 @@ class OdmXmlExporterService:
         Returns:
             Document: The generated XML document.
         """
+        current_xml_element.appendChild(self._create_xml_element(odm_element))
+
+        return self.xml_document
+
+    def _create_xml_element(self, odm_element, with_children: bool = True):
+        """
+        Creates the XML element of an ODM element.
+
+        Args:
+            odm_element: The ODM element to create the XML element from.
+            with_children (bool): Whether to create the child elements and the inner text too.
+
+        Returns:
+            Element: The created XML element.
+        """
         if hasattr(odm_element, "_custom_element_name") and isinstance(
             odm_element._custom_element_name, str
         ):
@@ -193,21 +339,21 @@ class OdmXmlExporterService:
                     new_xml_element.setAttribute(
                         attribute_value.name, attribute_value.value
                     )
+            elif not with_children:
+                continue
             elif isinstance(attribute_value, str):
                 if attribute_name == "_custom_element_name":
                     continue
                 new_xml_element.appendChild(
                     self.xml_document.createTextNode(attribute_value)
                 )
-            elif isinstance(attribute_value, list):
+            elif isinstance(attribute_value, list | Iterator):
                 for odm_element_from_list in attribute_value:
                     self._generate_odm_xml(odm_element_from_list, new_xml_element)
             else:
                 self._generate_odm_xml(attribute_value, new_xml_element)
 
-        current_xml_element.appendChild(new_xml_element)
-
-        return self.xml_document
+        return new_xml_element
 
     def _get_vendor_attributes_or_empty_dict(
         self, elements: dict[str, Attribute] | Any
@@ -341,13 +487,8 @@ class OdmXmlExporterService:
         """
         rs = {}
         for attribute in attributes:
-            vendor_attribute = next(
-                (
-                    ref_odm_vendor_attribute
-                    for attr_uid, ref_odm_vendor_attribute in self.odm_data_extractor.ref_odm_vendor_attributes.items()
-                    if attribute.uid == attr_uid
-                ),
-                None,
+            vendor_attribute = self.odm_data_extractor.ref_odm_vendor_attributes.get(
+                attribute.uid
             )
             if vendor_attribute:
                 rs[vendor_attribute["name"]] = Attribute(
@@ -358,7 +499,7 @@ class OdmXmlExporterService:
 
     def _create_odm_object(self):
         def create_odm_form_def():
-            return [
+            return (
                 FormDef(
                     oid=Attribute("OID", form.oid),
                     name=Attribute("Name", form.name),
@@ -371,7 +512,7 @@ class OdmXmlExporterService:
                                 next(
                                     (
                                         description.instruction
-                                        for description in form.descriptions
+                                        for description in form.descriptions or []
                                         if description.language == ENG_LANGUAGE
                                         and description.instruction
                                     ),
@@ -383,7 +524,7 @@ class OdmXmlExporterService:
                                 next(
                                     (
                                         description.sponsor_instruction
-                                        for description in form.descriptions
+                                        for description in form.descriptions or []
                                         if description.language == ENG_LANGUAGE
                                         and description.sponsor_instruction
                                     ),
@@ -412,7 +553,7 @@ class OdmXmlExporterService:
                                     }
                                 ),
                             )
-                            for description in form.descriptions
+                            for description in form.descriptions or []
                             if description.description
                         ]
                     ),
@@ -449,10 +590,10 @@ class OdmXmlExporterService:
                     ],
                 )
                 for form in self.odm_data_extractor.odm_forms
-            ]
+            )
 
         def create_odm_item_group_def():
-            return [
+            return (
                 ItemGroupDef(
                     oid=Attribute("OID", item_group.oid),
                     name=Attribute("Name", item_group.name),
@@ -571,10 +712,10 @@ class OdmXmlExporterService:
                     ],
                 )
                 for item_group in self.odm_data_extractor.odm_item_groups
-            ]
+            )
 
         def create_odm_item_def():
-            return [
+            return (
                 ItemDef(
                     oid=Attribute("OID", item.oid),
                     name=Attribute("Name", item.name),
@@ -688,10 +829,10 @@ class OdmXmlExporterService:
                     ],
                 )
                 for item in self.odm_data_extractor.odm_items
-            ]
+            )
 
         def create_odm_condition_def():
-            return [
+            return (
                 ConditionDef(
                     oid=Attribute("OID", condition.oid),
                     name=Attribute("Name", condition.name),
@@ -746,10 +887,10 @@ class OdmXmlExporterService:
                     ),
                 )
                 for condition in self.odm_data_extractor.odm_conditions
-            ]
+            )
 
         def create_odm_method_def():
-            return [
+            return (
                 MethodDef(
                     oid=Attribute("OID", method.oid),
                     name=Attribute("Name", method.name),
@@ -805,15 +946,16 @@ class OdmXmlExporterService:
                     ),
                 )
                 for method in self.odm_data_extractor.odm_methods
-            ]
+            )
 
         def create_odm_codelist():
-            codelists = []
-
             for codelist in self.odm_data_extractor.codelists:
                 items = self.odm_data_extractor.get_items_by_codelist_uid(
                     codelist.codelist_uid
                 )
+                terms = self.odm_data_extractor.get_terms_by_codelist_uid(
+                    codelist.codelist_uid
+                )
 
                 for item in items:
                     terms_by_uid = {
@@ -826,114 +968,97 @@ class OdmXmlExporterService:
                         for term in item.terms
                     }
 
-                    codelists.append(
-                        CodeList(
-                            oid=Attribute(
-                                "OID", f"{codelist.submission_value}@{item.oid}"
-                            ),
-                            name=Attribute("Name", codelist.codelist_uid),
-                            datatype=Attribute("DataType", "string"),
-                            sas_format_name=Attribute(
-                                "SASFormatName", codelist.submission_value
-                            ),
-                            **self._get_vendor_attributes_or_empty_dict(
-                                {
-                                    "version": Attribute(
-                                        self.OSB_VERSION, codelist.version
+                    yield CodeList(
+                        oid=Attribute("OID", f"{codelist.submission_value}@{item.oid}"),
+                        name=Attribute("Name", codelist.codelist_uid),
+                        datatype=Attribute("DataType", "string"),
+                        sas_format_name=Attribute(
+                            "SASFormatName", codelist.submission_value
+                        ),
+                        **self._get_vendor_attributes_or_empty_dict(
+                            {"version": Attribute(self.OSB_VERSION, codelist.version)}
+                        ),
+                        codelist_items=[
+                            CodeListItem(
+                                coded_value=Attribute(
+                                    "CodedValue",
+                                    codelist_item["code_submission_value"],
+                                ),
+                                decode=Decode(
+                                    TranslatedText(
+                                        terms_by_uid.get(codelist_item["term_uid"]).get(
+                                            "display_text"
+                                        )
+                                        or codelist_item["nci_preferred_name"],
+                                        Attribute(
+                                            self.XML_LANG,
+                                            get_iso_lang_data(
+                                                query="eng", return_key="639-1"
+                                            ),
+                                        ),
                                     )
-                                }
-                            ),
-                            codelist_items=[
-                                CodeListItem(
-                                    coded_value=Attribute(
-                                        "CodedValue",
-                                        codelist_item["code_submission_value"],
+                                ),
+                                order_number=Attribute(
+                                    "OrderNumber",
+                                    terms_by_uid.get(codelist_item["term_uid"]).get(
+                                        "order"
                                     ),
-                                    decode=Decode(
-                                        TranslatedText(
+                                ),
+                                **self._get_vendor_attributes_or_empty_dict(
+                                    {
+                                        "name": Attribute(
+                                            "osb:name", codelist_item["name"]
+                                        ),
+                                        "OID": Attribute(
+                                            "osb:OID", codelist_item["term_uid"]
+                                        ),
+                                        "mandatory": Attribute(
+                                            "osb:mandatory",
                                             terms_by_uid.get(
                                                 codelist_item["term_uid"]
-                                            ).get("display_text")
-                                            or codelist_item["nci_preferred_name"],
-                                            Attribute(
-                                                self.XML_LANG,
-                                                get_iso_lang_data(
-                                                    query="eng", return_key="639-1"
-                                                ),
-                                            ),
-                                        )
-                                    ),
-                                    order_number=Attribute(
-                                        "OrderNumber",
-                                        terms_by_uid.get(codelist_item["term_uid"]).get(
-                                            "order"
+                                            ).get("mandatory"),
                                         ),
-                                    ),
-                                    **self._get_vendor_attributes_or_empty_dict(
-                                        {
-                                            "name": Attribute(
-                                                "osb:name", codelist_item["name"]
-                                            ),
-                                            "OID": Attribute(
-                                                "osb:OID", codelist_item["term_uid"]
-                                            ),
-                                            "mandatory": Attribute(
-                                                "osb:mandatory",
-                                                terms_by_uid.get(
-                                                    codelist_item["term_uid"]
-                                                ).get("mandatory"),
-                                            ),
-                                            "version": Attribute(
-                                                self.OSB_VERSION,
-                                                terms_by_uid.get(
-                                                    codelist_item["term_uid"]
-                                                ).get("version"),
-                                            ),
-                                        }
-                                    ),
-                                )
-                                for codelist_item in self.odm_data_extractor.ct_terms
-                                if codelist.codelist_uid
-                                == codelist_item["codelist_uid"]
-                                and codelist_item["term_uid"] in terms_by_uid
-                            ],
-                        )
+                                        "version": Attribute(
+                                            self.OSB_VERSION,
+                                            terms_by_uid.get(
+                                                codelist_item["term_uid"]
+                                            ).get("version"),
+                                        ),
+                                    }
+                                ),
+                            )
+                            for codelist_item in terms
+                            if codelist_item["term_uid"] in terms_by_uid
+                        ],
                     )
 
-            return codelists
-
         def create_odm_measurement_unit():
-            unit_definition_uids = []
-            unit_definitions = []
+            unit_definition_uids = set()
             for unit_definition in self.odm_data_extractor.unit_definitions:
                 if unit_definition.uid in unit_definition_uids:
                     continue
-                unit_definition_uids.append(unit_definition.uid)
-                unit_definitions.append(
-                    MeasurementUnit(
-                        oid=Attribute("OID", unit_definition.uid),
-                        name=Attribute("Name", unit_definition.name),
-                        symbol=Symbol(
-                            TranslatedText(
-                                unit_definition.name,
-                                lang=Attribute(
-                                    self.XML_LANG,
-                                    get_iso_lang_data(query="eng", return_key="639-1"),
-                                ),
+                unit_definition_uids.add(unit_definition.uid)
+                yield MeasurementUnit(
+                    oid=Attribute("OID", unit_definition.uid),
+                    name=Attribute("Name", unit_definition.name),
+                    symbol=Symbol(
+                        TranslatedText(
+                            unit_definition.name,
+                            lang=Attribute(
+                                self.XML_LANG,
+                                get_iso_lang_data(query="eng", return_key="639-1"),
+                            ),
+                        )
+                    ),
+                    **self._get_vendor_attributes_or_empty_dict(
+                        {
+                            "version": Attribute(
+                                self.OSB_VERSION, unit_definition.version
                             )
-                        ),
-                        **self._get_vendor_attributes_or_empty_dict(
-                            {
-                                "version": Attribute(
-                                    self.OSB_VERSION, unit_definition.version
-                                )
-                            }
-                        ),
-                    )
+                        }
+                    ),
                 )
 
-            return unit_definitions
-
         odm = ODM(
             odm_ns=Attribute("xmlns:odm", "http://www.cdisc.org/ns/odm/v1.3"),
             odm_version=Attribute("ODMVersion", "1.3.2"),
@@ -986,6 +1111,12 @@ class OdmXmlExporterService:
         return odm
 
     def remove_none_attributes(self, obj):
+        """
+        Removes the attributes without value of an ODM element and of its children.
+        The elements that are generated lazily are left as they are, they are cleaned when they are streamed.
+        """
+        if isinstance(obj, Iterator):
+            return
         if not isinstance(obj, list):
             for key, value in list(vars(obj).items()):
                 if isinstance(value, Attribute) and (value.value in [None, "None", ""]):
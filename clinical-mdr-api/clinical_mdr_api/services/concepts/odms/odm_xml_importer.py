@@ -1,6 +1,10 @@
 import re
+from collections import Counter
+from itertools import batched, chain, islice
 from time import time
-from xml.dom import minicompat, minidom
+from typing import Callable, Sequence
+from xml.dom import XML_NAMESPACE, XMLNS_NAMESPACE, minicompat, minidom
+from xml.etree import ElementTree
 
 from fastapi import UploadFile
 from neomodel import db
@@ -110,13 +114,145 @@ from clinical_mdr_api.services.concepts.unit_definitions.unit_definition import
 from clinical_mdr_api.services.controlled_terminologies.ct_term_attributes import (
     CTTermAttributesService,
 )
-from clinical_mdr_api.services.utils.odm_xml_mapper import map_xml
+from clinical_mdr_api.services.jobs import report_progress
+from clinical_mdr_api.services.utils.odm_xml_mapper import (
+    apply_mapping_rules,
+    map_xml,
+    read_mapping_rules,
+)
 from clinical_mdr_api.utils import normalize_string
 from common import exceptions
 from common.auth.user import user
+from common.config import ODM_XML_IMPORT_BATCH_SIZE, ODM_XML_IMPORT_PROGRESS_INTERVAL
 from common.utils import strtobool
 
 
+def _qualified_name(name: str, prefixes: dict[str, str]) -> tuple[str | None, str]:
+    if not name.startswith("{"):
+        return None, name
+    uri, local_name = name[1:].split("}", 1)
+    prefix = prefixes.get(uri)
+    return uri, f"{prefix}:{local_name}" if prefix else local_name
+
+
+def _to_minidom_element(
+    document: minidom.Document,
+    element: ElementTree.Element,
+    prefixes: dict[str, str],
+    namespaces: list[tuple[str, str]] | None = None,
+) -> minidom.Element:
+    node = document.createElementNS(*_qualified_name(element.tag, prefixes))
+    for prefix, uri in namespaces or []:
+        node.setAttributeNS(
+            XMLNS_NAMESPACE, f"xmlns:{prefix}" if prefix else "xmlns", uri
+        )
+    for name, value in element.attrib.items():
+        node.setAttributeNS(*_qualified_name(name, prefixes), value)
+    if element.text:
+        node.appendChild(document.createTextNode(element.text))
+    for child in element:
+        node.appendChild(_to_minidom_element(document, child, prefixes))
+        if child.tail:
+            node.appendChild(document.createTextNode(child.tail))
+    return node
+
+
+def iter_xml_elements(
+    xml_file: UploadFile,
+    tag_names: set[str],
+    mapping_rules: list[dict[str, str]],
+    tag_counts: Counter | None = None,
+):
+    """
+    Parses the XML file incrementally and yields its elements with one of the given tag names,
+    as minidom elements with their descendants and the mapping rules applied.
+
+    The root element is yielded when it starts, without its descendants.
+    Every other element is dropped as soon as it ends, so the memory doesn't grow with the size of the file.
+
+    Args:
+        xml_file (UploadFile): The XML file to parse.
+        tag_names (set[str]): The tag names of the elements to yield.
+        mapping_rules (list[dict[str, str]]): The mapping rules applied to each yielded element.
+        tag_counts (Counter | None): Counts the elements of each tag name when given.
+
+    Yields:
+        minidom.Element: The elements with one of the given tag names, in document order.
+    """
+    xml_file.file.seek(0)
+    document = minidom.Document()
+    prefixes = {XML_NAMESPACE: "xml"}
+    # Namespaces declared by the next element
+    namespaces: list[tuple[str, str]] = []
+    # Open elements with their tag name and declared namespaces, from the root
+    ancestors: list[tuple[ElementTree.Element, str, list[tuple[str, str]]]] = []
+    # Depth of the element being built to be yielded
+    yielded_depth = None
+
+    for event, item in ElementTree.iterparse(
+        xml_file.file, events=("start-ns", "start", "end")
+    ):
+        if event == "start-ns":
+            prefixes[item[1]] = item[0]
+            namespaces.append(item)
+        elif event == "start":
+            _, tag_name = _qualified_name(item.tag, prefixes)
+            ancestors.append((item, tag_name, namespaces))
+            if tag_counts is not None:
+                tag_counts[tag_name] += 1
+            if tag_name in tag_names and len(ancestors) == 1:
+                yield _to_minidom_element(document, item, prefixes, namespaces)
+            elif tag_name in tag_names and yielded_depth is None:
+                yielded_depth = len(ancestors)
+            namespaces = []
+        else:
+            if yielded_depth is not None and len(ancestors) > yielded_depth:
+                ancestors.pop()
+                continue
+
+            element, tag_name, element_namespaces = ancestors.pop()
+            if not ancestors:
+                break
+
+            if yielded_depth is not None:
+                yielded_depth = None
+                node = _to_minidom_element(
+                    document, element, prefixes, element_namespaces
+                )
+                apply_mapping_rules(node, mapping_rules)
+                yield node
+
+            # The earlier siblings are already dropped, so this is the last child
+            del ancestors[-1][0][-1]
+
+
+class StreamedElements:
+    """
+    Elements of an ODM XML file with a given tag name, parsed incrementally each time they are iterated.
+
+    Only the element being iterated is built, with its descendants and the mapping rules applied,
+    so the memory doesn't grow with the size of the file.
+    """
+
+    def __init__(
+        self,
+        xml_file: UploadFile,
+        tag_name: str,
+        mapping_rules: list[dict[str, str]],
+        count: int,
+    ):
+        self.xml_file = xml_file
+        self.tag_name = tag_name
+        self.mapping_rules = mapping_rules
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter_xml_elements(self.xml_file, {self.tag_name}, self.mapping_rules)
+
+
 class OdmXmlImporterService:
     _repos: MetaRepository
     odm_vendor_namespace_service: OdmVendorNamespaceService
@@ -134,14 +270,16 @@ class OdmXmlImporterService:
     unit_definition_service: UnitDefinitionService
     ct_term_attributes_service: CTTermAttributesService
 
-    xml_document: minidom.Document
-    form_defs: minicompat.NodeList
-    item_group_defs: minicompat.NodeList
-    item_defs: minicompat.NodeList
-    condition_defs: minicompat.NodeList
-    method_defs: minicompat.NodeList
-    codelists: minicompat.NodeList
-    measurement_units: minicompat.NodeList
+    xml_document: minidom.Document | None
+    form_defs: minicompat.NodeList | StreamedElements
+    item_group_defs: minicompat.NodeList | StreamedElements
+    item_defs: minicompat.NodeList | StreamedElements
+    condition_defs: minicompat.NodeList | StreamedElements
+    method_defs: minicompat.NodeList | StreamedElements
+    codelists: minicompat.NodeList | list[minidom.Element]
+    measurement_units: minicompat.NodeList | list[minidom.Element]
+    codelists_by_oid: dict[str, minidom.Element]
+    study_name: str | None
 
     namespace_prefixes: dict[str, str]
 
@@ -156,9 +294,14 @@ class OdmXmlImporterService:
     db_methods: list[OdmMethod]
     db_ct_term_attributes: list[CTTermAttributes]
     db_unit_definitions: list[UnitDefinitionModel]
+    db_item_uids_by_oid: dict[str, str]
+    db_item_group_uids_by_oid: dict[str, str]
+    alias_uids_by_key: dict[tuple[str, str], str]
+    formal_expression_uids_by_key: dict[tuple[str, str], str]
     measurement_unit_names_by_oid: dict[str, str]
 
     mapper_file: UploadFile | None = None
+    streaming: bool = False
 
     OSB_PREFIX = "osb"
     EXCLUDED_OSB_VENDOR_ATTRIBUTES = [
@@ -171,7 +314,21 @@ class OdmXmlImporterService:
     OSB_INSTRUCTION = f"{OSB_PREFIX}:instruction"
     OSB_SPONSOR_INSTRUCTION = f"{OSB_PREFIX}:sponsorInstruction"
 
-    def __init__(self, xml_file: UploadFile, mapper_file: UploadFile | None):
+    def __init__(
+        self,
+        xml_file: UploadFile,
+        mapper_file: UploadFile | None,
+        streaming: bool = False,
+    ):
+        """
+        Args:
+            xml_file (UploadFile): The ODM XML file to import.
+            mapper_file (UploadFile | None): The CSV file containing the mapping rules.
+            streaming (bool): Parse the XML file incrementally instead of loading the whole document.
+                A first pass keeps what the definitions refer to, i.e. the namespaces, measurement units and codelists.
+                The other definitions are parsed one at a time when they are created,
+                with the mapping rules applied to each of them.
+        """
         exceptions.BusinessLogicException.raise_if(
             xml_file.content_type not in ["application/xml", "text/xml"],
             msg="Only XML format is supported.",
@@ -204,14 +361,28 @@ class OdmXmlImporterService:
         self.db_methods = []
         self.db_ct_term_attributes = []
         self.db_unit_definitions = []
+        self.db_item_uids_by_oid = {}
+        self.db_item_group_uids_by_oid = {}
+        self.alias_uids_by_key = {}
+        self.formal_expression_uids_by_key = {}
+        self._libraries: dict[str, LibraryVO] = {}
 
         self.mapper_file = mapper_file
+        self.streaming = streaming
 
-        self.xml_document = minidom.parseString(xml_file.file.read())
+        if streaming:
+            self.xml_document = None
+            self._scan_xml_file(xml_file)
+        else:
+            self.xml_document = minidom.parseString(xml_file.file.read())
+
+            map_xml(self.xml_document, mapper_file)
 
-        map_xml(self.xml_document, mapper_file)
+            self._set_def_elements()
 
-        self._set_def_elements()
+        self.codelists_by_oid = {}
+        for codelist in self.codelists:
+            self.codelists_by_oid.setdefault(codelist.getAttribute("OID"), codelist)
 
     @db.transaction
     def store_odm_xml(self):
@@ -222,10 +393,14 @@ class OdmXmlImporterService:
         if not self.db_unit_definitions:
             self._set_unit_definitions()
         self._set_ct_term_attributes()
+        report_progress(0.1, "Creating methods and conditions")
         self._create_methods_with_relations()
         self._create_conditions_with_relations()
+        report_progress(0.2, "Creating items")
         self._create_items_with_relations()
+        report_progress(0.6, "Creating item groups")
         self._create_item_groups_with_relations()
+        report_progress(0.8, "Creating forms and study events")
         self._create_forms_with_relations()
         self._create_study_event_with_relations()
 
@@ -242,6 +417,9 @@ class OdmXmlImporterService:
         }
 
     def _set_def_elements(self):
+        self._set_namespace_prefixes(self.xml_document.getElementsByTagName("ODM")[0])
+        study_names = self.xml_document.getElementsByTagName("StudyName")
+        self.study_name = study_names[0].firstChild.nodeValue if study_names else None
         self.measurement_units = self.xml_document.getElementsByTagName(
             "MeasurementUnit"
         )
@@ -252,12 +430,61 @@ class OdmXmlImporterService:
         self.method_defs = self.xml_document.getElementsByTagName("MethodDef")
         self.codelists = self.xml_document.getElementsByTagName("CodeList")
 
-    def _set_vendor_namespaces(self):
-        odm_element = self.xml_document.getElementsByTagName("ODM")[0]
+    def _scan_xml_file(self, xml_file: UploadFile):
+        """
+        First pass of a streamed import.
+
+        Keeps the namespaces, the study name, the measurement units and the codelists referred to by the definitions,
+        and counts the other definitions which are parsed again when they are created.
+        """
+        mapping_rules = read_mapping_rules(self.mapper_file)
+        counts = Counter()
+        self.study_name = None
+        self.measurement_units = []
+        self.codelists = []
+
+        for element in iter_xml_elements(
+            xml_file,
+            {"ODM", "StudyName", "MeasurementUnit", "CodeList"},
+            mapping_rules,
+            counts,
+        ):
+            if element.tagName == "ODM":
+                self._set_namespace_prefixes(element)
+            elif element.tagName == "StudyName" and self.study_name is None:
+                self.study_name = element.firstChild.nodeValue
+            elif element.tagName == "MeasurementUnit":
+                self.measurement_units.append(element)
+            elif element.tagName == "CodeList":
+                self.codelists.append(element)
+
+        def streamed(tag_name: str):
+            return StreamedElements(xml_file, tag_name, mapping_rules, counts[tag_name])
+
+        self.form_defs = streamed("FormDef")
+        self.item_group_defs = streamed("ItemGroupDef")
+        self.item_defs = streamed("ItemDef")
+        self.condition_defs = streamed("ConditionDef")
+        self.method_defs = streamed("MethodDef")
+
+    def _set_namespace_prefixes(self, odm_element: minidom.Element):
         for attribute in odm_element.attributes.values():
             if attribute.prefix and attribute.localName != "odm":
                 self.namespace_prefixes[attribute.localName] = attribute.nodeValue
 
+    @staticmethod
+    def _report_progress(
+        def_name: str, created: int, total: int, start: float, end: float
+    ):
+        """Reports the progress between `start` and `end` every `ODM_XML_IMPORT_PROGRESS_INTERVAL` created definitions."""
+        if created % ODM_XML_IMPORT_PROGRESS_INTERVAL and created != total:
+            return
+        report_progress(
+            start + (end - start) * created / total,
+            f"Created {created} of {total} {def_name}s",
+        )
+
+    def _set_vendor_namespaces(self):
         rs, _ = self._repos.odm_vendor_namespace_repository.find_all(
             filter_by={
                 "prefix": {"v": list(self.namespace_prefixes.keys()), "op": "eq"}
@@ -752,254 +979,299 @@ class OdmXmlImporterService:
             for ct_codelist_ar in rs.items
         ]
 
-    def _create_formal_expressions(self, target):
-        new_formal_expressions = []
-        for formal_expression in target.getElementsByTagName("FormalExpression"):
-            rs = self._create(
-                self._repos.odm_formal_expression_repository,
-                self.odm_formal_expression_service,
-                new_formal_expressions,
-                OdmFormalExpressionPostInput(
-                    context=formal_expression.getAttribute("Context"),
-                    expression=formal_expression.firstChild.nodeValue,
-                ),
-            )
-
-            self._approve(
+    def _create_formal_expressions(
+        self, def_elements: Sequence[minidom.Element]
+    ) -> list[list[str]]:
+        """
+        Creates the formal expressions of the given definitions with one write,
+        and returns the UIDs of the formal expressions of each definition.
+
+        The formal expressions which already exist get a new version.
+        """
+        keys = [
+            [
+                (
+                    formal_expression.getAttribute("Context"),
+                    formal_expression.firstChild.nodeValue,
+                )
+                for formal_expression in def_element.getElementsByTagName(
+                    "FormalExpression"
+                )
+            ]
+            for def_element in def_elements
+        ]
+        missing = [
+            key
+            for key in dict.fromkeys(chain.from_iterable(keys))
+            if key not in self.formal_expression_uids_by_key
+        ]
+        uids = self._create_batch(
+            self._repos.odm_formal_expression_repository,
+            self.odm_formal_expression_service,
+            [
+                OdmFormalExpressionPostInput(context=context, expression=expression)
+                for context, expression in missing
+            ],
+            on_existing=lambda uid: self._approve_new_version(
                 self._repos.odm_formal_expression_repository,
                 self.odm_formal_expression_service,
-                rs,
-            )
+                uid,
+            ),
+        )
+        self.formal_expression_uids_by_key.update(zip(missing, uids))
 
-        return new_formal_expressions
+        return [
+            [self.formal_expression_uids_by_key[key] for key in def_keys]
+            for def_keys in keys
+        ]
 
     def _create_conditions_with_relations(self):
-        for condition_def in self.condition_defs:
-            descriptions = self._extract_descriptions(condition_def)
-
-            rs = self._create(
-                self._repos.odm_condition_repository,
-                self.odm_condition_service,
-                self.db_conditions,
-                OdmConditionPostInput(
-                    oid=condition_def.getAttribute("OID"),
-                    name=condition_def.getAttribute("Name"),
-                    formal_expressions=[
-                        formal_expression.uid
-                        for formal_expression in self._create_formal_expressions(
-                            condition_def
-                        )
-                    ],
-                    descriptions=[
-                        self._create_description(
-                            name=description["name"],
-                            lang=description["lang"],
-                            description=description["description"],
-                        ).uid
-                        for description in descriptions
-                    ],
-                    alias_uids=[
-                        self._create_alias(
-                            name=alias_element.getAttribute("Name"),
-                            context=alias_element.getAttribute("Context"),
-                        ).uid
-                        for alias_element in condition_def.getElementsByTagName("Alias")
-                    ],
-                ),
-            )
-            self._approve(
-                self._repos.odm_condition_repository, self.odm_condition_service, rs
+        created = 0
+        for condition_defs in batched(self.condition_defs, ODM_XML_IMPORT_BATCH_SIZE):
+            formal_expression_uids = self._create_formal_expressions(condition_defs)
+            descriptions_and_aliases = self._create_descriptions_and_aliases(
+                condition_defs
             )
 
-    def _create_methods_with_relations(self):
-        for method_def in self.method_defs:
-            descriptions = self._extract_descriptions(method_def)
+            for (
+                condition_def,
+                formal_expressions,
+                (description_uids, alias_uids),
+            ) in zip(condition_defs, formal_expression_uids, descriptions_and_aliases):
+                rs = self._create(
+                    self._repos.odm_condition_repository,
+                    self.odm_condition_service,
+                    self.db_conditions,
+                    OdmConditionPostInput(
+                        oid=condition_def.getAttribute("OID"),
+                        name=condition_def.getAttribute("Name"),
+                        formal_expressions=formal_expressions,
+                        descriptions=description_uids,
+                        alias_uids=alias_uids,
+                    ),
+                )
+                self._approve(
+                    self._repos.odm_condition_repository, self.odm_condition_service, rs
+                )
+                created += 1
+                self._report_progress(
+                    "ConditionDef", created, len(self.condition_defs), 0.15, 0.2
+                )
 
-            rs = self._create(
-                self._repos.odm_method_repository,
-                self.odm_method_service,
-                self.db_methods,
-                OdmMethodPostInput(
-                    oid=method_def.getAttribute("OID"),
-                    name=method_def.getAttribute("Name"),
-                    method_type=method_def.getAttribute("Name"),
-                    formal_expressions=[
-                        formal_expression.uid
-                        for formal_expression in self._create_formal_expressions(
-                            method_def
-                        )
-                    ],
-                    descriptions=[
-                        self._create_description(
-                            name=description["name"],
-                            lang=description["lang"],
-                            description=description["description"],
-                        ).uid
-                        for description in descriptions
-                    ],
-                    alias_uids=[
-                        self._create_alias(
-                            name=alias_element.getAttribute("Name"),
-                            context=alias_element.getAttribute("Context"),
-                        ).uid
-                        for alias_element in method_def.getElementsByTagName("Alias")
-                    ],
-                ),
-            )
-            self._approve(
-                self._repos.odm_method_repository, self.odm_method_service, rs
+    def _create_methods_with_relations(self):
+        created = 0
+        for method_defs in batched(self.method_defs, ODM_XML_IMPORT_BATCH_SIZE):
+            formal_expression_uids = self._create_formal_expressions(method_defs)
+            descriptions_and_aliases = self._create_descriptions_and_aliases(
+                method_defs
             )
 
-    def _create_items_with_relations(self):
-        for item_def in self.item_defs:
-            self._create_missing_vendors(item_def)
+            for method_def, formal_expressions, (description_uids, alias_uids) in zip(
+                method_defs, formal_expression_uids, descriptions_and_aliases
+            ):
+                rs = self._create(
+                    self._repos.odm_method_repository,
+                    self.odm_method_service,
+                    self.db_methods,
+                    OdmMethodPostInput(
+                        oid=method_def.getAttribute("OID"),
+                        name=method_def.getAttribute("Name"),
+                        method_type=method_def.getAttribute("Name"),
+                        formal_expressions=formal_expressions,
+                        descriptions=description_uids,
+                        alias_uids=alias_uids,
+                    ),
+                )
+                self._approve(
+                    self._repos.odm_method_repository, self.odm_method_service, rs
+                )
+                created += 1
+                self._report_progress(
+                    "MethodDef", created, len(self.method_defs), 0.1, 0.15
+                )
 
-            (
-                odm_item_post_input,
-                terms,
-                unit_definitions,
-            ) = self._get_odm_item_post_input(item_def)
+    def _create_items_with_relations(self):
+        created = 0
+        for item_defs in batched(self.item_defs, ODM_XML_IMPORT_BATCH_SIZE):
+            for item_def, (description_uids, alias_uids) in zip(
+                item_defs, self._create_descriptions_and_aliases(item_defs)
+            ):
+                created += 1
+                self._create_item_with_relations(item_def, description_uids, alias_uids)
+                self._report_progress("ItemDef", created, len(self.item_defs), 0.2, 0.6)
 
-            rs = self._create(
-                self._repos.odm_item_repository,
-                self.odm_item_service,
-                self.db_items,
-                odm_item_post_input,
-            )
+    def _create_item_with_relations(
+        self,
+        item_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
+        self._create_missing_vendors(item_def)
 
-            if terms:
-                self.odm_item_service._manage_terms(rs.uid, terms)
-            self.odm_item_service._manage_unit_definitions(rs.uid, unit_definitions)
+        (
+            odm_item_post_input,
+            terms,
+            unit_definitions,
+        ) = self._get_odm_item_post_input(item_def, description_uids, alias_uids)
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                item_def,
-                self._repos.odm_item_repository,
-                VendorAttributeCompatibleType.ITEM_DEF,
-                VendorElementCompatibleType.ITEM_DEF,
-            )
-            self._approve(self._repos.odm_item_repository, self.odm_item_service, rs)
+        rs = self._create(
+            self._repos.odm_item_repository,
+            self.odm_item_service,
+            self.db_items,
+            odm_item_post_input,
+        )
+        self.db_item_uids_by_oid.setdefault(rs.oid, rs.uid)
+
+        if terms:
+            self.odm_item_service._manage_terms(rs.uid, terms)
+        self.odm_item_service._manage_unit_definitions(rs.uid, unit_definitions)
+
+        self._create_relationships_with_vendors(
+            rs.uid,
+            item_def,
+            self._repos.odm_item_repository,
+            VendorAttributeCompatibleType.ITEM_DEF,
+            VendorElementCompatibleType.ITEM_DEF,
+        )
+        self._approve(self._repos.odm_item_repository, self.odm_item_service, rs)
 
     def _create_item_groups_with_relations(self):
-        for item_group_def in self.item_group_defs:
-            self._create_missing_vendors(item_group_def)
-
-            rs = self._create(
-                self._repos.odm_item_group_repository,
-                self.odm_item_group_service,
-                self.db_item_groups,
-                self._get_odm_item_group_post_input(item_group_def),
-            )
+        created = 0
+        for item_group_defs in batched(self.item_group_defs, ODM_XML_IMPORT_BATCH_SIZE):
+            for item_group_def, (description_uids, alias_uids) in zip(
+                item_group_defs, self._create_descriptions_and_aliases(item_group_defs)
+            ):
+                created += 1
+                self._create_item_group_with_relations(
+                    item_group_def, description_uids, alias_uids
+                )
+                self._report_progress(
+                    "ItemGroupDef", created, len(self.item_group_defs), 0.6, 0.8
+                )
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                item_group_def,
-                self._repos.odm_item_group_repository,
-                VendorAttributeCompatibleType.ITEM_GROUP_DEF,
-                VendorElementCompatibleType.ITEM_GROUP_DEF,
-            )
+    def _create_item_group_with_relations(
+        self,
+        item_group_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
+        self._create_missing_vendors(item_group_def)
 
-            odm_item_group_items: list[OdmItemGroupItemPostInput] = []
-            for item_ref in item_group_def.getElementsByTagName("ItemRef"):
-                self._create_missing_vendor_attributes(item_ref.attributes.values())
+        rs = self._create(
+            self._repos.odm_item_group_repository,
+            self.odm_item_group_service,
+            self.db_item_groups,
+            self._get_odm_item_group_post_input(
+                item_group_def, description_uids, alias_uids
+            ),
+        )
+        self.db_item_group_uids_by_oid.setdefault(rs.oid, rs.uid)
+
+        self._create_relationships_with_vendors(
+            rs.uid,
+            item_group_def,
+            self._repos.odm_item_group_repository,
+            VendorAttributeCompatibleType.ITEM_GROUP_DEF,
+            VendorElementCompatibleType.ITEM_GROUP_DEF,
+        )
 
-                odm_item_group_items.append(
-                    OdmItemGroupItemPostInput(
-                        uid=next(
-                            (
-                                db_item.uid
-                                for db_item in self.db_items
-                                if db_item.oid == item_ref.getAttribute("ItemOID")
-                            ),
-                            None,
-                        ),
-                        order_number=item_ref.getAttribute("OrderNumber"),
-                        mandatory=item_ref.getAttribute("Mandatory"),
-                        key_sequence="None",
-                        method_oid=item_ref.getAttribute("MethodOID") or None,
-                        imputation_method_oid="None",
-                        role="None",
-                        role_codelist_oid="None",
-                        collection_exception_condition_oid=item_ref.getAttribute(
-                            "CollectionExceptionConditionOID"
-                        ),
-                        vendor=OdmRefVendorPostInput(
-                            attributes=self._get_list_of_attributes(
-                                item_ref.attributes.items()
-                            )
-                        ),
-                    )
+        odm_item_group_items: list[OdmItemGroupItemPostInput] = []
+        for item_ref in item_group_def.getElementsByTagName("ItemRef"):
+            self._create_missing_vendor_attributes(item_ref.attributes.values())
+
+            odm_item_group_items.append(
+                OdmItemGroupItemPostInput(
+                    uid=self.db_item_uids_by_oid.get(item_ref.getAttribute("ItemOID")),
+                    order_number=item_ref.getAttribute("OrderNumber"),
+                    mandatory=item_ref.getAttribute("Mandatory"),
+                    key_sequence="None",
+                    method_oid=item_ref.getAttribute("MethodOID") or None,
+                    imputation_method_oid="None",
+                    role="None",
+                    role_codelist_oid="None",
+                    collection_exception_condition_oid=item_ref.getAttribute(
+                        "CollectionExceptionConditionOID"
+                    ),
+                    vendor=OdmRefVendorPostInput(
+                        attributes=self._get_list_of_attributes(
+                            item_ref.attributes.items()
+                        )
+                    ),
                 )
-
-            self.odm_item_group_service.non_transactional_add_items(
-                rs.uid, odm_item_group_items
             )
 
-            self._approve(
-                self._repos.odm_item_group_repository, self.odm_item_group_service, rs
-            )
+        self.odm_item_group_service.non_transactional_add_items(
+            rs.uid, odm_item_group_items
+        )
+
+        self._approve(
+            self._repos.odm_item_group_repository, self.odm_item_group_service, rs
+        )
 
     def _create_forms_with_relations(self):
-        for form_def in self.form_defs:
-            self._create_missing_vendors(form_def)
+        created = 0
+        for form_defs in batched(self.form_defs, ODM_XML_IMPORT_BATCH_SIZE):
+            for form_def, (description_uids, alias_uids) in zip(
+                form_defs, self._create_descriptions_and_aliases(form_defs)
+            ):
+                created += 1
+                self._create_form_with_relations(form_def, description_uids, alias_uids)
+                self._report_progress(
+                    "FormDef", created, len(self.form_defs), 0.8, 0.95
+                )
 
-            rs = self._create(
-                self._repos.odm_form_repository,
-                self.odm_form_service,
-                self.db_forms,
-                self._get_odm_form_post_input(form_def),
-            )
+    def _create_form_with_relations(
+        self,
+        form_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
+        self._create_missing_vendors(form_def)
 
-            self._create_relationships_with_vendors(
-                rs.uid,
-                form_def,
-                self._repos.odm_form_repository,
-                VendorAttributeCompatibleType.FORM_DEF,
-                VendorElementCompatibleType.FORM_DEF,
-            )
-            odm_form_item_groups: list[OdmFormItemGroupPostInput] = []
-            for item_group_ref in form_def.getElementsByTagName("ItemGroupRef"):
-                self._create_missing_vendor_attributes(
-                    item_group_ref.attributes.values()
-                )
+        rs = self._create(
+            self._repos.odm_form_repository,
+            self.odm_form_service,
+            self.db_forms,
+            self._get_odm_form_post_input(form_def, description_uids, alias_uids),
+        )
 
-                odm_form_item_groups.append(
-                    OdmFormItemGroupPostInput(
-                        uid=next(
-                            (
-                                db_item_group.uid
-                                for db_item_group in self.db_item_groups
-                                if db_item_group.oid
-                                == item_group_ref.getAttribute("ItemGroupOID")
-                            ),
-                            None,
-                        ),
-                        order_number=item_group_ref.getAttribute("OrderNumber"),
-                        mandatory=item_group_ref.getAttribute("Mandatory"),
-                        collection_exception_condition_oid=item_group_ref.getAttribute(
-                            "CollectionExceptionConditionOID"
-                        ),
-                        vendor=OdmRefVendorPostInput(
-                            attributes=self._get_list_of_attributes(
-                                item_group_ref.attributes.items()
-                            )
-                        ),
-                    )
+        self._create_relationships_with_vendors(
+            rs.uid,
+            form_def,
+            self._repos.odm_form_repository,
+            VendorAttributeCompatibleType.FORM_DEF,
+            VendorElementCompatibleType.FORM_DEF,
+        )
+        odm_form_item_groups: list[OdmFormItemGroupPostInput] = []
+        for item_group_ref in form_def.getElementsByTagName("ItemGroupRef"):
+            self._create_missing_vendor_attributes(item_group_ref.attributes.values())
+
+            odm_form_item_groups.append(
+                OdmFormItemGroupPostInput(
+                    uid=self.db_item_group_uids_by_oid.get(
+                        item_group_ref.getAttribute("ItemGroupOID")
+                    ),
+                    order_number=item_group_ref.getAttribute("OrderNumber"),
+                    mandatory=item_group_ref.getAttribute("Mandatory"),
+                    collection_exception_condition_oid=item_group_ref.getAttribute(
+                        "CollectionExceptionConditionOID"
+                    ),
+                    vendor=OdmRefVendorPostInput(
+                        attributes=self._get_list_of_attributes(
+                            item_group_ref.attributes.items()
+                        )
+                    ),
                 )
-
-            self.odm_form_service.non_transactional_add_item_groups(
-                rs.uid, odm_form_item_groups
             )
 
-            self._approve(self._repos.odm_form_repository, self.odm_form_service, rs)
+        self.odm_form_service.non_transactional_add_item_groups(
+            rs.uid, odm_form_item_groups
+        )
+
+        self._approve(self._repos.odm_form_repository, self.odm_form_service, rs)
 
     def _create_study_event_with_relations(self):
-        if self.xml_document.getElementsByTagName("StudyName"):
-            study_name = self.xml_document.getElementsByTagName("StudyName")[
-                0
-            ].firstChild.nodeValue
-        else:
-            study_name = f"@{int(time() * 1_000)}"
+        study_name = self.study_name or f"@{int(time() * 1_000)}"
 
         rs = self._create(
             self._repos.odm_study_event_repository,
@@ -1036,40 +1308,93 @@ class OdmXmlImporterService:
             self._repos.odm_study_event_repository, self.odm_study_event_service, rs
         )
 
-    def _create_alias(self, name: str, context: str):
-        concept_input = OdmAliasPostInput(name=name, context=context)
+    def _create_descriptions_and_aliases(
+        self, def_elements: Sequence[minidom.Element]
+    ) -> list[tuple[list[str], list[str]]]:
+        """
+        Creates the descriptions and aliases of the given definitions with one write of each kind,
+        and returns the UIDs of the descriptions and aliases of each definition.
+
+        The aliases are shared by all definitions, the ones which already exist are not created again.
+        """
+        description_inputs = [
+            self._get_description_inputs(def_element) for def_element in def_elements
+        ]
+        description_uids = iter(
+            self._create_batch(
+                self._repos.odm_description_repository,
+                self.odm_description_service,
+                list(chain.from_iterable(description_inputs)),
+            )
+        )
 
-        library_vo = self._get_library(concept_input)
+        alias_keys = [
+            [
+                (
+                    alias_element.getAttribute("Name"),
+                    alias_element.getAttribute("Context"),
+                )
+                for alias_element in self._get_alias_elements(def_element)
+            ]
+            for def_element in def_elements
+        ]
+        missing = [
+            key
+            for key in dict.fromkeys(chain.from_iterable(alias_keys))
+            if key not in self.alias_uids_by_key
+        ]
+        uids = self._create_batch(
+            self._repos.odm_alias_repository,
+            self.odm_alias_service,
+            [
+                OdmAliasPostInput(name=name, context=context)
+                for name, context in missing
+            ],
+        )
+        self.alias_uids_by_key.update(zip(missing, uids))
 
-        try:
-            concept_ar = self.odm_alias_service._create_aggregate_root(
-                concept_input=concept_input, library=library_vo
-            )
-            self._repos.odm_alias_repository.save(concept_ar)
-            self._approve(
-                self._repos.odm_alias_repository,
-                self.odm_alias_service,
-                concept_ar,
+        return [
+            (
+                list(islice(description_uids, len(inputs))),
+                [self.alias_uids_by_key[key] for key in keys],
             )
-        except exceptions.AlreadyExistsException as e:
-            uid = re.search(r" already exists with UID \((.*)\) and data {", e.msg)
-            if uid:
-                concept_ar = self._repos.odm_alias_repository.find_by_uid_2(uid=uid[1])
-            else:
-                raise
+            for inputs, keys in zip(description_inputs, alias_keys)
+        ]
 
-        return self.odm_alias_service._transform_aggregate_root_to_pydantic_model(
-            concept_ar
-        )
+    def _get_alias_elements(self, def_element: minidom.Element):
+        return def_element.getElementsByTagName("Alias")
 
-    def _create_description(
+    def _get_description_inputs(
+        self, def_element: minidom.Element
+    ) -> list[OdmDescriptionPostInput]:
+        with_instructions = def_element.tagName not in {"ConditionDef", "MethodDef"}
+        return [
+            self._get_description_input(
+                name=description["name"],
+                lang=description["lang"],
+                description=description["description"],
+                instruction=(
+                    def_element.getAttribute(self.OSB_INSTRUCTION)
+                    if with_instructions
+                    else None
+                ),
+                sponsor_instruction=(
+                    def_element.getAttribute(self.OSB_SPONSOR_INSTRUCTION)
+                    if with_instructions
+                    else None
+                ),
+            )
+            for description in self._extract_descriptions(def_element)
+        ]
+
+    def _get_description_input(
         self,
         name: str | minidom.Text,
         lang: str = ENG_LANGUAGE,
         description: str | None = None,
         instruction: str | None = None,
         sponsor_instruction: str | None = None,
-    ):
+    ) -> OdmDescriptionPostInput:
         if isinstance(name, minidom.Text):
             name = name.nodeValue
 
@@ -1082,7 +1407,7 @@ class OdmXmlImporterService:
         if not sponsor_instruction:
             sponsor_instruction = "Please update this sponsor instruction"
 
-        concept_input = OdmDescriptionPostInput(
+        return OdmDescriptionPostInput(
             name=name,
             language=lang,
             description=description,
@@ -1090,17 +1415,6 @@ class OdmXmlImporterService:
             sponsor_instruction=sponsor_instruction if lang == ENG_LANGUAGE else None,
         )
 
-        library_vo = self._get_library(concept_input)
-
-        concept_ar = self.odm_description_service._create_aggregate_root(
-            concept_input=concept_input, library=library_vo
-        )
-        self._repos.odm_description_repository.save(concept_ar)
-
-        return self.odm_description_service._transform_aggregate_root_to_pydantic_model(
-            concept_ar
-        )
-
     def _extract_descriptions(self, elm):
         description_element = elm.getElementsByTagName("Description")
         question_element = elm.getElementsByTagName("Question")
@@ -1339,6 +1653,10 @@ class OdmXmlImporterService:
         ]
 
     def _get_library(self, concept_input):
+        # Looked up once per import, the concepts are all created in the same libraries
+        if concept_input.library_name in self._libraries:
+            return self._libraries[concept_input.library_name]
+
         exceptions.BusinessLogicException.raise_if_not(
             self._repos.library_repository.library_exists(
                 normalize_string(concept_input.library_name)
@@ -1346,28 +1664,22 @@ class OdmXmlImporterService:
             msg=f"Library with Name '{concept_input.library_name}' doesn't exist.",
         )
 
-        return LibraryVO.from_input_values_2(
+        library_vo = LibraryVO.from_input_values_2(
             library_name=concept_input.library_name,
             is_library_editable_callback=is_library_editable,
         )
+        self._libraries[concept_input.library_name] = library_vo
+        return library_vo
 
-    def _get_odm_item_post_input(self, item_def):
-        descriptions = self._extract_descriptions(item_def)
-
+    def _get_odm_item_post_input(
+        self,
+        item_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         item_unit_definitions = self._get_item_unit_definition_inputs(item_def)
 
-        codelist = next(
-            (
-                codelist
-                for codelist in self.codelists
-                if item_def.getElementsByTagName("CodeListRef")
-                and codelist.getAttribute("OID")
-                == item_def.getElementsByTagName("CodeListRef")[0].getAttribute(
-                    "CodeListOID"
-                )
-            ),
-            None,
-        )
+        codelist = self._get_codelist(item_def)
 
         input_terms = []
         if codelist:
@@ -1397,25 +1709,8 @@ class OdmXmlImporterService:
                 sas_field_name=item_def.getAttribute("SASFieldName"),
                 sds_var_name=item_def.getAttribute("SDSVarName"),
                 origin=item_def.getAttribute("Origin"),
-                descriptions=[
-                    self._create_description(
-                        name=description["name"],
-                        lang=description["lang"],
-                        description=description["description"],
-                        instruction=item_def.getAttribute(self.OSB_INSTRUCTION),
-                        sponsor_instruction=item_def.getAttribute(
-                            self.OSB_SPONSOR_INSTRUCTION
-                        ),
-                    ).uid
-                    for description in descriptions
-                ],
-                alias_uids=[
-                    self._create_alias(
-                        name=alias_element.getAttribute("Name"),
-                        context=alias_element.getAttribute("Context"),
-                    ).uid
-                    for alias_element in item_def.getElementsByTagName("Alias")
-                ],
+                descriptions=description_uids,
+                alias_uids=alias_uids,
                 unit_definitions=item_unit_definitions,
                 codelist_uid=codelist.getAttribute("Name") if codelist else None,
                 terms=input_terms,
@@ -1424,9 +1719,12 @@ class OdmXmlImporterService:
             item_unit_definitions,
         )
 
-    def _get_odm_item_group_post_input(self, item_group_def):
-        descriptions = self._extract_descriptions(item_group_def)
-
+    def _get_odm_item_group_post_input(
+        self,
+        item_group_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         return OdmItemGroupPostInput(
             oid=item_group_def.getAttribute("OID"),
             name=item_group_def.getAttribute("Name"),
@@ -1435,25 +1733,8 @@ class OdmXmlImporterService:
             is_reference_data="no",  # missing in odm
             purpose=item_group_def.getAttribute("Purpose"),
             sas_dataset_name=item_group_def.getAttribute("SASDatasetName"),
-            descriptions=[
-                self._create_description(
-                    name=description["name"],
-                    lang=description["lang"],
-                    description=description["description"],
-                    instruction=item_group_def.getAttribute(self.OSB_INSTRUCTION),
-                    sponsor_instruction=item_group_def.getAttribute(
-                        self.OSB_SPONSOR_INSTRUCTION
-                    ),
-                ).uid
-                for description in descriptions
-            ],
-            alias_uids=[
-                self._create_alias(
-                    name=alias_element.getAttribute("Name"),
-                    context=alias_element.getAttribute("Context"),
-                ).uid
-                for alias_element in item_group_def.getElementsByTagName("Alias")
-            ],
+            descriptions=description_uids,
+            alias_uids=alias_uids,
             sdtm_domain_uids=[
                 db_ct_term_attribute.term_uid
                 for db_ct_term_attribute in self.db_ct_term_attributes
@@ -1463,35 +1744,27 @@ class OdmXmlImporterService:
             ],
         )
 
-    def _get_odm_form_post_input(self, form_def):
-        descriptions = self._extract_descriptions(form_def)
-
+    def _get_odm_form_post_input(
+        self,
+        form_def: minidom.Element,
+        description_uids: list[str],
+        alias_uids: list[str],
+    ):
         return OdmFormPostInput(
             oid=form_def.getAttribute("OID"),
             name=form_def.getAttribute("Name"),
             sdtm_version="",
             repeating=form_def.getAttribute("Repeating"),
-            descriptions=[
-                self._create_description(
-                    name=description["name"],
-                    lang=description["lang"],
-                    description=description["description"],
-                    instruction=form_def.getAttribute(self.OSB_INSTRUCTION),
-                    sponsor_instruction=form_def.getAttribute(
-                        self.OSB_SPONSOR_INSTRUCTION
-                    ),
-                ).uid
-                for description in descriptions
-            ],
-            alias_uids=[
-                self._create_alias(
-                    name=alias_element.getAttribute("Name"),
-                    context=alias_element.getAttribute("Context"),
-                ).uid
-                for alias_element in form_def.getElementsByTagName("Alias")
-            ],
+            descriptions=description_uids,
+            alias_uids=alias_uids,
         )
 
+    def _get_codelist(self, item_def):
+        codelist_refs = item_def.getElementsByTagName("CodeListRef")
+        if not codelist_refs:
+            return None
+        return self.codelists_by_oid.get(codelist_refs[0].getAttribute("CodeListOID"))
+
     def _get_item_unit_definition_inputs(self, item_def):
         try:
             return [
@@ -1549,8 +1822,52 @@ class OdmXmlImporterService:
         save_to.append(item)
         return item
 
+    def _create_batch(
+        self,
+        repository: OdmGenericRepository,
+        service,
+        concept_inputs: list,
+        on_existing: Callable[[str], None] | None = None,
+    ) -> list[str]:
+        """
+        Creates and approves the concepts with a single write, and returns their UIDs in the order of the inputs.
+
+        Each concept is validated by its service, the same way as when it is created on its own.
+        The UIDs of the concepts which already exist are returned instead, after passing them to `on_existing` if given.
+        """
+        uids = iter(repository.generate_uids(len(concept_inputs)))
+        rs = []
+        new_items = []
+        for concept_input in concept_inputs:
+            try:
+                concept_ar = service._create_aggregate_root(
+                    concept_input=concept_input,
+                    library=self._get_library(concept_input),
+                    generate_uid_callback=lambda: next(uids),
+                )
+            except exceptions.AlreadyExistsException as e:
+                uid = re.search(r" already exists with UID \((.*)\) and data {", e.msg)
+                if not uid:
+                    raise
+                if on_existing:
+                    on_existing(uid[1])
+                rs.append(uid[1])
+            else:
+                new_items.append(concept_ar)
+                rs.append(concept_ar.uid)
+
+        repository.save_batch(new_items, approve_author_id=user().id())
+        return rs
+
+    def _approve_new_version(self, repository, service, uid: str):
+        concept_ar = repository.find_by_uid_2(uid=uid, for_update=True)
+        if concept_ar.item_metadata.status != LibraryItemStatus.DRAFT:
+            concept_ar.create_new_version(author_id=user().id())
+            repository.save(concept_ar)
+        self._approve(repository, service, concept_ar)
+
     def _approve(self, repository, service, item):
+        # The descriptions are approved when they are created, see `_create_batch`
         appr = service._find_by_uid_or_raise_not_found(item.uid, for_update=True)
         appr.approve(author_id=user().id())
         repository.save(appr)
-        service.cascade_edit_and_approve(appr)
@@ -174,6 +174,7 @@ class CTTermService:
         filter_by: dict | None = None,
         filter_operator: FilterOperator | None = FilterOperator.AND,
         total_count: bool = False,
+        cursor: str | None = None,
     ) -> GenericFilteringReturn[CTTermNameAndAttributes]:
         self.enforce_codelist_package_library(
             codelist_uid, codelist_name, library, package
@@ -193,6 +194,7 @@ class CTTermService:
                 filter_operator=filter_operator,
                 page_number=page_number,
                 page_size=page_size,
+                cursor=cursor,
             )
         )
 
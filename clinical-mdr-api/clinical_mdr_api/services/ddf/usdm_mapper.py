@@ -57,6 +57,22 @@ DDF_TIMING_TYPE_AFTER = "C201356"
 DDF_TIMING_TYPE_BEFORE = "C201357"
 DDF_TIMING_TYPE_FIXED = "C201358"
 DDF_TIME_RELATIVE_TO_FROM_START_TO_START = "C201355"
+DDF_CONCEPT_IDS = [
+    DDF_STUDY_POPULATION_DURATION_UNIT_DAYS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_WEEKS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_MONTHS,
+    DDF_STUDY_POPULATION_DURATION_UNIT_YEARS,
+    DDF_STUDY_POPULATION_ENROLLMENT_NUMBER_UNIT,
+    DDF_STUDY_PROTOCOL_STATUS_DRAFT,
+    DDF_STUDY_PROTOCOL_STATUS_FINAL,
+    DDF_STUDY_POPULATION_SEX_BOTH,
+    DDF_STUDY_POPULATION_SEX_FEMALE,
+    DDF_STUDY_POPULATION_SEX_MALE,
+    DDF_TIMING_TYPE_AFTER,
+    DDF_TIMING_TYPE_BEFORE,
+    DDF_TIMING_TYPE_FIXED,
+    DDF_TIME_RELATIVE_TO_FROM_START_TO_START,
+]
 
 
 def get_ddf_timing_iso_duration_value(time_value: int, time_unit_name: str) -> str:
@@ -80,6 +96,10 @@ def extract_c_code_from_simple_term(term_uid: str) -> str | None:
     return None
 
 
+def _term_uid(code) -> str | None:
+    return getattr(code, "term_uid", None)
+
+
 def _update_ddf_encounter_scheduled_at(encounters, schedule_timelines):
     encounters_timing_info = []  # (scheduled_instance_id, encounter_id, timing_id)
     timings = list(chain.from_iterable(tl.timings for tl in schedule_timelines))
@@ -118,15 +138,146 @@ class USDMMapper:
         get_osb_study_activities: Callable,
         get_osb_activity_schedules: Callable,
     ):
-        self._get_osb_study_design_cells = get_osb_study_design_cells
-        self._get_osb_study_arms = get_osb_study_arms
-        self._get_osb_study_epochs = get_osb_study_epochs
-        self._get_osb_study_elements = get_osb_study_elements
-        self._get_osb_study_endpoints = get_osb_study_endpoints
-        self._get_osb_study_visits = get_osb_study_visits
-        self._get_osb_study_activities = get_osb_study_activities
-        self._get_osb_activity_schedules = get_osb_activity_schedules
+        # The study selections are fetched once per mapping,
+        # they are used both to collect the codes to prefetch and to build the document
+        self._osb_selections: dict[tuple, Any] = {}
+        self._get_osb_study_design_cells = self._fetch_once(get_osb_study_design_cells)
+        self._get_osb_study_arms = self._fetch_once(get_osb_study_arms)
+        self._get_osb_study_epochs = self._fetch_once(get_osb_study_epochs)
+        self._get_osb_study_elements = self._fetch_once(get_osb_study_elements)
+        self._get_osb_study_endpoints = self._fetch_once(get_osb_study_endpoints)
+        self._get_osb_study_visits = self._fetch_once(get_osb_study_visits)
+        self._get_osb_study_activities = self._fetch_once(get_osb_study_activities)
+        self._get_osb_activity_schedules = self._fetch_once(get_osb_activity_schedules)
         self._id_manager = IdManager()
+        # Library name and decode of the CT terms and dictionary terms, by concept id / term uid.
+        # None when the term doesn't exist.
+        self._ct_codes: dict[str, tuple[str, str] | None] = {}
+        self._dictionary_codes: dict[str, tuple[str, str] | None] = {}
+
+    def _fetch_once(self, get_osb_selection: Callable) -> Callable:
+        def fetch(*args, **kwargs):
+            key = (get_osb_selection, args, tuple(sorted(kwargs.items())))
+            if key not in self._osb_selections:
+                self._osb_selections[key] = get_osb_selection(*args, **kwargs)
+            return self._osb_selections[key]
+
+        return fetch
+
+    def _collect_code_ids(self, study: OSBStudy) -> tuple[set[str], set[str]]:
+        """
+        Returns the concept ids of the CT terms and the uids of the dictionary terms
+        that the mapping of the study refers to.
+        """
+        metadata = getattr(study, "current_metadata", None)
+        design = getattr(metadata, "high_level_study_design", None)
+        intervention = getattr(metadata, "study_intervention", None)
+        population = getattr(metadata, "study_population", None)
+
+        intervention_model_uid = _term_uid(
+            getattr(intervention, "intervention_model_code", None)
+        )
+        ct_term_uids = [
+            intervention_model_uid,
+            _term_uid(getattr(intervention, "control_type_code", None)),
+            _term_uid(getattr(intervention, "trial_blinding_schema_code", None)),
+            _term_uid(getattr(intervention, "intervention_type_code", None)),
+        ]
+        ct_term_uids.extend(
+            _term_uid(code)
+            for code in getattr(intervention, "trial_intent_types_codes", None) or []
+        )
+        ct_term_uids.extend(
+            _term_uid(code) for code in getattr(design, "trial_type_codes", None) or []
+        )
+        ct_term_uids.extend(
+            extract_c_code_from_simple_term(term_uid)
+            for term_uid in (
+                intervention_model_uid,
+                _term_uid(getattr(design, "trial_phase_code", None)),
+                _term_uid(getattr(design, "study_type_code", None)),
+            )
+            if term_uid is not None
+        )
+        ct_term_uids.extend(
+            _term_uid(sa.arm_type) for sa in self._get_osb_study_arms(study.uid).items
+        )
+        ct_term_uids.extend(
+            _term_uid(se.epoch_type_ctterm)
+            for se in self._get_osb_study_epochs(study.uid).items
+        )
+        for se in self._get_osb_study_endpoints(study.uid, no_brackets=True).items:
+            if se.study_objective is not None:
+                ct_term_uids.append(_term_uid(se.study_objective.objective_level))
+                ct_term_uids.append(_term_uid(se.endpoint_level))
+        for sv in self._get_osb_study_visits(study.uid).items:
+            ct_term_uids.append(sv.visit_type_uid)
+            ct_term_uids.append(sv.visit_contact_mode_uid)
+        ct_term_uids.extend(DDF_CONCEPT_IDS)
+
+        dictionary_term_uids = [
+            _term_uid(code)
+            for code in getattr(population, "therapeutic_area_codes", None) or []
+        ]
+        return (
+            {uid for uid in ct_term_uids if uid is not None},
+            {uid for uid in dictionary_term_uids if uid is not None},
+        )
+
+    def prefetch_codes(self, concept_ids, dictionary_term_uids):
+        """
+        Resolves the given CT terms and dictionary terms in one query each,
+        the mapping then builds their codes without further queries.
+        """
+        concept_ids = [uid for uid in concept_ids if uid not in self._ct_codes]
+        if concept_ids:
+            self._ct_codes.update(dict.fromkeys(concept_ids))
+            self._ct_codes.update(
+                self._query_codes(
+                    """
+                    UNWIND $uids AS uid
+                    MATCH (l:Library)-[:CONTAINS_TERM]->(cttr:CTTermRoot)-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cttav)
+                    WHERE cttr.uid STARTS WITH uid
+                    WITH uid, head(collect([l.name, cttav.preferred_term])) AS code
+                    RETURN uid, code[0], code[1]
+                    """,
+                    concept_ids,
+                )
+            )
+        term_uids = [
+            uid for uid in dictionary_term_uids if uid not in self._dictionary_codes
+        ]
+        if term_uids:
+            self._dictionary_codes.update(dict.fromkeys(term_uids))
+            self._dictionary_codes.update(
+                self._query_codes(
+                    """
+                    UNWIND $uids AS uid
+                    MATCH (l:Library)-[:CONTAINS_DICTIONARY_TERM]->(dtr:DictionaryTermRoot)-[:LATEST]->(dtv)
+                    WHERE dtr.uid STARTS WITH uid
+                    WITH uid, head(collect([l.name, dtv.name])) AS code
+                    RETURN uid, code[0], code[1]
+                    """,
+                    term_uids,
+                )
+            )
+
+    def _query_codes(self, query: str, uids: list[str]) -> dict[str, tuple[str, str]]:
+        result, _ = db.cypher_query(query, {"uids": uids})
+        return {uid: (library_name, decode) for uid, library_name, decode in result}
+
+    def _get_usdm_code(self, code_id: str, code: tuple[str, str] | None) -> USDMCode:
+        if code is None:
+            return self.get_void_usdm_code()
+        library_name, decode = code
+        return USDMCode(
+            id=self._id_manager.get_id(USDMCode.__name__, code_id),
+            code=code_id,
+            codeSystem=library_name,
+            codeSystemVersion=str(date.today()),
+            decode=decode,
+            instanceType="Code",
+        )
 
     def get_void_usdm_code(self):
         return USDMCode(
@@ -141,30 +292,9 @@ class USDMMapper:
     def get_ct_package_term_as_usdm_code(self, concept_id: str | None) -> USDMCode:
         if concept_id is None:
             return self.get_void_usdm_code()
-        query = """
-            MATCH (l:Library)-[:CONTAINS_TERM]->(cttr:CTTermRoot)-[:HAS_ATTRIBUTES_ROOT]->()-[:LATEST]->(cttav)
-            WHERE cttr.uid STARTS WITH $concept_id
-            RETURN l, cttav
-        """
-        result, _ = db.cypher_query(
-            query,
-            {
-                "concept_id": concept_id,
-            },
-        )
-        if len(result) == 0:
-            return self.get_void_usdm_code()
-        library = result[0][0]
-        ct_term_attributes_value = result[0][1]
-        code = USDMCode(
-            id=self._id_manager.get_id(USDMCode.__name__, concept_id),
-            code=concept_id,
-            codeSystem=library["name"],
-            codeSystemVersion=str(date.today()),
-            decode=ct_term_attributes_value["preferred_term"],
-            instanceType="Code",
-        )
-        return code
+        if concept_id not in self._ct_codes:
+            self.prefetch_codes([concept_id], [])
+        return self._get_usdm_code(concept_id, self._ct_codes[concept_id])
 
     def get_ddf_study_population_duration_unit_from_name_as_code(
         self, time_unit_name: str
@@ -237,32 +367,14 @@ class USDMMapper:
     def get_dictionary_term_as_usdm_code(self, term_uid: str) -> USDMCode:
         if term_uid is None:
             return self.get_void_usdm_code()
-        query = """
-            MATCH (l:Library)-[:CONTAINS_DICTIONARY_TERM]->(dtr:DictionaryTermRoot)-[:LATEST]->(dtv)
-            WHERE dtr.uid STARTS WITH $term_uid
-            RETURN l, dtv
-        """
-        result, _ = db.cypher_query(
-            query,
-            {
-                "term_uid": term_uid,
-            },
-        )
-        if len(result) == 0:
-            return self.get_void_usdm_code()
-        library = result[0][0]
-        ct_term_attributes_value = result[0][1]
-        code = USDMCode(
-            id=self._id_manager.get_id(USDMCode.__name__, term_uid),
-            code=term_uid,
-            codeSystem=library["name"],
-            codeSystemVersion=str(date.today()),
-            decode=ct_term_attributes_value["name"],
-            instanceType="Code",
-        )
-        return code
+        if term_uid not in self._dictionary_codes:
+            self.prefetch_codes([], [term_uid])
+        return self._get_usdm_code(term_uid, self._dictionary_codes[term_uid])
 
     def map(self, study: OSBStudy) -> dict[str, Any]:
+        self._osb_selections.clear()
+        self.prefetch_codes(*self._collect_code_ids(study))
+
         usdm_study = USDMStudy(name=self._get_study_name(study), instanceType="Study")
         usdm_study.id = uuid.uuid4()
         usdm_study.label = self._get_study_label(study)
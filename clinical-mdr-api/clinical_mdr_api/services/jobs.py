@@ -0,0 +1,451 @@
+"""
+Background jobs for long-running operations.
+
+Heavy operations (study lock, study clone, ODM XML import, USDM export) can take longer than
+the timeouts of the proxies in front of the API. Instead of running them within the HTTP request,
+they can be submitted as jobs and their status polled with `/jobs/{job_uid}`.
+
+Jobs are queued as `Job` nodes in the database, see `JobRepository`, so no external broker is needed.
+Every API process runs a `JobWorkerPool` which claims queued jobs and runs their handler in a thread pool,
+with the identity of the user who submitted the job.
+
+A job handler is registered with `@job_handler(<job type>)`. It receives the parameters of the job
+and returns a JSON serializable result. Handlers can call `report_progress` to publish their progress.
+"""
+
+import contextlib
+import datetime
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from fastapi import UploadFile
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import Headers
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api.domain_repositories.job_repository import JobRepository
+from clinical_mdr_api.domain_repositories.models.job import Job as JobNode
+from clinical_mdr_api.models.job import Job, JobError, JobStatus
+from common import config
+from common.auth.dependencies import dummy_auth_object
+from common.auth.models import AccessTokenClaims
+from common.auth.user import auth, user
+from common.exceptions import (
+    BusinessLogicException,
+    MDRApiBaseException,
+    NotFoundException,
+)
+
+log = logging.getLogger(__name__)
+
+JOB_TYPE_STUDY_LOCK = "study-lock"
+JOB_TYPE_STUDY_CLONE = "study-clone"
+JOB_TYPE_ODM_XML_IMPORT = "odm-xml-import"
+JOB_TYPE_USDM_EXPORT = "usdm-export"
+
+JobHandler = Callable[[dict[str, Any]], Any]
+
+_job_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """Registers the decorated function as the handler of the given job type."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _job_handlers[job_type] = func
+        return func
+
+    return decorator
+
+
+class JobProgress:
+    """Progress of a running job, published to the database by the worker pool."""
+
+    def __init__(self) -> None:
+        self.progress = 0.0
+        self.message: str | None = None
+
+
+_current_job_progress: ContextVar[JobProgress | None] = ContextVar(
+    "current_job_progress", default=None
+)
+
+
+def report_progress(progress: float, message: str | None = None) -> None:
+    """
+    Reports the progress of the current job, a number from 0 to 1, with an optional message.
+
+    Does nothing when not called from a job, so that the heavy operations can call it unconditionally.
+    """
+    job_progress = _current_job_progress.get()
+    if job_progress is None:
+        return
+    job_progress.progress = min(max(float(progress), 0.0), 1.0)
+    job_progress.message = message
+
+
+class JobWorkerPool:
+    """
+    Runs the queued jobs in a local thread pool.
+
+    A poller thread claims queued jobs while the pool has free workers, and publishes the progress
+    and heartbeat of the running jobs. The database writes of the poller are made from its own thread,
+    as the progress of a job would otherwise be part of the transaction of the job itself.
+    """
+
+    def __init__(
+        self,
+        repository: JobRepository | None = None,
+        workers: int = config.JOB_WORKERS,
+        poll_interval: float = config.JOB_POLL_INTERVAL,
+    ) -> None:
+        self.repository = repository or JobRepository()
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._running: dict[str, JobProgress] = {}
+        self._running_lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._last_cleanup = 0.0
+
+    def wake(self) -> None:
+        """Makes the poller claim new jobs without waiting for the poll interval."""
+        self._wake_event.set()
+
+    def _publish_progress(self) -> None:
+        with self._running_lock:
+            progress = {
+                uid: (job_progress.progress, job_progress.message)
+                for uid, job_progress in self._running.items()
+            }
+        if progress:
+            self.repository.update_running_jobs(self.worker_id, progress)
+
+    def _cleanup(self) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.repository.fail_stale_jobs(
+            now - datetime.timedelta(seconds=config.JOB_STALE_AFTER_SECS)
+        )
+        self.repository.delete_finished_jobs(
+            now - datetime.timedelta(hours=config.JOB_RETENTION_HOURS)
+        )
+        remove_upload_files_before(
+            now - datetime.timedelta(hours=config.JOB_RETENTION_HOURS)
+        )
+
+    def poll(self) -> int:
+        """
+        Publishes the progress of the running jobs and claims queued jobs for the free workers.
+
+        Returns the number of claimed jobs.
+        """
+        claimed = 0
+        with self._poll_lock:
+            self._publish_progress()
+            if time.monotonic() - self._last_cleanup > config.JOB_STALE_AFTER_SECS:
+                self._cleanup()
+                self._last_cleanup = time.monotonic()
+            if self._executor is None:
+                return 0
+            while len(self._running) < self.workers:
+                job = self.repository.claim_next_job(self.worker_id)
+                if job is None:
+                    break
+                with self._running_lock:
+                    self._running[job.uid] = JobProgress()
+                self._executor.submit(self.execute, job)
+                claimed += 1
+        return claimed
+
+    def _log_lost_claim(self, job: JobNode) -> None:
+        # The job was failed as stale or claimed by another worker meanwhile,
+        # its current status is kept rather than overwritten with the outcome of this run
+        log.warning(
+            "Job %s of type %s is no longer running by worker %s, its outcome is discarded",
+            job.uid,
+            job.job_type,
+            self.worker_id,
+        )
+
+    def execute(self, job: JobNode) -> None:
+        """
+        Runs the handler of a claimed job and records its result or error,
+        unless the worker lost its claim on the job meanwhile.
+        """
+        job_progress = self._running.get(job.uid) or JobProgress()
+        token = _current_job_progress.set(job_progress)
+        try:
+            handler = _job_handlers.get(job.job_type)
+            BusinessLogicException.raise_if(
+                handler is None, msg=f"Unknown job type '{job.job_type}'."
+            )
+            access_token_claims = AccessTokenClaims.model_validate_json(
+                job.access_token_claims
+            )
+            with request_cycle_context(
+                {"auth": dummy_auth_object(access_token_claims)}
+            ):
+                result = handler(json.loads(job.params))
+            if not self.repository.complete_job(
+                job.uid, self.worker_id, json.dumps(jsonable_encoder(result))
+            ):
+                self._log_lost_claim(job)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if isinstance(exc, MDRApiBaseException):
+                error = JobError(
+                    status_code=exc.status_code or 500,
+                    type=type(exc).__name__,
+                    message=str(exc.msg),
+                )
+            else:
+                log.exception("Job %s of type %s failed", job.uid, job.job_type)
+                error = JobError(
+                    status_code=500, type=type(exc).__name__, message=str(exc)
+                )
+            if not self.repository.fail_job(job.uid, self.worker_id, error):
+                self._log_lost_claim(job)
+        finally:
+            _current_job_progress.reset(token)
+            with self._running_lock:
+                self._running.pop(job.uid, None)
+            self.wake()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception("Failed to poll the background jobs")
+
+    def start(self) -> None:
+        if self._thread is not None or self.workers < 1:
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="job-worker"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="job-worker-pool", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops claiming jobs, the running jobs are completed first."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread.join()
+        self._thread = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+
+_pool: JobWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    """Returns the job worker pool of the current process, creating and starting it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = JobWorkerPool()
+                pool.start()
+                _pool = pool
+    return _pool
+
+
+def set_job_worker_pool(pool: JobWorkerPool | None) -> None:
+    """Replaces the job worker pool of the current process, stopping the previous one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is not pool:
+            _pool.stop()
+        _pool = pool
+
+
+class JobService:
+    repo: JobRepository
+
+    def __init__(self) -> None:
+        self.repo = JobRepository()
+
+    def _check_access(self, job: Job) -> None:
+        # Jobs of other users are hidden, except for admins
+        current_user = user()
+        NotFoundException.raise_if(
+            job.author_id != current_user.id()
+            and current_user.hasnt_role("Admin.Read"),
+            "Job",
+            job.uid,
+        )
+
+    def get_job(self, uid: str) -> Job:
+        job = self.repo.retrieve_job(uid)
+        self._check_access(job)
+        return job
+
+    def get_job_result(self, uid: str) -> Any:
+        job = self.get_job(uid)
+        BusinessLogicException.raise_if(
+            job.status != JobStatus.SUCCEEDED,
+            msg=f"Job with UID '{uid}' has no result as its status is '{job.status.value}'.",
+        )
+        result = self.repo.retrieve_result(uid)
+        return json.loads(result) if result is not None else None
+
+    def submit(
+        self,
+        job_type: str,
+        params: dict[str, Any],
+        idempotency_key: str | None = None,
+    ) -> Job:
+        """
+        Queues a job of the given type, to be run with the identity of the current user.
+
+        Submitting again a job with the same `idempotency_key` returns the job submitted first.
+        """
+        BusinessLogicException.raise_if(
+            job_type not in _job_handlers, msg=f"Unknown job type '{job_type}'."
+        )
+        job = self.repo.create_job(
+            job_type=job_type,
+            author_id=user().id(),
+            access_token_claims=auth().access_token_claims.model_dump_json(),
+            params=json.dumps(jsonable_encoder(params)),
+            idempotency_key=idempotency_key,
+        )
+        if job.status == JobStatus.QUEUED:
+            get_job_worker_pool().wake()
+        return job
+
+
+def store_upload_file(upload_file: UploadFile) -> dict[str, Any]:
+    """
+    Stores an uploaded file in `JOB_FILES_DIR` and returns a JSON serializable job parameter referencing it.
+
+    The content isn't part of the job parameters, so that large uploads are not stored in the `Job` node.
+    """
+    os.makedirs(config.JOB_FILES_DIR, exist_ok=True)
+    name = uuid.uuid4().hex
+    with open(os.path.join(config.JOB_FILES_DIR, name), "wb") as file:
+        shutil.copyfileobj(upload_file.file, file)
+    return {
+        "filename": upload_file.filename,
+        "content_type": upload_file.content_type,
+        "name": name,
+    }
+
+
+def open_upload_file(value: dict[str, Any] | None) -> UploadFile | None:
+    if value is None:
+        return None
+    return UploadFile(
+        # Closed by the job handler, see `remove_upload_files`
+        file=open(  # pylint: disable=consider-using-with
+            os.path.join(config.JOB_FILES_DIR, value["name"]), "rb"
+        ),
+        filename=value["filename"],
+        headers=Headers({"content-type": value["content_type"] or ""}),
+    )
+
+
+def remove_upload_files(*upload_files: UploadFile | None) -> None:
+    """Closes and removes the files opened with `open_upload_file`, once the job is done with them."""
+    for upload_file in upload_files:
+        if upload_file is None:
+            continue
+        upload_file.file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(upload_file.file.name)
+
+
+def remove_upload_files_before(modified_before: datetime.datetime) -> None:
+    """Removes the stored files left behind, e.g. by jobs which were interrupted or submitted twice."""
+    if not os.path.isdir(config.JOB_FILES_DIR):
+        return
+    with os.scandir(config.JOB_FILES_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and (
+                entry.stat().st_mtime < modified_before.timestamp()
+            ):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(entry.path)
+
+
+# The job handlers import the services lazily to avoid circular imports,
+# as the services import `report_progress`
+
+
+@job_handler(JOB_TYPE_STUDY_LOCK)
+def lock_study(params: dict[str, Any]):
+    from clinical_mdr_api.services.studies.study import StudyService
+
+    return StudyService().lock(
+        uid=params["study_uid"], change_description=params["change_description"]
+    )
+
+
+@job_handler(JOB_TYPE_STUDY_CLONE)
+def clone_study(params: dict[str, Any]):
+    from clinical_mdr_api.models.study_selections.study import StudyCloneInput
+    from clinical_mdr_api.services.studies.study import StudyService
+
+    return StudyService().clone_study(
+        study_src_uid=params["study_uid"],
+        study_clone_input=StudyCloneInput(**params["clone_input"]),
+    )
+
+
+@job_handler(JOB_TYPE_ODM_XML_IMPORT)
+def import_odm_xml(params: dict[str, Any]):
+    from clinical_mdr_api.domains.concepts.utils import ExporterType
+    from clinical_mdr_api.services.concepts.odms.odm_clinspark_import import (
+        OdmClinicalXmlImporterService,
+    )
+    from clinical_mdr_api.services.concepts.odms.odm_xml_importer import (
+        OdmXmlImporterService,
+    )
+
+    xml_file = open_upload_file(params["xml_file"])
+    mapper_file = open_upload_file(params.get("mapper_file"))
+    streaming = params.get("streaming", False)
+    try:
+        if ExporterType(params["exporter"]) == ExporterType.OSB:
+            odm_xml_importer_service = OdmXmlImporterService(
+                xml_file, mapper_file, streaming
+            )
+        else:
+            odm_xml_importer_service = OdmClinicalXmlImporterService(
+                xml_file, mapper_file, streaming
+            )
+
+        return odm_xml_importer_service.store_odm_xml()
+    finally:
+        remove_upload_files(xml_file, mapper_file)
+
+
+@job_handler(JOB_TYPE_USDM_EXPORT)
+def export_usdm(params: dict[str, Any]):
+    from clinical_mdr_api.services.ddf.usdm_service import USDMService
+
+    return USDMService(study_uid=params["study_uid"]).get_by_uid(params["study_uid"])
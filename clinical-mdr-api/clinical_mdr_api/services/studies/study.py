@@ -77,6 +77,7 @@ from clinical_mdr_api.services._utils import (  # type: ignore
     service_level_generic_filtering,
     service_level_generic_header_filtering,
 )
+from clinical_mdr_api.services.jobs import report_progress
 from common.auth.user import user
 from common.config import (
     DAY_UNIT_NAME,
@@ -559,12 +560,14 @@ class StudyService:
             )
 
             # save Protocol SoA snapshot
+            report_progress(0.1, "Saving the Protocol SoA snapshot")
             StudyFlowchartService().update_soa_snapshot(
                 study_uid=uid,
                 layout=SoALayout.PROTOCOL,
                 study_status=study_definition.study_status,
             )
 
+            report_progress(0.8, "Locking the study")
             study_definition.lock(
                 version_description=change_description,
                 author_id=self.author_id,
@@ -730,6 +733,26 @@ class StudyService:
         exclude_sections: list[StudyComponentEnum] | None = None,
     ) -> list[StudyFieldAuditTrailEntry]:
         # Create entries from the audit trail value objects and filter by section.
+        sections_selected = StudyService._study_field_audit_trail_sections(
+            include_sections=include_sections, exclude_sections=exclude_sections
+        )
+        result = [
+            StudyFieldAuditTrailEntry.from_study_field_audit_trail_vo(
+                study_audit_trail_vo, sections_selected, find_term_by_uid
+            )
+            for study_audit_trail_vo in study_audit_trail_vo_sequence
+        ]
+
+        # Only return entries that have at least one audit trail action in them.
+        result = [entry for entry in result if len(entry.actions) > 0]
+
+        return result
+
+    @staticmethod
+    def _study_field_audit_trail_sections(
+        include_sections: list[StudyComponentEnum] | None = None,
+        exclude_sections: list[StudyComponentEnum] | None = None,
+    ) -> Collection[str]:
         all_sections = [
             "identification_metadata",
             "registry_identifiers",
@@ -752,17 +775,7 @@ class StudyService:
             if include_sections or exclude_sections
             else all_sections
         )
-        result = [
-            StudyFieldAuditTrailEntry.from_study_field_audit_trail_vo(
-                study_audit_trail_vo, sections_selected, find_term_by_uid
-            )
-            for study_audit_trail_vo in study_audit_trail_vo_sequence
-        ]
-
-        # Only return entries that have at least one audit trail action in them.
-        result = [entry for entry in result if len(entry.actions) > 0]
-
-        return result
+        return sections_selected
 
     @db.transaction
     def get_fields_audit_trail_by_uid(
@@ -770,11 +783,35 @@ class StudyService:
         uid: str,
         include_sections: list[StudyComponentEnum] | None = None,
         exclude_sections: list[StudyComponentEnum] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyFieldAuditTrailEntry] | None:
         try:
+            repository = self._repos.study_definition_repository
+            # Only the fields of the selected sections are read from the database, so that pages are not emptied
+            # by the filtering of the sections.
+            fields = (
+                repository.get_study_fields_of_sections(
+                    set(
+                        self._study_field_audit_trail_sections(
+                            include_sections=include_sections,
+                            exclude_sections=exclude_sections,
+                        )
+                    )
+                )
+                if include_sections or exclude_sections
+                else None
+            )
             # call relevant finder (we use helper property to get to the repository)
-            study_fields_audit_trail_vo_sequence = (
-                self._repos.study_definition_repository.get_audit_trail_by_uid(uid)
+            study_fields_audit_trail_vo_sequence = repository.get_audit_trail_by_uid(
+                uid,
+                field_names=fields,
+                since=since,
+                until=until,
+                page_number=page_number,
+                page_size=page_size,
             )
 
             NotFoundException.raise_if(
@@ -1107,6 +1144,7 @@ class StudyService:
             msg="At least one item should be selected",
         )
 
+        report_progress(0.2, "Copying the study items")
         self._repos.study_definition_repository.copy_study_items(
             study_src_uid=study_src_uid,
             study_target_uid=study_created.uid,
@@ -232,27 +232,77 @@ class StudyActivityScheduleService(StudySelectionMixin):
         operations: list[StudyActivityScheduleBatchInput],
     ) -> list[StudyActivityScheduleBatchOutput]:
         results = []
+        for response_code, content in self.apply_batch_operations(
+            study_uid, operations
+        ):
+            if isinstance(content, BatchErrorResponse):
+                results.append(
+                    StudyActivityScheduleBatchOutput.model_construct(
+                        response_code=response_code, content=content
+                    )
+                )
+            elif content:
+                results.append(
+                    StudyActivityScheduleBatchOutput(
+                        response_code=response_code, content=content.model_dump()
+                    )
+                )
+            else:
+                results.append(
+                    StudyActivityScheduleBatchOutput(response_code=response_code)
+                )
+        return results
+
+    def apply_batch_operations(
+        self,
+        study_uid: str,
+        operations: list[StudyActivityScheduleBatchInput],
+    ) -> list[tuple[int, StudyActivitySchedule | BatchErrorResponse | None]]:
+        """
+        Validates the create and delete operations against the schedules of the study loaded once,
+        then writes the accepted ones.
+
+        Each operation is validated against the outcome of the previous ones, so the response code
+        and content of every operation are the same as when the operations are performed one by one.
+        """
+        try:
+            batch = self._repos.study_activity_schedule_repository.start_batch(
+                study_uid
+            )
+        except exceptions.NotFoundException as error:
+            batch, batch_error = None, error
+        else:
+            batch_error = None
+
+        results: list[tuple[int, StudyActivitySchedule | BatchErrorResponse | None]] = (
+            []
+        )
+        created_indexes = []
         for operation in operations:
-            result = {}
-            item = None
             try:
+                if operation.method not in ("POST", "DELETE"):
+                    raise exceptions.MethodNotAllowedException(method=operation.method)
+                if batch_error is not None:
+                    raise batch_error
                 if operation.method == "POST":
-                    item = self.create(study_uid, operation.content)
-                    response_code = status.HTTP_201_CREATED
-                elif operation.method == "DELETE":
-                    self.delete(study_uid, operation.content.uid)
-                    response_code = status.HTTP_204_NO_CONTENT
+                    batch.create(self._from_input_values(study_uid, operation.content))
+                    created_indexes.append(len(results))
+                    results.append((status.HTTP_201_CREATED, None))
                 else:
-                    raise exceptions.MethodNotAllowedException(method=operation.method)
-                result["response_code"] = response_code
-                if item:
-                    result["content"] = item.model_dump()
-                results.append(StudyActivityScheduleBatchOutput(**result))
+                    batch.delete(operation.content.uid, self.author)
+                    results.append((status.HTTP_204_NO_CONTENT, None))
             except exceptions.MDRApiBaseException as error:
                 results.append(
-                    StudyActivityScheduleBatchOutput.model_construct(
-                        response_code=error.status_code,
-                        content=BatchErrorResponse(message=str(error)),
-                    )
+                    (error.status_code, BatchErrorResponse(message=str(error)))
+                )
+
+        if batch is not None:
+            created = self._repos.study_activity_schedule_repository.save_batch(
+                batch, self.author
+            )
+            for index, schedule_vo in zip(created_indexes, created):
+                results[index] = (
+                    status.HTTP_201_CREATED,
+                    StudyActivitySchedule.from_vo(schedule_vo),
                 )
         return results
@@ -478,11 +478,24 @@ class StudyActivitySelectionService(StudyActivitySelectionBaseService):
         return result
 
     @db.transaction
-    def get_all_selection_audit_trail(self, study_uid: str) -> list[BaseModel]:
+    def get_all_selection_audit_trail(
+        self,
+        study_uid: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+    ) -> list[BaseModel]:
         repos = self._repos
         try:
             try:
-                selection_history = self.repository.find_selection_history(study_uid)
+                selection_history = self.repository.find_selection_history(
+                    study_uid,
+                    since=since,
+                    until=until,
+                    page_number=page_number,
+                    page_size=page_size,
+                )
             except ValueError as value_error:
                 raise NotFoundException(msg=value_error.args[0]) from value_error
             # Extract start dates from the selection history
@@ -1684,7 +1697,39 @@ class StudyActivitySelectionService(StudyActivitySelectionBaseService):
     ) -> list[StudySoAEditBatchOutput]:
         study_activity_schedules_service = StudyActivityScheduleService()
         results = []
+        # Consecutive creations and deletions of schedules, e.g. ticking cells of the SoA grid,
+        # are applied together, see StudyActivityScheduleService.apply_batch_operations
+        schedule_operations = []
+
+        def apply_schedule_operations():
+            for (
+                response_code,
+                content,
+            ) in study_activity_schedules_service.apply_batch_operations(
+                study_uid, schedule_operations
+            ):
+                if isinstance(content, BatchErrorResponse):
+                    results.append(
+                        StudySoAEditBatchOutput.model_construct(
+                            response_code=response_code, content=content
+                        )
+                    )
+                else:
+                    results.append(
+                        StudySoAEditBatchOutput(
+                            response_code=response_code, content=content
+                        )
+                    )
+            schedule_operations.clear()
+
         for operation in operations:
+            if operation.object == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value and (
+                operation.method in ("POST", "DELETE")
+            ):
+                schedule_operations.append(operation)
+                continue
+            if schedule_operations:
+                apply_schedule_operations()
             result = {}
             item = None
             try:
@@ -1698,23 +1743,19 @@ class StudyActivitySelectionService(StudyActivitySelectionBaseService):
                         operation.content.content,
                     )
                     response_code = status.HTTP_200_OK
-                elif operation.method == "POST":
-                    if operation.object == SoAItemType.STUDY_ACTIVITY.value:
-                        item = self.make_selection(study_uid, operation.content)
-                    elif operation.object == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value:
-                        item = study_activity_schedules_service.create(
-                            study_uid, operation.content
-                        )
+                elif (
+                    operation.method == "POST"
+                    and operation.object == SoAItemType.STUDY_ACTIVITY.value
+                ):
+                    item = self.make_selection(study_uid, operation.content)
                     response_code = status.HTTP_201_CREATED
-                elif operation.method == "DELETE":
-                    if operation.object == SoAItemType.STUDY_ACTIVITY.value:
-                        self.delete_selection(
-                            study_uid, operation.content.study_activity_uid
-                        )
-                    elif operation.object == SoAItemType.STUDY_ACTIVITY_SCHEDULE.value:
-                        item = study_activity_schedules_service.delete(
-                            study_uid, operation.content.uid
-                        )
+                elif (
+                    operation.method == "DELETE"
+                    and operation.object == SoAItemType.STUDY_ACTIVITY.value
+                ):
+                    self.delete_selection(
+                        study_uid, operation.content.study_activity_uid
+                    )
                     response_code = status.HTTP_204_NO_CONTENT
                 else:
                     raise MethodNotAllowedException(method=operation.method)
@@ -1728,6 +1769,8 @@ class StudyActivitySelectionService(StudyActivitySelectionBaseService):
                         content=BatchErrorResponse(message=str(error)),
                     )
                 )
+        if schedule_operations:
+            apply_schedule_operations()
         all_soa_footnotes = (
             self._repos.study_soa_footnote_repository.find_all_footnotes(
                 study_uids=study_uid
@@ -257,11 +257,24 @@ class StudyActivitySelectionBaseService(StudySelectionMixin):
         finally:
             repos.close()
 
-    def get_all_selection_audit_trail(self, study_uid: str) -> list[BaseModel]:
+    def get_all_selection_audit_trail(
+        self,
+        study_uid: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+    ) -> list[BaseModel]:
         repos = self._repos
         try:
             try:
-                selection_history = self.repository.find_selection_history(study_uid)
+                selection_history = self.repository.find_selection_history(
+                    study_uid,
+                    since=since,
+                    until=until,
+                    page_number=page_number,
+                    page_size=page_size,
+                )
             except ValueError as value_error:
                 raise exceptions.NotFoundException(msg=value_error.args[0])
 
@@ -290,12 +290,21 @@ class StudyCompoundDosingSelectionService(StudySelectionMixin):
 
     @db.transaction
     def get_all_selection_audit_trail(
-        self, study_uid: str
+        self,
+        study_uid: str,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudyCompoundDosing]:
         try:
             selection_history = (
                 self._repos.study_compound_dosing_repository.find_selection_history(
-                    study_uid
+                    study_uid,
+                    since=since,
+                    until=until,
+                    page_number=page_number,
+                    page_size=page_size,
                 )
             )
             return self._transform_history_to_response_model(
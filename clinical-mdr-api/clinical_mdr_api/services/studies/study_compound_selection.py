@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.study_selections.study_compound_repository import (
@@ -514,12 +516,21 @@ class StudyCompoundSelectionService(
 
     @db.transaction
     def get_all_selection_audit_trail(
-        self, study_uid: str
+        self,
+        study_uid: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudySelectionCompound]:
         repos = self._repos
         try:
             selection_history = repos.study_compound_repository.find_selection_history(
-                study_uid
+                study_uid,
+                since=since,
+                until=until,
+                page_number=page_number,
+                page_size=page_size,
             )
             return self._transform_history_to_response_model(
                 selection_history, study_uid
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from neomodel import db
 
 from clinical_mdr_api.domain_repositories.study_selections.study_criteria_repository import (
@@ -848,14 +850,25 @@ class StudyCriteriaSelectionService(StudySelectionMixin):
 
     @db.transaction
     def get_all_selection_audit_trail(
-        self, study_uid: str, criteria_type_uid: str | None
+        self,
+        study_uid: str,
+        criteria_type_uid: str | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudySelectionCriteriaCore]:
         repos = self._repos
         try:
             try:
                 selection_history = (
                     repos.study_criteria_repository.find_selection_history(
-                        study_uid=study_uid, criteria_type_uid=criteria_type_uid
+                        study_uid=study_uid,
+                        criteria_type_uid=criteria_type_uid,
+                        since=since,
+                        until=until,
+                        page_number=page_number,
+                        page_size=page_size,
                     )
                 )
             except ValueError as value_error:
@@ -1,12 +1,18 @@
 import logging
 import os
 from collections import OrderedDict
+from threading import Lock
 from typing import Mapping, MutableMapping
 
 import yattag
+from cachetools import LRUCache, TTLCache, cached
+from cachetools.keys import hashkey
 from colour import Color
 from PIL import ImageFont
 
+from clinical_mdr_api.domain_repositories.study_selections.study_soa_repository import (
+    StudySoARepository,
+)
 from clinical_mdr_api.models.study_selections.study import StudySoaPreferences
 from clinical_mdr_api.models.study_selections.study_epoch import StudyEpoch
 from clinical_mdr_api.models.study_selections.study_selection import (
@@ -67,6 +73,8 @@ FONT_FILE_NAME = "clinical_mdr_api/services/utils/LiberationSerif-Regular.ttf"
 FONT_SIZE = 12  # in points
 FONT_SIZE_POINT_TO_PIXELS_RATIO = PPI / DPI
 LINE_SPACING = 3
+# Number of measured texts and text flows kept per process
+TEXT_CACHE_MAX_SIZE = 10_000
 TEXT_BOTTOM_EXTRA_PADDING = int(FONT_SIZE / 3)
 TEXT_COLOR_LIGHT = Color("white")
 TEXT_COLOR_DARK = Color("black")
@@ -147,15 +155,81 @@ class StudyDesignFigureService:
 
     debug = False
 
+    # Although ImageFont.truetype() expects point size, it seems we need to scale it up for calculations in pixels
+    font_size = int(round(FONT_SIZE * FONT_SIZE_POINT_TO_PIXELS_RATIO))
+
+    # The font is loaded once per process and shared by all instances.
+    # A FreeType face must not be used by concurrent threads, so measuring text is serialized by the lock.
+    _font: ImageFont.FreeTypeFont | None = None
+    lock_font = Lock()
+
+    # Sizes of texts measured with the font, keyed by text.
+    # Pillow applies kerning and hinting on the whole string, so the sizes are not a sum of the glyph sizes.
+    cache_store_text_size = LRUCache(maxsize=TEXT_CACHE_MAX_SIZE)
+
+    # Text flows keyed by text, cell width, paddings and centering
+    cache_store_text_flow = LRUCache(maxsize=TEXT_CACHE_MAX_SIZE)
+    lock_store_text_flow = Lock()
+
+    # SVG documents keyed by study uid, study version, debug mode and the revision of the study
+    cache_store_svg = TTLCache(
+        maxsize=config.STUDY_DESIGN_FIGURE_CACHE_MAX_SIZE,
+        ttl=config.STUDY_DESIGN_FIGURE_CACHE_TTL,
+    )
+    lock_store_svg = Lock()
+
     def __init__(self, debug: bool = False):
         self.debug = debug
-        font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
-        # Although ImageFont.truetype() expects point size, it seems we need to scale it up for calculations in pixels
-        self.font_size = int(round(FONT_SIZE * FONT_SIZE_POINT_TO_PIXELS_RATIO))
-        self.font = ImageFont.truetype(font_path, self.font_size)
+        self.font = self.get_font()
+
+    @classmethod
+    def get_font(cls) -> ImageFont.FreeTypeFont:
+        """Returns the font of the figure texts, loading it on first use"""
+        with cls.lock_font:
+            if StudyDesignFigureService._font is None:
+                font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
+                StudyDesignFigureService._font = ImageFont.truetype(
+                    font_path, cls.font_size
+                )
+            return StudyDesignFigureService._font
 
     @trace_calls
     def get_svg_document(self, study_uid: str, study_value_version: str | None = None):
+        """Returns the SVG drawing as text, from the cache if the study hasn't changed since it was drawn
+
+        Released and locked study versions never change. For the latest draft version,
+        the revision counter of the study is part of the cache key,
+        so any write to the study arms, epochs, elements, design cells or visits invalidates the cached drawing.
+        """
+
+        if study_value_version:
+            revision = None
+        else:
+            revision = self._get_study_revision(study_uid)
+            if revision is None:
+                # Non-existent study, let the services raise the appropriate exception
+                return self._build_svg_document(study_uid, study_value_version)
+
+        cache_key = (study_uid, study_value_version, self.debug, revision)
+        with self.lock_store_svg:
+            document = self.cache_store_svg.get(cache_key)
+
+        if document is None:
+            document = self._build_svg_document(study_uid, study_value_version)
+            with self.lock_store_svg:
+                self.cache_store_svg[cache_key] = document
+
+        return document
+
+    @staticmethod
+    def _get_study_revision(study_uid: str) -> int | None:
+        """Returns a token that changes whenever the data of the study changes"""
+        return StudySoARepository.get_study_revision(study_uid)
+
+    @trace_calls
+    def _build_svg_document(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> str:
         """Fetches necessary data and returns the SVG drawing as text"""
 
         # fetch data
@@ -657,6 +731,11 @@ class StudyDesignFigureService:
                 cell["text"], cell["width"], paddings, center
             )
 
+    @cached(
+        cache=cache_store_text_flow,
+        key=lambda _self, *args, **kwargs: hashkey(*args, **kwargs),
+        lock=lock_store_text_flow,
+    )
     def _flow_text(
         self,
         text: str,
@@ -805,7 +884,11 @@ class StudyDesignFigureService:
 
     def _get_text_size_px(self, text: str) -> tuple[int, int]:
         """Returns width and height (in pixels) of given text if rendered with font and size"""
-        return self.font.getbbox(text)[2:4]
+        with self.lock_font:
+            size = self.cache_store_text_size.get(text)
+            if size is None:
+                size = self.cache_store_text_size[text] = self.font.getbbox(text)[2:4]
+        return size
 
     def _get_words_size_px(self, text: str) -> tuple[tuple[str, int, int]]:
         """Returns a tuple of (word, width, height) in pixels of each word of a text if rendered with font and size"""
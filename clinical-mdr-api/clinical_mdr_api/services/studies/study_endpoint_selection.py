@@ -1235,12 +1235,21 @@ class StudyEndpointSelectionService(StudySelectionMixin):
 
     @db.transaction
     def get_all_selection_audit_trail(
-        self, study_uid: str
+        self,
+        study_uid: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudySelectionEndpoint]:
         repos = self._repos
         try:
             selection_history = repos.study_endpoint_repository.find_selection_history(
-                study_uid
+                study_uid,
+                since=since,
+                until=until,
+                page_number=page_number,
+                page_size=page_size,
             )
             # Extract start dates from the selection history
             start_dates = [history.start_date for history in selection_history]
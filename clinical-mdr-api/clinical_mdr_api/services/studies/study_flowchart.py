@@ -1,8 +1,11 @@
+import copy
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Iterable, Mapping, Sequence
+from threading import Lock
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
+from cachetools import TTLCache
 from docx.enum.style import WD_STYLE_TYPE
 from neomodel import db
 from openpyxl.workbook import Workbook
@@ -66,7 +69,7 @@ from clinical_mdr_api.services.utils.table_f import (
     TableCell,
     TableRow,
     TableWithFootnotes,
-    table_to_docx,
+    table_to_docx_xml,
     table_to_html,
     table_to_xlsx,
 )
@@ -171,12 +174,55 @@ class StudyFlowchartService:
 
     _repository = None
 
+    # Built SoA tables and coordinates,
+    # keyed by study uid, study version, kind of item (layout, time unit, ...) and revision of the study
+    cache_store_soa = TTLCache(
+        maxsize=config.SOA_CACHE_MAX_SIZE, ttl=config.SOA_CACHE_TTL
+    )
+    lock_store_soa = Lock()
+
     @property
     def repository(self):
         if self._repository is None:
             self._repository = StudySoARepository()
         return self._repository
 
+    @trace_calls(args=[1, 2, 3], kwargs=["study_uid", "study_value_version", "key"])
+    def _get_cached(
+        self,
+        study_uid: str,
+        study_value_version: str | None,
+        key: tuple,
+        build: Callable[[], Any],
+    ) -> Any:
+        """
+        Returns a copy of the item built by `build`, from the cache if the study hasn't changed since it was built.
+
+        Released and locked study versions never change. For the latest draft version,
+        the revision counter of the study is part of the cache key,
+        so any write to the study selections, visits, epochs, footnotes or preferences invalidates the cached items.
+        """
+
+        if study_value_version:
+            revision = None
+        else:
+            revision = self.repository.get_study_revision(study_uid)
+            if revision is None:
+                # Non-existent study, let the builder raise the appropriate exception
+                return build()
+
+        cache_key = (study_uid, study_value_version, *key, revision)
+        with self.lock_store_soa:
+            item = self.cache_store_soa.get(cache_key)
+
+        if item is None:
+            item = build()
+            with self.lock_store_soa:
+                self.cache_store_soa[cache_key] = item
+
+        # Callers alter the returned tables (hidden rows, debug info, ...), so the cached item is never handed out
+        return copy.deepcopy(item)
+
     @trace_calls
     def _validate_parameters(
         self,
@@ -461,6 +507,23 @@ class StudyFlowchartService:
                                        of item's position in the detailed SoA table.
         """
 
+        return self._get_cached(
+            study_uid,
+            study_value_version,
+            ("coordinates", hide_soa_groups),
+            lambda: self._build_flowchart_item_uid_coordinates(
+                study_uid,
+                study_value_version=study_value_version,
+                hide_soa_groups=hide_soa_groups,
+            ),
+        )
+
+    def _build_flowchart_item_uid_coordinates(
+        self,
+        study_uid: str,
+        study_value_version: str | None = None,
+        hide_soa_groups: bool = False,
+    ) -> dict[str, CellCoordinates]:
         self._validate_parameters(study_uid, study_value_version=study_value_version)
 
         study_activity_schedules: list[StudyActivitySchedule] = (
@@ -600,21 +663,51 @@ class StudyFlowchartService:
                 time_unit=time_unit,
             )
 
-        else:
-            # Build SoA (of the latest draft version or detailed and operational SoA of locked versions too)
-            table = self.build_flowchart_table(
+        elif force_build:
+            table = self._build_flowchart_table_for_layout(
                 study_uid=study_uid,
                 study_value_version=study_value_version,
                 layout=layout,
                 time_unit=time_unit,
             )
 
-            if layout == SoALayout.PROTOCOL:
-                # propagate checkmarks from hidden rows for protocol layout
-                self.propagate_hidden_rows(table.rows)
+        else:
+            # Build SoA (of the latest draft version or detailed and operational SoA of locked versions too),
+            # shared by the JSON, HTML and DOCX representations until the study changes
+            table = self._get_cached(
+                study_uid,
+                study_value_version,
+                ("table", layout, time_unit),
+                lambda: self._build_flowchart_table_for_layout(
+                    study_uid=study_uid,
+                    study_value_version=study_value_version,
+                    layout=layout,
+                    time_unit=time_unit,
+                ),
+            )
+
+        return table
+
+    def _build_flowchart_table_for_layout(
+        self,
+        study_uid: str,
+        study_value_version: str | None,
+        layout: SoALayout,
+        time_unit: str | None = None,
+    ) -> TableWithFootnotes:
+        table = self.build_flowchart_table(
+            study_uid=study_uid,
+            study_value_version=study_value_version,
+            layout=layout,
+            time_unit=time_unit,
+        )
+
+        if layout == SoALayout.PROTOCOL:
+            # propagate checkmarks from hidden rows for protocol layout
+            self.propagate_hidden_rows(table.rows)
 
-                # remove hidden rows
-                self.remove_hidden_rows(table)
+            # remove hidden rows
+            self.remove_hidden_rows(table)
 
         return table
 
@@ -811,7 +904,7 @@ class StudyFlowchartService:
             self.add_protocol_section_column(table)
 
         # convert flowchart to DOCX document applying styles
-        return table_to_docx(
+        return table_to_docx_xml(
             table,
             styles=(
                 OPERATIONAL_DOCX_STYLES
@@ -878,6 +971,38 @@ class StudyFlowchartService:
             TableWithFootnotes: Operational SoA flowchart table.
         """
 
+        table = self._get_cached(
+            study_uid,
+            study_value_version,
+            ("operational_spreadsheet", time_unit),
+            lambda: self._build_operational_spreadsheet(
+                study_uid,
+                time_unit=time_unit,
+                study_value_version=study_value_version,
+            ),
+        )
+
+        # Extraction details are specific to each download, so they are not part of the cached table
+        table.rows[2].cells[0:0] = [
+            TableCell(
+                f"Date/time of extraction: {datetime.now().strftime('%Y-%m-%d %H:%M:%S Z')}",
+                span=3,
+                style="dateTime",
+            ),
+            TableCell(span=0, style="dateTime"),
+            TableCell(span=0, style="dateTime"),
+            TableCell(f"By: {user().id()}", span=2, style="extractedBy"),
+            TableCell(span=0, style="extractedBy"),
+        ]
+
+        return table
+
+    def _build_operational_spreadsheet(
+        self,
+        study_uid: str,
+        time_unit: str | None = None,
+        study_value_version: str | None = None,
+    ) -> TableWithFootnotes:
         study = self._get_study(study_uid, study_value_version=study_value_version)
 
         if not time_unit:
@@ -941,15 +1066,7 @@ class StudyFlowchartService:
             ),
             TableRow(
                 cells=[
-                    TableCell(
-                        f"Date/time of extraction: {datetime.now().strftime('%Y-%m-%d %H:%M:%S Z')}",
-                        span=3,
-                        style="dateTime",
-                    ),
-                    TableCell(span=0, style="dateTime"),
-                    TableCell(span=0, style="dateTime"),
-                    TableCell(f"By: {user().id()}", span=2, style="extractedBy"),
-                    TableCell(span=0, style="extractedBy"),
+                    # Extraction date/time and user cells are inserted by get_operational_spreadsheet()
                     TableCell(span=2),
                     TableCell("Epochs", style="header1"),
                 ]
@@ -805,13 +805,24 @@ class StudyObjectiveSelectionService(StudySelectionMixin):
 
     @db.transaction
     def get_all_selection_audit_trail(
-        self, study_uid: str
+        self,
+        study_uid: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
     ) -> list[StudySelectionObjectiveCore]:
         repos = self._repos
         try:
             try:
                 selection_history = (
-                    repos.study_objective_repository.find_selection_history(study_uid)
+                    repos.study_objective_repository.find_selection_history(
+                        study_uid,
+                        since=since,
+                        until=until,
+                        page_number=page_number,
+                        page_size=page_size,
+                    )
                 )
                 # Extract start dates from the selection history
                 start_dates = [history.start_date for history in selection_history]
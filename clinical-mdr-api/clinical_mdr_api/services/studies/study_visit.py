@@ -3,7 +3,12 @@ import datetime
 from typing import Any
 
 from neomodel import Q, db
+from starlette_context import context
 
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_lookup_cache import (
+    CTCodelistLookup,
+    get_codelist_lookups,
+)
 from clinical_mdr_api.domain_repositories.models.study_visit import (
     StudyVisit as StudyVisitNeoModel,
 )
@@ -118,6 +123,30 @@ from common.exceptions import (
 )
 from common.telemetry import trace_calls
 
+STUDY_VISIT_EFFECTIVE_DATES_CONTEXT_KEY = "study_visit_effective_dates"
+
+# Codelists looked up when building study visits,
+# with the service attribute holding their term uids and the map of their terms
+CTLIST_MAP_CODELISTS = {
+    settings.STUDY_EPOCH_TYPE_NAME: ("study_epoch_types", StudyEpochType),
+    settings.STUDY_EPOCH_SUBTYPE_NAME: ("study_epoch_subtypes", StudyEpochSubType),
+    settings.STUDY_EPOCH_EPOCH_NAME: ("study_epoch_epochs", StudyEpochEpoch),
+    settings.STUDY_VISIT_TYPE_NAME: ("study_visit_types", StudyVisitType),
+    settings.STUDY_VISIT_REPEATING_FREQUENCY: (
+        "study_visit_repeating_frequency",
+        StudyVisitRepeatingFrequency,
+    ),
+    settings.STUDY_VISIT_TIMEREF_NAME: ("study_visit_timeref", StudyVisitTimeReference),
+    settings.STUDY_VISIT_CONTACT_MODE_NAME: (
+        "study_visit_contact_mode",
+        StudyVisitContactMode,
+    ),
+    settings.STUDY_VISIT_EPOCH_ALLOCATION_NAME: (
+        "study_visit_epoch_allocation",
+        StudyVisitEpochAllocation,
+    ),
+}
+
 
 class StudyVisitService(StudySelectionMixin):
     def __init__(
@@ -144,6 +173,21 @@ class StudyVisitService(StudySelectionMixin):
         self._day_unit, self._week_unit = self.repo.get_day_week_units()
 
     def _extract_effective_date(self, study_uid, study_value_version: str = None):
+        # The flowchart, USDM and design figure services build the visits of the same
+        # study within a single request, so the effective date is looked up only once
+        effective_dates = (
+            context.setdefault(STUDY_VISIT_EFFECTIVE_DATES_CONTEXT_KEY, {})
+            if context.exists()
+            else {}
+        )
+        key = (study_uid, study_value_version)
+        if key not in effective_dates:
+            effective_dates[key] = self._find_effective_date(
+                study_uid=study_uid, study_value_version=study_value_version
+            )
+        return effective_dates[key]
+
+    def _find_effective_date(self, study_uid, study_value_version: str = None):
         study_standard_versions = self._repos.study_standard_version_repository.find_standard_versions_in_study(
             study_uid=study_uid,
             study_value_version=study_value_version,
@@ -175,127 +219,45 @@ class StudyVisitService(StudySelectionMixin):
             else None
         )
 
-    def _create_ctlist_map(self):
-        ct_terms = self.repo.fetch_ctlist(
-            codelist_names=[
-                settings.STUDY_EPOCH_TYPE_NAME,
-                settings.STUDY_EPOCH_SUBTYPE_NAME,
-                settings.STUDY_EPOCH_EPOCH_NAME,
-                settings.STUDY_VISIT_TYPE_NAME,
-                settings.STUDY_VISIT_REPEATING_FREQUENCY,
-                settings.STUDY_VISIT_TIMEREF_NAME,
-                settings.STUDY_VISIT_CONTACT_MODE_NAME,
-                settings.STUDY_VISIT_EPOCH_ALLOCATION_NAME,
-            ]
-        )
-        for ct_term_uid, codelist_names in ct_terms.items():
-            if settings.STUDY_EPOCH_TYPE_NAME in codelist_names:
-                self.study_epoch_types.append(ct_term_uid)
-            if settings.STUDY_EPOCH_SUBTYPE_NAME in codelist_names:
-                self.study_epoch_subtypes.append(ct_term_uid)
-            if settings.STUDY_EPOCH_EPOCH_NAME in codelist_names:
-                self.study_epoch_epochs.append(ct_term_uid)
-            if settings.STUDY_VISIT_TYPE_NAME in codelist_names:
-                self.study_visit_types.append(ct_term_uid)
-            if settings.STUDY_VISIT_REPEATING_FREQUENCY in codelist_names:
-                self.study_visit_repeating_frequency.append(ct_term_uid)
-            if settings.STUDY_VISIT_TIMEREF_NAME in codelist_names:
-                self.study_visit_timeref.append(ct_term_uid)
-            if settings.STUDY_VISIT_CONTACT_MODE_NAME in codelist_names:
-                self.study_visit_contact_mode.append(ct_term_uid)
-            if settings.STUDY_VISIT_EPOCH_ALLOCATION_NAME in codelist_names:
-                self.study_visit_epoch_allocation.append(ct_term_uid)
-
-        ctterm_uids = list(
-            set(
-                self.study_epoch_types
-                + self.study_epoch_subtypes
-                + self.study_epoch_epochs
-                + self.study_visit_types
-                + self.study_visit_repeating_frequency
-                + self.study_visit_timeref
-                + self.study_visit_contact_mode
-                + self.study_visit_epoch_allocation
-            )
-        )
-
+    def _load_codelist_lookups(
+        self, codelist_names: list[str]
+    ) -> dict[str, CTCodelistLookup]:
+        ct_terms = self.repo.fetch_ctlist(codelist_names=codelist_names)
         ctterms = self._find_terms_by_uids(
-            term_uids=ctterm_uids,
+            term_uids=list(ct_terms),
             at_specific_date=self.terms_at_specific_datetime,
             return_simple_object=True,
         )
+        ctterms_by_uid = {ct_term.term_uid: ct_term for ct_term in ctterms}
 
-        StudyEpochType.clear()
-        StudyEpochType.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_epoch_types
-            ]
-        )
-
-        StudyEpochSubType.clear()
-        StudyEpochSubType.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_epoch_subtypes
-            ]
-        )
-
-        StudyEpochEpoch.clear()
-        StudyEpochEpoch.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_epoch_epochs
-            ]
-        )
-
-        StudyVisitType.clear()
-        StudyVisitType.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_visit_types
-            ]
-        )
-
-        StudyVisitRepeatingFrequency.clear()
-        StudyVisitRepeatingFrequency.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_visit_repeating_frequency
-            ]
-        )
-
-        StudyVisitTimeReference.clear()
-        StudyVisitTimeReference.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_visit_timeref
-            ]
-        )
-
-        StudyVisitContactMode.clear()
-        StudyVisitContactMode.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_visit_contact_mode
-            ]
-        )
+        lookups = {}
+        for codelist_name in codelist_names:
+            term_uids = tuple(
+                ct_term_uid
+                for ct_term_uid, ct_term_codelist_names in ct_terms.items()
+                if codelist_name in ct_term_codelist_names
+            )
+            lookups[codelist_name] = CTCodelistLookup(
+                term_uids=term_uids,
+                terms={
+                    term_uid: ctterms_by_uid[term_uid]
+                    for term_uid in term_uids
+                    if term_uid in ctterms_by_uid
+                },
+            )
+        return lookups
 
-        StudyVisitEpochAllocation.clear()
-        StudyVisitEpochAllocation.update(
-            [
-                (ct_term.term_uid, ct_term)
-                for ct_term in ctterms
-                if ct_term.term_uid in self.study_visit_epoch_allocation
-            ]
-        )
+    def _create_ctlist_map(self):
+        lookups = get_codelist_lookups(
+            codelist_names=list(CTLIST_MAP_CODELISTS),
+            effective_date=self.terms_at_specific_datetime,
+            load=self._load_codelist_lookups,
+        )
+        for codelist_name, (attribute, global_terms) in CTLIST_MAP_CODELISTS.items():
+            lookup = lookups[codelist_name]
+            setattr(self, attribute, list(lookup.term_uids))
+            global_terms.clear()
+            global_terms.update(lookup.terms)
 
     def get_allowed_time_references_for_study(self, study_uid: str):
         resp = []
@@ -1,4 +1,7 @@
-from clinical_mdr_api.domain_repositories.user_repository import UserRepository
+from clinical_mdr_api.domain_repositories.user_repository import (
+    UserRepository,
+    get_author_username_loader,
+)
 from clinical_mdr_api.models.user import UserInfo
 
 
@@ -24,5 +27,8 @@ class UserInfoService:
 
     @classmethod
     def get_author_username_from_id(cls, user_id: str) -> str:
+        if user_id and (loader := get_author_username_loader()):
+            return loader.load(user_id)
+
         user = cls().repo.get_user(user_id)
         return user.username if user and user.username else user_id
@@ -10,10 +10,10 @@ from docx import Document
 from docx.blkcntnr import BlockItemContainer
 from docx.enum.section import WD_ORIENTATION
 from docx.enum.text import WD_BREAK
-from docx.oxml import OxmlElement
+from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import qn
 from docx.section import Section
-from docx.shared import Inches
+from docx.shared import Inches, Length
 from docx.table import Table, _Cell, _Row
 from docx.text.paragraph import Paragraph
 
@@ -99,6 +99,19 @@ class DocxBuilder:
             table.style = self.document.styles[style[0]]
         return table
 
+    @property
+    def block_width(self) -> Length:
+        """Width of the space between the margins of the last section"""
+        # pylint: disable=protected-access
+        return self.document._block_width
+
+    def add_table_xml(self, xml: str) -> Table:
+        """Parses a WordprocessingML `w:tbl` element and appends it to the document body"""
+        # pylint: disable=protected-access
+        tbl = parse_xml(xml)
+        self.document._element.body._insert_tbl(tbl)
+        return Table(tbl, self.document._body)
+
     @staticmethod
     def add_row(table: Table, cell_text_content: list[str | None]) -> _Row:
         """Adds a row to the table and fills the cells text content"""
@@ -1,6 +1,6 @@
 from codecs import iterdecode
 from csv import DictReader
-from xml.dom.minidom import Document
+from xml.dom.minidom import Document, Element
 
 from fastapi import UploadFile
 
@@ -30,11 +30,27 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
     Returns:
         None
 
+    Raises:
+        BusinessLogicException: If the mapper is not in CSV format, or if the mandatory mapping fields are not present.
+    """
+    apply_mapping_rules(xml_document, read_mapping_rules(mapper))
+
+
+def read_mapping_rules(mapper: UploadFile | None) -> list[dict[str, str]]:
+    """
+    Reads the mapping rules of the CSV mapper.
+
+    Args:
+        mapper (UploadFile | None): The CSV file containing the mapping rules.
+
+    Returns:
+        list[dict[str, str]]: The mapping rules, empty if no mapper is provided.
+
     Raises:
         BusinessLogicException: If the mapper is not in CSV format, or if the mandatory mapping fields are not present.
     """
     if not mapper:
-        return
+        return []
 
     BusinessLogicException.raise_if(
         mapper.content_type != "text/csv", msg="Only CSV format is supported."
@@ -47,12 +63,29 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
         msg=f"These headers must be present: {sorted(MANDATORY_MAPPER_FIELDS)}",
     )
 
-    for mapping in dict_reader:
+    return list(dict_reader)
+
+
+def apply_mapping_rules(
+    xml_node: Document | Element, mapping_rules: list[dict[str, str]]
+):
+    """
+    Transform the XML Elements and Attributes of a document, or of an element and its descendants,
+    according to the given mapping rules.
+
+    Args:
+        xml_node (Document | Element): The XML document or element to modify.
+        mapping_rules (list[dict[str, str]]): The mapping rules, as read by `read_mapping_rules`.
+
+    Returns:
+        None
+    """
+    for mapping in mapping_rules:
         parent = mapping["parent"] or "*"
 
         if mapping["type"] == "attribute":
             _map_attributes(
-                xml_document,
+                xml_node,
                 mapping["from_name"],
                 mapping["to_name"],
                 parent,
@@ -60,7 +93,7 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
             )
         elif mapping["type"] == "element":
             _map_elements(
-                xml_document,
+                xml_node,
                 mapping["from_name"],
                 mapping["to_name"],
                 parent,
@@ -69,12 +102,30 @@ def map_xml(xml_document: Document, mapper: UploadFile | None):
             )
 
 
-def _get_elements(xml_document: Document, name: str, parent: str):
+def _get_elements_by_tag_name(xml_node: Document | Element, name: str):
+    """
+    Gets all elements with the given name in the XML document,
+    or in the XML element and its descendants, the element included.
+
+    Args:
+        xml_node (Document | Element): The XML document or element to search.
+        name (str): The name of the elements to search for.
+
+    Returns:
+        list[Element]: A list of matching elements.
+    """
+    elements = list(xml_node.getElementsByTagName(name))
+    if isinstance(xml_node, Element) and name in ("*", xml_node.tagName):
+        elements.insert(0, xml_node)
+    return elements
+
+
+def _get_elements(xml_node: Document | Element, name: str, parent: str):
     """
     Gets all elements with the given name that are children of the specified parent element in the XML document.
 
     Args:
-        xml_document (Document): The XML document to search.
+        xml_node (Document | Element): The XML document or element to search.
         name (str): The name of the elements to search for.
         parent (str): The name of the parent element to search under.
 
@@ -82,17 +133,17 @@ def _get_elements(xml_document: Document, name: str, parent: str):
         NodeList[Element]: A list of matching elements.
     """
     if parent == "*":
-        return xml_document.getElementsByTagName(name)
+        return _get_elements_by_tag_name(xml_node, name)
 
     elements = []
-    parent_elements = xml_document.getElementsByTagName(parent)
+    parent_elements = _get_elements_by_tag_name(xml_node, parent)
     for parent_element in parent_elements:
         elements += parent_element.getElementsByTagName(name)
     return elements
 
 
 def _map_elements(
-    xml_document: Document,
+    xml_node: Document | Element,
     from_name: str,
     to_name: str,
     parent: str,
@@ -103,7 +154,7 @@ def _map_elements(
     Maps elements in the XML document from one name to another based on the given rules.
 
     Args:
-        xml_document (Document): The XML document to modify.
+        xml_node (Document | Element): The XML document or element to modify.
         from_name (str): The name of the elements to map.
         to_name (str): The name to map the elements to.
         parent (str): The name of the parent element to search under.
@@ -113,7 +164,7 @@ def _map_elements(
     Returns:
         None
     """
-    elements = _get_elements(xml_document, from_name, parent)
+    elements = _get_elements(xml_node, from_name, parent)
 
     for element in elements:
         if from_alias and alias_context == element.getAttribute("Context"):
@@ -130,7 +181,7 @@ def _map_elements(
 
 
 def _map_attributes(
-    xml_document: Document,
+    xml_node: Document | Element,
     from_name: str,
     to_name: str,
     parent: str,
@@ -140,7 +191,7 @@ def _map_attributes(
     Maps attributes in the XML document from one name to another based on the given rules.
 
     Args:
-        xml_document (Document): The XML document to modify.
+        xml_node (Document | Element): The XML document or element to modify.
         from_name (str): The name of the attribute to map.
         to_name (str): The name to map the attribute to.
         parent (str): The name of the parent element to search under.
@@ -149,12 +200,12 @@ def _map_attributes(
     Returns:
         None
     """
-    elements = xml_document.getElementsByTagName(parent)
+    elements = _get_elements_by_tag_name(xml_node, parent)
 
     for element in elements:
         element_attribute_value = element.getAttribute(from_name)
         if element_attribute_value and to_alias:
-            alias_element = xml_document.createElement("Alias")
+            alias_element = (xml_node.ownerDocument or xml_node).createElement("Alias")
             alias_element.setAttribute("Name", element_attribute_value)
             alias_element.setAttribute("Context", from_name)
             element.appendChild(alias_element)
@@ -1,9 +1,13 @@
 import os
+import re
 from collections import defaultdict
 from typing import Annotated, Any, Mapping
+from xml.sax.saxutils import escape
 
 import yattag
-from docx.shared import Inches
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import nsdecls
+from docx.shared import Emu, Inches
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import NamedStyle
 from openpyxl.utils import get_column_letter
@@ -99,6 +103,8 @@ CHAR_WIDTHS = {
     '"': 0.4,
 }
 
+RUN_BREAKS_RE = re.compile(r"(\t|[\r\n])")
+
 
 class Ref(BaseModel):
     type: Annotated[str | None, Field(title="Referenced item type")]
@@ -265,25 +271,186 @@ def table_to_docx(
                 run.font.bold = True
                 run.font.superscript = True
 
-    # add footnotes
-    if table.footnotes:
-        style_name = styles.get("footnote", [None])[0] if styles else None
+    add_docx_footnotes(docx, table, styles)
+
+    return docx
+
+
+@trace_calls()
+def table_to_docx_xml(
+    table: TableWithFootnotes,
+    styles: Mapping[str, tuple[str, Any]] | None = None,
+    template: str | None = None,
+) -> DocxBuilder:
+    """Renders TableWithFootnotes into a DOCX document by serialising the table to WordprocessingML
+
+    Produces the same document as `table_to_docx()`, but instead of building the table cell by cell with
+    python-docx objects, the whole `w:tbl` element is written as an XML string with the styles, merges and
+    widths resolved up-front, and parsed once into the template document.
+    Cells covered by a spanning cell are expected to be empty (`span=0`), as the contents of merged cells are not moved.
+    """
+
+    # assume horizontal table dimension from number of cells in first row
+    num_cols = sum((c.span for c in table.rows[0].cells))
+
+    # parses an empty template DOCX file into a helper class
+    docx = DocxBuilder(
+        styles=styles, landscape=True, margins=[0.5, 0.5, 0.5, 0.5], template=template
+    )
+
+    # columns share the width between the page margins evenly, like python-docx add_table()
+    col_width = Emu(docx.block_width // num_cols).twips if num_cols else 0
+
+    # resolve style ids once per style instead of once per cell
+    style_ids = {}
 
-        for symbol, footnote in table.footnotes.items():
-            # each footnote is a new paragraph at the end of the document
-            x_para = docx.document.add_paragraph(style=style_name)
+    def paragraph_properties(style):
+        if style not in style_ids:
+            style_name = styles.get(style, [None])[0] if styles else None
+            if style_name:
+                style_id = docx.document.part.get_style_id(
+                    style_name, WD_STYLE_TYPE.PARAGRAPH
+                )
+                style_ids[style] = (
+                    f'<w:pPr><w:pStyle w:val="{_xml_attr(style_id)}"/></w:pPr>'
+                    if style_id
+                    else "<w:pPr/>"
+                )
+            else:
+                style_ids[style] = ""
+        return style_ids[style]
+
+    table_style_id = None
+    if styles and styles.get("table"):
+        table_style_id = docx.document.part.get_style_id(
+            styles["table"][0], WD_STYLE_TYPE.TABLE
+        )
 
-            # footnote symbols into a run (like <span>) with superscript
-            run = x_para.add_run(symbol)
-            run.font.bold = True
-            run.font.superscript = True
+    xml = [f"<w:tbl {nsdecls('w')}><w:tblPr>"]
+    if table_style_id:
+        xml.append(f'<w:tblStyle w:val="{_xml_attr(table_style_id)}"/>')
+    xml.append(
+        '<w:tblW w:type="auto" w:w="0"/><w:tblLayout w:type="autofit"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+        ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>'
+    )
 
-            # footnote text with glue and spacing into a distinct run
-            x_para.add_run(footnote.text_plain)
+    # set width of first column
+    if num_cols:
+        xml.append(f'<w:gridCol w:w="{Inches(4).twips}"/>')
+    xml.append(f'<w:gridCol w:w="{col_width}"/>' * (num_cols - 1))
+    xml.append("</w:tblGrid>")
+
+    empty_cell = (
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr><w:p/></w:tc>'
+    )
+
+    for r, t_row in enumerate((row for row in table.rows if not row.hide)):
+        xml.append("<w:tr>")
+
+        # set header row to repeat on each page
+        if r < table.num_header_rows:
+            xml.append('<w:trPr><w:tblHeader w:val="true"/></w:trPr>')
+
+        num_merge, c = 0, 0
+        for t_cell in t_row.cells[:num_cols]:
+            # cells merged into the previous spanning cell
+            if num_merge:
+                num_merge -= 1
+                continue
+
+            c += 1
+
+            # skip invisible cells (should not get here if spans are coherent)
+            if t_cell.span < 1:
+                xml.append(empty_cell)
+                continue
+
+            span = min(t_cell.span, num_cols - c + 1)
+            num_merge = span - 1
+            c += num_merge
+
+            xml.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width * span}"/>')
+            if span > 1:
+                xml.append(f'<w:gridSpan w:val="{span}"/>')
+
+            # set vertical text direction
+            if t_cell.vertical:
+                xml.append('<w:textDirection w:val="btLr"/>')
+
+            xml.append("</w:tcPr><w:p>")
+            xml.append(paragraph_properties(t_cell.style))
+
+            # set cell text in a run
+            if t_cell.text:
+                xml.append(f"<w:r>{_run_content_xml(t_cell.text)}</w:r>")
+
+            # add footnote symbols to a bold superscript run
+            if t_cell.footnotes:
+                symbols = _run_content_xml("\u00A0".join(t_cell.footnotes))
+                xml.append(
+                    '<w:r><w:rPr><w:b/><w:vertAlign w:val="superscript"/></w:rPr>'
+                    f"{symbols}</w:r>"
+                )
+
+            xml.append("</w:p></w:tc>")
+
+        # fill up rows shorter than the table
+        xml.append(empty_cell * (num_cols - c))
+
+        xml.append("</w:tr>")
+
+    xml.append("</w:tbl>")
+
+    docx.add_table_xml("".join(xml))
+
+    add_docx_footnotes(docx, table, styles)
 
     return docx
 
 
+def add_docx_footnotes(
+    docx: DocxBuilder,
+    table: TableWithFootnotes,
+    styles: Mapping[str, tuple[str, Any]] | None = None,
+):
+    """Adds the footnotes of the table as paragraphs at the end of the document"""
+
+    if not table.footnotes:
+        return
+
+    style_name = styles.get("footnote", [None])[0] if styles else None
+
+    for symbol, footnote in table.footnotes.items():
+        # each footnote is a new paragraph at the end of the document
+        x_para = docx.document.add_paragraph(style=style_name)
+
+        # footnote symbols into a run (like <span>) with superscript
+        run = x_para.add_run(symbol)
+        run.font.bold = True
+        run.font.superscript = True
+
+        # footnote text with glue and spacing into a distinct run
+        x_para.add_run(footnote.text_plain)
+
+
+def _xml_attr(value: str) -> str:
+    return escape(value, {'"': "&quot;"})
+
+
+def _run_content_xml(text: str) -> str:
+    """Serialises text into run content like python-docx: tabs to `w:tab`, line breaks to `w:br`"""
+
+    xml = []
+    for i, chunk in enumerate(RUN_BREAKS_RE.split(text)):
+        if i % 2:
+            xml.append("<w:tab/>" if chunk == "\t" else "<w:br/>")
+        elif chunk:
+            space = ' xml:space="preserve"' if len(chunk.strip()) < len(chunk) else ""
+            xml.append(f"<w:t{space}>{escape(chunk)}</w:t>")
+    return "".join(xml)
+
+
 @trace_calls
 def table_to_html(table: TableWithFootnotes, css_style: str | None = None) -> str:
     """Renders TableWithFootnotes into an HTML document
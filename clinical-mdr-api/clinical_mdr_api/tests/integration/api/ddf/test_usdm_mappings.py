@@ -9,11 +9,15 @@ Tests for DDF adapter endpoints
 # pytest fixture functions have other fixture functions as arguments,
 # which pylint interprets as unused arguments
 
+import logging
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
 from clinical_mdr_api.main import app
 from clinical_mdr_api.models.study_selections.study import Study
+from clinical_mdr_api.services.ddf.usdm_mapper import USDMMapper
 from clinical_mdr_api.tests.integration.utils.api import (
     inject_and_clear_db,
     inject_base_data,
@@ -21,6 +25,8 @@ from clinical_mdr_api.tests.integration.utils.api import (
 from clinical_mdr_api.tests.integration.utils.utils import TestUtils
 from clinical_mdr_api.tests.utils.checks import assert_response_status_code
 
+log = logging.getLogger(__name__)
+
 # Global variables shared between fixtures and tests
 study: Study
 
@@ -50,3 +56,24 @@ def test_ddf_study(api_client):
         f"/usdm/v3/studyDefinitions/{study.uid}",
     )
     assert_response_status_code(response, 200)
+
+
+def test_ddf_study_codes_are_prefetched(api_client, monkeypatch):
+    queries = []
+    query_codes = USDMMapper._query_codes
+
+    def spy_query_codes(self, query, uids):
+        queries.append(uids)
+        return query_codes(self, query, uids)
+
+    monkeypatch.setattr(USDMMapper, "_query_codes", spy_query_codes)
+
+    start = time.perf_counter()
+    response = api_client.get(
+        f"/usdm/v3/studyDefinitions/{study.uid}",
+    )
+    log.info("USDM export of %s took %.3fs", study.uid, time.perf_counter() - start)
+    assert_response_status_code(response, 200)
+
+    # The codes are resolved by the prefetch, one query for CT terms and one for dictionary terms at most
+    assert len(queries) <= 2
@@ -53,9 +53,11 @@ def test_data():
     drop_db("old.json.test.odm.xml.importer")
 
 
-def test_import_odm_xml(api_client):
+@pytest.mark.parametrize("streaming", [False, True])
+def test_import_odm_xml(api_client, streaming):
     response = api_client.post(
         "concepts/odms/metadata/xmls/import",
+        params={"streaming": streaming},
         files={"xml_file": ("odm.xml", import_input1, CONTENT_TYPE)},
     )
 
@@ -66,9 +68,11 @@ def test_import_odm_xml(api_client):
     assert_with_key_exclusion(import_output1, res, ["start_date"])
 
 
-def test_import_odm_vendor_with_csv_mapper(api_client):
+@pytest.mark.parametrize("streaming", [False, True])
+def test_import_odm_vendor_with_csv_mapper(api_client, streaming):
     response = api_client.post(
         "concepts/odms/metadata/xmls/import",
+        params={"streaming": streaming},
         files={
             "xml_file": ("odm.xml", import_input2, CONTENT_TYPE),
             "mapper_file": (
@@ -92,10 +96,12 @@ def test_import_odm_vendor_with_csv_mapper(api_client):
     assert_with_key_exclusion(import_output2, res, ["start_date"])
 
 
-def test_import_clinspark_odm_xml(api_client):
+@pytest.mark.parametrize("streaming", [False, True])
+def test_import_clinspark_odm_xml(api_client, streaming):
     db.cypher_query("MERGE (:CTCatalogue {name:'CDASH CT'})")
     response = api_client.post(
-        "concepts/odms/metadata/xmls/import?exporter=clinspark",
+        "concepts/odms/metadata/xmls/import",
+        params={"exporter": "clinspark", "streaming": streaming},
         files={"xml_file": ("clinspark.xml", clinspark_input, CONTENT_TYPE)},
     )
 
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "benchmark: micro-benchmark, only run when the RUN_BENCHMARKS env var is set",
+    )
+
+
+def pytest_collection_modifyitems(items):
+    """Skips the benchmarks unless the RUN_BENCHMARKS env var is set, as they take a while"""
+
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+
+    skip_benchmark = pytest.mark.skip(
+        reason="Benchmarks are disabled (see RUN_BENCHMARKS env var)"
+    )
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_benchmark)
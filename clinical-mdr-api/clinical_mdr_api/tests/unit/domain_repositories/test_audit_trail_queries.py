@@ -0,0 +1,97 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from clinical_mdr_api.domain_repositories._utils.helpers import (
+    audit_trail_page_clause,
+    audit_trail_window_filter,
+    audit_trail_window_params,
+)
+from clinical_mdr_api.domain_repositories.study_definitions import (
+    study_definition_repository_impl,
+)
+from clinical_mdr_api.domain_repositories.study_definitions.study_definition_repository_impl import (
+    StudyDefinitionRepositoryImpl,
+)
+from common import config
+from common.exceptions import ValidationException
+
+
+def test_audit_trail_window_params_default_to_utc():
+    naive = datetime.datetime(2024, 3, 1, 12, 30)
+    aware = datetime.datetime(
+        2024, 3, 2, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+    )
+
+    params = audit_trail_window_params(since=naive, until=aware)
+
+    assert params == {
+        "since": datetime.datetime(2024, 3, 1, 12, 30, tzinfo=datetime.timezone.utc),
+        "until": aware,
+    }
+    assert audit_trail_window_params() == {"since": None, "until": None}
+
+
+def test_audit_trail_window_filter_uses_the_creating_action():
+    predicate = audit_trail_window_filter("all_so")
+
+    assert "(all_so)<-[:AFTER]-(window_action:StudyAction)" in predicate
+    assert "window_date >= $since" in predicate
+    assert "window_date < $until" in predicate
+
+
+def test_audit_trail_page_clause():
+    assert audit_trail_page_clause(page_number=1, page_size=0) == ""
+    assert audit_trail_page_clause(page_number=3, page_size=10) == " SKIP 20 LIMIT 10"
+
+    with pytest.raises(ValidationException):
+        audit_trail_page_clause(page_number=config.MAX_INT_NEO4J, page_size=10)
+
+
+def test_study_fields_of_sections_match_their_section():
+    sections = {"identification_metadata", "study_population"}
+
+    study_fields = StudyDefinitionRepositoryImpl.get_study_fields_of_sections(sections)
+
+    assert "study_id" in study_fields
+    assert "project_number" in study_fields
+    assert all(
+        StudyDefinitionRepositoryImpl.get_section_name_for_study_field(field)
+        in sections
+        for field in study_fields
+    )
+    assert (
+        StudyDefinitionRepositoryImpl.get_study_fields_of_sections({"Unknown"}) is None
+    )
+
+
+@pytest.mark.parametrize(
+    "study_exists, expected",
+    [pytest.param(True, [], id="no-entries"), pytest.param(False, None, id="no-study")],
+)
+def test_fields_audit_trail_is_filtered_and_paged_in_the_query(study_exists, expected):
+    repository = StudyDefinitionRepositoryImpl(author_id="unknown-user")
+
+    with patch.object(
+        study_definition_repository_impl.db, "cypher_query", return_value=([], [])
+    ) as cypher_query, patch.object(
+        repository, "study_exists_by_uid", return_value=study_exists
+    ):
+        audit_trail = repository.get_audit_trail_by_uid(
+            "Study_000001",
+            field_names=["study_acronym"],
+            since=datetime.datetime(2024, 1, 1),
+            page_number=2,
+            page_size=50,
+        )
+
+    assert audit_trail == expected
+    query, params = cypher_query.call_args.args
+    assert query.rstrip().endswith("SKIP 50 LIMIT 50")
+    assert params == {
+        "studyuid": "Study_000001",
+        "fields": ["study_acronym"],
+        "since": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        "until": None,
+    }
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from clinical_mdr_api.domain_repositories.controlled_terminologies import (
+    ct_lookup_cache,
+)
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_lookup_cache import (
+    CTCodelistLookup,
+    get_codelist_lookups,
+)
+
+EFFECTIVE_DATE = datetime.datetime(2024, 3, 29, 23, 59, 59, 999999)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ct_lookup_cache.cache_store_ct_lookup.clear()
+    yield
+    ct_lookup_cache.cache_store_ct_lookup.clear()
+
+
+class FakeLoader:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, codelist_names: list[str]) -> dict[str, CTCodelistLookup]:
+        self.calls.append(list(codelist_names))
+        return {
+            name: CTCodelistLookup(
+                term_uids=(f"{name}_1", f"{name}_2"),
+                terms={f"{name}_1": f"{name} term"},
+            )
+            for name in codelist_names
+            if name != "Empty"
+        }
+
+
+def test_missing_codelists_are_loaded_together():
+    load = FakeLoader()
+
+    lookups = get_codelist_lookups(["A", "B", "Empty"], EFFECTIVE_DATE, load)
+    assert load.calls == [["A", "B", "Empty"]]
+    assert lookups["A"].term_uids == ("A_1", "A_2")
+    assert lookups["B"].terms == {"B_1": "B term"}
+    assert lookups["Empty"] == CTCodelistLookup()
+
+    lookups = get_codelist_lookups(["A", "C"], EFFECTIVE_DATE, load)
+    assert load.calls[-1] == ["C"]
+    assert set(lookups) == {"A", "C"}
+
+    get_codelist_lookups(["A", "B", "C", "Empty"], EFFECTIVE_DATE, load)
+    assert len(load.calls) == 2
+
+
+def test_lookups_are_cached_per_effective_date():
+    load = FakeLoader()
+
+    get_codelist_lookups(["A"], EFFECTIVE_DATE, load)
+    get_codelist_lookups(["A"], None, load)
+    get_codelist_lookups(["A"], EFFECTIVE_DATE, load)
+
+    assert load.calls == [["A"], ["A"]]
+
+
+def test_lookups_loaded_during_a_clear_are_not_cached():
+    def load(codelist_names):
+        # A CT write clears the store while the terms are being loaded
+        ct_lookup_cache.cache_store_ct_lookup.clear()
+        return FakeLoader()(codelist_names)
+
+    lookups = get_codelist_lookups(["A"], EFFECTIVE_DATE, load)
+
+    assert lookups["A"].term_uids == ("A_1", "A_2")
+    assert ("A", EFFECTIVE_DATE) not in ct_lookup_cache.cache_store_ct_lookup
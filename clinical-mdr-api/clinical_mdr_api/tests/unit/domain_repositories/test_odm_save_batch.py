@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from clinical_mdr_api.domain_repositories.concepts.odms.description_repository import (
+    DescriptionRepository,
+)
+from clinical_mdr_api.domain_repositories.concepts.odms.odm_generic_repository import (
+    SAVE_BATCH_QUERY,
+)
+from clinical_mdr_api.domain_repositories.models.odm import OdmDescriptionRoot
+from clinical_mdr_api.domains.concepts.odms.description import (
+    OdmDescriptionAR,
+    OdmDescriptionVO,
+)
+from clinical_mdr_api.domains.versioned_object_aggregate import LibraryVO
+from clinical_mdr_api.services.user_info import UserInfoService
+
+
+def make_description(uid: str) -> OdmDescriptionAR:
+    return OdmDescriptionAR.from_input_values(
+        author_id="unknown-user",
+        concept_vo=OdmDescriptionVO.from_repository_values(
+            name=f"name {uid}",
+            language="eng",
+            description="description",
+            instruction=None,
+            sponsor_instruction=None,
+        ),
+        library=LibraryVO.from_repository_values(
+            library_name="Sponsor", is_editable=True
+        ),
+        generate_uid_callback=lambda: uid,
+    )
+
+
+@patch.object(
+    UserInfoService, "get_author_username_from_id", return_value="unknown-user"
+)
+@patch("neomodel.db.cypher_query")
+def test_save_batch_creates_approved_concepts_with_one_query(cypher_query, _):
+    items = [make_description(f"OdmDescription_{idx:06}") for idx in range(1, 4)]
+
+    DescriptionRepository().save_batch(items, approve_author_id="unknown-user")
+
+    cypher_query.assert_called_once()
+    query, params = cypher_query.call_args.args
+    assert query == SAVE_BATCH_QUERY.format(
+        library_rel_label="CONTAINS_CONCEPT",
+        root_labels="OdmDescriptionRoot:ConceptRoot",
+        value_labels="OdmDescriptionValue:ConceptValue",
+    )
+    assert [item["uid"] for item in params["items"]] == [item.uid for item in items]
+
+    item = params["items"][0]
+    assert item["library_name"] == "Sponsor"
+    assert item["value"]["name"] == "name OdmDescription_000001"
+    assert item["value"]["language"] == "eng"
+    draft, final = item["versions"]
+    assert (draft["version"], draft["status"]) == ("0.1", "Draft")
+    assert (final["version"], final["status"]) == ("1.0", "Final")
+    assert draft["end_date"] == final["start_date"]
+    assert final["end_date"] is None
+
+
+@patch.object(
+    UserInfoService, "get_author_username_from_id", return_value="unknown-user"
+)
+@patch("neomodel.db.cypher_query")
+def test_save_batch_without_approval_keeps_drafts(cypher_query, _):
+    DescriptionRepository().save_batch([make_description("OdmDescription_000001")])
+
+    (item,) = cypher_query.call_args.args[1]["items"]
+    assert [version["status"] for version in item["versions"]] == ["Draft"]
+
+
+@patch("neomodel.db.cypher_query")
+def test_save_empty_batch_writes_nothing(cypher_query):
+    DescriptionRepository().save_batch([])
+    assert OdmDescriptionRoot.get_next_free_uids_and_increment_counter(0) == []
+
+    cypher_query.assert_not_called()
@@ -0,0 +1,134 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from clinical_mdr_api.domain_repositories.models.study_selections import (
+    StudyActivitySchedule,
+)
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_schedule_repository import (
+    SAVE_BATCH_CREATED_QUERY,
+    SAVE_BATCH_DELETED_QUERY,
+    ScheduleBatch,
+    StudyActivityScheduleRepository,
+)
+from clinical_mdr_api.domains.study_selections.study_activity_schedule import (
+    StudyActivityScheduleVO,
+)
+from common.exceptions import BusinessLogicException, NotFoundException
+
+
+def make_batch() -> ScheduleBatch:
+    return ScheduleBatch(
+        study_uid="Study_000001",
+        study_activities={"StudyActivity_000001": "StudyActivityInstance_000001"},
+        study_visit_uids={"StudyVisit_000001", "StudyVisit_000002"},
+        schedules={
+            "StudyActivitySchedule_000001": (
+                "StudyActivity_000001",
+                "StudyVisit_000001",
+            )
+        },
+    )
+
+
+def make_schedule(study_activity_uid: str, study_visit_uid: str):
+    return StudyActivityScheduleVO(
+        study_uid="Study_000001",
+        study_activity_uid=study_activity_uid,
+        study_activity_instance_uid=None,
+        study_visit_uid=study_visit_uid,
+        author_id="unknown-user",
+        start_date=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+def test_create_validates_against_previous_operations():
+    batch = make_batch()
+
+    batch.create(make_schedule("StudyActivity_000001", "StudyVisit_000002"))
+    with pytest.raises(BusinessLogicException) as exc:
+        batch.create(make_schedule("StudyActivity_000001", "StudyVisit_000002"))
+    assert "already exist a schedule" in exc.value.msg
+
+    with pytest.raises(NotFoundException) as exc:
+        batch.create(make_schedule("StudyActivity_000009", "StudyVisit_000002"))
+    assert "Study Activity with UID 'StudyActivity_000009'" in exc.value.msg
+
+    with pytest.raises(NotFoundException) as exc:
+        batch.create(make_schedule("StudyActivity_000001", "StudyVisit_000009"))
+    assert "Study Visit with UID 'StudyVisit_000009'" in exc.value.msg
+
+    assert len(batch.created) == 1
+
+
+def test_delete_then_create_same_cell():
+    batch = make_batch()
+
+    with pytest.raises(BusinessLogicException):
+        batch.create(make_schedule("StudyActivity_000001", "StudyVisit_000001"))
+
+    batch.delete("StudyActivitySchedule_000001", "unknown-user")
+    batch.create(make_schedule("StudyActivity_000001", "StudyVisit_000001"))
+
+    assert [vo.uid for vo in batch.deleted] == ["StudyActivitySchedule_000001"]
+    assert batch.deleted[0].study_visit_uid == "StudyVisit_000001"
+    assert len(batch.created) == 1
+
+    with pytest.raises(NotFoundException) as exc:
+        batch.delete("StudyActivitySchedule_000001", "unknown-user")
+    assert "Study Activity Schedule" in exc.value.msg
+
+
+@patch.object(StudyActivitySchedule, "get_next_free_uids_and_increment_counter")
+@patch("neomodel.db.cypher_query")
+def test_save_batch_writes_with_one_query_per_kind_of_operation(
+    cypher_query, get_next_free_uids
+):
+    batch = make_batch()
+    batch.delete("StudyActivitySchedule_000001", "unknown-user")
+    for idx in range(2, 300):
+        batch.study_visit_uids.add(f"StudyVisit_{idx:06}")
+    for visit_uid in sorted(batch.study_visit_uids):
+        batch.create(make_schedule("StudyActivity_000001", visit_uid))
+    get_next_free_uids.return_value = [
+        f"StudyActivitySchedule_{idx:06}" for idx in range(2, 301)
+    ]
+    cypher_query.return_value = ([], None)
+
+    created = StudyActivityScheduleRepository().save_batch(batch, "unknown-user")
+
+    get_next_free_uids.assert_called_once_with(299)
+    assert cypher_query.call_count == 2
+    (deleted_query, deleted_params), (created_query, created_params) = (
+        call.args for call in cypher_query.call_args_list
+    )
+    assert deleted_query == SAVE_BATCH_DELETED_QUERY
+    assert deleted_params["deleted"] == [
+        {
+            "uid": "StudyActivitySchedule_000001",
+            "study_activity_uid": "StudyActivity_000001",
+            "study_visit_uid": "StudyVisit_000001",
+        }
+    ]
+    assert created_query == SAVE_BATCH_CREATED_QUERY
+    assert len(created_params["created"]) == 299
+    assert created_params["created"][0] == {
+        "uid": "StudyActivitySchedule_000002",
+        "study_activity_uid": "StudyActivity_000001",
+        "study_visit_uid": "StudyVisit_000001",
+    }
+    assert created_params["date"] == deleted_params["date"]
+
+    assert [vo.uid for vo in created] == [
+        f"StudyActivitySchedule_{idx:06}" for idx in range(2, 301)
+    ]
+    assert created[0].study_visit_uid == "StudyVisit_000001"
+    assert created[0].study_activity_instance_uid == "StudyActivityInstance_000001"
+    assert all(vo.author_id == "unknown-user" for vo in created)
+
+
+@patch("neomodel.db.cypher_query")
+def test_save_empty_batch_writes_nothing(cypher_query):
+    assert StudyActivityScheduleRepository().save_batch(make_batch(), "user") == []
+    cypher_query.assert_not_called()
@@ -0,0 +1,241 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_codelist_name_repository import (
+    CTCodelistNameRepository,
+)
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_codelist_repository import (
+    DictionaryCodelistGenericRepository,
+)
+from clinical_mdr_api.domain_repositories.models.template_parameter import (
+    TemplateParameterTermRoot,
+)
+from clinical_mdr_api.domain_repositories.template_parameters import complex_parameter
+from clinical_mdr_api.domain_repositories.template_parameters.complex_parameter import (
+    ComplexTemplateParameterRepository,
+    ParameterConcept,
+    refresh_template_parameter_terms,
+)
+from clinical_mdr_api.repositories.cache_invalidation import set_cache_invalidation_bus
+
+
+def term(uid, name, type_="Activity"):
+    return {"uid": uid, "name": name, "type": type_}
+
+
+ACTIVITY_TERMS = [term(f"Activity_{i:06}", f"activity {i}") for i in range(5)]
+INTERVENTION_TERMS = [term("Compound_000001", "compound", "Compound")]
+
+
+def fake_cypher_query(query, params=None):
+    if query == complex_parameter.PARAMETER_TERMS_QUERY:
+        catalogue = {"Activity": ACTIVITY_TERMS, "Intervention": INTERVENTION_TERMS}
+        names = params["names"] if params["names"] is not None else list(catalogue)
+        return [[name, catalogue[name]] for name in names if name in catalogue], []
+    if query == complex_parameter.PARAMETERS_OF_TERM_QUERY:
+        return ([["Activity"]], []) if params["uid"] == "Activity_000001" else ([], [])
+    if query == complex_parameter.PARAMETERS_OF_CODELIST_QUERY:
+        return (
+            ([["Activity"]], []) if params["uid"] == "CTCodelist_000001" else ([], [])
+        )
+    return [], []
+
+
+class Saver:
+    @refresh_template_parameter_terms
+    def save(self, item):
+        return item.uid
+
+
+class TestTemplateParameterCatalogue(unittest.TestCase):
+    def setUp(self):
+        set_cache_invalidation_bus(None)
+        ComplexTemplateParameterRepository.cache_store_parameter_terms.clear()
+        ComplexTemplateParameterRepository.cache_store_parameter_names.clear()
+        ComplexTemplateParameterRepository.cache_store_parameter_concepts.clear()
+        ComplexTemplateParameterRepository.cache_store_parameter_concepts[
+            "concepts"
+        ] = [ParameterConcept("TimeUnit", [term("UnitDefinition_000001", "day")])]
+        patcher = patch.object(
+            complex_parameter.db, "cypher_query", side_effect=fake_cypher_query
+        )
+        self.cypher_query = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = ComplexTemplateParameterRepository()
+
+    def tearDown(self):
+        ComplexTemplateParameterRepository.cache_store_parameter_terms.clear()
+        ComplexTemplateParameterRepository.cache_store_parameter_names.clear()
+        ComplexTemplateParameterRepository.cache_store_parameter_concepts.clear()
+
+    def test_catalogue_is_loaded_once(self):
+        assert self.repository.find_values("Activity") == ACTIVITY_TERMS
+        assert self.repository.find_values("Intervention") == INTERVENTION_TERMS
+        assert self.repository.find_values("Activity") == ACTIVITY_TERMS
+
+        self.cypher_query.assert_called_once()
+        assert self.cypher_query.call_args.args[1] == {"names": None}
+
+    def test_unknown_parameter_is_looked_up_once(self):
+        self.repository.find_values("Activity")
+
+        assert not self.repository.find_values("Unknown")
+        assert self.repository.get_parameter_including_terms("Unknown") is None
+
+        assert self.cypher_query.call_count == 2
+        assert self.cypher_query.call_args.args[1] == {"names": ["Unknown"]}
+
+    def test_parameters_with_samples_are_served_from_the_catalogue(self):
+        expected = [
+            {"name": "Activity", "terms": ACTIVITY_TERMS[:3]},
+            {"name": "Intervention", "terms": INTERVENTION_TERMS},
+            {"name": "TimeUnit", "values": [term("UnitDefinition_000001", "day")]},
+        ]
+        assert self.repository.find_extended() == expected
+
+        Saver().save(Mock(uid="Activity_000001"))
+        self.cypher_query.reset_mock()
+
+        assert self.repository.find_extended() == expected
+        # Only the evicted parameter is loaded again
+        self.cypher_query.assert_called_once_with(
+            complex_parameter.PARAMETER_TERMS_QUERY, {"names": ["Activity"]}
+        )
+
+    def test_parameter_including_terms(self):
+        assert self.repository.get_parameter_including_terms("Activity") == {
+            "name": "Activity",
+            "terms": ACTIVITY_TERMS[:3],
+        }
+        assert self.repository.get_parameter_including_terms("TimeUnit") == {
+            "name": "TimeUnit",
+            "values": [term("UnitDefinition_000001", "day")],
+        }
+
+    def test_saving_a_term_evicts_its_parameters(self):
+        self.repository.find_values("Activity")
+
+        Saver().save(Mock(uid="Activity_000001"))
+
+        catalogue = ComplexTemplateParameterRepository.cache_store_parameter_terms
+        assert "Activity" not in catalogue
+        assert "Intervention" in catalogue
+
+        self.cypher_query.reset_mock()
+        assert self.repository.find_values("Activity") == ACTIVITY_TERMS
+        assert self.cypher_query.call_args.args[1] == {"names": ["Activity"]}
+
+    def test_parameters_are_evicted_once_the_transaction_is_committed(self):
+        self.repository.find_values("Activity")
+        transaction = Mock(spec=["commit"])
+
+        with patch.object(complex_parameter.db, "_active_transaction", transaction):
+            Saver().save(Mock(uid="Activity_000001"))
+            assert (
+                "Activity"
+                in ComplexTemplateParameterRepository.cache_store_parameter_terms
+            )
+
+            transaction.commit()
+
+        assert (
+            "Activity"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_terms
+        )
+
+    def test_saving_an_item_which_is_not_a_term(self):
+        self.repository.find_values("Activity")
+
+        Saver().save(Mock(uid="Activity_000009"))
+
+        assert len(ComplexTemplateParameterRepository.cache_store_parameter_terms) == 2
+
+    def test_changing_the_terms_of_a_codelist_evicts_its_parameters(self):
+        self.repository.find_values("Activity")
+        transaction = Mock(spec=["commit"])
+
+        with patch.object(complex_parameter.db, "_active_transaction", transaction):
+            ComplexTemplateParameterRepository.evict_parameters_of_codelist(
+                "CTCodelist_000001"
+            )
+            assert (
+                "Activity"
+                in ComplexTemplateParameterRepository.cache_store_parameter_terms
+            )
+
+            transaction.commit()
+
+        catalogue = ComplexTemplateParameterRepository.cache_store_parameter_terms
+        assert "Activity" not in catalogue
+        assert "Intervention" in catalogue
+        assert "names" in ComplexTemplateParameterRepository.cache_store_parameter_names
+
+    def test_codelist_becoming_a_parameter_evicts_the_parameter_names(self):
+        assert self.repository.get_parameter_names() == ["Activity", "Intervention"]
+        codelist = Mock(
+            uid="DictionaryCodelist_000001",
+            repository_closure_data=None,
+            dictionary_codelist_vo=Mock(is_template_parameter=True),
+        )
+
+        with patch.object(
+            TemplateParameterTermRoot, "generate_node_uids_if_not_present"
+        ):
+            DictionaryCodelistGenericRepository()._maintain_parameters(
+                codelist, root=Mock(), value=Mock()
+            )
+
+        assert (
+            "names"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_names
+        )
+
+    def test_ct_codelist_becoming_a_parameter_evicts_the_parameter_names(self):
+        assert self.repository.get_parameter_names() == ["Activity", "Intervention"]
+        codelist = Mock(
+            uid="CTCodelist_000001",
+            repository_closure_data=None,
+            ct_codelist_vo=Mock(is_template_parameter=True),
+        )
+
+        with patch.object(
+            TemplateParameterTermRoot, "generate_node_uids_if_not_present"
+        ):
+            CTCodelistNameRepository()._maintain_parameters(
+                codelist, root=Mock(), value=Mock()
+            )
+
+        assert (
+            "Activity"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_terms
+        )
+        assert (
+            "names"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_names
+        )
+
+    def test_ct_codelist_stopping_being_a_parameter_evicts_it_first(self):
+        assert self.repository.get_parameter_names() == ["Activity", "Intervention"]
+        previous_codelist = Mock(ct_codelist_vo=Mock(is_template_parameter=True))
+        codelist = Mock(
+            uid="CTCodelist_000001",
+            repository_closure_data=(Mock(), Mock(), Mock(), previous_codelist),
+            ct_codelist_vo=Mock(is_template_parameter=False),
+        )
+        self.cypher_query.reset_mock()
+
+        CTCodelistNameRepository()._maintain_parameters(
+            codelist, root=Mock(), value=Mock()
+        )
+
+        queries = [call.args[0] for call in self.cypher_query.call_args_list]
+        assert queries[0] == complex_parameter.PARAMETERS_OF_CODELIST_QUERY
+        assert "REMOVE codelist_ver_value:TemplateParameter" in queries[1]
+        assert (
+            "Activity"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_terms
+        )
+        assert (
+            "names"
+            not in ComplexTemplateParameterRepository.cache_store_parameter_names
+        )
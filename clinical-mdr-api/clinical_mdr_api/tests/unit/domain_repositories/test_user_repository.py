@@ -0,0 +1,41 @@
+from clinical_mdr_api.domain_repositories.user_repository import (
+    AuthorUsernameLoader,
+    collect_author_ids,
+)
+
+
+class FakeUserRepository:
+    def __init__(self, usernames: dict[str, str]):
+        self.usernames = usernames
+        self.queries: list[list[str]] = []
+
+    def get_usernames_by_ids(self, ids: list[str]) -> dict[str, str]:
+        self.queries.append(sorted(ids))
+        return {key: self.usernames[key] for key in ids if key in self.usernames}
+
+
+def test_collect_author_ids():
+    rows = [
+        {"uid": "Item_1", "author_id": "user-1", "nested": {"author_id": "user-2"}},
+        {"uid": "Item_2", "author_id": None, "versions": [{"author_id": "user-3"}]},
+        ["user-4", {"author_id": "user-1"}],
+    ]
+
+    assert collect_author_ids(rows) == {"user-1", "user-2", "user-3"}
+
+
+def test_loader_resolves_primed_ids_with_one_query():
+    repo = FakeUserRepository({f"user-{idx}": f"User {idx}" for idx in range(100)})
+    loader = AuthorUsernameLoader(repo)
+
+    loader.prime(f"user-{idx}" for idx in range(150))
+    usernames = [loader.load(f"user-{idx}") for idx in range(150)]
+
+    assert len(repo.queries) == 1
+    assert usernames[0] == "User 0"
+    # Unknown users fall back to their id
+    assert usernames[120] == "user-120"
+
+    loader.load("user-200")
+    assert repo.queries[-1] == ["user-200"]
+    assert len(repo.queries) == 2
@@ -1,4 +1,7 @@
 # pylint: disable=no-member
+import logging
+import time
+import zipfile
 from typing import Mapping
 
 import bs4
@@ -12,9 +15,12 @@ from clinical_mdr_api.services.utils.table_f import (
     TableRow,
     TableWithFootnotes,
     table_to_docx,
+    table_to_docx_xml,
     table_to_html,
 )
 
+log = logging.getLogger(__name__)
+
 DOCX_TEXT_DIRECTION_VALUE = (
     "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val"
 )
@@ -313,11 +319,12 @@ def compare_html_footnotes(doc: bs4.BeautifulSoup, test_table: TableWithFootnote
         ), f"footnote plain-text doesn't match in row {r}"
 
 
+@pytest.mark.parametrize("renderer", [table_to_docx, table_to_docx_xml])
 @pytest.mark.parametrize("test_table", [TEST_TABLE])
-def test_table_to_docx(test_table: TableWithFootnotes):
+def test_table_to_docx(test_table: TableWithFootnotes, renderer):
     """Tests table_to_docx() by comparing DOCX document to TableWithFootnotes input"""
 
-    docx_doc: docx.Document = table_to_docx(test_table, styles=DOCX_STYLES).document
+    docx_doc: docx.Document = renderer(test_table, styles=DOCX_STYLES).document
 
     # THEN the document contains exactly one table
     assert len(docx_doc.tables) == 1, "expected exactly 1 table in DOCX SoA"
@@ -446,3 +453,108 @@ def compare_docx_footnotes(
         assert (
             textx == footnote.text_plain
         ), f"footnote text doesn't match in row {row_idx}"
+
+
+def make_soa_table(num_visits: int, num_activities: int) -> TableWithFootnotes:
+    """Generates a SoA-like table with spanning, vertical, hidden and footnoted cells"""
+
+    rows = [
+        TableRow(
+            cells=[TableCell("Visit", style="head")]
+            + [
+                TableCell(
+                    f"V{i}",
+                    style="head",
+                    vertical=True,
+                    footnotes=["a"] if i % 7 == 0 else None,
+                )
+                for i in range(num_visits)
+            ]
+        ),
+        TableRow(
+            cells=[TableCell("Epoch", style="head")]
+            + [
+                cell
+                for i in range(num_visits // 3)
+                for cell in (
+                    TableCell(f"Epoch <{i}> & more", span=3, style="head"),
+                    TableCell(span=0),
+                    TableCell(span=0),
+                )
+            ]
+            + [TableCell("-") for _ in range(num_visits % 3)]
+        ),
+    ]
+
+    texts = ["Activity\tname", " leading", "trailing ", "two\nlines", "", "plain"]
+    for a in range(num_activities):
+        rows.append(
+            TableRow(
+                hide=a % 10 == 9,
+                cells=[
+                    TableCell(
+                        texts[a % len(texts)],
+                        style="data" if a % 2 else None,
+                        footnotes=["hello", "z13"] if a % 11 == 0 else None,
+                    )
+                ]
+                + [TableCell("X" if (a + v) % 3 else "") for v in range(num_visits)],
+            )
+        )
+
+    return TableWithFootnotes(
+        rows=rows,
+        num_header_rows=2,
+        num_header_cols=1,
+        footnotes=TEST_TABLE.footnotes,
+    )
+
+
+def get_document_xml(docx_builder) -> bytes:
+    with zipfile.ZipFile(docx_builder.get_document_stream()) as archive:
+        return archive.read("word/document.xml")
+
+
+@pytest.mark.parametrize(
+    "test_table", [TEST_TABLE, make_soa_table(num_visits=20, num_activities=40)]
+)
+@pytest.mark.parametrize(
+    "styles, template",
+    [
+        (DOCX_STYLES, None),
+        (None, None),
+        (DOCX_STYLES, "operational-soa-template.docx"),
+    ],
+)
+def test_table_to_docx_xml_matches_table_to_docx(
+    test_table: TableWithFootnotes, styles, template
+):
+    """Tests that table_to_docx_xml() renders the same document as table_to_docx()"""
+
+    expected = get_document_xml(table_to_docx(test_table, styles, template))
+    actual = get_document_xml(table_to_docx_xml(test_table, styles, template))
+
+    # THEN documents are byte-for-byte equivalent
+    assert actual == expected
+
+
+@pytest.mark.benchmark
+def test_table_to_docx_benchmark():
+    num_visits, num_activities = 60, 300
+    table = make_soa_table(num_visits, num_activities)
+
+    start = time.perf_counter()
+    table_to_docx(table, styles=DOCX_STYLES).get_document_stream()
+    reference_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table_to_docx_xml(table, styles=DOCX_STYLES).get_document_stream()
+    xml_secs = time.perf_counter() - start
+
+    log.info(
+        "Rendering DOCX of %s visits x %s activities: python-docx %.3fs, xml %.3fs",
+        num_visits,
+        num_activities,
+        reference_secs,
+        xml_secs,
+    )
@@ -1,9 +1,9 @@
 from typing import Annotated
 
 import pytest
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 
-from clinical_mdr_api.models.utils import InputModel, sanitize_html
+from clinical_mdr_api.models.utils import CustomPage, InputModel, sanitize_html
 
 TEXT_INPUTS = [
     (" HellO", "HellO"),
@@ -105,3 +105,34 @@ def test_input_model(
     assert obj.title == input_string.strip()
     assert obj.body == expected_sanitized_string
     assert obj.tags is None
+
+
+@pytest.mark.parametrize(
+    "cursor_mode, next_cursor, expected_keys",
+    [
+        (False, None, ["items", "total", "page", "size"]),
+        (False, "ignored", ["items", "total", "page", "size"]),
+        (True, "abc", ["items", "total", "page", "size", "next_cursor"]),
+        (True, None, ["items", "total", "page", "size", "next_cursor"]),
+    ],
+)
+def test_custom_page_next_cursor_only_in_cursor_mode(
+    cursor_mode: bool, next_cursor: str | None, expected_keys: list[str]
+):
+    page = CustomPage[int].create(
+        items=[1, 2],
+        total=2,
+        page=1,
+        size=10,
+        next_cursor=next_cursor,
+        cursor_mode=cursor_mode,
+    )
+
+    # FastAPI dumps the returned page and validates it again against the response model
+    adapter = TypeAdapter(CustomPage[int])
+    res = adapter.dump_python(
+        adapter.validate_python(page.model_dump(by_alias=True)), mode="json"
+    )
+    assert list(res.keys()) == expected_keys
+    if cursor_mode:
+        assert res["next_cursor"] == next_cursor
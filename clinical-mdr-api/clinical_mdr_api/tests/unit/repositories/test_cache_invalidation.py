@@ -0,0 +1,198 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from cachetools import TTLCache
+
+from clinical_mdr_api.repositories import cache_invalidation
+from clinical_mdr_api.repositories._utils import sb_clear_cache
+from clinical_mdr_api.repositories.cache_invalidation import (
+    CacheInvalidationEvent,
+    FileCacheInvalidationBus,
+    InProcessCacheInvalidationBus,
+    cache_target_name,
+    invalidate_cache_after_commit,
+    resolve_cache_target,
+    set_cache_invalidation_bus,
+)
+
+
+class CachedRepository:
+    cache_store_item_by_uid = TTLCache(maxsize=100, ttl=3600)
+    cache_store_lookup = TTLCache(maxsize=100, ttl=3600)
+
+    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    def save(self):
+        pass
+
+    @sb_clear_cache(
+        caches=["cache_store_item_by_uid"], caches_after_commit=["cache_store_lookup"]
+    )
+    def save_lookup(self):
+        pass
+
+
+class DerivedCachedRepository(CachedRepository):
+    pass
+
+
+class TestCacheInvalidation(unittest.TestCase):
+    def setUp(self):
+        CachedRepository.cache_store_item_by_uid.clear()
+        CachedRepository.cache_store_lookup.clear()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "events.log")
+        with open(self.path, "wb"):
+            pass
+
+    def tearDown(self):
+        set_cache_invalidation_bus(None)
+        shutil.rmtree(self.directory)
+
+    def test_cache_target_name_uses_declaring_class(self):
+        target = cache_target_name(DerivedCachedRepository(), "cache_store_item_by_uid")
+
+        assert target == f"{__name__}:CachedRepository.cache_store_item_by_uid"
+        assert resolve_cache_target(target) is CachedRepository.cache_store_item_by_uid
+
+    def test_resolve_cache_target_of_not_imported_module(self):
+        assert resolve_cache_target("not.imported.module:Repo.cache") is None
+
+    def test_event_json_round_trip(self):
+        event = CacheInvalidationEvent(
+            target="module:Repo.cache", keys=(("Repo", "uid-1"), "uid-2"), origin="x"
+        )
+
+        assert CacheInvalidationEvent.from_json(event.to_json()) == event
+
+    def test_in_process_bus_clears_whole_store_or_keys(self):
+        bus = InProcessCacheInvalidationBus()
+        target = cache_target_name(CachedRepository, "cache_store_item_by_uid")
+        cache = CachedRepository.cache_store_item_by_uid
+        cache["a"] = 1
+        cache["b"] = 2
+
+        bus.publish(target, ("a",))
+        assert "a" not in cache and cache["b"] == 2
+
+        bus.publish(target)
+        assert cache.currsize == 0
+
+    def test_sb_clear_cache_publishes_on_bus(self):
+        bus = InProcessCacheInvalidationBus()
+        received = []
+        bus.add_listener(received.append)
+        set_cache_invalidation_bus(bus)
+        CachedRepository.cache_store_item_by_uid["a"] = 1
+
+        DerivedCachedRepository().save()
+
+        assert CachedRepository.cache_store_item_by_uid.currsize == 0
+        assert [event.target for event in received] == [
+            f"{__name__}:CachedRepository.cache_store_item_by_uid"
+        ]
+
+    def test_invalidate_cache_after_commit(self):
+        cache = CachedRepository.cache_store_item_by_uid
+        cache["a"] = 1
+        cache["b"] = 2
+        transaction = Mock(spec=["commit"])
+
+        with patch.object(cache_invalidation.db, "_active_transaction", transaction):
+            invalidate_cache_after_commit(
+                CachedRepository, "cache_store_item_by_uid", ("a",)
+            )
+            invalidate_cache_after_commit(
+                CachedRepository, "cache_store_item_by_uid", ("b",)
+            )
+            assert cache.currsize == 2
+
+            transaction.commit()
+            assert cache.currsize == 0
+
+        cache["a"] = 1
+        # Without an active transaction the cache is cleared immediately
+        invalidate_cache_after_commit(CachedRepository, "cache_store_item_by_uid")
+        assert cache.currsize == 0
+
+    def test_sb_clear_cache_after_commit(self):
+        CachedRepository.cache_store_item_by_uid["a"] = 1
+        CachedRepository.cache_store_lookup["a"] = 1
+        transaction = Mock(spec=["commit"])
+
+        with patch.object(cache_invalidation.db, "_active_transaction", transaction):
+            CachedRepository().save_lookup()
+            assert CachedRepository.cache_store_item_by_uid.currsize == 0
+            # Only cleared once the write is committed
+            assert CachedRepository.cache_store_lookup["a"] == 1
+
+            transaction.commit()
+            assert CachedRepository.cache_store_lookup.currsize == 0
+
+    def test_file_bus_propagates_to_other_workers(self):
+        worker_1 = FileCacheInvalidationBus(self.path)
+        worker_2 = FileCacheInvalidationBus(self.path)
+        target = cache_target_name(CachedRepository, "cache_store_item_by_uid")
+
+        worker_1.publish(target)
+        # Item cached after the write was published by the other worker
+        CachedRepository.cache_store_item_by_uid["a"] = 1
+
+        assert worker_1.poll() == 0
+        assert CachedRepository.cache_store_item_by_uid["a"] == 1
+        assert worker_2.poll() == 1
+        assert CachedRepository.cache_store_item_by_uid.currsize == 0
+        assert worker_2.poll() == 0
+
+    def test_file_bus_skips_partial_and_malformed_lines(self):
+        worker = FileCacheInvalidationBus(self.path)
+        with open(self.path, "ab") as file:
+            file.write(b"not-json\n")
+            file.write(b'{"target": "module:Repo.cache"')
+
+        assert worker.poll() == 0
+
+        with open(self.path, "ab") as file:
+            file.write(b', "origin": "other"}\n')
+
+        assert worker.poll() == 1
+
+    def test_file_bus_ignores_events_published_before_start(self):
+        FileCacheInvalidationBus(self.path).publish("module:Repo.cache")
+
+        assert FileCacheInvalidationBus(self.path).poll() == 0
+
+    def test_file_bus_rotates_file(self):
+        worker_1 = FileCacheInvalidationBus(self.path, max_size=200)
+        worker_2 = FileCacheInvalidationBus(self.path, max_size=200)
+
+        for i in range(10):
+            worker_1.publish(f"module:Repo.cache_{i}")
+
+        # every publish after the file grew over max_size rotated it
+        assert os.path.getsize(self.path) <= 200
+        assert os.path.exists(f"{self.path}.1")
+        assert worker_2.poll() < 10
+
+        worker_1.publish("module:Repo.cache_last")
+        assert worker_2.poll() == 1
+
+    def test_file_bus_reads_rotated_file_to_the_end(self):
+        worker_1 = FileCacheInvalidationBus(self.path, max_size=1)
+        worker_2 = FileCacheInvalidationBus(self.path, max_size=1)
+        target = cache_target_name(CachedRepository, "cache_store_item_by_uid")
+        CachedRepository.cache_store_item_by_uid["a"] = 1
+
+        # the event is rotated away right after being written
+        worker_1.publish(target)
+        assert not os.path.exists(self.path)
+
+        assert worker_2.poll() == 1
+        assert CachedRepository.cache_store_item_by_uid.currsize == 0
+
+        # the new file is read from its start
+        with open(self.path, "ab") as file:
+            file.write(b'{"target": "module:Repo.cache", "origin": "other"}\n')
+        assert worker_2.poll() == 1
@@ -0,0 +1,126 @@
+import json
+from unittest.mock import patch
+
+from neo4j.time import Date, DateTime
+
+from clinical_mdr_api.repositories import ct_packages
+
+STORED_CHANGES = {
+    "new_codelists": [
+        {
+            "uid": "C1",
+            "value_node": {
+                "name": "Codelist one",
+                "different": {
+                    "effective_date": {
+                        "left": {"$date": "2023-03-31"},
+                        "right": {"$date": "2023-06-30"},
+                    }
+                },
+            },
+            "change_date": {"$datetime": "2023-06-30T00:00:00.000000000+00:00"},
+        }
+    ],
+    "deleted_codelists": [],
+    "updated_codelists": [],
+    "new_terms": [],
+    "deleted_terms": [],
+    "updated_terms": [],
+}
+
+
+def test_stored_ct_packages_changes_are_decoded():
+    with patch.object(
+        ct_packages.db,
+        "cypher_query",
+        return_value=([[json.dumps(STORED_CHANGES)]], []),
+    ) as cypher_query:
+        changes = ct_packages.get_stored_ct_packages_changes(
+            old_package_name="SDTM CT 2023-03-31",
+            new_package_name="SDTM CT 2023-06-30",
+        )
+
+    assert cypher_query.call_args.args[1] == {
+        "old_package_name": "SDTM CT 2023-03-31",
+        "new_package_name": "SDTM CT 2023-06-30",
+    }
+    assert changes["new_codelists"][0]["change_date"] == DateTime.from_iso_format(
+        "2023-06-30T00:00:00.000000000+00:00"
+    )
+    # The dates are restored at any depth
+    assert changes["new_codelists"][0]["value_node"] == {
+        "name": "Codelist one",
+        "different": {
+            "effective_date": {
+                "left": Date(2023, 3, 31),
+                "right": Date(2023, 6, 30),
+            }
+        },
+    }
+
+
+def test_ct_packages_changes_are_computed_when_not_stored():
+    for stored_result in ([], [[None]]):
+        with patch.object(
+            ct_packages.db, "cypher_query", return_value=(stored_result, [])
+        ):
+            assert (
+                ct_packages.get_stored_ct_packages_changes(
+                    old_package_name="SDTM CT 2022-12-16",
+                    new_package_name="SDTM CT 2023-06-30",
+                )
+                is None
+            )
+
+    with patch.object(
+        ct_packages, "get_stored_ct_packages_changes", return_value=None
+    ), patch.object(
+        ct_packages, "compute_ct_packages_changes", return_value={"new_terms": []}
+    ) as compute_changes:
+        # Bypass the transaction handling of the decorated function
+        changes = ct_packages.get_ct_packages_changes.__wrapped__(
+            old_package_name="SDTM CT 2022-12-16",
+            new_package_name="SDTM CT 2023-06-30",
+        )
+
+    assert changes == {"new_terms": []}
+    compute_changes.assert_called_once_with(
+        old_package_name="SDTM CT 2022-12-16",
+        new_package_name="SDTM CT 2023-06-30",
+    )
+
+
+def test_package_changes_by_year_only_reads_the_stored_counters():
+    with patch.object(
+        ct_packages.db,
+        "cypher_query",
+        return_value=([[2023, 1, 2, 3, 4, 5, 6], [2024, 0, 1, 0, 2, 0, 0]], []),
+    ) as cypher_query, patch.object(
+        ct_packages, "compute_ct_packages_changes"
+    ) as compute_changes:
+        # Bypass the transaction handling of the decorated function
+        stats = ct_packages.get_package_changes_by_year.__wrapped__()
+
+    # The packages are never compared when reading the statistics
+    cypher_query.assert_called_once()
+    compute_changes.assert_not_called()
+    assert stats == [
+        {
+            "year": 2023,
+            "added_codelists": 1,
+            "updated_codelists": 2,
+            "deleted_codelists": 3,
+            "added_terms": 4,
+            "updated_terms": 5,
+            "deleted_terms": 6,
+        },
+        {
+            "year": 2024,
+            "added_codelists": 0,
+            "updated_codelists": 1,
+            "deleted_codelists": 0,
+            "added_terms": 2,
+            "updated_terms": 0,
+            "deleted_terms": 0,
+        },
+    ]
@@ -0,0 +1,201 @@
+import re
+import unittest
+from datetime import datetime, timezone
+
+from clinical_mdr_api.repositories._utils import (
+    CURSOR_SORT_KEY_ALIAS,
+    CypherQueryBuilder,
+    decode_cursor,
+    encode_cursor,
+)
+from common.exceptions import ValidationException
+
+MATCH_CLAUSE = "MATCH (n:Node)"
+ALIAS_CLAUSE = "n.uid AS uid, n.name AS name"
+
+
+def matches_cursor_clause(query: CypherQueryBuilder, row: dict) -> bool:
+    """Evaluates the keyset predicate of the query on a row, for the simple predicates built on aliases"""
+
+    if not query.cursor_clause:
+        return True
+    expression = query.cursor_clause.removeprefix("WITH * WHERE ")
+    expression = re.sub(r"\$(cursor_\d+)", r"parameters['\1']", expression)
+    for cypher, python in (
+        (" IS NOT NULL", " is not None"),
+        (" IS NULL", " is None"),
+        (" AND ", " and "),
+        (" OR ", " or "),
+        (" = ", " == "),
+        ("false", "False"),
+    ):
+        expression = expression.replace(cypher, python)
+    # pylint: disable=eval-used
+    return eval(expression, {"parameters": query.parameters}, dict(row))
+
+
+class TestCypherQueryBuilderCursor(unittest.TestCase):
+    def test_page_number_pagination_is_unchanged(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": True},
+            implicit_sort_by="uid",
+            page_number=3,
+            page_size=10,
+        )
+
+        assert query.full_query.endswith(
+            "RETURN * ORDER BY name ASC,uid SKIP $page_number * $page_size LIMIT $page_size"
+        )
+        assert CURSOR_SORT_KEY_ALIAS not in query.full_query
+        assert query.parameters == {"page_number": 2, "page_size": 10}
+
+    def test_first_page_has_no_cursor_predicate(self):
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            implicit_sort_by="uid",
+            page_number=5,
+            page_size=10,
+            cursor="",
+        )
+
+        assert query.full_query == (
+            f"{MATCH_CLAUSE} WITH {ALIAS_CLAUSE}   "
+            f"RETURN *, [uid] AS {CURSOR_SORT_KEY_ALIAS} ORDER BY uid LIMIT $page_size"
+        )
+        assert query.parameters == {"page_size": 10}
+
+    def test_cursor_predicate_follows_sort_directions(self):
+        first_page = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": False},
+            implicit_sort_by="uid",
+            page_size=10,
+            cursor="",
+        )
+        cursor = encode_cursor(["Aspirin", "Uid_1"], first_page.cursor_signature)
+
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": False},
+            implicit_sort_by="uid",
+            page_size=10,
+            cursor=cursor,
+        )
+
+        assert query.cursor_clause == (
+            "WITH * WHERE (name < $cursor_0) OR "
+            "(name = $cursor_0 AND (uid > $cursor_1 OR uid IS NULL))"
+        )
+        assert query.parameters["cursor_0"] == "Aspirin"
+        assert query.parameters["cursor_1"] == "Uid_1"
+        assert "SKIP" not in query.full_query
+
+    def test_cursor_predicate_with_null_values(self):
+        signature = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": True},
+            implicit_sort_by="uid",
+            page_size=10,
+            cursor="",
+        ).cursor_signature
+
+        query = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": True},
+            implicit_sort_by="uid",
+            page_size=10,
+            cursor=encode_cursor([None, "Uid_1"], signature),
+        )
+
+        assert query.cursor_clause == (
+            "WITH * WHERE (name IS NULL AND (uid > $cursor_1 OR uid IS NULL))"
+        )
+        assert "cursor_0" not in query.parameters
+
+    def test_cursor_for_other_sorting_is_rejected(self):
+        signature = CypherQueryBuilder(
+            match_clause=MATCH_CLAUSE,
+            alias_clause=ALIAS_CLAUSE,
+            sort_by={"name": True},
+            implicit_sort_by="uid",
+            page_size=10,
+            cursor="",
+        ).cursor_signature
+
+        with self.assertRaises(ValidationException):
+            CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                sort_by={"name": False},
+                implicit_sort_by="uid",
+                page_size=10,
+                cursor=encode_cursor(["Aspirin", "Uid_1"], signature),
+            )
+
+    def test_malformed_cursor_is_rejected(self):
+        with self.assertRaises(ValidationException):
+            CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                implicit_sort_by="uid",
+                page_size=10,
+                cursor="not-a-cursor",
+            )
+
+    def test_cursor_requires_implicit_sort(self):
+        with self.assertRaises(ValidationException):
+            CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause=ALIAS_CLAUSE,
+                sort_by={"name": True},
+                page_size=10,
+                cursor="",
+            )
+
+    def test_cursor_pages_with_several_implicit_sort_keys(self):
+        # A term belonging to two codelists is returned twice, and straddles a page boundary
+        rows = [
+            {"term_uid": "CTTerm_000001", "codelist_uid": "CTCodelist_000001"},
+            {"term_uid": "CTTerm_000002", "codelist_uid": "CTCodelist_000001"},
+            {"term_uid": "CTTerm_000002", "codelist_uid": "CTCodelist_000002"},
+            {"term_uid": "CTTerm_000003", "codelist_uid": "CTCodelist_000002"},
+        ]
+        cursor = ""
+        pages = []
+        while cursor is not None:
+            query = CypherQueryBuilder(
+                match_clause=MATCH_CLAUSE,
+                alias_clause="term_uid, codelist_uid",
+                implicit_sort_by=["term_uid", "codelist_uid"],
+                page_size=2,
+                cursor=cursor,
+            )
+            page = [row for row in rows if matches_cursor_clause(query, row)][:2]
+            pages.append(page)
+            cursor = (
+                encode_cursor(
+                    [page[-1]["term_uid"], page[-1]["codelist_uid"]],
+                    query.cursor_signature,
+                )
+                if len(page) == 2
+                else None
+            )
+
+        assert query.sort_clause.endswith("term_uid,codelist_uid")
+        assert pages == [rows[:2], rows[2:], []]
+
+    def test_cursor_round_trip_with_datetime(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor([value, 1, None], "sig"), "sig", 3) == [
+            value,
+            1,
+            None,
+        ]
@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import patch
+
+import pytest
+from neo4j.exceptions import ClientError
+
+from clinical_mdr_api.repositories import _utils
+from clinical_mdr_api.repositories._utils import (
+    FULLTEXT_LIMIT_EXCEEDED,
+    CypherQueryBuilder,
+    FilterDict,
+    FilterOperator,
+    FullTextField,
+    build_fulltext_rank,
+    build_fulltext_search,
+)
+from common.exceptions import ValidationException
+
+MATCH_CLAUSE = "MATCH (n:Node)"
+ALIAS_CLAUSE = "n.uid AS uid, n.name AS name, n.code AS code"
+FULLTEXT_FIELDS = {"name": FullTextField("fulltext_node_name", "n", "name")}
+SEED = (
+    "CALL db.index.fulltext.queryNodes($fulltext_index, $fulltext_search,"
+    " {limit: $fulltext_limit + 1}) YIELD node"
+    " WITH collect(node) AS fulltext_nodes"
+    " CALL apoc.util.validate(size(fulltext_nodes) > $fulltext_limit,"
+    f" '{FULLTEXT_LIMIT_EXCEEDED}', [])"
+    " UNWIND fulltext_nodes AS n"
+)
+
+
+def build_query(filter_by, match_clause=MATCH_CLAUSE, **kwargs):
+    return CypherQueryBuilder(
+        match_clause=match_clause,
+        alias_clause=ALIAS_CLAUSE,
+        implicit_sort_by="uid",
+        page_size=10,
+        filter_by=FilterDict(elements=filter_by),
+        total_count=True,
+        fulltext_fields=FULLTEXT_FIELDS,
+        **kwargs,
+    )
+
+
+class TestCypherQueryBuilderFullText(unittest.TestCase):
+    def setUp(self):
+        # The full-text search runs within the built queries
+        patcher = patch.object(_utils.db, "cypher_query")
+        self.cypher_query = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cypher_query.assert_not_called()
+
+    def test_build_fulltext_search(self):
+        assert build_fulltext_search(["Blood"]) == "((blood^3 OR blood*^2 OR *blood*))"
+        assert build_fulltext_search(["Blood Pressure", "pulse"]) == (
+            "((blood^3 OR blood*^2 OR *blood*) AND (pressure^3 OR pressure*^2 OR *pressure*))"
+            " OR ((pulse^3 OR pulse*^2 OR *pulse*))"
+        )
+        assert build_fulltext_search(["+-!"]) is None
+        assert build_fulltext_search([1]) is None
+
+    def test_short_words_have_no_leading_wildcard(self):
+        assert build_fulltext_search(["BP 24h"]) == (
+            "((bp^3 OR bp*^2) AND (24h^3 OR 24h*^2 OR *24h*))"
+        )
+        with patch.object(_utils.config, "FULLTEXT_SEARCH_INFIX_MIN_LENGTH", 5):
+            assert build_fulltext_search(["pulse rate"]) == (
+                "((pulse^3 OR pulse*^2 OR *pulse*) AND (rate^3 OR rate*^2))"
+            )
+
+    def test_fulltext_filter_drives_the_match_and_ranks_the_rows(self):
+        query = build_query({"name": {"v": ["Blood"], "op": "ft"}})
+
+        assert query.full_query.startswith(f"{SEED} {MATCH_CLAUSE} WITH")
+        assert query.count_query.startswith(f"{SEED} {MATCH_CLAUSE} WITH")
+        assert f"WITH {ALIAS_CLAUSE}   RETURN" in query.full_query
+        assert query.full_query.endswith(
+            f"ORDER BY {build_fulltext_rank('name')} DESC,uid"
+            " SKIP $page_number * $page_size LIMIT $page_size"
+        )
+        assert query.parameters["fulltext_index"] == "fulltext_node_name"
+        assert query.parameters["fulltext_search"] == (
+            "((blood^3 OR blood*^2 OR *blood*))"
+        )
+        assert query.parameters["fulltext_limit"] == _utils.config.FULLTEXT_SEARCH_LIMIT
+        assert query.parameters["fulltext_words"] == ["blood"]
+
+    def test_fulltext_seed_follows_query_options(self):
+        query = build_query(
+            {"name": {"v": ["blood"], "op": "ft"}},
+            match_clause=f"CYPHER runtime=slotted {MATCH_CLAUSE}",
+        )
+
+        assert query.full_query.startswith(
+            f"CYPHER runtime=slotted {SEED} {MATCH_CLAUSE} WITH"
+        )
+
+    def test_requested_sort_takes_precedence_over_the_rank(self):
+        query = build_query(
+            {"name": {"v": ["blood"], "op": "ft"}}, sort_by={"code": True}
+        )
+
+        assert query.full_query.startswith(SEED)
+        assert "reduce(rank" not in query.full_query
+        assert "ORDER BY code ASC,uid" in query.full_query
+
+    def test_fields_without_index_fall_back_to_contains(self):
+        query = build_query({"code": {"v": ["blood"], "op": "ft"}})
+
+        assert "fulltext" not in query.full_query
+        assert "toLower(toString(code)) CONTAINS $code_0" in query.full_query
+
+    def test_or_filters_fall_back_to_contains(self):
+        query = build_query(
+            {
+                "name": {"v": ["blood"], "op": "ft"},
+                "code": {"v": ["BP"], "op": "eq"},
+            },
+            filter_operator=FilterOperator.OR,
+        )
+
+        assert "fulltext" not in query.full_query
+        assert "toLower(toString(name)) CONTAINS $name_0" in query.full_query
+
+
+class TestCypherQueryBuilderFullTextLimit(unittest.TestCase):
+    def test_exceeded_limit_raises_a_validation_error(self):
+        query = build_query({"name": {"v": ["blood"], "op": "ft"}})
+        error = ClientError(
+            f"Failed to invoke procedure `apoc.util.validate`: {FULLTEXT_LIMIT_EXCEEDED}"
+        )
+
+        with patch.object(_utils.db, "cypher_query", side_effect=error):
+            with pytest.raises(ValidationException) as exc_info:
+                query.execute()
+
+        assert str(_utils.config.FULLTEXT_SEARCH_LIMIT) in exc_info.value.msg
+
+    def test_other_errors_are_raised_as_is(self):
+        query = build_query({"name": {"v": ["blood"], "op": "ft"}})
+        error = ClientError("Failed to invoke procedure `db.index.fulltext.queryNodes`")
+
+        with patch.object(_utils.db, "cypher_query", side_effect=error):
+            with pytest.raises(ClientError):
+                query.execute()
@@ -0,0 +1,159 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from clinical_mdr_api.models.utils import BaseModel, CustomPage
+from clinical_mdr_api.routers import export
+from common import config
+from common.exceptions import ValidationException
+
+
+class Item(BaseModel):
+    uid: str
+    name: str
+    is_final: bool
+
+
+ITEMS = [
+    Item(uid=f"Item_{idx:03}", name=f"Item {idx}", is_final=idx % 2 == 0)
+    for idx in range(23)
+]
+
+EXPORT_DEFINITION = {
+    "defaults": ["uid", "Name=name", "is_final"],
+    "formats": ["text/csv", "text/xml"],
+}
+
+
+class Request:
+    def __init__(self, accept: str):
+        self.headers = {"accept": accept}
+
+
+def make_endpoint(calls: list, with_cursor: bool):
+    def get_items(page_number=1, page_size=10, **_kwargs):
+        calls.append((page_number, page_size, None))
+        items = (
+            ITEMS[(page_number - 1) * page_size : page_number * page_size]
+            if page_size
+            else ITEMS
+        )
+        return CustomPage.create(items=items, total=0, page=page_number, size=page_size)
+
+    def get_items_with_cursor(page_number=1, page_size=10, cursor=None, **_kwargs):
+        if cursor is None:
+            return get_items(page_number, page_size)
+        calls.append((page_number, page_size, cursor))
+        start = int(cursor or 0)
+        items = ITEMS[start : start + page_size]
+        return CustomPage.create(
+            items=items,
+            total=0,
+            page=page_number,
+            size=page_size,
+            next_cursor=str(start + page_size) if len(items) == page_size else None,
+            cursor_mode=True,
+        )
+
+    return get_items_with_cursor if with_cursor else get_items
+
+
+def read_body(response) -> str:
+    async def collect():
+        return [
+            chunk.decode() if isinstance(chunk, bytes) else chunk
+            async for chunk in response.body_iterator
+        ]
+
+    return "".join(asyncio.run(collect()))
+
+
+@pytest.mark.parametrize("with_cursor", [False, True])
+def test_export_all_items_in_chunks(monkeypatch, with_cursor):
+    monkeypatch.setattr(config, "EXPORT_CHUNK_SIZE", 10)
+    calls = []
+    endpoint = export.allow_exports(EXPORT_DEFINITION)(
+        make_endpoint(calls, with_cursor)
+    )
+
+    # FastAPI passes every parameter of the endpoint as a keyword argument
+    kwargs = {
+        "request": Request("text/csv"),
+        "page_number": 1,
+        "page_size": 0,
+        "total_count": True,
+    }
+    if with_cursor:
+        kwargs["cursor"] = None
+    response = endpoint(**kwargs)
+    # Only the first chunk is retrieved before the response starts
+    assert len(calls) == 1
+
+    rows = list(csv.reader(io.StringIO(read_body(response))))
+    assert rows[0] == ["uid", "Name", "is_final"]
+    assert [row[0] for row in rows[1:]] == [item.uid for item in ITEMS]
+    assert len(calls) == 3
+    assert all(page_size == 10 for _, page_size, _ in calls)
+
+
+@pytest.mark.parametrize("grouped", [False, True])
+def test_export_all_items_with_cursor_only_when_supported(monkeypatch, grouped):
+    monkeypatch.setattr(config, "EXPORT_CHUNK_SIZE", 10)
+    calls = []
+    get_items_with_cursor = make_endpoint(calls, with_cursor=True)
+
+    def get_items(grouped=True, cursor=None, **kwargs):
+        ValidationException.raise_if(
+            cursor is not None and not grouped,
+            msg="Cursor pagination requires grouped items.",
+        )
+        return get_items_with_cursor(cursor=cursor, **kwargs)
+
+    endpoint = export.allow_exports(
+        {**EXPORT_DEFINITION, "cursor_if": lambda kwargs: kwargs.get("grouped")}
+    )(get_items)
+
+    response = endpoint(
+        request=Request("text/csv"),
+        page_number=1,
+        page_size=0,
+        grouped=grouped,
+        cursor=None,
+    )
+
+    rows = list(csv.reader(io.StringIO(read_body(response))))
+    assert [row[0] for row in rows[1:]] == [item.uid for item in ITEMS]
+    if grouped:
+        assert [cursor for _, _, cursor in calls] == ["", "10", "20"]
+    else:
+        assert [page_number for page_number, _, _ in calls] == [1, 2, 3]
+        assert all(cursor is None for _, _, cursor in calls)
+
+
+def test_export_ndjson():
+    calls = []
+    endpoint = export.allow_exports(EXPORT_DEFINITION)(make_endpoint(calls, False))
+
+    response = endpoint(request=Request(export.NDJSON_MEDIA_TYPE), page_size=0)
+
+    lines = read_body(response).splitlines()
+    assert json.loads(lines[0]) == {
+        "uid": "Item_000",
+        "Name": "Item 0",
+        "is_final": "Yes",
+    }
+    assert len(lines) == len(ITEMS)
+
+
+def test_export_xml_streams_items():
+    calls = []
+    endpoint = export.allow_exports(EXPORT_DEFINITION)(make_endpoint(calls, False))
+
+    body = read_body(endpoint(request=Request("text/xml"), page_size=0))
+
+    assert body.startswith("<items>\n  <item>")
+    assert body.endswith("</item>\n</items>")
+    assert body.count("<item>") == len(ITEMS)
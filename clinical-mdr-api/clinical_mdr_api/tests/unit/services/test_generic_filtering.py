@@ -0,0 +1,316 @@
+"""
+Equivalence tests and micro-benchmark of the compiled in-memory filtering engine.
+
+`reference_item_filtering` is the item-by-item implementation that `generic_item_filtering` replaced:
+every filter element is applied with `filter_aggregated_items`, one full pass per filter element,
+and the sort keys are resolved on every comparison.
+"""
+
+import logging
+import random
+import time
+from enum import Enum
+from typing import Any
+
+import pytest
+
+from clinical_mdr_api.models.utils import BaseModel
+from clinical_mdr_api.repositories._utils import (
+    ComparisonOperator,
+    FilterDict,
+    FilterOperator,
+)
+from clinical_mdr_api.services import _utils
+from common.exceptions import ValidationException
+
+log = logging.getLogger(__name__)
+
+
+class Status(Enum):
+    DRAFT = "Draft"
+    FINAL = "Final"
+    RETIRED = "Retired"
+
+
+class Category(BaseModel):
+    name: str
+    code: str | None = None
+
+
+class Item(BaseModel):
+    uid: str
+    name: str
+    version: str
+    status: Status
+    order: int | None = None
+    category: Category | None = None
+    tags: list[Category] = []
+    synonyms: list[str] = []
+
+
+def make_items(count: int, seed: int = 1) -> list[Item]:
+    rnd = random.Random(seed)
+    items = []
+    for index in range(count):
+        items.append(
+            Item(
+                # A few items share their uid to exercise the deduplication of the OR operator
+                uid=f"Item_{index - index % 50 if index % 97 == 0 else index:06}",
+                name=f"{rnd.choice(['Body', 'Blood', 'Heart', 'Liver'])} item {index}",
+                version=f"{rnd.randint(0, 3)}.{rnd.randint(0, 9)}",
+                status=rnd.choice(list(Status)),
+                order=rnd.choice([None, rnd.randint(0, 100)]),
+                category=(
+                    Category(name=f"Category {index % 7}", code=f"C{index % 3}")
+                    if index % 5
+                    else None
+                ),
+                tags=[
+                    Category(name=f"Tag {rnd.randint(0, 20)}")
+                    for _ in range(rnd.randint(0, 3))
+                ],
+                synonyms=[f"syn{rnd.randint(0, 30)}" for _ in range(rnd.randint(0, 2))],
+            )
+        )
+    return items
+
+
+def reference_item_filtering(
+    items: list[Any],
+    filter_by: dict,
+    filter_operator: FilterOperator,
+    sort_by: dict,
+) -> list[Any]:
+    filters = FilterDict(elements=filter_by)
+    if filter_operator == FilterOperator.AND:
+        filtered_items = items
+        for key, element in filters.elements.items():
+            filtered_items = [
+                item
+                for item in filtered_items
+                if _utils.filter_aggregated_items(item, key, element.v, element.op)
+            ]
+    elif not filters.elements:
+        filtered_items = items
+    else:
+        matching_items = []
+        for key, element in filters.elements.items():
+            matching_items += [
+                item
+                for item in items
+                if _utils.filter_aggregated_items(item, key, element.v, element.op)
+            ]
+        uids = set()
+        filtered_items = []
+        for item in matching_items:
+            if item.uid not in uids:
+                filtered_items.append(item)
+                uids.add(item.uid)
+    filtered_items = list(filtered_items)
+
+    def _key(item, sort_key):
+        value = _utils.extract_nested_key_value(item, sort_key)
+        if value is not None:
+            return value
+        return (
+            "-1"
+            if issubclass(_utils.extract_nested_key_type(item, sort_key), str)
+            else -1
+        )
+
+    distinct_sort_orders = set(sort_by.values())
+    if len(distinct_sort_orders) == 1:
+        filtered_items.sort(
+            key=lambda x: [_key(x, sort_key) for sort_key in sort_by],
+            reverse=not distinct_sort_orders.pop(),
+        )
+    elif len(distinct_sort_orders) > 1:
+        for sort_key, sort_order in sort_by.items():
+            filtered_items.sort(
+                key=lambda x, s=sort_key: _key(x, s), reverse=not sort_order
+            )
+    return filtered_items
+
+
+CASES = [
+    ({}, FilterOperator.AND, {}),
+    ({}, FilterOperator.OR, {"name": True}),
+    ({"name": {"v": ["heart"], "op": "co"}}, FilterOperator.AND, {"uid": True}),
+    ({"name": {"v": ["Body item 3", "Liver item 4"]}}, FilterOperator.AND, {}),
+    ({"status": {"v": ["Final"]}}, FilterOperator.AND, {"version": False}),
+    ({"status": {"v": ["Final", "Draft"], "op": "ne"}}, FilterOperator.AND, {}),
+    ({"order": {"v": []}}, FilterOperator.AND, {"name": True}),
+    ({"category": {"v": []}}, FilterOperator.AND, {}),
+    ({"tags": {"v": []}}, FilterOperator.AND, {}),
+    ({"tags.name": {"v": ["Tag 1"], "op": "co"}}, FilterOperator.AND, {}),
+    ({"synonyms": {"v": ["syn1", "syn2"]}}, FilterOperator.AND, {}),
+    ({"category.code": {"v": ["C1"]}}, FilterOperator.AND, {"category.name": True}),
+    ({"version": {"v": ["1.5"], "op": "gt"}}, FilterOperator.AND, {"order": True}),
+    ({"version": {"v": ["1.5"], "op": "ge"}}, FilterOperator.AND, {"order": False}),
+    ({"version": {"v": ["1.5"], "op": "lt"}}, FilterOperator.AND, {}),
+    ({"version": {"v": ["1.5"], "op": "le"}}, FilterOperator.AND, {}),
+    ({"version": {"v": ["2.0", "1.0"], "op": "bw"}}, FilterOperator.AND, {}),
+    ({"*": {"v": ["category 3"]}}, FilterOperator.AND, {}),
+    ({"*": {"v": ["tag 7"], "op": "co"}}, FilterOperator.AND, {"uid": False}),
+    (
+        {
+            "name": {"v": ["blood"], "op": "co"},
+            "status": {"v": ["Retired"]},
+            "order": {"v": ["50"], "op": "gt"},
+        },
+        FilterOperator.AND,
+        {"version": True, "name": False},
+    ),
+    (
+        {
+            "name": {"v": ["blood"], "op": "co"},
+            "status": {"v": ["Retired"]},
+            "category.name": {"v": ["Category 2"]},
+        },
+        FilterOperator.OR,
+        {},
+    ),
+    (
+        {"synonyms": {"v": ["syn3"]}, "*": {"v": ["tag 2"]}},
+        FilterOperator.OR,
+        {"name": False, "order": True, "version": False},
+    ),
+]
+
+
+@pytest.mark.parametrize("filter_by, filter_operator, sort_by", CASES)
+def test_generic_item_filtering_matches_reference(filter_by, filter_operator, sort_by):
+    items = make_items(600)
+
+    expected = reference_item_filtering(items, filter_by, filter_operator, sort_by)
+    out = _utils.generic_item_filtering(
+        items=items,
+        filter_by=filter_by,
+        filter_operator=filter_operator,
+        sort_by=sort_by,
+    )
+
+    assert [id(item) for item in out] == [id(item) for item in expected]
+
+
+@pytest.mark.parametrize(
+    "filter_by, filter_operator",
+    [
+        ({"name": {"v": ["blood"], "op": "co"}}, FilterOperator.AND),
+        ({"name": {"v": ["blood"]}, "*": {"v": ["tag 2"]}}, FilterOperator.OR),
+        ({}, FilterOperator.AND),
+        ({}, FilterOperator.OR),
+    ],
+)
+def test_generic_header_filtering_values(filter_by, filter_operator):
+    items = make_items(300)
+
+    out = _utils.service_level_generic_header_filtering(
+        items=items,
+        field_name="tags.name",
+        filter_operator=filter_operator,
+        search_string="1",
+        filter_by=dict(filter_by),
+        page_size=1000,
+    )
+
+    filters = FilterDict(elements={**filter_by, "tags.name": {"v": ["1"], "op": "co"}})
+    matching = [
+        item
+        for item in items
+        if (all if filter_operator == FilterOperator.AND else any)(
+            _utils.filter_aggregated_items(item, key, element.v, element.op)
+            for key, element in filters.elements.items()
+        )
+    ]
+    expected = []
+    for item in matching:
+        for tag in item.tags:
+            if tag.name not in expected:
+                expected.append(tag.name)
+    assert sorted(out) == sorted(expected)
+
+
+def test_null_filter_requires_equal_operator():
+    items = make_items(10)
+
+    with pytest.raises(ValidationException) as exc:
+        _utils.generic_item_filtering(
+            items=items, filter_by={"order": {"v": [], "op": "co"}}
+        )
+    assert "null value" in exc.value.msg
+
+    # Lists are matched on emptiness before the operator is checked, as before
+    assert _utils.generic_item_filtering(
+        items=[item for item in items if not item.tags],
+        filter_by={"tags": {"v": [], "op": "co"}},
+    )
+
+
+OPERATOR_VALUES = [None, "", "1.5", "2.0", "Heart item 1", 3, ["1.5"]]
+OPERATOR_FILTER_VALUES = [[], ["1.5"], ["2.0", "1.0"], ["heart"], [3, "1.5"]]
+
+
+def outcome(function, *args) -> Any:
+    """Returns the result of the function, or the type of the exception it raised"""
+
+    try:
+        return function(*args)
+    except (ValidationException, TypeError, IndexError, AttributeError) as exc:
+        return type(exc)
+
+
+@pytest.mark.parametrize("operator", list(ComparisonOperator))
+def test_compiled_operator_matches_apply_filter_operator(operator):
+    for filter_values in OPERATOR_FILTER_VALUES:
+        if operator == ComparisonOperator.BETWEEN and len(filter_values) == 1:
+            # A single bound fails when compiling the filter, rather than on the first item
+            continue
+        for value in OPERATOR_VALUES:
+            expected = outcome(
+                _utils.apply_filter_operator, value, operator, list(filter_values)
+            )
+            result = outcome(
+                lambda fv=filter_values, v=value: _utils.compile_filter_operator(
+                    operator, list(fv)
+                )(v)
+            )
+
+            assert result == expected, (operator, filter_values, value)
+
+
+BENCHMARK_FILTERS = {
+    "name": {"v": ["blood", "heart"], "op": "co"},
+    "status": {"v": ["Final", "Draft"]},
+    "category.code": {"v": ["C1", "C2"]},
+}
+BENCHMARK_SORT = {"version": False, "name": True}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_generic_item_filtering_benchmark(count):
+    items = make_items(count)
+
+    start = time.perf_counter()
+    expected = reference_item_filtering(
+        items, BENCHMARK_FILTERS, FilterOperator.AND, BENCHMARK_SORT
+    )
+    reference_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    out = _utils.generic_item_filtering(
+        items=items,
+        filter_by=BENCHMARK_FILTERS,
+        filter_operator=FilterOperator.AND,
+        sort_by=BENCHMARK_SORT,
+    )
+    compiled_secs = time.perf_counter() - start
+
+    assert [id(item) for item in out] == [id(item) for item in expected]
+    log.info(
+        "Filtering %s items: reference %.3fs, compiled %.3fs",
+        count,
+        reference_secs,
+        compiled_secs,
+    )
@@ -0,0 +1,188 @@
+import datetime
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from clinical_mdr_api.models.job import JobError
+from clinical_mdr_api.services import jobs
+from clinical_mdr_api.services.jobs import JobWorkerPool, report_progress
+from common import config
+from common.auth.dependencies import dummy_access_token_claims
+from common.auth.user import user
+from common.exceptions import NotFoundException
+
+
+class FakeJobRepository:
+    def __init__(self, queued: list | None = None):
+        self.queued = list(queued or [])
+        self.completed: dict[str, str] = {}
+        self.failed: dict[str, JobError] = {}
+        self.progress: dict[str, tuple] = {}
+        # Jobs which are no longer running by the worker, e.g. failed as stale
+        self.lost: set[str] = set()
+
+    def claim_next_job(self, _worker: str):
+        return self.queued.pop(0) if self.queued else None
+
+    def update_running_jobs(self, _worker: str, progress: dict[str, tuple]):
+        self.progress.update(progress)
+
+    def complete_job(self, uid: str, _worker: str, result: str):
+        if uid in self.lost:
+            return False
+        self.completed[uid] = result
+        return True
+
+    def fail_job(self, uid: str, _worker: str, error: JobError):
+        if uid in self.lost:
+            return False
+        self.failed[uid] = error
+        return True
+
+    def fail_stale_jobs(self, _heartbeat_before):
+        return 0
+
+    def delete_finished_jobs(self, _finished_before):
+        return 0
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args):
+        self.submitted.append((func, args))
+
+
+def make_job(uid: str, job_type: str, params: dict | None = None):
+    return SimpleNamespace(
+        uid=uid,
+        job_type=job_type,
+        params=json.dumps(params or {}),
+        access_token_claims=dummy_access_token_claims("job-author").model_dump_json(),
+    )
+
+
+@pytest.fixture(name="handlers")
+def fixture_handlers(monkeypatch):
+    def register(job_type, func):
+        monkeypatch.setitem(jobs._job_handlers, job_type, func)
+
+    return register
+
+
+def test_execute_records_result_with_submitter_identity(handlers):
+    def handler(params):
+        report_progress(0.5, "Halfway")
+        assert pool._running["Job_000001"].message == "Halfway"
+        return {"value": params["value"], "user": user().email}
+
+    handlers("test-ok", handler)
+    repository = FakeJobRepository()
+    pool = JobWorkerPool(repository=repository, workers=1)
+    pool._running["Job_000001"] = jobs.JobProgress()
+
+    pool.execute(make_job("Job_000001", "test-ok", {"value": 1}))
+
+    assert json.loads(repository.completed["Job_000001"]) == {
+        "value": 1,
+        "user": "job-author@example.com",
+    }
+    assert not pool._running
+
+
+def test_execute_records_errors(handlers):
+    def handler(_params):
+        raise NotFoundException("Study", "Study_000001")
+
+    handlers("test-error", handler)
+    repository = FakeJobRepository()
+    pool = JobWorkerPool(repository=repository, workers=1)
+
+    pool.execute(make_job("Job_000001", "test-error"))
+    pool.execute(make_job("Job_000002", "test-unknown"))
+
+    assert repository.failed["Job_000001"].status_code == 404
+    assert repository.failed["Job_000001"].type == "NotFoundException"
+    assert repository.failed["Job_000002"].status_code == 400
+    assert "Unknown job type 'test-unknown'" in repository.failed["Job_000002"].message
+    assert not repository.completed
+
+
+def test_execute_discards_the_outcome_of_jobs_no_longer_claimed(handlers, caplog):
+    def handler(_params):
+        raise ValueError("Too late")
+
+    handlers("test-ok", lambda params: params)
+    handlers("test-error", handler)
+    repository = FakeJobRepository()
+    repository.lost.update({"Job_000001", "Job_000002"})
+    pool = JobWorkerPool(repository=repository, workers=1)
+
+    pool.execute(make_job("Job_000001", "test-ok"))
+    pool.execute(make_job("Job_000002", "test-error"))
+
+    assert not repository.completed
+    assert not repository.failed
+    assert "Job Job_000001 of type test-ok is no longer running" in caplog.text
+    assert "Job Job_000002 of type test-error is no longer running" in caplog.text
+    assert not pool._running
+
+
+def test_poll_claims_jobs_for_free_workers_only():
+    repository = FakeJobRepository(
+        queued=[make_job(f"Job_00000{i}", "test-ok") for i in range(1, 4)]
+    )
+    pool = JobWorkerPool(repository=repository, workers=2)
+    pool._executor = FakeExecutor()
+
+    assert pool.poll() == 2
+    assert len(repository.queued) == 1
+    assert pool.poll() == 0
+
+    report_progress(0.5)  # not in a job, ignored
+    pool._running["Job_000001"].progress = 0.25
+    pool.poll()
+    assert repository.progress == {
+        "Job_000001": (0.25, None),
+        "Job_000002": (0.0, None),
+    }
+
+
+def test_upload_files_are_stored_out_of_the_job_params(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "JOB_FILES_DIR", str(tmp_path))
+    upload_file = UploadFile(
+        file=io.BytesIO(b"<ODM/>"),
+        filename="odm.xml",
+        headers=Headers({"content-type": "application/xml"}),
+    )
+
+    param = jobs.store_upload_file(upload_file)
+    assert "<ODM/>" not in json.dumps(param)
+
+    stored = jobs.open_upload_file(json.loads(json.dumps(param)))
+    assert stored.filename == "odm.xml"
+    assert stored.content_type == "application/xml"
+    assert stored.file.read() == b"<ODM/>"
+
+    jobs.remove_upload_files(stored, None)
+    assert not list(tmp_path.iterdir())
+
+
+def test_cleanup_removes_left_behind_upload_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "JOB_FILES_DIR", str(tmp_path))
+    jobs.store_upload_file(UploadFile(file=io.BytesIO(b"<ODM/>")))
+
+    jobs.remove_upload_files_before(
+        datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)
+    )
+    assert len(list(tmp_path.iterdir())) == 1
+
+    jobs.remove_upload_files_before(
+        datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    )
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,493 @@
+"""
+Tests and micro-benchmark of the ODM XML and CSV exports.
+
+The ODM elements of an export are fetched with one query per element type,
+and the streamed XML must be the same as the pretty-printed XML of the whole document.
+
+The benchmark only runs when the RUN_BENCHMARKS env var is set:
+    RUN_BENCHMARKS=1 pytest clinical_mdr_api/tests/unit/services/test_odm_exporter.py -k benchmark
+"""
+
+import io
+import json
+import logging
+import re
+import time
+import tracemalloc
+from collections.abc import Iterator
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api.domain_repositories.concepts.odms import metadata_repository
+from clinical_mdr_api.domains._utils import ObjectStatus
+from clinical_mdr_api.domains.concepts.odms.odm_xml_definition import Attribute
+from clinical_mdr_api.domains.concepts.utils import TargetType
+from clinical_mdr_api.services.concepts.odms.odm_csv_exporter import (
+    OdmCsvExporterService,
+)
+from clinical_mdr_api.services.concepts.odms.odm_xml_exporter import (
+    OdmXmlExporterService,
+)
+from clinical_mdr_api.services.utils.odm_xml_mapper import apply_mapping_rules
+from common.auth.dependencies import dummy_access_token_claims, dummy_auth_object
+from common.exceptions import NotFoundException
+
+log = logging.getLogger(__name__)
+
+MAPPER = (
+    "type,parent,from_name,to_name,to_alias,from_alias,alias_context\n"
+    "attribute,,Repeating,Repeated,,,\n"
+    "attribute,ItemGroupDef,osb:version,osb:igVersion,,,\n"
+    "element,ItemDef,Question,Prompt,,,\n"
+    "attribute,,osb:instruction,,true,,\n"
+)
+
+NAMESPACE = {
+    "uid": "OdmVendorNamespace_000001",
+    "name": "OpenStudyBuilder",
+    "prefix": "osb",
+    "url": "osb",
+}
+
+
+def versions(*statuses: str) -> list[dict]:
+    return [
+        {
+            "version": f"{i // 2}.{i % 2}" if status == "Draft" else f"{i}.0",
+            "status": status,
+            "start_date": f"2024-01-0{i + 1}",
+            "end_date": None if i == len(statuses) else f"2024-01-0{i + 2}",
+        }
+        for i, status in enumerate(statuses, start=1)
+    ]
+
+
+def description(uid: str, name: str) -> dict:
+    return {
+        "uid": f"OdmDescription_{uid}",
+        "name": name,
+        "language": "ENG",
+        "description": f"Description of {name}",
+        "instruction": f"Fill {name} & check <it>",
+        "sponsor_instruction": None,
+        "versions": ["1.0"],
+    }
+
+
+def alias(uid: str, name: str) -> dict:
+    return {
+        "uid": f"OdmAlias_{uid}",
+        "name": name,
+        "context": "SDTM",
+        "versions": ["1.0"],
+    }
+
+
+def no_vendors() -> dict:
+    return {
+        "vendor_elements": [],
+        "vendor_attributes": [],
+        "vendor_element_attributes": [],
+    }
+
+
+def make_library(num_forms: int, num_items: int) -> dict[str, list[dict]]:
+    """Returns the rows of the metadata repository queries, by label, for a study event."""
+    library = {
+        "OdmStudyEvent": [
+            {
+                "uid": "OdmStudyEvent_000001",
+                "oid": "SE.1",
+                "name": "Visit 1",
+                "versions": versions("Final"),
+                "forms": [
+                    {"uid": f"OdmForm_{f}", "order_number": f, "mandatory": True}
+                    for f in range(num_forms)
+                ],
+            }
+        ],
+        "OdmForm": [],
+        "OdmItemGroup": [],
+        "OdmItem": [],
+        "OdmCondition": [
+            {
+                "uid": "OdmCondition_000001",
+                "oid": "C.1",
+                "name": "Condition",
+                "versions": versions("Final"),
+                "descriptions": [description("C", "Condition")],
+                "aliases": [],
+                "formal_expressions": [
+                    {
+                        "uid": "OdmFormalExpression_1",
+                        "context": "XPath",
+                        "expression": "A = B",
+                        "versions": ["1.0"],
+                    }
+                ],
+            }
+        ],
+        "OdmMethod": [
+            {
+                "uid": "OdmMethod_000001",
+                "oid": "M.1",
+                "name": "Method",
+                "method_type": "Computation",
+                "versions": versions("Final"),
+                "descriptions": [],
+                "aliases": [],
+                "formal_expressions": [],
+            }
+        ],
+        "OdmVendorNamespace": [NAMESPACE],
+        "OdmVendorElement": [
+            {
+                "uid": "OdmVendorElement_000001",
+                "name": "DomainColor",
+                "versions": versions("Final"),
+                "vendor_namespace": NAMESPACE,
+            }
+        ],
+        "OdmVendorAttribute": [
+            {
+                "uid": "OdmVendorAttribute_000001",
+                "name": "allowsMultiChoice",
+                "versions": versions("Final"),
+                "vendor_namespace": NAMESPACE,
+            }
+        ],
+        "CTCodelist": [
+            {
+                "name": f"Term {t}",
+                "term_uid": f"CTTerm_{c}_{t}",
+                "codelist_uid": f"CTCodelist_{c}",
+                "code_submission_value": f"T{t}",
+                "nci_preferred_name": f"Term {t}",
+            }
+            for c in range(3)
+            for t in range(3)
+        ],
+    }
+
+    for f in range(num_forms):
+        library["OdmForm"].append(
+            {
+                "uid": f"OdmForm_{f}",
+                "oid": f"F.{f}",
+                "name": f"Form {f}",
+                "repeating": f % 2 == 0,
+                "versions": versions("Final", "Draft", "Final"),
+                "descriptions": [description(f"F{f}", f"Form {f}")],
+                "aliases": [alias(f"F{f}", f"Form alias {f}")],
+                "vendor_elements": [
+                    {
+                        "uid": "OdmVendorElement_000001",
+                        "name": "DomainColor",
+                        "value": "VS",
+                    }
+                ],
+                "vendor_attributes": [],
+                "vendor_element_attributes": [],
+                "item_groups": [
+                    {
+                        "uid": f"OdmItemGroup_{f}",
+                        "oid": f"IG.{f}",
+                        "name": f"Item group {f}",
+                        "order_number": 1,
+                        "mandatory": True,
+                        "collection_exception_condition_oid": "C.1",
+                        "vendor": json.dumps(
+                            {
+                                "attributes": [
+                                    {"uid": "OdmVendorAttribute_000001", "value": "No"}
+                                ]
+                            }
+                        ),
+                    }
+                ],
+            }
+        )
+        library["OdmItemGroup"].append(
+            {
+                "uid": f"OdmItemGroup_{f}",
+                "oid": f"IG.{f}",
+                "name": f"Item group {f}",
+                "repeating": False,
+                "is_reference_data": False,
+                "purpose": "Tabulation",
+                "versions": versions("Final"),
+                "descriptions": [description(f"IG{f}", f"Item group {f}")],
+                "aliases": [],
+                "sdtm_domains": [
+                    {
+                        "uid": "CTTerm_VS",
+                        "code_submission_value": "VS",
+                        "preferred_term": "Vital Signs",
+                    }
+                ],
+                "items": [
+                    {
+                        "uid": f"OdmItem_{f}_{i}",
+                        "oid": f"I.{f}.{i}",
+                        "name": f"Item {f}.{i}",
+                        "order_number": i,
+                        "mandatory": i == 0,
+                        "key_sequence": None,
+                        "method_oid": "M.1" if i == 0 else None,
+                        "imputation_method_oid": None,
+                        "role": None,
+                        "role_codelist_oid": None,
+                        "collection_exception_condition_oid": None,
+                        "vendor": None,
+                    }
+                    for i in range(num_items)
+                ],
+                **no_vendors(),
+            }
+        )
+        for i in range(num_items):
+            library["OdmItem"].append(
+                {
+                    "uid": f"OdmItem_{f}_{i}",
+                    "oid": f"I.{f}.{i}",
+                    "name": f"Item {f}.{i}",
+                    "prompt": f"Item {i}?",
+                    "datatype": "string",
+                    "length": 20,
+                    "versions": versions("Final"),
+                    "descriptions": [description(f"I{f}.{i}", f"Item {f}.{i}")],
+                    "aliases": [alias(f"I{f}.{i}", f"ITEM{i}")],
+                    "unit_definitions": [
+                        {
+                            "uid": f"UnitDefinition_{i % 2}",
+                            "name": f"unit {i % 2}",
+                            "mandatory": True,
+                            "order": 1,
+                            "versions": ["1.0"],
+                        }
+                    ],
+                    "codelist": {
+                        "uid": f"CTCodelist_{i % 3}",
+                        "name": f"Codelist {i % 3}",
+                        "submission_value": f"CL{i % 3}",
+                        "preferred_term": f"Codelist {i % 3}",
+                        "versions": ["1.0"],
+                    },
+                    "terms": [
+                        {
+                            "term_uid": f"CTTerm_{i % 3}_{t}",
+                            "code_submission_value": f"T{t}",
+                            "name": f"Term {t}",
+                            "mandatory": True,
+                            "order": t,
+                            "display_text": None,
+                            "has_latest_draft": False,
+                            "has_latest_final": True,
+                            "versions": [
+                                {"version": "1.0", "status": "Final", "end_date": None}
+                            ],
+                        }
+                        for t in range(3)
+                    ],
+                    **no_vendors(),
+                }
+            )
+
+    return library
+
+
+class FakeDatabase:
+    """Answers the queries of the metadata repository from the rows of a library."""
+
+    def __init__(self, library: dict[str, list[dict]]):
+        self.library = library
+        self.num_queries = 0
+
+    def cypher_query(self, query: str, params: dict | None = None):
+        self.num_queries += 1
+        label = re.search(r"MATCH \((?:root|codelist):(\w+)Root\)", query).group(1)
+        rows = self.library[label]
+
+        if params is None:
+            return [[row] for row in rows], []
+        if label == "CTCodelist":
+            values = set(params["codelist_uids"])
+            return [[row] for row in rows if row["codelist_uid"] in values], []
+        values = set(params["values"])
+        key = "oid" if "value.oid IN" in query else "uid"
+        return [[row] for row in rows if row[key] in values], []
+
+
+@pytest.fixture(name="auth_context", autouse=True)
+def fixture_auth_context():
+    with request_cycle_context(
+        {"auth": dummy_auth_object(dummy_access_token_claims("odm-exporter"))}
+    ):
+        yield
+
+
+def use_library(monkeypatch, library: dict[str, list[dict]]) -> FakeDatabase:
+    fake = FakeDatabase(library)
+    monkeypatch.setattr(metadata_repository, "db", fake)
+    return fake
+
+
+def make_exporter(
+    target_uid: str, target_type: TargetType, mapper: str | None = None
+) -> OdmXmlExporterService:
+    return OdmXmlExporterService(
+        target_uid,
+        target_type,
+        ObjectStatus.LATEST,
+        ["*"],
+        False,
+        "sdtm",
+        (
+            UploadFile(
+                file=io.BytesIO(mapper.encode("utf-8")),
+                filename="mapper",
+                headers=Headers({"content-type": "text/csv"}),
+            )
+            if mapper
+            else None
+        ),
+    )
+
+
+def materialize(odm_element):
+    for name, value in vars(odm_element).items():
+        if isinstance(value, Iterator):
+            value = list(value)
+            setattr(odm_element, name, value)
+        if isinstance(value, list):
+            for child in value:
+                materialize(child)
+        elif not isinstance(value, Attribute | str):
+            materialize(value)
+
+
+def pretty_printed_document(exporter: OdmXmlExporterService) -> bytes:
+    """The whole document built in memory, as the export built it before streaming."""
+    materialize(exporter.odm)
+    exporter.remove_none_attributes(exporter.odm)
+    document = exporter._generate_odm_xml(exporter.odm, exporter.xml_document)
+    if exporter.mapping_rules:
+        apply_mapping_rules(document, exporter.mapping_rules)
+    return document.toprettyxml(encoding="utf-8")
+
+
+def without_timestamps(xml: bytes) -> bytes:
+    return re.sub(rb'(FileOID|CreationDateTime)="[^"]*"', rb'\1=""', xml)
+
+
+@pytest.mark.parametrize(
+    "target_uid, target_type",
+    [
+        ("OdmStudyEvent_000001", TargetType.STUDY_EVENT),
+        ("OdmForm_1", TargetType.FORM),
+        ("OdmItemGroup_0", TargetType.ITEM_GROUP),
+        ("OdmItem_0_0", TargetType.ITEM),
+    ],
+)
+@pytest.mark.parametrize(
+    "mapper", [None, MAPPER], ids=["without-mapper", "with-mapper"]
+)
+def test_streamed_document_matches_pretty_printed_document(
+    monkeypatch, target_uid, target_type, mapper
+):
+    use_library(monkeypatch, make_library(3, 4))
+
+    streamed = b"".join(
+        make_exporter(target_uid, target_type, mapper).stream_odm_document()
+    )
+
+    assert without_timestamps(streamed) == without_timestamps(
+        pretty_printed_document(make_exporter(target_uid, target_type, mapper))
+    )
+    assert b"<ItemDef " in streamed
+    assert (b"<Prompt>" in streamed) == bool(mapper)
+
+
+def test_export_queries_do_not_depend_on_the_number_of_elements(monkeypatch):
+    small = use_library(monkeypatch, make_library(1, 1))
+    make_exporter("OdmStudyEvent_000001", TargetType.STUDY_EVENT)
+    large = use_library(monkeypatch, make_library(20, 10))
+    exporter = make_exporter("OdmStudyEvent_000001", TargetType.STUDY_EVENT)
+
+    assert large.num_queries == small.num_queries
+    assert len(exporter.odm_data_extractor.odm_items) == 200
+    assert [form.version for form in exporter.odm_data_extractor.odm_forms][:1] == [
+        "3.0"
+    ]
+
+
+def test_missing_target_raises_not_found(monkeypatch):
+    use_library(monkeypatch, make_library(1, 1))
+
+    with pytest.raises(NotFoundException):
+        make_exporter("OdmForm_unknown", TargetType.FORM)
+
+
+def test_csv_export(monkeypatch):
+    use_library(monkeypatch, make_library(2, 2))
+
+    exporter = OdmCsvExporterService("OdmStudyEvent_000001", TargetType.STUDY_EVENT)
+
+    lines = list(exporter.get_odm_csv())
+
+    assert lines == [
+        '"StudyEvent_Name","StudyEvent_Version","Form_Name","Form_Repeating","Form_Version",'
+        '"ItemGroup_Name","ItemGroup_Version","Item_Name","Item_Datatype","Item_Version",'
+        '"Item_Units","Item_Codelist","Item_Terms"\n',
+        '"Visit 1","1.0","Form 0","yes","3.0","Item group 0","1.0","Item 0.0","string","1.0",'
+        '"unit 0","Codelist 0","T0|T1|T2"\n',
+        '"Visit 1","1.0","Form 0","yes","3.0","Item group 0","1.0","Item 0.1","string","1.0",'
+        '"unit 1","Codelist 1","T0|T1|T2"\n',
+        '"Visit 1","1.0","Form 1","no","3.0","Item group 1","1.0","Item 1.0","string","1.0",'
+        '"unit 0","Codelist 0","T0|T1|T2"\n',
+        '"Visit 1","1.0","Form 1","no","3.0","Item group 1","1.0","Item 1.1","string","1.0",'
+        '"unit 1","Codelist 1","T0|T1|T2"\n',
+    ]
+
+
+def measure(streaming: bool) -> tuple[float, int, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    exporter = make_exporter("OdmStudyEvent_000001", TargetType.STUDY_EVENT)
+    if streaming:
+        size = sum(len(chunk) for chunk in exporter.stream_odm_document())
+    else:
+        size = len(pretty_printed_document(exporter))
+    secs = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return secs, peak, size
+
+
+@pytest.mark.benchmark
+def test_streamed_export_benchmark():
+    num_forms = 100
+    library = make_library(num_forms, 10)
+    db = metadata_repository.db
+    metadata_repository.db = FakeDatabase(library)
+    try:
+        document_secs, document_peak, expected = measure(streaming=False)
+        streamed_secs, streamed_peak, size = measure(streaming=True)
+        num_queries = metadata_repository.db.num_queries
+    finally:
+        metadata_repository.db = db
+
+    assert size == expected
+    log.info(
+        "Exporting %s forms in %s queries: document %.3fs (peak %.1f MB), streamed %.3fs (peak %.1f MB)",
+        num_forms,
+        num_queries // 2,
+        document_secs,
+        document_peak / 2**20,
+        streamed_secs,
+        streamed_peak / 2**20,
+    )
+    assert streamed_peak * 2 < document_peak
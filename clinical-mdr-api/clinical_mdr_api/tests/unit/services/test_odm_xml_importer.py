@@ -0,0 +1,180 @@
+"""
+Tests and micro-benchmark of the streamed ODM XML import.
+
+The streamed import must read the same definitions as the import parsing the whole document,
+while its memory stays proportional to a single definition.
+
+The benchmark only runs when the RUN_BENCHMARKS env var is set:
+    RUN_BENCHMARKS=1 pytest clinical_mdr_api/tests/unit/services/test_odm_xml_importer.py -k benchmark
+"""
+
+import io
+import logging
+import time
+import tracemalloc
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api.services.concepts.odms.odm_xml_importer import (
+    OdmXmlImporterService,
+)
+from clinical_mdr_api.tests.data.odm_xml import import_input1, import_input2
+from common.auth.dependencies import dummy_access_token_claims, dummy_auth_object
+
+log = logging.getLogger(__name__)
+
+MAPPER = (
+    "type,parent,from_name,to_name,to_alias,from_alias,alias_context\n"
+    "attribute,,Repeated,Repeating,,,\n"
+    "element,,NameOne,cs:nameOne,,,\n"
+    "element,,Alias,,,true,CompletionInstructions\n"
+    "element,*,Alias,,,true,ImplementationNotes\n"
+    "attribute,,CompletionInstructions,osb:instruction,,,\n"
+    "attribute,*,ImplementationNotes,osb:sponsorInstruction,,,\n"
+)
+
+DEF_ELEMENTS = [
+    "form_defs",
+    "item_group_defs",
+    "item_defs",
+    "condition_defs",
+    "method_defs",
+    "codelists",
+    "measurement_units",
+]
+
+
+def upload_file(content: str, content_type: str) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content.encode("utf-8")),
+        filename="odm",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def make_importer(
+    xml: str | UploadFile, mapper: str | None = None, streaming: bool = False
+) -> OdmXmlImporterService:
+    return OdmXmlImporterService(
+        upload_file(xml, "application/xml") if isinstance(xml, str) else xml,
+        upload_file(mapper, "text/csv") if mapper else None,
+        streaming,
+    )
+
+
+def make_odm_xml(num_items: int) -> str:
+    item_defs = "".join(
+        f"""
+            <ItemDef OID="I.{i}" Name="Item {i}" DataType="text" osb:instruction="Enter item {i}">
+                <Description><TranslatedText xml:lang="en">Description of item {i}</TranslatedText></Description>
+                <Question><TranslatedText xml:lang="en">What is item {i}?</TranslatedText></Question>
+                <CodeListRef CodeListOID="CL.{i % 10}"/>
+                <Alias Context="SDTM" Name="VAR{i}"/>
+            </ItemDef>"""
+        for i in range(num_items)
+    )
+    codelists = "".join(
+        f"""
+            <CodeList OID="CL.{i}" Name="Codelist {i}" DataType="text">
+                <CodeListItem CodedValue="Y" osb:OID="CTTerm_{i}"><Decode><TranslatedText>Yes</TranslatedText></Decode></CodeListItem>
+            </CodeList>"""
+        for i in range(10)
+    )
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<ODM xmlns:odm="http://www.cdisc.org/ns/odm/v1.3" xmlns:osb="url2" ODMVersion="1.3.2">
+    <Study OID="S.1">
+        <GlobalVariables><StudyName>Library</StudyName></GlobalVariables>
+        <MetaDataVersion OID="MDV.1" Name="MDV.1">
+            <ItemGroupDef OID="IG.1" Name="Group" Repeating="No" Domain="VS">
+                <ItemRef ItemOID="I.0" Mandatory="Yes" OrderNumber="1"/>
+            </ItemGroupDef>{item_defs}{codelists}
+        </MetaDataVersion>
+    </Study>
+</ODM>"""
+
+
+@pytest.fixture(name="auth_context", autouse=True)
+def fixture_auth_context():
+    with request_cycle_context(
+        {"auth": dummy_auth_object(dummy_access_token_claims("odm-importer"))}
+    ):
+        yield
+
+
+def read_definitions(importer: OdmXmlImporterService):
+    return (
+        importer.namespace_prefixes,
+        importer.study_name,
+        {
+            name: [element.toxml() for element in getattr(importer, name)]
+            for name in DEF_ELEMENTS
+        },
+        {name: len(getattr(importer, name)) for name in DEF_ELEMENTS},
+    )
+
+
+@pytest.mark.parametrize(
+    "xml, mapper",
+    [(import_input1, None), (import_input2, MAPPER)],
+    ids=["without-mapper", "with-mapper"],
+)
+def test_streamed_definitions_match_parsed_document(xml, mapper):
+    streamed = read_definitions(make_importer(xml, mapper, streaming=True))
+
+    assert streamed == read_definitions(make_importer(xml, mapper))
+    assert streamed[2]["form_defs"]
+
+
+def test_streamed_definitions_are_parsed_on_each_iteration():
+    importer = make_importer(make_odm_xml(3), streaming=True)
+
+    assert importer.study_name == "Library"
+    assert sorted(importer.codelists_by_oid) == [f"CL.{i}" for i in range(10)]
+    assert len(importer.item_defs) == 3
+    for _ in range(2):
+        assert [item_def.getAttribute("OID") for item_def in importer.item_defs] == [
+            "I.0",
+            "I.1",
+            "I.2",
+        ]
+    item_def = next(iter(importer.item_defs))
+    assert importer._get_codelist(item_def).getAttribute("Name") == "Codelist 0"
+    assert importer._extract_descriptions(item_def)[0]["description"] == (
+        "Description of item 0"
+    )
+
+
+def measure(xml: str, streaming: bool) -> tuple[float, int, list[str]]:
+    # The uploaded file is spooled to disk by the API, it isn't counted
+    xml = upload_file(xml, "application/xml")
+    tracemalloc.start()
+    start = time.perf_counter()
+    importer = make_importer(xml, streaming=streaming)
+    oids = [item_def.getAttribute("OID") for item_def in importer.item_defs]
+    secs = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return secs, peak, oids
+
+
+@pytest.mark.benchmark
+def test_streamed_import_benchmark():
+    num_items = 1000
+    xml = make_odm_xml(num_items)
+
+    document_secs, document_peak, expected = measure(xml, streaming=False)
+    streamed_secs, streamed_peak, oids = measure(xml, streaming=True)
+
+    assert oids == expected
+    log.info(
+        "Reading %s ItemDefs: document %.3fs (peak %.1f MB), streamed %.3fs (peak %.1f MB)",
+        num_items,
+        document_secs,
+        document_peak / 2**20,
+        streamed_secs,
+        streamed_peak / 2**20,
+    )
+    assert streamed_peak * 4 < document_peak
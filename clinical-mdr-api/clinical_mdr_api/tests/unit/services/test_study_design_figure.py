@@ -1,5 +1,6 @@
 import datetime
 from collections import OrderedDict
+from unittest.mock import patch
 
 from clinical_mdr_api.models.controlled_terminologies.ct_term import CTTermName
 from clinical_mdr_api.models.study_selections.study import StudySoaPreferences
@@ -2402,6 +2403,11 @@ class MockStudyDesignFigureService(StudyDesignFigureService):
     def _get_preferred_time_unit_name(*_args, **_kwargs):
         return "week"
 
+    @staticmethod
+    def _get_study_revision(*_args, **_kwargs):
+        # draw the figure on every call
+        return None
+
 
 def test_mk_data_matrix():
     table = MockStudyDesignFigureService()._mk_data_matrix(
@@ -2471,3 +2477,45 @@ def test_get_svg_document():
     assert "markerWidth" in doc, '"markerWidth" found, missing arrowhead markers?'
 
     assert doc == SVG_DOCUMENT
+
+
+def test_get_svg_document_is_cached_per_study_revision():
+    StudyDesignFigureService.cache_store_svg.clear()
+    service = MockStudyDesignFigureService()
+    revision = 10
+
+    with patch.object(
+        service, "_get_study_revision", side_effect=lambda _uid: revision
+    ), patch.object(
+        service, "_get_study_arms", wraps=service._get_study_arms
+    ) as get_study_arms:
+        doc = service.get_svg_document(STUDY_UID)
+        assert service.get_svg_document(STUDY_UID) == doc
+        assert get_study_arms.call_count == 1
+
+        # a write to the study changes its revision
+        revision = 11
+        assert service.get_svg_document(STUDY_UID) == doc
+        assert get_study_arms.call_count == 2
+
+        # study versions don't change, their revision is not queried
+        service.get_svg_document(STUDY_UID, study_value_version="1")
+        service.get_svg_document(STUDY_UID, study_value_version="1")
+        assert get_study_arms.call_count == 3
+        assert service._get_study_revision.call_count == 3
+
+    StudyDesignFigureService.cache_store_svg.clear()
+
+
+def test_text_measurements_are_memoised():
+    service = MockStudyDesignFigureService()
+    text = "Screening and run-in period with a rather long name"
+    flow = service._flow_text(text, 120, (5, 5), False)
+    size = service._get_text_size_px(text)
+
+    # measurements are shared by all instances of the process
+    other = MockStudyDesignFigureService()
+    assert other.font is service.font
+    with patch.object(other.font, "getbbox", side_effect=AssertionError):
+        assert other._flow_text(text, 120, (5, 5), False) == flow
+        assert other._get_text_size_px(text) == size
@@ -39,10 +39,23 @@ class MockStudyEpoch(BaseModel):
     epoch_ctterm: CTTermName
 
 
+class MockStudySoARepository:
+    def __init__(self):
+        self.revision = 1
+
+    def get_study_revision(self, *_args, **_kwargs):
+        return self.revision
+
+
 class MockStudyFlowchartService(StudyFlowchartService):
     # pylint: disable=super-init-not-called
     def __init__(self):
-        pass
+        self._repository = MockStudySoARepository()
+        self.num_builds = 0
+
+    def build_flowchart_table(self, *args, **kwargs):
+        self.num_builds += 1
+        return super().build_flowchart_table(*args, **kwargs)
 
     def _get_study_visits(self, *_args, **_kwargs):
         return STUDY_VISITS
@@ -662,6 +675,43 @@ def test_build_flowchart_table(mock_study_flowchart_service):
     assert table.dict() == DETAILED_SOA_TABLE.model_dump()
 
 
+def test_get_flowchart_table_cache():
+    # Not using the module scoped fixture, since the number of builds and the revision are altered
+    mock_study_flowchart_service = MockStudyFlowchartService()
+    StudyFlowchartService.cache_store_soa.clear()
+
+    def get_table():
+        return mock_study_flowchart_service.get_flowchart_table(
+            study_uid="",
+            study_value_version=None,
+            layout=SoALayout.DETAILED,
+            time_unit="day",
+        )
+
+    table = get_table()
+    assert mock_study_flowchart_service.num_builds == 1
+
+    # THEN the same table is returned from the cache while the study doesn't change
+    table.rows.pop()
+    cached_table = get_table()
+    assert mock_study_flowchart_service.num_builds == 1
+    assert cached_table.model_dump() == DETAILED_SOA_TABLE.model_dump()
+
+    # THEN the table is rebuilt after a write to the study
+    mock_study_flowchart_service.repository.revision = 2
+    assert get_table().model_dump() == DETAILED_SOA_TABLE.model_dump()
+    assert mock_study_flowchart_service.num_builds == 2
+
+    # THEN other layouts are built separately
+    mock_study_flowchart_service.get_flowchart_table(
+        study_uid="",
+        study_value_version=None,
+        layout=SoALayout.PROTOCOL,
+        time_unit="day",
+    )
+    assert mock_study_flowchart_service.num_builds == 3
+
+
 @pytest.mark.parametrize(
     ("propagate_refs", "soa", "expected_soa"),
     [
@@ -0,0 +1,230 @@
+"""
+Tests and micro-benchmark of the prefetched CT code table of the USDM mapper.
+
+The reference mapping runs one query per emitted code, like the mapper did before the codes were prefetched.
+The database is simulated with a fixed latency per query.
+
+The benchmark only runs when the RUN_BENCHMARKS env var is set:
+    RUN_BENCHMARKS=1 pytest clinical_mdr_api/tests/unit/services/test_usdm_mapper.py -k benchmark
+"""
+
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from clinical_mdr_api.services.ddf import usdm_mapper
+from clinical_mdr_api.services.ddf.usdm_mapper import USDMMapper
+
+log = logging.getLogger(__name__)
+
+QUERY_LATENCY_SECS = 0.001
+
+CT_TERMS = {
+    "C25301": "Day",
+    "C7652": "Screening",
+    "C101526": "Treatment",
+    "C99158": "Follow-up",
+    "C174266": "Arm Type",
+    "C175574": "On Site Visit",
+    "C85826": "Primary Objective",
+    "C94496": "Primary Endpoint",
+}
+DICTIONARY_TERMS = {"Term_000001": "Diabetes"}
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.num_queries = 0
+
+    def cypher_query(self, query, params):
+        self.num_queries += 1
+        time.sleep(QUERY_LATENCY_SECS)
+        terms = DICTIONARY_TERMS if "DictionaryTermRoot" in query else CT_TERMS
+        library = "SNOMED" if "DictionaryTermRoot" in query else "CDISC"
+        rows = [
+            [uid, library, terms[uid]]
+            for uid in params["uids"]
+            if uid in terms  # the fake only matches whole uids
+        ]
+        return rows, ["uid", "library", "decode"]
+
+
+class PerCodeUSDMMapper(USDMMapper):
+    """Resolves every emitted code with its own query."""
+
+    def get_ct_package_term_as_usdm_code(self, concept_id):
+        self._ct_codes.clear()
+        return super().get_ct_package_term_as_usdm_code(concept_id)
+
+
+def term(term_uid):
+    return SimpleNamespace(term_uid=term_uid)
+
+
+def make_study(num_visits: int):
+    visit_types = ["C7652", "C101526", "C99158"]
+    selections = {
+        "arms": [
+            SimpleNamespace(
+                arm_uid=f"StudyArm_{i}",
+                name=f"Arm {i}",
+                description=None,
+                arm_type=term("C174266"),
+            )
+            for i in range(3)
+        ],
+        "epochs": [
+            SimpleNamespace(
+                uid=f"StudyEpoch_{i}",
+                order=i,
+                epoch_name=f"Epoch {i}",
+                description=None,
+                epoch_type_ctterm=term(visit_types[i]),
+            )
+            for i in range(3)
+        ],
+        "endpoints": [
+            SimpleNamespace(
+                study_objective=SimpleNamespace(objective_level=term("C85826")),
+                endpoint_level=term("C94496"),
+            )
+        ],
+        "visits": [
+            SimpleNamespace(
+                uid=f"StudyVisit_{i}",
+                visit_number=i,
+                visit_short_name=f"V{i}",
+                visit_name=f"Visit {i}",
+                description=None,
+                visit_type_uid=visit_types[i % 3],
+                visit_contact_mode_uid="C175574",
+                start_rule=None,
+                end_rule=None,
+            )
+            for i in range(num_visits)
+        ],
+    }
+    study = SimpleNamespace(
+        uid="Study_000001",
+        current_metadata=SimpleNamespace(
+            study_population=SimpleNamespace(
+                therapeutic_area_codes=[term("Term_000001")]
+            )
+        ),
+    )
+    return study, selections
+
+
+def make_mapper(selections, mapper_class=USDMMapper):
+    def getter(name):
+        return lambda *_args, **_kwargs: SimpleNamespace(items=selections[name])
+
+    return mapper_class(
+        get_osb_study_design_cells=lambda *_args: [],
+        get_osb_study_arms=getter("arms"),
+        get_osb_study_epochs=getter("epochs"),
+        get_osb_study_elements=getter("elements"),
+        get_osb_study_endpoints=getter("endpoints"),
+        get_osb_study_visits=getter("visits"),
+        get_osb_study_activities=getter("activities"),
+        get_osb_activity_schedules=lambda *_args: [],
+    )
+
+
+def map_codes(mapper, study, prefetch: bool):
+    if prefetch:
+        mapper.prefetch_codes(*mapper._collect_code_ids(study))
+    return (
+        mapper._get_study_arms(study),
+        mapper._get_study_epochs(study),
+        mapper._get_study_encounters(study),
+        mapper._get_therapeutic_areas(study),
+        mapper.get_ddf_study_population_duration_unit_days(),
+    )
+
+
+@pytest.fixture(name="database")
+def fixture_database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(usdm_mapper, "db", database)
+    return database
+
+
+def test_prefetched_codes_are_built_without_queries(database):
+    study, selections = make_study(num_visits=6)
+    mapper = make_mapper(selections)
+
+    arms, epochs, encounters, therapeutic_areas, unit = map_codes(
+        mapper, study, prefetch=True
+    )
+
+    # One query for the CT terms, one for the dictionary terms
+    assert database.num_queries == 2
+    assert {arm.type.code for arm in arms} == {"C174266"}
+    assert [epoch.type.decode for epoch in epochs] == [
+        "Screening",
+        "Treatment",
+        "Follow-up",
+    ]
+    assert encounters[4].type.decode == "Treatment"
+    assert encounters[4].contactModes[0].codeSystem == "CDISC"
+    assert therapeutic_areas[0].decode == "Diabetes"
+    assert unit.decode == "Day"
+
+    # Codes missing from the table are resolved, once
+    assert mapper.get_ct_package_term_as_usdm_code("C00000").code == ""
+    assert mapper.get_ct_package_term_as_usdm_code("C00000").code == ""
+    assert database.num_queries == 3
+
+
+@pytest.mark.usefixtures("database")
+def test_selections_are_fetched_once_per_mapping():
+    study, selections = make_study(num_visits=2)
+    calls = []
+
+    def get_visits(*args, **_kwargs):
+        calls.append(args)
+        return SimpleNamespace(items=selections["visits"])
+
+    mapper = make_mapper(selections)
+    mapper._get_osb_study_visits = mapper._fetch_once(get_visits)
+
+    mapper._get_study_encounters(study)
+    mapper._get_study_encounters(study)
+    assert calls == [("Study_000001",)]
+
+
+@pytest.mark.benchmark
+def test_prefetched_codes_benchmark():
+    num_visits = 50
+    study, selections = make_study(num_visits)
+    database = FakeDatabase()
+    original_db = usdm_mapper.db
+    usdm_mapper.db = database
+    try:
+        start = time.perf_counter()
+        expected = map_codes(
+            make_mapper(selections, PerCodeUSDMMapper), study, prefetch=False
+        )
+        reference_secs = time.perf_counter() - start
+        reference_queries = database.num_queries
+
+        database.num_queries = 0
+        start = time.perf_counter()
+        out = map_codes(make_mapper(selections), study, prefetch=True)
+        prefetched_secs = time.perf_counter() - start
+    finally:
+        usdm_mapper.db = original_db
+
+    assert out == expected
+    assert database.num_queries < reference_queries
+    log.info(
+        "Mapping codes of %s visits: per code %.3fs (%s queries), prefetched %.3fs (%s queries)",
+        num_visits,
+        reference_secs,
+        reference_queries,
+        prefetched_secs,
+        database.num_queries,
+    )
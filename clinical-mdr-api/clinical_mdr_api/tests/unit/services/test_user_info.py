@@ -0,0 +1,22 @@
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api.domain_repositories import user_repository
+from clinical_mdr_api.domain_repositories.user_repository import prime_author_usernames
+from clinical_mdr_api.services.user_info import UserInfoService
+from clinical_mdr_api.tests.unit.domain_repositories.test_user_repository import (
+    FakeUserRepository,
+)
+
+
+def test_author_usernames_are_batched_per_request(monkeypatch):
+    repo = FakeUserRepository({f"user-{idx}": f"User {idx}" for idx in range(50)})
+    monkeypatch.setattr(user_repository, "UserRepository", lambda: repo)
+
+    rows = [{"uid": f"Item_{idx}", "author_id": f"user-{idx}"} for idx in range(50)]
+    with request_cycle_context({}):
+        for row in prime_author_usernames(rows):
+            assert UserInfoService.get_author_username_from_id(row["author_id"]) == row[
+                "author_id"
+            ].replace("user-", "User ")
+
+    assert len(repo.queries) == 1
@@ -3,6 +3,7 @@ from os import environ
 from common.utils import strtobool
 
 JWT_LEEWAY_SECONDS = 10
+JWT_CLAIMS_CACHE_MAX_SIZE = int(environ.get("JWT_CLAIMS_CACHE_MAX_SIZE", 1000))
 OAUTH_ENABLED = strtobool(environ.get("OAUTH_ENABLED", "1"))
 OAUTH_RBAC_ENABLED = strtobool(environ.get("OAUTH_RBAC_ENABLED", "1"))
 OAUTH_API_APP_ID = environ.get("OAUTH_API_APP_ID")
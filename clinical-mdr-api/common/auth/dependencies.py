@@ -29,6 +29,7 @@ jwks_service = JWKService(
     oidc_client,
     audience=config.OAUTH_API_APP_ID,
     leeway_seconds=config.JWT_LEEWAY_SECONDS,
+    claims_cache_size=config.JWT_CLAIMS_CACHE_MAX_SIZE,
 )
 
 oauth_scheme = OAuth2AuthorizationCodeBearer(
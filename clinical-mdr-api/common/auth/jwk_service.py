@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import time
 import uuid
@@ -5,6 +6,7 @@ from typing import Any, Mapping
 
 from authlib.integrations.base_client import OAuth2Mixin
 from authlib.jose import JsonWebKey, JWTClaims, Key, KeySet, jwt
+from cachetools import TLRUCache
 from httpx import AsyncClient
 
 from common.exceptions import NotAuthenticatedException
@@ -23,6 +25,7 @@ class JWKService(KeySet):
         oauth_client: OAuth2Mixin,
         audience: str | list[str],
         leeway_seconds: int | float = 15,
+        claims_cache_size: int = 1000,
     ):
         self.oauth_client = oauth_client
         self.audience = audience
@@ -31,6 +34,10 @@ class JWKService(KeySet):
         self.jwks_uri = None
         self.leeway = leeway_seconds
         self.claims_options = {}
+        # Claims of the validated tokens by token hash, until the tokens expire
+        self._claims_cache = TLRUCache(
+            maxsize=claims_cache_size, ttu=_claims_expiry, timer=time.time
+        )
         super().__init__({})
 
     async def init(self) -> None:
@@ -139,7 +146,18 @@ class JWKService(KeySet):
         return resp.json()
 
     async def validate_jwt(self, token: str | bytes) -> JWTClaims:
-        """Validates JWT, fetching JWKs, checking signature and iss & aud claims (if init), then returns claims."""
+        """
+        Validates JWT, fetching JWKs, checking signature and iss & aud claims (if init), then returns claims.
+
+        The claims of a validated token are cached until the token expires,
+        so that the signature of the token isn't verified again on every request.
+        """
+        token_hash = hashlib.sha256(
+            token.encode() if isinstance(token, str) else token
+        ).hexdigest()
+        if (claims := self._claims_cache.get(token_hash)) is not None:
+            return claims
+
         await self.init()
 
         try:
@@ -160,8 +178,15 @@ class JWKService(KeySet):
 
         claims.validate(leeway=self.leeway)
 
+        if claims.get("exp") is not None:
+            self._claims_cache[token_hash] = claims
+
         return claims
 
 
+def _claims_expiry(_token_hash: str, claims: JWTClaims, _now: float) -> float:
+    return claims["exp"]
+
+
 class UnknownKeyError(ValueError):
     pass
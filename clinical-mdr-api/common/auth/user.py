@@ -1,12 +1,18 @@
+import hashlib
+import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from cachetools import TTLCache, cached
+from cachetools import TTLCache
 from neomodel.sync_.core import db
 from starlette_context import context
 
 from common.auth.models import Auth, User
 
-cache_persist_user = TTLCache(maxsize=1000, ttl=10)
+# Fingerprints of the users as stored in the database, by user id
+cache_persist_user = TTLCache(maxsize=1000, ttl=3600)
+lock_persist_user = threading.Lock()
 
 log = logging.getLogger(__name__)
 
@@ -23,43 +29,139 @@ def user() -> User:
     return auth().user
 
 
-@cached(cache=cache_persist_user, key=lambda user_info: user_info.id())
-def persist_user(user_info: User):
-    """Persists user information in the database."""
+def user_fingerprint(user_info: User) -> str:
+    """Returns a hash of the user information persisted in the database."""
+
+    return hashlib.sha256(
+        json.dumps(
+            [
+                user_info.id(),
+                user_info.oid,
+                user_info.azp,
+                user_info.username,
+                user_info.name,
+                user_info.email,
+                sorted(user_info.roles),
+            ]
+        ).encode()
+    ).hexdigest()
+
 
-    log.info("Persisting user %s", user_info)
+def write_users(users: list[User]):
+    """Writes the given users to the database."""
+
+    log.info("Persisting users %s", users)
     db.cypher_query(
         query="""
-        MERGE (u:User {user_id: $id})
+        UNWIND $users AS user
+        MERGE (u:User {user_id: user.id})
         ON CREATE
             SET u.created = datetime(),
-                u.oid = $oid,
-                u.azp = $azp,
-                u.username = $username,
-                u.name = $name,
-                u.email = $email,
-                u.roles = $roles
+                u.oid = user.oid,
+                u.azp = user.azp,
+                u.username = user.username,
+                u.name = user.name,
+                u.email = user.email,
+                u.roles = user.roles
         ON MATCH
             SET u.updated = datetime(),
-                u.oid = $oid,
-                u.azp = $azp,
-                u.username = COALESCE($username, u.username),
-                u.name = $name,
-                u.email = $email,
-                u.roles = $roles
+                u.oid = user.oid,
+                u.azp = user.azp,
+                u.username = COALESCE(user.username, u.username),
+                u.name = user.name,
+                u.email = user.email,
+                u.roles = user.roles
+        SET u.fingerprint = user.fingerprint
         """,
         params={
-            "id": user_info.id(),
-            "oid": user_info.oid,
-            "azp": user_info.azp,
-            "username": user_info.username,
-            "name": user_info.name,
-            "email": user_info.email,
-            "roles": list(user_info.roles),
+            "users": [
+                {
+                    "id": user_info.id(),
+                    "oid": user_info.oid,
+                    "azp": user_info.azp,
+                    "username": user_info.username,
+                    "name": user_info.name,
+                    "email": user_info.email,
+                    "roles": list(user_info.roles),
+                    "fingerprint": user_fingerprint(user_info),
+                }
+                for user_info in users
+            ]
         },
     )
 
 
+class UserWriter:
+    """
+    Writes users to the database in a background thread.
+
+    Users submitted while a write is pending are written together,
+    only the last submitted information of a user is written.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, User] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="user-writer"
+        )
+
+    def submit(self, user_info: User):
+        with self._lock:
+            schedule = not self._pending
+            self._pending[user_info.id()] = user_info
+        if schedule:
+            self._executor.submit(self.flush)
+
+    def flush(self):
+        with self._lock:
+            users = list(self._pending.values())
+            self._pending.clear()
+        if not users:
+            return
+        try:
+            write_users(users)
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Failed to persist users")
+            with lock_persist_user:
+                for user_info in users:
+                    cache_persist_user.pop(user_info.id(), None)
+
+
+user_writer = UserWriter()
+
+
+def persist_user(user_info: User):
+    """
+    Persists user information in the database, if it changed since it was last persisted.
+
+    New users are written immediately, as the request may rely on them.
+    Changes of known users are written in the background, off the request path.
+    """
+
+    user_id = user_info.id()
+    fingerprint = user_fingerprint(user_info)
+    with lock_persist_user:
+        if cache_persist_user.get(user_id) == fingerprint:
+            return
+
+    rs, _ = db.cypher_query(
+        "MATCH (u:User {user_id: $id}) RETURN u.fingerprint",
+        params={"id": user_id},
+    )
+    if not rs:
+        write_users([user_info])
+        with lock_persist_user:
+            cache_persist_user[user_id] = fingerprint
+    else:
+        # Set first, as a failed background write evicts the user
+        with lock_persist_user:
+            cache_persist_user[user_id] = fingerprint
+        if rs[0][0] != fingerprint:
+            user_writer.submit(user_info)
+
+
 def clear_users_cache():
-    cache_persist_user.clear()
+    with lock_persist_user:
+        cache_persist_user.clear()
     log.info("Users cache cleared")
@@ -36,6 +36,62 @@ NUMBER_OF_UID_DIGITS = 6
 
 CACHE_MAX_SIZE = int(environ.get("CACHE_MAX_SIZE", 1000))
 CACHE_TTL = int(environ.get("CACHE_TTL", 3600))
+# Propagation of cache invalidations between API workers: 'local' (current process only) or 'file'
+CACHE_INVALIDATION_BUS = environ.get("CACHE_INVALIDATION_BUS", "local")
+CACHE_INVALIDATION_BUS_PATH = environ.get(
+    "CACHE_INVALIDATION_BUS_PATH", "/tmp/clinical-mdr-api-cache-invalidation.log"
+)
+CACHE_INVALIDATION_POLL_INTERVAL = float(
+    environ.get("CACHE_INVALIDATION_POLL_INTERVAL", "0.5")
+)
+CACHE_INVALIDATION_BUS_MAX_SIZE = int(
+    environ.get("CACHE_INVALIDATION_BUS_MAX_SIZE", 1024 * 1024)
+)
+
+# Built SoA tables of draft studies, refreshed when the audit trail of the study changes
+SOA_CACHE_MAX_SIZE = int(environ.get("SOA_CACHE_MAX_SIZE", 100))
+SOA_CACHE_TTL = int(environ.get("SOA_CACHE_TTL", 3600))
+
+# Drawn study design figures, refreshed when the audit trail of the study changes
+STUDY_DESIGN_FIGURE_CACHE_MAX_SIZE = int(
+    environ.get("STUDY_DESIGN_FIGURE_CACHE_MAX_SIZE", 200)
+)
+STUDY_DESIGN_FIGURE_CACHE_TTL = int(environ.get("STUDY_DESIGN_FIGURE_CACHE_TTL", 3600))
+
+# CT terms looked up when building study visits, per codelist and effective date.
+# Cleared on CT writes, the TTL bounds the staleness of CT imported outside the API.
+CT_LOOKUP_CACHE_MAX_SIZE = int(environ.get("CT_LOOKUP_CACHE_MAX_SIZE", 500))
+CT_LOOKUP_CACHE_TTL = int(environ.get("CT_LOOKUP_CACHE_TTL", 3600))
+
+# Background jobs, see clinical_mdr_api.services.jobs
+# Number of jobs run concurrently by each API worker, 0 only queues the jobs for other workers
+JOB_WORKERS = int(environ.get("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(environ.get("JOB_POLL_INTERVAL", "1"))
+# Running jobs without heartbeat for this long are failed, e.g. after a restart of the API
+JOB_STALE_AFTER_SECS = int(environ.get("JOB_STALE_AFTER_SECS", "300"))
+# Finished jobs and their results are deleted after this many hours
+JOB_RETENTION_HOURS = int(environ.get("JOB_RETENTION_HOURS", "72"))
+# Files uploaded with jobs are stored in this directory rather than in the database,
+# it must be shared by all API processes running background jobs
+JOB_FILES_DIR = environ.get("JOB_FILES_DIR", "/tmp/clinical-mdr-api-jobs")
+
+# ODM XML imports report their progress every this many created definitions
+ODM_XML_IMPORT_PROGRESS_INTERVAL = int(
+    environ.get("ODM_XML_IMPORT_PROGRESS_INTERVAL", "100")
+)
+# ODM XML imports create the descriptions, aliases and formal expressions of this many definitions at once
+ODM_XML_IMPORT_BATCH_SIZE = int(environ.get("ODM_XML_IMPORT_BATCH_SIZE", "100"))
+
+# Number of items retrieved at once when exporting all items of a list endpoint
+EXPORT_CHUNK_SIZE = int(environ.get("EXPORT_CHUNK_SIZE", 1000))
+
+# Maximum number of nodes returned by a full-text index for a filter with the `ft` operator
+FULLTEXT_SEARCH_LIMIT = int(environ.get("FULLTEXT_SEARCH_LIMIT", 1000))
+# Words of a full-text search are also matched inside other words from this length,
+# shorter words only match whole words and prefixes
+FULLTEXT_SEARCH_INFIX_MIN_LENGTH = int(
+    environ.get("FULLTEXT_SEARCH_INFIX_MIN_LENGTH", 3)
+)
 
 MAX_INT_NEO4J = 9223372036854775807
 DEFAULT_PAGE_NUMBER = 1
@@ -145,6 +201,12 @@ TRACE_REQUEST_BODY_TRUNCATE_BYTES = int(
 )
 TRACE_QUERY_MAX_LEN = int(environ.get("TRACE_QUERY_MAX_LEN", "4000"))
 
+# Cypher query profiling of single requests, see common.telemetry.request_metrics
+CYPHER_PROFILE_MAX_QUERIES = int(environ.get("CYPHER_PROFILE_MAX_QUERIES", "5000"))
+CYPHER_PROFILE_N_PLUS_ONE_MIN_COUNT = int(
+    environ.get("CYPHER_PROFILE_N_PLUS_ONE_MIN_COUNT", "5")
+)
+
 
 # Absolute path of application root directory
 APP_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
@@ -161,3 +223,9 @@ ALLOW_CREDENTIALS = environ.get("ALLOW_CREDENTIALS", "true").upper().strip() not
 ALLOW_METHODS = environ.get("ALLOW_METHODS", "*").split(",")
 ALLOW_HEADERS = environ.get("ALLOW_HEADERS", "*").split(",")
 SLOW_QUERY_TIME_SECS = 1
+
+# Maximum number of concurrent database calls per consumer API worker
+CONSUMER_API_DB_CONCURRENCY = int(environ.get("CONSUMER_API_DB_CONCURRENCY", "16"))
+CONSUMER_API_HEAVY_DB_CONCURRENCY = int(
+    environ.get("CONSUMER_API_HEAVY_DB_CONCURRENCY", "4")
+)
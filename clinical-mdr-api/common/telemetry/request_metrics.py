@@ -1,16 +1,20 @@
 import contextlib
+import hashlib
 import json
 import logging
+import re
 import time
 from functools import wraps
-from typing import Mapping
+from threading import Lock
+from typing import Any, Mapping
+from urllib.parse import parse_qs
 
 import neomodel
 import opencensus.trace
 from pydantic import BaseModel, Field
-from starlette.datastructures import MutableHeaders
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import Response
-from starlette.types import Message
+from starlette.types import Message, Scope, Send
 from starlette_context import context
 
 from common import config
@@ -20,6 +24,21 @@ log = logging.getLogger(__name__)
 
 REQUEST_METRICS_HEADER_NAME = "X-Metrics"
 
+# Cypher query profiling is requested with this header or query parameter, with value `header` or `json`
+CYPHER_PROFILE_HEADER_NAME = "X-Cypher-Profile"
+CYPHER_PROFILE_QUERY_PARAM = "cypher_profile"
+CYPHER_PROFILE_MODES = ("header", "json")
+# Role required to receive the profiling report
+CYPHER_PROFILE_ROLE = "Admin.Read"
+# Number of N+1 query shapes listed in the X-Metrics header
+CYPHER_PROFILE_HEADER_MAX_SHAPES = 5
+CYPHER_PROFILE_HEADER_MAX_QUERY_LEN = 200
+
+_cypher_literal_regex = re.compile(
+    r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|(?<![\w$])\d+(?:\.\d+)?\b"
+)
+_whitespace_regex = re.compile(r"\s+")
+
 
 class RequestMetrics(BaseModel):
     """Per-request metrics"""
@@ -49,6 +68,172 @@ class RequestMetrics(BaseModel):
     )
 
 
+class CypherQueryProfile(BaseModel):
+    """A Cypher query executed during a profiled request"""
+
+    shape_id: str = Field(title="Identifier of the normalised query text")
+    params_hash: str = Field(title="Hash of the query parameters")
+    time: float = Field(title="Walltime (in seconds) of the query")
+    rows: int | None = Field(None, title="Number of returned rows")
+
+
+class CypherQueryShapeProfile(BaseModel):
+    """Cypher queries sharing the same normalised text, executed during a profiled request"""
+
+    shape_id: str = Field(title="Identifier of the normalised query text")
+    query: str = Field(title="Normalised query text (truncated)")
+    count: int = Field(0, title="Number of executions")
+    distinct_params: int = Field(0, title="Number of distinct query parameters")
+    total_time: float = Field(0, title="Cumulative walltime (in seconds)")
+    max_time: float = Field(0, title="Walltime (in seconds) of the slowest execution")
+    rows: int = Field(0, title="Total number of returned rows")
+    n_plus_one: bool = Field(
+        False,
+        title="Executed many times with different parameters, a likely N+1 query pattern",
+    )
+
+
+def normalise_cypher_query(query: str) -> str:
+    """Returns the shape of a Cypher query: literal values are replaced by `?` and whitespace is collapsed"""
+
+    return _whitespace_regex.sub(" ", _cypher_literal_regex.sub("?", query)).strip()
+
+
+def hash_cypher_params(params: Mapping | None) -> str:
+    """Returns a short hash of Cypher query parameters"""
+
+    try:
+        payload = json.dumps(params, sort_keys=True, default=str)
+    except TypeError:
+        payload = repr(params)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+class CypherProfiler:
+    """
+    Records the Cypher queries of a request, and groups them by shape to find N+1 query patterns.
+
+    A query shape executed at least CYPHER_PROFILE_N_PLUS_ONE_MIN_COUNT times with different parameters
+    is flagged as N+1, as it typically means that a query is run for every item of a result.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.queries: list[CypherQueryProfile] = []
+        self.dropped_queries = 0
+        self._shapes: dict[str, CypherQueryShapeProfile] = {}
+        self._shape_params: dict[str, set[str]] = {}
+        self._lock = Lock()
+
+    def record(
+        self, query: str, params: Mapping | None, delta_time: float, rows: int | None
+    ) -> None:
+        shape = normalise_cypher_query(query)
+        shape_id = hashlib.sha1(shape.encode()).hexdigest()[:12]
+        params_hash = hash_cypher_params(params)
+
+        with self._lock:
+            if (group := self._shapes.get(shape_id)) is None:
+                group = self._shapes[shape_id] = CypherQueryShapeProfile(
+                    shape_id=shape_id, query=shape[: config.TRACE_QUERY_MAX_LEN]
+                )
+                self._shape_params[shape_id] = set()
+            self._shape_params[shape_id].add(params_hash)
+            group.count += 1
+            group.distinct_params = len(self._shape_params[shape_id])
+            group.total_time += delta_time
+            group.max_time = max(group.max_time, delta_time)
+            group.rows += rows or 0
+            group.n_plus_one = (
+                group.count >= config.CYPHER_PROFILE_N_PLUS_ONE_MIN_COUNT
+                and group.distinct_params > 1
+            )
+
+            if len(self.queries) < config.CYPHER_PROFILE_MAX_QUERIES:
+                self.queries.append(
+                    CypherQueryProfile(
+                        shape_id=shape_id,
+                        params_hash=params_hash,
+                        time=round(delta_time, 6),
+                        rows=rows,
+                    )
+                )
+            else:
+                self.dropped_queries += 1
+
+    def shapes(self) -> list[CypherQueryShapeProfile]:
+        """Query shapes, the most time-consuming first"""
+
+        with self._lock:
+            return sorted(
+                (group.model_copy() for group in self._shapes.values()),
+                key=lambda group: group.total_time,
+                reverse=True,
+            )
+
+    def report(self) -> dict[str, Any]:
+        """Full profiling report"""
+
+        shapes = self.shapes()
+        return {
+            "cypher.count": sum(group.count for group in shapes),
+            "cypher.times": round(sum(group.total_time for group in shapes), 4),
+            "n_plus_one": [group.shape_id for group in shapes if group.n_plus_one],
+            "shapes": [group.model_dump() for group in shapes],
+            "queries": [query.model_dump() for query in self.queries],
+            "queries.dropped": self.dropped_queries,
+        }
+
+    def header_summary(self) -> dict[str, Any]:
+        """Profiling summary for the X-Metrics response header"""
+
+        shapes = self.shapes()
+        return {
+            "cypher.profile.shapes": len(shapes),
+            "cypher.profile.n_plus_one": [
+                {
+                    "query": group.query[:CYPHER_PROFILE_HEADER_MAX_QUERY_LEN],
+                    "count": group.count,
+                    "time": round(group.total_time, 4),
+                }
+                for group in shapes
+                if group.n_plus_one
+            ][:CYPHER_PROFILE_HEADER_MAX_SHAPES],
+        }
+
+
+def init_cypher_profiler(scope: Scope):
+    """Enables Cypher query profiling of the request, if requested by header or query parameter"""
+
+    if not context.exists():
+        return
+
+    mode = Headers(scope=scope).get(CYPHER_PROFILE_HEADER_NAME)
+    if mode is None:
+        query_params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        mode = query_params.get(CYPHER_PROFILE_QUERY_PARAM, [None])[-1]
+
+    if mode and (mode := mode.strip().lower()) in CYPHER_PROFILE_MODES:
+        context["cypher_profiler"] = CypherProfiler(mode)
+
+
+def get_cypher_profiler() -> CypherProfiler | None:
+    """
+    Gets the Cypher profiler from request context, if profiling was requested by an admin user.
+
+    Nothing is recorded nor disclosed before the user is authenticated, nor for the other users.
+    """
+
+    if not context.exists() or not (profiler := context.get("cypher_profiler")):
+        return None
+
+    auth = context.get("auth")
+    if auth is None or not auth.user.has_role(CYPHER_PROFILE_ROLE):
+        return None
+
+    return profiler
+
+
 def init_request_metrics():
     """Initialize request metrics object in request context"""
 
@@ -86,6 +271,8 @@ def add_request_metrics_header(
     metrics = {
         k: (round(v, 4) if isinstance(v, float) else v) for k, v in metrics.items()
     }
+    if (profiler := get_cypher_profiler()) and profiler.mode == "header":
+        metrics.update(profiler.header_summary())
     value = json.dumps(metrics)
 
     if isinstance(response, Response):
@@ -98,26 +285,105 @@ def add_request_metrics_header(
         headers.setdefault("Access-Control-Expose-Headers", REQUEST_METRICS_HEADER_NAME)
 
 
+def wrap_send_with_cypher_profile(send: Send) -> Send:
+    """
+    Replaces the response with the Cypher profiling report when the `json` profiling mode was requested.
+
+    The original response is buffered, and returned within the report
+    (parsed if JSON, as text if textual, otherwise only its size).
+    The response is only buffered if the user is allowed to profile, otherwise it is streamed untouched.
+    """
+
+    if not context.exists() or not (profiler := context.get("cypher_profiler")):
+        return send
+    if profiler.mode != "json":
+        return send
+
+    start_message: Message | None = None
+    body = bytearray()
+
+    async def _send(message: Message) -> None:
+        nonlocal start_message
+
+        if message["type"] == "http.response.start":
+            # The user is authenticated by now
+            if get_cypher_profiler() is None:
+                context["cypher_profiler"] = None
+                await send(message)
+                return
+            start_message = message
+            return
+
+        if message["type"] != "http.response.body" or start_message is None:
+            await send(message)
+            return
+
+        body.extend(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        headers = Headers(raw=start_message.get("headers", []))
+        content_type = headers.get("content-type", "")
+        response: dict[str, Any] = {
+            "status_code": start_message.get("status"),
+            "content_type": content_type,
+            "size": len(body),
+        }
+        if not headers.get("content-encoding"):
+            if content_type.startswith("application/json"):
+                with contextlib.suppress(ValueError):
+                    response["body"] = json.loads(body)
+            elif content_type.startswith("text/"):
+                response["body"] = body.decode("utf-8", errors="replace")
+
+        report = json.dumps(
+            {"cypher_profile": profiler.report(), "response": response}, default=str
+        ).encode()
+
+        raw_headers = [
+            (name, value)
+            for name, value in start_message.get("headers", [])
+            if name.lower()
+            not in (b"content-length", b"content-type", b"content-encoding")
+        ]
+        raw_headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(report)).encode()),
+        ]
+        await send({**start_message, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": report})
+
+    return _send
+
+
 @contextlib.contextmanager
 # pylint: disable=unused-argument
 def cypher_tracing(query: str, params: Mapping):
     """cypher query tracing and metrics to Opencensus"""
     # update request metrics
-    if metrics := get_request_metrics():
+    metrics = get_request_metrics()
+    if metrics:
         metrics.cypher_count += 1
-        start_time = time.time()
+    profiler = get_cypher_profiler()
+    start_time = time.time()
+    # the number of rows returned by the query, if known
+    query_result = {}
 
     with trace_block("neomodel.query") as span:
         span.add_attribute("cypher.query", query[: config.TRACE_QUERY_MAX_LEN])
         # span.add_attribute("cypher.params", params)
 
         # run the query (or any wrapped code) as a distinct operation (logical tracing block == Span)
-        yield
+        yield query_result
+
+    delta_time = time.time() - start_time
+
+    # record the query if profiling of the request is enabled
+    if profiler:
+        profiler.record(query, params, delta_time, query_result.get("rows"))
 
     # update cypher query metrics of the request
     if metrics:
-        # pylint: disable=possibly-used-before-assignment
-        delta_time = time.time() - start_time
         metrics.cypher_times += delta_time
 
         # find the slowest query of the request
@@ -144,8 +410,8 @@ def patch_neomodel_database():
             retry_on_session_expire,
             resolve_objects,
         ):
-            with cypher_tracing(query, params):
-                return func(
+            with cypher_tracing(query, params) as query_result:
+                results = func(
                     self,
                     session=session,
                     query=query,
@@ -154,6 +420,9 @@ def patch_neomodel_database():
                     retry_on_session_expire=retry_on_session_expire,
                     resolve_objects=resolve_objects,
                 )
+                if results and isinstance(results[0], list):
+                    query_result["rows"] = len(results[0])
+                return results
 
         return _run_cypher_query
 
@@ -21,8 +21,11 @@ from starlette_context import context
 from common import config
 from common.telemetry.request_metrics import (
     add_request_metrics_header,
+    get_cypher_profiler,
     include_request_metrics,
+    init_cypher_profiler,
     init_request_metrics,
+    wrap_send_with_cypher_profile,
 )
 
 TRACE_RESPONSE_HEADER_NAME = "traceresponse"
@@ -90,6 +93,7 @@ class TracingMiddleware:
         )
 
         init_request_metrics()
+        init_cypher_profiler(scope)
 
         request_body = None
         request_body_size = 0
@@ -115,7 +119,7 @@ class TracingMiddleware:
         async def _send(message: Message) -> None:
             if message["type"] == "http.response.start":
                 self.add_traceresponse_header(message)
-                if config.TRACING_METRICS_HEADER:
+                if config.TRACING_METRICS_HEADER or get_cypher_profiler():
                     add_request_metrics_header(message)
                 self.log_access(scope, message)
                 self.add_attributes_form_request_body(
@@ -134,7 +138,7 @@ class TracingMiddleware:
 
             self.add_attributes_form_request_scope(span, scope, headers=headers)
 
-            await self.app(scope, _receive, _send)
+            await self.app(scope, _receive, wrap_send_with_cypher_profile(_send))
 
     @staticmethod
     def add_attributes_form_request_scope(
@@ -262,3 +262,22 @@ async def test_token_invalid_issuer(jwk_service, jwk_good_key):
     token = mk_jwt(claims, jwk_good_key)
     with pytest.raises(authlib.jose.errors.InvalidClaimError, match='"iss"'):
         await jwk_service.validate_jwt(token)
+
+
+@pytest.mark.asyncio
+async def test_validated_claims_are_cached(jwk_service, jwk_good_key, monkeypatch):
+    claims_in = mk_claims()
+    token = mk_jwt(claims_in, jwk_good_key)
+    assert await jwk_service.validate_jwt(token) == claims_in
+
+    def decode(*args, **kwargs):
+        raise AssertionError("The token should not be decoded again")
+
+    monkeypatch.setattr(jwt, "decode", decode)
+    assert await jwk_service.validate_jwt(token) == claims_in
+    assert await jwk_service.validate_jwt(token.decode("utf8")) == claims_in
+
+    # Another token with the same claims isn't served from the cache
+    claims_in["name"] = "Test User 43"
+    with pytest.raises(AssertionError):
+        await jwk_service.validate_jwt(mk_jwt(claims_in, jwk_good_key))
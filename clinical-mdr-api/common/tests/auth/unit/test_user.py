@@ -0,0 +1,90 @@
+# pylint: disable=redefined-outer-name
+
+from unittest.mock import patch
+
+import pytest
+
+from common.auth import user as user_module
+from common.auth.dependencies import dummy_user
+from common.auth.user import (
+    UserWriter,
+    clear_users_cache,
+    persist_user,
+    user_fingerprint,
+)
+
+
+@pytest.fixture
+def cypher_query():
+    clear_users_cache()
+    with patch.object(user_module.db, "cypher_query") as mock:
+        yield mock
+    clear_users_cache()
+
+
+def test_user_fingerprint():
+    user_info = dummy_user()
+    same_user = dummy_user(roles=set(reversed(sorted(user_info.roles))))
+    other_user = dummy_user(roles={"Library.Read"})
+
+    assert user_fingerprint(user_info) == user_fingerprint(same_user)
+    assert user_fingerprint(user_info) != user_fingerprint(other_user)
+
+
+def test_new_user_is_written_once(cypher_query):
+    cypher_query.return_value = ([], [])
+    user_info = dummy_user()
+
+    persist_user(user_info)
+    persist_user(user_info)
+
+    assert cypher_query.call_count == 2
+    write_params = cypher_query.call_args.kwargs["params"]
+    assert [user["id"] for user in write_params["users"]] == [user_info.id()]
+    assert write_params["users"][0]["fingerprint"] == user_fingerprint(user_info)
+
+
+def test_unchanged_user_is_not_written(cypher_query):
+    user_info = dummy_user()
+    cypher_query.return_value = ([[user_fingerprint(user_info)]], [])
+
+    with patch.object(user_module.user_writer, "submit") as submit:
+        persist_user(user_info)
+        persist_user(user_info)
+
+    cypher_query.assert_called_once()
+    submit.assert_not_called()
+
+
+def test_changed_user_is_written_in_background(cypher_query):
+    cypher_query.return_value = ([["outdated"]], [])
+    user_info = dummy_user()
+
+    with patch.object(user_module.user_writer, "submit") as submit:
+        persist_user(user_info)
+
+    cypher_query.assert_called_once()
+    submit.assert_called_once_with(user_info)
+
+
+def test_user_writer_coalesces_users(cypher_query):
+    writer = UserWriter()
+    first = dummy_user()
+    updated = dummy_user(roles={"Library.Read"})
+    other = dummy_user()
+    other.oid = "other-user"
+
+    with patch.object(writer, "_executor") as executor:
+        writer.submit(first)
+        writer.submit(updated)
+        writer.submit(other)
+        executor.submit.assert_called_once_with(writer.flush)
+
+    writer.flush()
+
+    cypher_query.assert_called_once()
+    users = cypher_query.call_args.kwargs["params"]["users"]
+    assert [(user["id"], set(user["roles"])) for user in users] == [
+        ("unknown-user", {"Library.Read"}),
+        ("other-user", other.roles),
+    ]
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+from starlette_context import context, request_cycle_context
+
+from common import config
+from common.telemetry.request_metrics import (
+    CYPHER_PROFILE_ROLE,
+    CypherProfiler,
+    cypher_tracing,
+    normalise_cypher_query,
+    wrap_send_with_cypher_profile,
+)
+
+
+def test_normalise_cypher_query():
+    query = """
+        MATCH (n:StudyRoot {uid: 'Study_000001'})
+        WHERE n.version = 12 AND n.name = "a \\" b" AND n.id = $id2
+        RETURN n LIMIT 10
+    """
+
+    assert normalise_cypher_query(query) == (
+        "MATCH (n:StudyRoot {uid: ?}) WHERE n.version = ? AND n.name = ? AND n.id = $id2"
+        " RETURN n LIMIT ?"
+    )
+
+
+def test_cypher_profiler_flags_n_plus_one_queries(monkeypatch):
+    monkeypatch.setattr(config, "CYPHER_PROFILE_N_PLUS_ONE_MIN_COUNT", 5)
+    monkeypatch.setattr(config, "CYPHER_PROFILE_MAX_QUERIES", 8)
+    profiler = CypherProfiler("header")
+
+    for idx in range(6):
+        profiler.record(
+            "MATCH (n:ActivityRoot {uid: $uid}) RETURN n", {"uid": f"A{idx}"}, 0.01, 1
+        )
+    # Repeated with the same parameters, not an N+1 pattern
+    for _ in range(6):
+        profiler.record("MATCH (n:StudyRoot) RETURN n", {}, 0.001, 3)
+
+    report = profiler.report()
+    assert report["cypher.count"] == 12
+    assert report["queries.dropped"] == 4
+    assert len(report["queries"]) == 8
+
+    activity_shape, study_shape = report["shapes"]
+    assert activity_shape["count"] == 6
+    assert activity_shape["distinct_params"] == 6
+    assert activity_shape["n_plus_one"]
+    assert study_shape["distinct_params"] == 1
+    assert not study_shape["n_plus_one"]
+    assert study_shape["rows"] == 18
+    assert report["n_plus_one"] == [activity_shape["shape_id"]]
+
+    summary = profiler.header_summary()
+    assert summary["cypher.profile.shapes"] == 2
+    assert summary["cypher.profile.n_plus_one"][0]["count"] == 6
+
+
+def _auth(*roles):
+    return Mock(user=Mock(has_role=lambda role: role in roles))
+
+
+def _profile_response(auth) -> tuple[CypherProfiler, list[dict]]:
+    """Sends a response in two chunks through the profiling wrapper, as an endpoint authenticating `auth`"""
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def respond():
+        with request_cycle_context({"cypher_profiler": CypherProfiler("json")}):
+            profiler = context["cypher_profiler"]
+            _send = wrap_send_with_cypher_profile(send)
+            with cypher_tracing("MATCH (n) RETURN n", {}):
+                pass
+            context["auth"] = auth
+            with cypher_tracing("MATCH (n:StudyRoot) RETURN n", {}):
+                pass
+            await _send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/csv")],
+                }
+            )
+            await _send(
+                {"type": "http.response.body", "body": b"a,b\n", "more_body": True}
+            )
+            await _send({"type": "http.response.body", "body": b"1,2\n"})
+        return profiler
+
+    return asyncio.run(respond()), sent
+
+
+def test_cypher_profile_is_not_buffered_nor_recorded_for_other_users():
+    profiler, sent = _profile_response(_auth("Library.Read"))
+
+    # The response is streamed untouched, chunk by chunk
+    assert [message.get("body") for message in sent] == [None, b"a,b\n", b"1,2\n"]
+    assert sent[0]["headers"] == [(b"content-type", b"text/csv")]
+    assert not profiler.queries
+
+
+def test_cypher_profile_replaces_the_response_for_admins():
+    profiler, sent = _profile_response(_auth(CYPHER_PROFILE_ROLE))
+
+    assert len(sent) == 2
+    report = json.loads(sent[1]["body"])
+    assert report["response"]["body"] == "a,b\n1,2\n"
+    # Only the queries of the authenticated user are recorded
+    assert report["cypher_profile"]["cypher.count"] == 1
+    assert len(profiler.queries) == 1
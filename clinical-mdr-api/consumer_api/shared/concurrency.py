@@ -0,0 +1,64 @@
+"""
+Offloading of the blocking database calls of the consumer API.
+
+Database access in the consumer API goes through the synchronous `db.cypher_query`,
+so calling it directly from an `async def` endpoint blocks the event loop of the worker
+and stalls every other request until the query completes.
+
+The endpoints run the database calls in worker threads instead, bounded by two capacity limiters:
+
+* `CONSUMER_API_DB_CONCURRENCY` - maximum number of concurrent database calls of cheap endpoints
+* `CONSUMER_API_HEAVY_DB_CONCURRENCY` - maximum number of concurrent database calls of heavy endpoints (SoA)
+
+Keeping the heavy endpoints in a separate, smaller pool guarantees that a burst of SoA exports
+can't take all the threads needed by the cheap endpoints.
+"""
+
+import functools
+from enum import Enum
+from typing import Any, Callable, TypeVar
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+
+from common import config
+
+T = TypeVar("T")
+
+
+class DbWorkload(Enum):
+    DEFAULT = "default"
+    HEAVY = "heavy"
+
+
+_limiters: dict[DbWorkload, CapacityLimiter] = {}
+
+
+def get_limiter(workload: DbWorkload = DbWorkload.DEFAULT) -> CapacityLimiter:
+    limiter = _limiters.get(workload)
+    if limiter is None:
+        limiter = CapacityLimiter(
+            config.CONSUMER_API_HEAVY_DB_CONCURRENCY
+            if workload == DbWorkload.HEAVY
+            else config.CONSUMER_API_DB_CONCURRENCY
+        )
+        _limiters[workload] = limiter
+    return limiter
+
+
+async def run_db(
+    func: Callable[..., T],
+    *args: Any,
+    workload: DbWorkload = DbWorkload.DEFAULT,
+    **kwargs: Any,
+) -> T:
+    """
+    Runs a blocking database function in a worker thread without blocking the event loop.
+
+    Waits for a free slot of the capacity limiter of the given `workload` if the limit is reached.
+    Context variables (e.g. request metrics) are propagated to the worker thread.
+    """
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs),
+        limiter=get_limiter(workload),
+    )
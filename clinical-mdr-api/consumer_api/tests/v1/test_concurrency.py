@@ -0,0 +1,149 @@
+"""
+Load benchmark of the consumer API concurrency model.
+
+The database layer is replaced by functions that block the calling thread,
+simulating a slow SoA query and cheap list queries,
+and authentication by a dummy user which is not persisted, so the test doesn't need a database.
+While several heavy SoA requests are running, the latency of the cheap endpoints must stay low.
+"""
+
+# pylint: disable=unused-argument
+# pylint: disable=redefined-outer-name
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timezone
+
+import httpx
+import neo4j.time
+import pytest
+from starlette_context import context
+
+from common.auth.dependencies import (
+    dummy_access_token_claims,
+    dummy_auth_object,
+    dummy_user_auth,
+    validate_token,
+)
+from consumer_api.consumer_api import app
+from consumer_api.v1 import db as DB
+
+log = logging.getLogger(__name__)
+
+BASE_URL = "/v1"
+HEAVY_QUERY_SECS = 1.0
+CHEAP_QUERY_SECS = 0.005
+HEAVY_REQUESTS = 4
+CHEAP_REQUESTS = 100
+# Without offloading, the cheap requests would wait for the SoA queries to finish
+CHEAP_P99_LIMIT_SECS = HEAVY_QUERY_SECS * 0.8
+
+
+def _blocking_heavy_query(**kwargs):
+    time.sleep(HEAVY_QUERY_SECS)
+    return []
+
+
+def _blocking_cheap_query(**kwargs):
+    time.sleep(CHEAP_QUERY_SECS)
+    return []
+
+
+def _blocking_study_version(**kwargs):
+    time.sleep(CHEAP_QUERY_SECS)
+    return {
+        "version_status": "DRAFT",
+        "version_number": None,
+        "version_started_at": neo4j.time.DateTime.from_native(
+            datetime.now(timezone.utc)
+        ),
+        "version_ended_at": None,
+    }
+
+
+def _dummy_auth():
+    context["auth"] = dummy_auth_object(dummy_access_token_claims())
+
+
+@pytest.fixture
+def dummy_auth():
+    app.dependency_overrides[validate_token] = _dummy_auth
+    app.dependency_overrides[dummy_user_auth] = _dummy_auth
+    yield
+    app.dependency_overrides.pop(validate_token, None)
+    app.dependency_overrides.pop(dummy_user_auth, None)
+
+
+@pytest.fixture
+def blocking_db(monkeypatch):
+    monkeypatch.setattr(DB, "get_study_operational_soa", _blocking_heavy_query)
+    monkeypatch.setattr(DB, "get_study_detailed_soa", _blocking_heavy_query)
+    monkeypatch.setattr(DB, "get_studies", _blocking_cheap_query)
+    monkeypatch.setattr(DB, "get_study_visits", _blocking_cheap_query)
+    monkeypatch.setattr(DB, "get_study_version", _blocking_study_version)
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+async def _timed_get(client: httpx.AsyncClient, url: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(url)
+    assert response.status_code == 200, response.text
+    return time.perf_counter() - start
+
+
+async def _run_load() -> tuple[list[float], list[float]]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        heavy = [
+            asyncio.create_task(
+                _timed_get(
+                    client,
+                    f"{BASE_URL}/studies/Study_000001/"
+                    + ("operational-soa" if i % 2 else "detailed-soa"),
+                )
+            )
+            for i in range(HEAVY_REQUESTS)
+        ]
+        # Let the heavy requests reach the database first
+        await asyncio.sleep(0.1)
+        cheap = [
+            asyncio.create_task(
+                _timed_get(
+                    client,
+                    (
+                        f"{BASE_URL}/studies"
+                        if i % 2
+                        else f"{BASE_URL}/studies/Study_000001/study-visits"
+                    ),
+                )
+            )
+            for i in range(CHEAP_REQUESTS)
+        ]
+        cheap_latencies = await asyncio.gather(*cheap)
+        heavy_latencies = await asyncio.gather(*heavy)
+    return list(cheap_latencies), list(heavy_latencies)
+
+
+def test_cheap_endpoint_latency_during_heavy_soa_export(dummy_auth, blocking_db):
+    cheap_latencies, heavy_latencies = asyncio.run(_run_load())
+
+    p50 = statistics.median(cheap_latencies)
+    p99 = _percentile(cheap_latencies, 99)
+    log.info(
+        "Cheap endpoints while %s SoA exports are running: p50=%.3fs p99=%.3fs max=%.3fs, SoA max=%.3fs",
+        HEAVY_REQUESTS,
+        p50,
+        p99,
+        max(cheap_latencies),
+        max(heavy_latencies),
+    )
+
+    # Without offloading, every cheap request would wait for the SoA queries to finish
+    assert p99 < CHEAP_P99_LIMIT_SECS
+    assert max(heavy_latencies) >= HEAVY_QUERY_SECS
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Path, Query, Request
 from common import config
 from common.auth import rbac
 from common.models.error import ErrorResponse
+from consumer_api.shared.concurrency import DbWorkload, run_db
 from consumer_api.shared.responses import (
     PaginatedResponse,
     PaginatedResponseWithStudyVersion,
@@ -53,7 +54,8 @@ async def get_studies(
     Returned `version_number` value can be used in other endpoints to retrieve study entities (e.g. visits, activities, etc.)
     associated with a specific study version.
     """
-    studies = DB.get_studies(
+    studies = await run_db(
+        DB.get_studies,
         sort_by=sort_by,
         sort_order=sort_order,
         page_size=page_size,
@@ -108,12 +110,14 @@ async def get_study_visits(
     associated with the specified study version will be returned.
     Otherwise, visits for the latest study version will be returned.
     """
-    study_version = DB.get_study_version(
+    study_version = await run_db(
+        DB.get_study_version,
         study_uid=uid,
         study_version_number=study_version_number,
     )
 
-    study_visits = DB.get_study_visits(
+    study_visits = await run_db(
+        DB.get_study_visits,
         study_uid=uid,
         sort_by=sort_by,
         sort_order=sort_order,
@@ -172,12 +176,14 @@ async def get_study_activities(
     associated with the specified study version will be returned.
     Otherwise, activities for the latest study version will be returned.
     """
-    study_version = DB.get_study_version(
+    study_version = await run_db(
+        DB.get_study_version,
         study_uid=uid,
         study_version_number=study_version_number,
     )
 
-    study_activities = DB.get_study_activities(
+    study_activities = await run_db(
+        DB.get_study_activities,
         study_uid=uid,
         sort_by=sort_by,
         sort_order=sort_order,
@@ -238,12 +244,15 @@ async def get_study_detailed_soa(
     associated with the specified study version will be returned.
     Otherwise, detailed SoA items for the latest study version will be returned.
     """
-    study_version = DB.get_study_version(
+    study_version = await run_db(
+        DB.get_study_version,
         study_uid=uid,
         study_version_number=study_version_number,
     )
 
-    study_detailed_soas = DB.get_study_detailed_soa(
+    study_detailed_soas = await run_db(
+        DB.get_study_detailed_soa,
+        workload=DbWorkload.HEAVY,
         study_uid=uid,
         sort_by=sort_by,
         sort_order=sort_order,
@@ -304,12 +313,15 @@ async def get_study_operational_soa(
     associated with the specified study version will be returned.
     Otherwise, operational SoA items for the latest study version will be returned.
     """
-    study_version = DB.get_study_version(
+    study_version = await run_db(
+        DB.get_study_version,
         study_uid=uid,
         study_version_number=study_version_number,
     )
 
-    study_operational_soas = DB.get_study_operational_soa(
+    study_operational_soas = await run_db(
+        DB.get_study_operational_soa,
+        workload=DbWorkload.HEAVY,
         study_uid=uid,
         sort_by=sort_by,
         sort_order=sort_order,
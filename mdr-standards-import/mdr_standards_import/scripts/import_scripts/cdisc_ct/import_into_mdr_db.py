@@ -1,5 +1,10 @@
 import time
 import re
+from mdr_standards_import.scripts.import_scripts.cdisc_ct.package_changes import (
+    get_consecutive_packages_without_changes,
+    remove_package_changes_around,
+    update_package_changes,
+)
 from mdr_standards_import.scripts.utils import (
     are_lists_equal,
     get_sentence_case_string,
@@ -1132,6 +1137,28 @@ def import_from_cdisc_db_into_mdr(
 
         session.close()
 
+    print("==  * Removing the changes between packages that are no longer consecutive.")
+    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
+        for package_data in packages_data:
+            session.write_transaction(
+                remove_package_changes_around, package_data["package"]["name"]
+            )
+        session.close()
+
+    print("==  * Storing the changes between consecutive packages.")
+    with mdr_neo4j_driver.session(database=mdr_db_name) as session:
+        # Also covers the packages imported before the changes were stored
+        consecutive_packages = session.read_transaction(
+            get_consecutive_packages_without_changes
+        )
+        for old_package_name, new_package_name in consecutive_packages:
+            # One transaction per pair of packages to bound the memory used by the comparison
+            session.write_transaction(
+                update_package_changes, old_package_name, new_package_name
+            )
+            print(f"==      {old_package_name} -> {new_package_name}")
+        session.close()
+
     end_time = time.time()
     elapsed_time = end_time - start_time
     print(f"== Duration: {round(elapsed_time, 1)} seconds")
@@ -0,0 +1,309 @@
+"""
+Computes the changes between consecutive CT packages of a catalogue and stores them
+on the NEXT_PACKAGE relationship between the two packages, next to the counters
+used for the yearly change statistics.
+
+The API only reads the stored changes and counters.
+The comparison mirrors the one of the API in clinical_mdr_api/repositories/ct_packages.py,
+which is still used on demand, without storing anything, for packages that are not consecutive.
+"""
+
+import json
+
+from neo4j.time import Date, DateTime
+
+PACKAGE_CODELISTS_DATA_RETRIEVAL = """
+MATCH (package:CTPackage {name:$package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
+(codelist_attr_val)<-[versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(codelist_root)
+WITH codelist_root, codelist_attr_val, max(versions.start_date) AS latest_date
+WITH collect(apoc.map.fromValues([codelist_root.uid, {
+    uid: codelist_root.uid,
+    value_node:codelist_attr_val,
+    change_date: latest_date}])) AS items
+RETURN apoc.map.mergeList(items) AS items_map
+"""
+
+PACKAGE_TERMS_DATA_RETRIEVAL = """
+MATCH (package:CTPackage {name:$package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_TERM]->
+(package_term:CTPackageTerm)-[:CONTAINS_ATTRIBUTES]->(term_attr_val:CTTermAttributesValue)<-[versions:HAS_VERSION]-
+(term_attr_root:CTTermAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-(term_root:CTTermRoot)
+WITH term_root,
+    [(codelist_root)-[:HAS_TERM]->(term_root) | codelist_root.uid] AS codelists,
+    term_attr_val,
+    max(versions.start_date) AS latest_date
+WITH collect(apoc.map.fromValues([term_root.uid, {
+    uid: term_root.uid,
+    value_node:term_attr_val,
+    codelists: codelists,
+    change_date: latest_date}])) AS items
+RETURN apoc.map.mergeList(items) AS items_map
+"""
+
+
+def remove_package_changes_around(tx, package_name):
+    """
+    Removes the NEXT_PACKAGE relationships spanning over the given package,
+    the packages they link are no longer consecutive.
+    """
+    tx.run(
+        """
+        MATCH (catalogue:CTCatalogue)-[:CONTAINS_PACKAGE]->(package:CTPackage {name: $package_name})
+        MATCH (catalogue)-[:CONTAINS_PACKAGE]->(previous:CTPackage)-[rel:NEXT_PACKAGE]->(next:CTPackage)
+        WHERE previous.effective_date < package.effective_date < next.effective_date
+        DELETE rel
+        """,
+        package_name=package_name,
+    ).consume()
+
+
+def get_consecutive_packages_without_changes(tx):
+    """
+    Returns the names of the consecutive CDISC packages of each catalogue
+    whose changes are not stored yet, as (old_package_name, new_package_name) pairs.
+    Sponsor packages are not part of the chain of packages.
+    """
+    result = tx.run(
+        """
+        MATCH (catalogue:CTCatalogue)-[:CONTAINS_PACKAGE]->(package:CTPackage)
+        WHERE NOT (package)-[:EXTENDS_PACKAGE]->()
+        WITH catalogue, package ORDER BY package.effective_date
+        WITH catalogue, collect(package) AS packages
+        UNWIND range(0, size(packages) - 2) AS index
+        WITH packages[index] AS old_package, packages[index + 1] AS new_package
+        WHERE NOT EXISTS {
+            MATCH (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+            WHERE rel.changes IS NOT NULL
+        }
+        RETURN old_package.name AS old_package_name, new_package.name AS new_package_name
+        ORDER BY new_package.effective_date
+        """
+    )
+    return [
+        (record["old_package_name"], record["new_package_name"]) for record in result
+    ]
+
+
+def get_package_items(tx, query, package_name):
+    result = tx.run(query, package_name=package_name).single()
+    items = (result["items_map"] if result else None) or {}
+    # The attribute nodes are turned into plain dicts to be stored as JSON
+    for item in items.values():
+        item["value_node"] = dict(item["value_node"])
+    return items
+
+
+def are_optional_lists_different(left_list, right_list):
+    if left_list == right_list:
+        return False
+    if left_list is None or right_list is None:
+        return True
+    return set(left_list) != set(right_list)
+
+
+def are_terms_different(left_term, right_term):
+    left_value = left_term["value_node"]
+    right_value = right_term["value_node"]
+    return (
+        left_term["change_date"] != right_term["change_date"]
+        or left_value.get("preferred_term") != right_value.get("preferred_term")
+        or are_optional_lists_different(
+            left_value.get("synonyms"), right_value.get("synonyms")
+        )
+        or left_value.get("code_submission_value")
+        != right_value.get("code_submission_value")
+        or left_value.get("name_submission_value")
+        != right_value.get("name_submission_value")
+        or left_value.get("definition") != right_value.get("definition")
+    )
+
+
+def are_codelists_different(left_cl, right_cl):
+    left_value = left_cl["value_node"]
+    right_value = right_cl["value_node"]
+    return (
+        left_cl["change_date"] != right_cl["change_date"]
+        or left_value.get("preferred_term") != right_value.get("preferred_term")
+        or are_optional_lists_different(
+            left_value.get("synonyms"), right_value.get("synonyms")
+        )
+        or left_value.get("name") != right_value.get("name")
+        or left_value.get("definition") != right_value.get("definition")
+        or left_value.get("extensible") != right_value.get("extensible")
+        or left_value.get("submission_value") != right_value.get("submission_value")
+    )
+
+
+def diff_dicts(left, right):
+    # Compare two dicts returning the result
+    # in the same format as apoc.diff.nodes()
+    diff = {
+        "right_only": {},
+        "left_only": {},
+        "in_common": {},
+        "different": {},
+    }
+    props = set(left.keys()) | set(right.keys())
+    for prop in props:
+        if prop in left and prop not in right:
+            diff["left_only"][prop] = left[prop]
+        elif prop in right and prop not in left:
+            diff["right_only"][prop] = right[prop]
+        elif left[prop] == right[prop]:
+            diff["in_common"][prop] = right[prop]
+        else:
+            diff["different"][prop] = {
+                "left": left[prop],
+                "right": right[prop],
+            }
+    return diff
+
+
+def codelist_diff(left_cl, right_cl):
+    return {
+        "uid": right_cl["uid"],
+        "change_date": right_cl["change_date"],
+        "value_node": diff_dicts(left_cl["value_node"], right_cl["value_node"]),
+    }
+
+
+def term_diff(left_term, right_term):
+    return {
+        "uid": right_term["uid"],
+        "change_date": right_term["change_date"],
+        "codelists": right_term["codelists"],
+        "value_node": diff_dicts(left_term["value_node"], right_term["value_node"]),
+    }
+
+
+def _by_change_date(items):
+    return sorted(items, key=lambda item: item["change_date"])
+
+
+def update_modified_codelists(output, all_codelists_in_package):
+    """
+    Adds the codelists containing some of the new, deleted or updated terms
+    to the 'updated_codelists' section to mark them as updated.
+    """
+    updated_codelist_uids = [
+        codelist["uid"] for codelist in output["updated_codelists"]
+    ]
+    for terms in [
+        output["new_terms"],
+        output["deleted_terms"],
+        output["updated_terms"],
+    ]:
+        for term in terms:
+            for codelist in term["codelists"]:
+                # we only want to add a codelist to the 'updated_codelists' column if given codelist
+                # is not already there and this codelist is from the package that we are currently comparing
+                if (
+                    codelist not in updated_codelist_uids
+                    and codelist in all_codelists_in_package
+                ):
+                    updated_codelist_uids.append(codelist)
+                    output["updated_codelists"].append(
+                        {
+                            "uid": codelist,
+                            "value_node": all_codelists_in_package[codelist][
+                                "value_node"
+                            ],
+                            "change_date": term["change_date"],
+                            "is_change_of_codelist": False,
+                        }
+                    )
+    output["updated_codelists"].sort(key=lambda codelist: codelist["change_date"])
+
+
+def compute_package_changes(old_codelists, new_codelists, old_terms, new_terms):
+    """
+    Compares the codelists and terms of two packages, given as maps from uid to item.
+    Returns the changes in the format returned by the API.
+    """
+    old_uids = set(old_codelists)
+    new_uids = set(new_codelists)
+    output = {
+        "new_codelists": _by_change_date(
+            new_codelists[uid] for uid in new_uids - old_uids
+        ),
+        "deleted_codelists": _by_change_date(
+            old_codelists[uid] for uid in old_uids - new_uids
+        ),
+        "updated_codelists": _by_change_date(
+            codelist_diff(old_codelists[uid], new_codelists[uid])
+            for uid in new_uids & old_uids
+            if are_codelists_different(old_codelists[uid], new_codelists[uid])
+        ),
+    }
+
+    old_uids = set(old_terms)
+    new_uids = set(new_terms)
+    output["new_terms"] = _by_change_date(new_terms[uid] for uid in new_uids - old_uids)
+    output["deleted_terms"] = _by_change_date(
+        old_terms[uid] for uid in old_uids - new_uids
+    )
+    output["updated_terms"] = _by_change_date(
+        term_diff(old_terms[uid], new_terms[uid])
+        for uid in new_uids & old_uids
+        if are_terms_different(old_terms[uid], new_terms[uid])
+    )
+
+    update_modified_codelists(output, all_codelists_in_package=new_codelists)
+    return output
+
+
+def _serialize_value(value):
+    # The dates are tagged with their type, so that the API restores them wherever they are
+    if isinstance(value, DateTime):
+        return {"$datetime": value.iso_format()}
+    if isinstance(value, Date):
+        return {"$date": value.iso_format()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_package_changes(changes):
+    return json.dumps(changes, default=_serialize_value)
+
+
+def store_package_changes(tx, old_package_name, new_package_name, changes):
+    tx.run(
+        """
+        MATCH (old_package:CTPackage {name: $old_package_name})
+        MATCH (new_package:CTPackage {name: $new_package_name})
+        MERGE (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+        SET
+            rel.added_terms = $added_terms,
+            rel.deleted_terms = $deleted_terms,
+            rel.updated_terms = $updated_terms,
+            rel.added_codelists = $added_codelists,
+            rel.deleted_codelists = $deleted_codelists,
+            rel.updated_codelists = $updated_codelists,
+            rel.changes = $changes,
+            rel.last_refresh = datetime()
+        """,
+        old_package_name=old_package_name,
+        new_package_name=new_package_name,
+        added_terms=len(changes["new_terms"]),
+        deleted_terms=len(changes["deleted_terms"]),
+        updated_terms=len(changes["updated_terms"]),
+        added_codelists=len(changes["new_codelists"]),
+        deleted_codelists=len(changes["deleted_codelists"]),
+        updated_codelists=len(changes["updated_codelists"]),
+        changes=serialize_package_changes(changes),
+    ).consume()
+
+
+def update_package_changes(tx, old_package_name, new_package_name):
+    """
+    Compares two consecutive packages and stores the changes between them.
+    """
+    store_package_changes(
+        tx,
+        old_package_name,
+        new_package_name,
+        compute_package_changes(
+            get_package_items(tx, PACKAGE_CODELISTS_DATA_RETRIEVAL, old_package_name),
+            get_package_items(tx, PACKAGE_CODELISTS_DATA_RETRIEVAL, new_package_name),
+            get_package_items(tx, PACKAGE_TERMS_DATA_RETRIEVAL, old_package_name),
+            get_package_items(tx, PACKAGE_TERMS_DATA_RETRIEVAL, new_package_name),
+        ),
+    )
@@ -53,6 +53,9 @@ VARIABLE_VALUE_LIST_MAPPINGS_FILE = load_env(
     "VARIABLE_VALUE_LIST_MAPPINGS_FILE",
     "cdisc_data/extra/variable_value_list_mappings.csv",
 )
+# "bulk" merges the variables with set-based queries, "sequential" one variable at a time
+VARIABLES_IMPORT_MODE = load_env("VARIABLES_IMPORT_MODE", "bulk")
+VARIABLES_IMPORT_BATCH_SIZE = int(load_env("VARIABLES_IMPORT_BATCH_SIZE", "500"))
 
 
 class ValueListMapping:
@@ -151,16 +154,31 @@ def import_from_cdisc_db_into_mdr(
                 print(f"==      Unchanged scenarii:  {unchanged_scenarii:6}")
 
                 print("==  * Merging Variables.")
-                (
-                    added_variables,
-                    updated_variables,
-                    unchanged_variables,
-                ) = session.write_transaction(
-                    merge_variables, version_data[0]["version"], variables_data
-                )
+                if VARIABLES_IMPORT_MODE == "bulk":
+                    (
+                        added_variables,
+                        updated_variables,
+                        unchanged_variables,
+                        phase_durations,
+                    ) = session.write_transaction(
+                        merge_variables_in_bulk,
+                        version_data[0]["version"],
+                        variables_data,
+                    )
+                else:
+                    (
+                        added_variables,
+                        updated_variables,
+                        unchanged_variables,
+                    ) = session.write_transaction(
+                        merge_variables, version_data[0]["version"], variables_data
+                    )
+                    phase_durations = {}
                 print(f"==      Added variables:     {added_variables:6}")
                 print(f"==      Updated variables:   {updated_variables:6}")
                 print(f"==      Unchanged variables: {unchanged_variables:6}")
+                for phase, duration in phase_durations.items():
+                    print(f"==      {phase + ':':<21}{round(duration, 1):6} seconds")
 
                 # This has to happen after the variables creation transaction has been committed
                 # Otherwise, new variables are not matched
@@ -503,7 +521,7 @@ def _get_scenario_instances(tx, catalogue, uid):
     return records
 
 
-def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
+def _build_variable_instances_query(data_model_type, parent_type, bulk=False):
     model_root_label = ""
     model_value_label = ""
     class_value_label = ""
@@ -528,23 +546,35 @@ def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
         variable_root_label = DATASET_VARIABLE_ROOT_LABEL
         version_to_variable_rel_type = VERSION_TO_DATASET_VARIABLE_REL_TYPE
 
+    # In bulk mode, the instances of all the given uids are returned together with their uid
+    unwind = "UNWIND $uids AS uid" if bulk else ""
+    uid = "uid" if bulk else "$uid"
+    returned_uid = "uid, " if bulk else ""
+
     query = ""
 
     if parent_type == "class":
         query = f"""
-            MATCH (:{variable_root_label}{{uid: $uid}})-[:HAS_INSTANCE]->(instance)
+            {unwind}
+            MATCH (:{variable_root_label}{{uid: {uid}}})-[:HAS_INSTANCE]->(instance)
                 <-[:{version_to_variable_rel_type}]-(:DataModelVersion)<-[:CONTAINS_VERSION]-(catalogue:DataModelCatalogue {{name: $catalogue}})
-            RETURN DISTINCT instance
+            RETURN DISTINCT {returned_uid}instance
         """
     elif parent_type == "scenario":
         query = f"""
-            MATCH (:{variable_root_label}{{uid: $uid}})-[:HAS_INSTANCE]->(instance)
+            {unwind}
+            MATCH (:{variable_root_label}{{uid: {uid}}})-[:HAS_INSTANCE]->(instance)
                 <-[:{scenario_to_variable_rel_type}]-(scenario:{scenario_value_label})<-[:{class_to_scenario_rel_type}]-(:{class_value_label})
                 <--(:{model_value_label})<--(:{model_root_label})<--(catalogue:DataModelCatalogue {{name: $catalogue}})
             MATCH (scenario)<-[:{scenario_variable_to_scenario_rel_type}]-(impl:{scenario_variable_value_label})
                 <-[:{variable_to_scenario_variable_rel_type}]-(instance)
-            RETURN DISTINCT apoc.map.mergeList([{{id: id(instance)}}, instance{{.*}}, impl{{.*}}]) AS instance
+            RETURN DISTINCT {returned_uid}apoc.map.mergeList([{{id: id(instance)}}, instance{{.*}}, impl{{.*}}]) AS instance
         """
+    return query
+
+
+def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
+    query = _build_variable_instances_query(data_model_type, parent_type)
     result = tx.run(
         query,
         uid=uid,
@@ -555,6 +585,29 @@ def _get_variable_instances(tx, catalogue, data_model_type, parent_type, uid):
     return records
 
 
+def _get_variable_instances_in_bulk(tx, catalogue, data_model_type, variables_data):
+    # Returns the existing instances of the given variables,
+    # grouped by parent type and variable uid
+    instances = {}
+    for parent_type in ("class", "scenario"):
+        uids = list(
+            {
+                variable_data["variable"]["uid"]
+                for variable_data in variables_data
+                if variable_data["parent_type"] == parent_type
+            }
+        )
+        if not uids:
+            continue
+        query = _build_variable_instances_query(
+            data_model_type, parent_type, bulk=True
+        )
+        for record in tx.run(query, uids=uids, catalogue=catalogue):
+            instances.setdefault((parent_type, record["uid"]), []).append(record)
+
+    return instances
+
+
 def _get_reusable_class(existing_classes, target_class):
     for _class in existing_classes:
         value = _class["value"]
@@ -720,6 +773,7 @@ def merge_variables(tx, version_data, variables_data):
     nbr_unchanged = 0
     nbr_updated = 0
     nbr_new = 0
+    value_list_mappings = parse_value_list_mapping_file()
     for variable_data in variables_data:
         # First, iterate over all variables
         # If this uid already has at least one instance
@@ -730,8 +784,6 @@ def merge_variables(tx, version_data, variables_data):
         parent_href = variable_data.get("parent_href", None)
         parent_type = variable_data.get("parent_type", None)
 
-        value_list_mappings = parse_value_list_mapping_file()
-
         records = _get_variable_instances(
             tx,
             catalogue=version_data["catalogue"],
@@ -792,6 +844,224 @@ def merge_variables(tx, version_data, variables_data):
     return nbr_new, nbr_updated, nbr_unchanged
 
 
+def _plan_variable_instances(variables_data, existing_instances):
+    # Decides for each variable whether a new instance has to be created,
+    # or an existing instance with the same properties can be reused.
+    # A variable identical to another variable to be created in the same round is deferred:
+    # it will reuse the instance created for the other variable in the next round.
+    to_create = []
+    to_reuse = []
+    deferred = []
+    created_variables = {}
+    for variable_data in variables_data:
+        variable = variable_data["variable"]
+        key = (variable_data["parent_type"], variable["uid"])
+        records = existing_instances.get(key, [])
+
+        reusable_instance_id = (
+            _get_reusable_variable(records, variable) if records else None
+        )
+        if reusable_instance_id is not None:
+            to_reuse.append((variable_data, reusable_instance_id))
+            continue
+
+        created = created_variables.setdefault(key, [])
+        created_records = [
+            {"instance": {**created_variable, "id": index}}
+            for index, created_variable in enumerate(created)
+        ]
+        if _get_reusable_variable(created_records, variable) is not None:
+            deferred.append(variable_data)
+            continue
+
+        # The variable is new if no instance exists (or is about to be created) for its uid
+        to_create.append((variable_data, not records and not created))
+        created.append(variable)
+
+    return to_create, to_reuse, deferred
+
+
+def _batches(items, size):
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+def create_variable_instances_in_bulk(tx, version_data, parent_type, variables_data):
+    prefixed_version_number = _prettify_version_number(version_data["version_number"])
+    variable_root_label = ""
+    if version_data["data_model_type"] == DataModelType.FOUNDATIONAL.value:
+        variable_root_label = VARIABLE_CLASS_ROOT_LABEL
+    elif version_data["data_model_type"] == DataModelType.IMPLEMENTATION.value:
+        variable_root_label = DATASET_VARIABLE_ROOT_LABEL
+
+    initial_part = f"""
+        UNWIND $rows AS row
+        MATCH (root:{variable_root_label}{{uid: row.uid}})
+        WITH root, row
+    """
+
+    full_query = initial_part + build_variable_instance_query(
+        instance_node_variable_name="value",
+        parent_type=parent_type,
+        version_data=version_data,
+        bulk=True,
+    )
+
+    rows = [
+        {
+            "uid": variable_data["variable"]["uid"],
+            "variable_data": variable_data["variable"],
+            "parent_href": variable_data["parent_href"],
+        }
+        for variable_data in variables_data
+    ]
+    for batch in _batches(rows, VARIABLES_IMPORT_BATCH_SIZE):
+        tx.run(
+            full_query,
+            rows=batch,
+            effective_date=version_data["effective_date"],
+            prefixed_version_number=prefixed_version_number,
+            version_href=version_data["href"],
+            author_id=AUTHOR_ID,
+        )
+
+
+def use_existing_variable_instances_in_bulk(
+    tx, version_data, parent_type, variables_data_and_instance_ids
+):
+    prefixed_version_number = _prettify_version_number(version_data["version_number"])
+
+    initial_part = """
+        UNWIND $rows AS row
+        MATCH (instance)
+        WHERE id(instance)=row.instance_node_id
+    """
+
+    full_query = initial_part + build_variable_instance_query(
+        instance_node_variable_name="instance",
+        parent_type=parent_type,
+        create_version=False,
+        version_data=version_data,
+        bulk=True,
+    )
+
+    rows = [
+        {
+            "uid": variable_data["variable"]["uid"],
+            "instance_node_id": instance_node_id,
+            "variable_data": variable_data["variable"],
+            "parent_href": variable_data["parent_href"],
+        }
+        for variable_data, instance_node_id in variables_data_and_instance_ids
+    ]
+    for batch in _batches(rows, VARIABLES_IMPORT_BATCH_SIZE):
+        tx.run(
+            full_query,
+            rows=batch,
+            effective_date=version_data["effective_date"],
+            prefixed_version_number=prefixed_version_number,
+            version_href=version_data["href"],
+        )
+
+
+def merge_variables_in_bulk(tx, version_data, variables_data):
+    # Set-based version of merge_variables
+    # The existing instances of all variables are fetched at once and compared in Python,
+    # then the new and reused instances are written with batched UNWIND queries
+    # Returns the number of new, updated and unchanged variables, and the duration of each phase
+    nbr_unchanged = 0
+    nbr_updated = 0
+    nbr_new = 0
+    durations = {
+        "Fetch instances": 0.0,
+        "Diff instances": 0.0,
+        "Create instances": 0.0,
+        "Reuse instances": 0.0,
+        "Link value terms": 0.0,
+        "Qualify variables": 0.0,
+    }
+
+    value_list_mappings = parse_value_list_mapping_file()
+
+    pending_variables = variables_data
+    while pending_variables:
+        start_time = time.time()
+        existing_instances = _get_variable_instances_in_bulk(
+            tx,
+            catalogue=version_data["catalogue"],
+            data_model_type=version_data["data_model_type"],
+            variables_data=pending_variables,
+        )
+        durations["Fetch instances"] += time.time() - start_time
+
+        start_time = time.time()
+        to_create, to_reuse, pending_variables = _plan_variable_instances(
+            pending_variables, existing_instances
+        )
+        durations["Diff instances"] += time.time() - start_time
+
+        start_time = time.time()
+        for parent_type in ("class", "scenario"):
+            create_variable_instances_in_bulk(
+                tx,
+                version_data=version_data,
+                parent_type=parent_type,
+                variables_data=[
+                    variable_data
+                    for variable_data, _ in to_create
+                    if variable_data["parent_type"] == parent_type
+                ],
+            )
+        nbr_new += sum(1 for _, is_new in to_create if is_new)
+        nbr_updated += sum(1 for _, is_new in to_create if not is_new)
+        durations["Create instances"] += time.time() - start_time
+
+        start_time = time.time()
+        for parent_type in ("class", "scenario"):
+            use_existing_variable_instances_in_bulk(
+                tx,
+                version_data=version_data,
+                parent_type=parent_type,
+                variables_data_and_instance_ids=[
+                    (variable_data, instance_id)
+                    for variable_data, instance_id in to_reuse
+                    if variable_data["parent_type"] == parent_type
+                ],
+            )
+        nbr_unchanged += len(to_reuse)
+        durations["Reuse instances"] += time.time() - start_time
+
+        start_time = time.time()
+        for variable_data, _ in to_create:
+            if "value_list" in variable_data["variable"]:
+                link_variable_with_value_terms(
+                    tx,
+                    version_data=version_data,
+                    variable=variable_data["variable"],
+                    parent_href=variable_data["parent_href"],
+                    value_list_mappings=value_list_mappings,
+                )
+        durations["Link value terms"] += time.time() - start_time
+
+    # The QUALIFIES_VARIABLES relationships exist between two variables of the same version
+    # So they are created once all variables have been merged
+    start_time = time.time()
+    create_qualify_variable_relationships_in_bulk(
+        tx,
+        source_variables=[
+            variable_data["variable"]
+            for variable_data in variables_data
+            if variable_data["variable"].get("qualifies_variables")
+        ],
+        prefixed_version_number=_prettify_version_number(
+            version_data["version_number"]
+        ),
+    )
+    durations["Qualify variables"] += time.time() - start_time
+
+    return nbr_new, nbr_updated, nbr_unchanged, durations
+
+
 def parse_value_list_mapping_file() -> "dict[str, ValueListMapping]":
     # Read the variable value list mappings CSV file
     # And load the records into a dictionary of ValueListMapping objects
@@ -1116,7 +1386,10 @@ def build_variable_instance_query(
     parent_type: str,
     version_data: dict,
     create_version: bool = True,
+    bulk: bool = False,
 ):
+    # In bulk mode, the query is run for each row of an UNWIND $rows AS row clause
+    # and the variable specific parameters are read from the row
     class_value_label = ""
     scenario_value_label = SCENARIO_VALUE_LABEL
     variable_value_label = ""
@@ -1153,6 +1426,8 @@ def build_variable_instance_query(
                {instance_node_variable_name}.length = $variable_data.length
     """
     with_clause = f" WITH {instance_node_variable_name} "
+    if bulk:
+        with_clause = f" WITH {instance_node_variable_name}, row "
 
     versioning = f"""
         , root
@@ -1260,6 +1535,10 @@ def build_variable_instance_query(
     else:
         full_query = with_clause.join([variable_parents, prior_version])
 
+    if bulk:
+        for parameter in ("variable_data", "parent_href", "uid"):
+            full_query = full_query.replace(f"${parameter}", f"row.{parameter}")
+
     return full_query
 
 
@@ -1675,6 +1954,36 @@ def create_qualify_variable_relationships(tx, source_variable, prefixed_version_
     )
 
 
+def create_qualify_variable_relationships_in_bulk(
+    tx, source_variables, prefixed_version_number
+):
+    relationships = [
+        {
+            "source_href": source_variable["href"],
+            "target_href": target_href,
+            "catalogue": source_variable["catalogue"],
+        }
+        for source_variable in source_variables
+        for target_href in source_variable["qualifies_variables"]
+    ]
+    for batch in _batches(relationships, VARIABLES_IMPORT_BATCH_SIZE):
+        tx.run(
+            f"""
+                UNWIND $relationships AS relationship
+                MATCH ()-[source_rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE}]->(source_variable_value)
+                WHERE source_rel.href=relationship.source_href
+                MATCH ()-[target_rel:{VERSION_TO_VARIABLE_CLASS_REL_TYPE}]->(target_variable_value)
+                WHERE target_rel.href=relationship.target_href
+                    MERGE (source_variable_value)-[:QUALIFIES_VARIABLE{{
+                        catalogue: relationship.catalogue,
+                        version_number: $prefixed_version_number
+                    }}]->(target_variable_value)
+            """,
+            relationships=batch,
+            prefixed_version_number=prefixed_version_number,
+        )
+
+
 def _prettify_version_number(version_number: str, number_only=False):
     version = version_number.replace("-", ".")
     if number_only:
@@ -0,0 +1,103 @@
+import json
+
+from neo4j.time import Date, DateTime
+
+from mdr_standards_import.scripts.import_scripts.cdisc_ct.package_changes import (
+    compute_package_changes,
+    serialize_package_changes,
+)
+
+
+def codelist(uid, change_date, **value_node):
+    return {"uid": uid, "change_date": change_date, "value_node": value_node}
+
+
+def term(uid, change_date, codelists, **value_node):
+    return {
+        "uid": uid,
+        "change_date": change_date,
+        "codelists": codelists,
+        "value_node": value_node,
+    }
+
+
+OLD_DATE = DateTime(2023, 3, 31)
+NEW_DATE = DateTime(2023, 6, 30)
+
+
+class Test:
+    def test__compute_package_changes(self):
+        # given
+        old_codelists = {
+            "C1": codelist("C1", OLD_DATE, name="One"),
+            "C2": codelist("C2", OLD_DATE, name="Two"),
+            "C3": codelist("C3", OLD_DATE, name="Three"),
+        }
+        new_codelists = {
+            "C1": codelist("C1", NEW_DATE, name="One renamed"),
+            "C2": codelist("C2", OLD_DATE, name="Two"),
+            "C4": codelist("C4", NEW_DATE, name="Four"),
+        }
+        old_terms = {
+            "T1": term("T1", OLD_DATE, ["C2"], preferred_term="Term one"),
+            "T2": term("T2", OLD_DATE, ["C3"], preferred_term="Term two"),
+        }
+        new_terms = {
+            "T1": term("T1", OLD_DATE, ["C2"], preferred_term="Term one"),
+            "T3": term("T3", NEW_DATE, ["C2"], preferred_term="Term three"),
+        }
+
+        # when
+        changes = compute_package_changes(
+            old_codelists, new_codelists, old_terms, new_terms
+        )
+
+        # then
+        assert [item["uid"] for item in changes["new_codelists"]] == ["C4"]
+        assert [item["uid"] for item in changes["deleted_codelists"]] == ["C3"]
+        assert [item["uid"] for item in changes["new_terms"]] == ["T3"]
+        assert [item["uid"] for item in changes["deleted_terms"]] == ["T2"]
+        assert changes["updated_terms"] == []
+        # C2 is updated because it contains a new term,
+        # C3 is not as it is not part of the new package
+        assert [
+            (item["uid"], item.get("is_change_of_codelist", True))
+            for item in changes["updated_codelists"]
+        ] == [("C1", True), ("C2", False)]
+        assert changes["updated_codelists"][0]["value_node"]["different"] == {
+            "name": {"left": "One", "right": "One renamed"}
+        }
+
+    def test__serialize_package_changes(self):
+        # given
+        changes = {
+            "new_terms": [term("T1", NEW_DATE, ["C1"], synonyms=["a"])],
+            "updated_codelists": [
+                {
+                    "uid": "C1",
+                    "change_date": NEW_DATE,
+                    "value_node": {
+                        "different": {
+                            "effective_date": {
+                                "left": Date(2023, 3, 31),
+                                "right": Date(2023, 6, 30),
+                            }
+                        }
+                    },
+                }
+            ],
+        }
+
+        # when
+        serialized = json.loads(serialize_package_changes(changes))
+
+        # then
+        assert serialized["new_terms"][0]["change_date"] == {
+            "$datetime": NEW_DATE.iso_format()
+        }
+        assert serialized["updated_codelists"][0]["value_node"]["different"] == {
+            "effective_date": {
+                "left": {"$date": "2023-03-31"},
+                "right": {"$date": "2023-06-30"},
+            }
+        }
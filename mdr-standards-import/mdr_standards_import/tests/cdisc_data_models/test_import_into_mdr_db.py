@@ -0,0 +1,45 @@
+from mdr_standards_import.scripts.import_scripts.cdisc_data_models.import_into_mdr_db import (
+    _plan_variable_instances,
+)
+
+
+def _variable_data(uid, label, parent_type="class", parent_href="/datasets/AE"):
+    return {
+        "variable": {"uid": uid, "name": uid, "label": label},
+        "parent_href": parent_href,
+        "parent_type": parent_type,
+    }
+
+
+def test_plan_variable_instances():
+    existing_instances = {
+        ("class", "AETERM"): [{"instance": {"id": 10, "label": "Reported Term"}}],
+        ("class", "AESEV"): [{"instance": {"id": 11, "label": "Severity"}}],
+    }
+    variables_data = [
+        # Unchanged
+        _variable_data("AETERM", "Reported Term"),
+        # Updated
+        _variable_data("AESEV", "Severity/Intensity"),
+        # New
+        _variable_data("STUDYID", "Study Identifier"),
+        # Same as a variable created in this round, deferred
+        _variable_data("STUDYID", "Study Identifier", parent_href="/datasets/CM"),
+        # Same uid as a variable created in this round but different properties
+        _variable_data("STUDYID", "Study ID", parent_href="/datasets/DM"),
+        # Same uid in a scenario
+        _variable_data("AETERM", "Reported Term", parent_type="scenario"),
+    ]
+
+    to_create, to_reuse, deferred = _plan_variable_instances(
+        variables_data, existing_instances
+    )
+
+    assert to_reuse == [(variables_data[0], 10)]
+    assert to_create == [
+        (variables_data[1], False),
+        (variables_data[2], True),
+        (variables_data[4], False),
+        (variables_data[5], True),
+    ]
+    assert deferred == [variables_data[3]]
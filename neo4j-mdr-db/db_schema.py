@@ -120,6 +120,15 @@ TEXT_INDEXES = [
     ("Brand", "name"),
 ]
 
+# array of full-text indexes to create [name, labels, properties],
+# used by the API to filter with the `ft` operator
+FULLTEXT_INDEXES = [
+    ("fulltext_ct_term_name", ["CTTermNameValue"], ["name"]),
+    ("fulltext_activity_name", ["ActivityValue"], ["name"]),
+    ("fulltext_activity_instance_name", ["ActivityInstanceValue"], ["name"]),
+    ("fulltext_syntax_template_name", ["SyntaxTemplateValue"], ["name"]),
+]
+
 # array of relation indexes to create [type, property]
 REL_INDEXES = [
     ("CONTAINS_DATASET", "href"),
@@ -218,6 +227,9 @@ CONSTRAINTS = [
     ("TextValueRoot", "uid", CONSTRAINT_TYPE_NODE_KEY),
     ("User", "user_id", CONSTRAINT_TYPE_NODE_KEY),
     ("WeekInStudyRoot", "uid", CONSTRAINT_TYPE_NODE_KEY),
+    ("Job", "uid", CONSTRAINT_TYPE_NODE_KEY),
+    # Jobs submitted without an idempotency key are not constrained
+    ("Job", ("job_type", "author_id", "idempotency_key"), CONSTRAINT_TYPE_UNIQUE),
 ]
 
 
@@ -237,6 +249,15 @@ def build_create_node_text_index_query(data):
     return query
 
 
+def build_create_fulltext_index_query(data):
+    name, labels, props = data
+    query = (
+        f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS "
+        f"FOR (n:{'|'.join(labels)}) ON EACH [{', '.join('n.' + prop for prop in props)}]"
+    )
+    return query
+
+
 def build_create_rel_index_query(data):
     label, prop = data
     name = label + "_" + prop
@@ -246,13 +267,15 @@ def build_create_rel_index_query(data):
     return query
 
 
-def build_create_constraint_query(label: str, property: str, type: str):
+def build_create_constraint_query(
+    label: str, property: str | tuple[str, ...], type: str
+):
     """
     Queries the constraints creation, where the type of the constraint could be key, unique or not null.
-    The constraint will be added on the specified label and property
+    The constraint will be added on the specified label and property, or tuple of properties
     input:
         label: str
-        property: str
+        property: str | tuple[str, ...]
         type: str ["NODE_KEY", "UNIQUE", "NOT NULL"]
     """
     if type not in [
@@ -263,7 +286,10 @@ def build_create_constraint_query(label: str, property: str, type: str):
         raise TypeError(
             f"Constraint type '{type}' for label '{label}' and property '{property}' must be 'NODE KEY', 'UNIQUE' or 'NOT NULL' "
         )
-    query = f"CREATE CONSTRAINT constraint_{label}_{property} IF NOT EXISTS FOR (n:{label}) REQUIRE (n.{property}) IS {type}"
+    properties = (property,) if isinstance(property, str) else property
+    name = "_".join(properties)
+    props = ", ".join("n." + prop for prop in properties)
+    query = f"CREATE CONSTRAINT constraint_{label}_{name} IF NOT EXISTS FOR (n:{label}) REQUIRE ({props}) IS {type}"
     return query
 
 
@@ -277,6 +303,10 @@ def build_schema_queries():
         query = build_create_node_text_index_query(idx)
         queries.append(query)
 
+    for idx in FULLTEXT_INDEXES:
+        query = build_create_fulltext_index_query(idx)
+        queries.append(query)
+
     for idx in REL_INDEXES:
         query = build_create_rel_index_query(idx)
         queries.append(query)
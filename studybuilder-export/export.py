@@ -6,10 +6,20 @@ import os
 import logging
 import sys
 import json
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 OUTPUT_DIR = environ.get("OUTPUT_DIR", "./output")
 LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
 
+# Number of requests sent to the api in parallel
+EXPORT_WORKERS = int(environ.get("EXPORT_WORKERS", "8"))
+# Only export studies and library data that changed since the last run
+INCREMENTAL = environ.get("INCREMENTAL", "false").lower() in ("1", "true", "yes")
+MANIFEST_FILENAME = "export-manifest.json"
+
 INCLUDE_STUDY_NUMBERS = environ.get("INCLUDE_STUDY_NUMBERS", "")
 EXCLUDE_STUDY_NUMBERS = environ.get("EXCLUDE_STUDY_NUMBERS", "")
 
@@ -83,7 +93,17 @@ class StudyExporter:
                 client_id=client_id,
                 scope=scope,
             )
-        self.client = httpx.Client(base_url=self.api_base_url, auth=auth, verify=context, timeout=60)
+        # The client is shared by the export workers, allow one connection per worker
+        limits = httpx.Limits(
+            max_connections=EXPORT_WORKERS, max_keepalive_connections=EXPORT_WORKERS
+        )
+        self.client = httpx.Client(
+            base_url=self.api_base_url,
+            auth=auth,
+            verify=context,
+            timeout=60,
+            limits=limits,
+        )
 
 
     # ---------------------------------------------------------------
@@ -106,12 +126,8 @@ class StudyExporter:
     def get_from_api(self, path, params=None, items_only=True):
         # Make sure that we always provide the page_size parameter,
         # otherwise the api uses its default of 10.
-        if params is None:
-            params = DEFAULT_QUERY_PARAMS
-        else:
-            for key, value in DEFAULT_QUERY_PARAMS.items():
-                if key not in params:
-                    params[key] = value
+        # The parameters are copied, since the same dicts are used by parallel requests.
+        params = {**DEFAULT_QUERY_PARAMS, **(params or {})}
 
         response = self.client.get(path, params=params)
         if response.is_success:
@@ -136,6 +152,8 @@ class StudyExporter:
         }
         page_params.update(params)
         data = self.get_from_api(path, params=page_params, items_only=False)
+        if data is None:
+            return None
         all_data = data["items"]
         count = data["total"]
 
@@ -145,6 +163,8 @@ class StudyExporter:
             page_number += 1
             page_params["page_number"] = page_number
             data = self.get_from_api(path, params=page_params, items_only=True)
+            if data is None:
+                return None
             all_data.extend(data)
         return all_data
 
@@ -157,12 +177,25 @@ class StudyExporter:
             return None
         return data[0].get("codelist_uid")
 
-    def save_formatted_json(self, data, dir, filename):
+    def save_formatted_json(self, data, dir, filename, manifest=None):
+        """
+        Saves the data to a json file.
+        When a manifest is given, the file is only written if its content changed
+        since the last export. Returns True if the file was written.
+        """
         filename = filename.replace("/", ".")
         path = os.path.join(dir, filename)
+        content = json.dumps(data, indent=2, sort_keys=True)
+        if manifest is not None:
+            checksum = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if manifest.file_unchanged(filename, checksum) and os.path.exists(path):
+                self.log.info(f"Unchanged, skipping file: {path}")
+                return False
+            manifest.record_file(filename, checksum)
         with open(path, "w") as f:
             self.log.info(f"Saving to file: {path}")
-            f.write(json.dumps(data, indent=2, sort_keys=True))
+            f.write(content)
+        return True
 
     def filter_studies(self, studies):
         include_numbers = [
@@ -194,6 +227,114 @@ class StudyExporter:
         return studies_copy
 
 
+class ExportManifest:
+    """
+    Keeps track of what was exported by the last run, saved next to the exported files.
+
+    For each study the status, number and timestamp of its latest version are stored,
+    and for each file a checksum of its content.
+    """
+
+    def __init__(self, dir):
+        self.path = os.path.join(dir, MANIFEST_FILENAME)
+        previous = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                previous = json.load(f)
+        self.previous_studies = previous.get("studies", {})
+        self.studies = {}
+        self.files = previous.get("files", {})
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def study_version(study):
+        version = study["current_metadata"].get("version_metadata") or {}
+        return {
+            "study_status": version.get("study_status"),
+            "version_number": version.get("version_number"),
+            "version_timestamp": version.get("version_timestamp"),
+        }
+
+    def study_unchanged(self, study):
+        # The version timestamp of a draft study doesn't change when its
+        # selections are edited, so draft studies are always exported.
+        version = self.study_version(study)
+        return (
+            version["study_status"] != "DRAFT"
+            and self.previous_studies.get(study["uid"]) == version
+        )
+
+    def record_study(self, study):
+        with self.lock:
+            self.studies[study["uid"]] = self.study_version(study)
+
+    def file_unchanged(self, filename, checksum):
+        with self.lock:
+            return self.files.get(filename) == checksum
+
+    def record_file(self, filename, checksum):
+        with self.lock:
+            self.files[filename] = checksum
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(
+                {"studies": self.studies, "files": self.files},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+class ExportEngine:
+    """
+    Runs the export in phases, the requests of each phase are sent by a bounded pool of workers.
+    Keeps the number of files written and the duration of each phase.
+    """
+
+    def __init__(self, api, manifest, workers=EXPORT_WORKERS):
+        self.api = api
+        self.manifest = manifest
+        self.executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+        self.timings = []
+
+    def export(self, path, filename, params=None, page_size=None):
+        """
+        Fetches the data of an endpoint and saves it to a json file.
+        Returns True if the file was written.
+        """
+        if page_size is None:
+            data = self.api.get_from_api(path, params=params)
+        else:
+            data = self.api.get_from_api_paged(path, params=params, page_size=page_size)
+        return self.api.save_formatted_json(data, OUTPUT_DIR, filename, self.manifest)
+
+    def run_phase(self, name, tasks):
+        """
+        Runs the tasks of a phase in parallel.
+        Each task is a callable returning the number of files it wrote.
+        Returns the results of the tasks.
+        """
+        self.api.log.info(f"=== Export {name} ===")
+        start = time.monotonic()
+        results = list(self.executor.map(lambda task: task(), tasks))
+        elapsed = time.monotonic() - start
+        self.timings.append((name, len(tasks), sum(results), elapsed))
+        self.api.log.info(f"Exported {name} in {elapsed:.1f} s")
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def log_timings(self):
+        self.api.log.info("=== Export timings ===")
+        self.api.log.info(f"{'Phase':<40} {'Tasks':>6} {'Written':>8} {'Seconds':>8}")
+        for name, tasks, written, elapsed in self.timings:
+            self.api.log.info(f"{name:<40} {tasks:>6} {written:>8} {elapsed:>8.1f}")
+        total = sum(timing[3] for timing in self.timings)
+        self.api.log.info(f"{'Total':<40} {'':>6} {'':>8} {total:>8.1f}")
+
+
 study_optional_fields = [
     "current_metadata.study_description",
     "current_metadata.identification_metadata",
@@ -374,135 +515,151 @@ dictionaries = [
 
 
 def run_export():
-    try:
-        os.mkdir("output")
-    except FileExistsError:
-        pass
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     api = StudyExporter()
+    manifest = ExportManifest(OUTPUT_DIR)
+    engine = ExportEngine(api, manifest)
+    api.log.info(
+        f"Exporting with {EXPORT_WORKERS} workers, incremental mode {'on' if INCREMENTAL else 'off'}"
+    )
+
+    def export_task(path, filename, params=None, page_size=None):
+        return lambda: int(engine.export(path, filename, params, page_size))
+
+    # Clinical programmes, brands and projects
+    engine.run_phase(
+        "clinical programmes, brands and projects",
+        [
+            export_task("/clinical-programmes", "clinical-programmes.json"),
+            export_task("/brands", "brands.json"),
+            export_task("/projects", "projects.json"),
+        ],
+    )
 
-    # Clinical programmes
-    api.log.info("=== Export clinical programmes ===")
-    programmes = api.get_from_api("/clinical-programmes")
-    api.save_formatted_json(programmes, OUTPUT_DIR, "clinical-programmes.json")
+    # Studies
+    studies = []
 
-    # Brands
-    api.log.info("=== Export brands ===")
-    brands = api.get_from_api("/brands")
-    api.save_formatted_json(brands, OUTPUT_DIR, "brands.json")
+    def studies_task():
+        studies.extend(api.filter_studies(api.get_from_api(f"/studies")))
+        return int(api.save_formatted_json(studies, OUTPUT_DIR, "studies.json", manifest))
 
-    # Projects
-    api.log.info("=== Export projects ===")
-    projects = api.get_from_api("/projects")
-    api.save_formatted_json(projects, OUTPUT_DIR, "projects.json")
+    engine.run_phase("studies", [studies_task])
+    api.log.info(f"Found studies {[s['uid'] for s in studies]}")
 
-    # Studies
-    api.log.info("=== Export studies ===")
-    studies = api.get_from_api(f"/studies")
-    studies = api.filter_studies(studies)
-    api.save_formatted_json(studies, OUTPUT_DIR, "studies.json")
-    study_uids = [s["uid"] for s in studies]
-    api.log.info(f"Found studies {study_uids}")
-
-    # Study metadata
-    api.log.info("=== Export study metadata ===")
+    changed_studies = []
+    for study in studies:
+        if INCREMENTAL and manifest.study_unchanged(study):
+            api.log.info(f"Study uid {study['uid']} unchanged since last export, skipping")
+            manifest.record_study(study)
+        else:
+            changed_studies.append(study)
+
+    # Study metadata and design
     # Include all optional fields
     # , --> %2C
     # + --> %2B
     fields = "%2C".join(["%2B" + f for f in study_optional_fields])
-    for uid in study_uids:
-        api.log.info(f"Export metadata for study uid: {uid}")
-        study = api.get_from_api(f"/studies/{uid}?fields={fields}")
-        api.save_formatted_json(study, OUTPUT_DIR, f"studies/{uid}.json")
-
-    # Study design
-    api.log.info("=== Export study design ===")
-    for uid in study_uids:
-        api.log.info(f"Export study design for study uid: {uid}")
-        for ep in study_design_endpoints:
-            study_ep = ep.format(study_uid=uid)
-            data = api.get_from_api(f"/{study_ep}")
-            api.save_formatted_json(data, OUTPUT_DIR, f"{study_ep}.json")
+
+    # Each study is exported by one worker, the studies are exported in parallel
+    def study_task(study):
+        def task():
+            uid = study["uid"]
+            api.log.info(f"Export metadata and design for study uid: {uid}")
+            paths = [f"/studies/{uid}?fields={fields}"]
+            filenames = [f"studies/{uid}.json"]
+            for ep in study_design_endpoints:
+                study_ep = ep.format(study_uid=uid)
+                paths.append(f"/{study_ep}")
+                filenames.append(f"{study_ep}.json")
+            written = 0
+            failed = False
+            for path, filename in zip(paths, filenames):
+                data = api.get_from_api(path)
+                failed = failed or data is None
+                written += api.save_formatted_json(data, OUTPUT_DIR, filename, manifest)
+            # A study failing to export is exported again by the next run
+            if not failed:
+                manifest.record_study(study)
+            return written
+
+        return task
+
+    engine.run_phase(
+        "study metadata and design", [study_task(study) for study in changed_studies]
+    )
 
     # Templates
-    api.log.info("=== Export syntax templates ===")
-    for ep in template_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    engine.run_phase(
+        "syntax templates",
+        [export_task(f"/{ep}", f"{ep}.json") for ep in template_endpoints],
+    )
 
     # Templates pre-instances
-    api.log.info("=== Export syntax pre-instances ===")
-    for ep in syntax_pre_instance_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    engine.run_phase(
+        "syntax pre-instances",
+        [export_task(f"/{ep}", f"{ep}.json") for ep in syntax_pre_instance_endpoints],
+    )
 
     # Sponsor extensions to CT packages
-    api.log.info("=== Export sponsor extensions ===")
-    for ext in sponsor_ct_extensions:
-        ep = ext["endpoint"]
-        params = ext["parameters"]
-        page_size = ext["page_size"]
-        codelist_name = params["codelist_name"]
-        api.log.info(f"Export sponsor extensions to {codelist_name} codelist")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
+    engine.run_phase(
+        "sponsor extensions",
+        [
+            export_task(
+                f"/{ext['endpoint']}",
+                f"{ext['endpoint']}.{ext['parameters']['codelist_name']}.json",
+                ext["parameters"],
+                ext["page_size"],
+            )
+            for ext in sponsor_ct_extensions
+        ],
+    )
 
     # Concepts
-    api.log.info("=== Export concepts ===")
-    for cpt in concept_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        concept_name = ep.rsplit("/", 1)[1]
-        api.log.info(f"Export concept: {concept_name}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    engine.run_phase(
+        "concepts",
+        [
+            export_task(
+                f"/{cpt['endpoint']}",
+                f"{cpt['endpoint']}.json",
+                cpt["parameters"],
+                cpt["page_size"],
+            )
+            for cpt in concept_endpoints
+        ],
+    )
 
     # Activity items etc
-    api.log.info("=== Export activity items, classes etc ===")
-    for cpt in activity_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        api.log.info(f"Export activity data: {ep}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+    engine.run_phase(
+        "activity items, classes etc",
+        [
+            export_task(
+                f"/{cpt['endpoint']}",
+                f"{cpt['endpoint']}.json",
+                cpt["parameters"],
+                cpt["page_size"],
+            )
+            for cpt in activity_endpoints
+        ],
+    )
 
     # Dictionaries
-    api.log.info("=== Export dictionaries ===")
-    for d in dictionaries:
-        api.log.info(f"Export dictionary: {d}")
-        uid = api.get_dictionary_uid(d)
-        if uid is None:
-            api.log.error(f"Could not find dictionary: {d}")
-            continue
-        params = {"codelist_uid": uid}
-        data = api.get_from_api("/dictionaries/terms", params=params)
-        api.save_formatted_json(data, OUTPUT_DIR, f"dictionaries.{d}.json")
-
+    def dictionary_task(d):
+        def task():
+            api.log.info(f"Export dictionary: {d}")
+            uid = api.get_dictionary_uid(d)
+            if uid is None:
+                api.log.error(f"Could not find dictionary: {d}")
+                return 0
+            params = {"codelist_uid": uid}
+            return int(engine.export("/dictionaries/terms", f"dictionaries.{d}.json", params))
+
+        return task
+
+    engine.run_phase("dictionaries", [dictionary_task(d) for d in dictionaries])
+
+    engine.shutdown()
+    manifest.save()
+    engine.log_timings()
 
     # All done
     api.log.info(f"=== Export completed successfully ===")
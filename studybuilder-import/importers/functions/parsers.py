@@ -1,6 +1,8 @@
 import logging
 from typing import Any, Optional, Sequence
 
+from .caselessdict import CaselessDict
+
 logger = logging.getLogger("legacy_mdr_migrations")
 # ---------------------------------------------------------------
 # Utilities for parsing and converting data
@@ -52,7 +54,51 @@ def map_boolean(bool_str: str, raise_exception=False, default=False) -> bool:
     return default
 
 
-def find_term_by_name(term_name: str, all_terms: Sequence[dict]) -> Optional[str]:
+class TermIndex:
+    """
+    Index of the terms of a codelist, as returned by the /ct/terms endpoint.
+
+    Terms are looked up by sponsor preferred name, submission value or concept id, ignoring case.
+    The "name" field matches either the sponsor preferred name or the submission value,
+    returning the first matching term like a scan of the terms would.
+    """
+
+    FIELDS = ("name", "sponsor_preferred_name", "submission_value", "concept_id")
+
+    def __init__(self, terms: Sequence[dict]):
+        self.terms = list(terms)
+        self.indexes = {field: CaselessDict() for field in self.FIELDS}
+        for term in self.terms:
+            sponsor_preferred_name = term["name"]["sponsor_preferred_name"]
+            attributes = term["attributes"]
+            submission_value = attributes["code_submission_value"]
+            if submission_value is None:
+                submission_value = attributes["name_submission_value"]
+            for field, value in (
+                ("name", sponsor_preferred_name),
+                ("name", submission_value),
+                ("sponsor_preferred_name", sponsor_preferred_name),
+                ("submission_value", submission_value),
+                ("concept_id", attributes["concept_id"]),
+            ):
+                if value is not None and value not in self.indexes[field]:
+                    self.indexes[field][value] = term
+
+    def find(self, field: str, value: Optional[str]) -> Optional[dict]:
+        if value is None:
+            return None
+        return self.indexes[field].get(value)
+
+    def find_uid(self, field: str, value: Optional[str]) -> Optional[str]:
+        term = self.find(field, value)
+        return term["term_uid"] if term is not None else None
+
+
+def find_term_by_name(
+    term_name: str, all_terms: Sequence[dict] | TermIndex
+) -> Optional[str]:
+    if isinstance(all_terms, TermIndex):
+        return all_terms.find_uid("name", term_name)
     term_uid = None
     for term in all_terms:
         if term["name"]["sponsor_preferred_name"].lower() == term_name.lower():
@@ -69,7 +115,11 @@ def find_term_by_name(term_name: str, all_terms: Sequence[dict]) -> Optional[str
     return term_uid
 
 
-def find_term_by_concept_id(term_id: str, all_terms: Sequence[dict]) -> Optional[str]:
+def find_term_by_concept_id(
+    term_id: str, all_terms: Sequence[dict] | TermIndex
+) -> Optional[str]:
+    if isinstance(all_terms, TermIndex):
+        return all_terms.find_uid("concept_id", term_id)
     for term in all_terms:
         if term["attributes"]["concept_id"] == term_id:
             return term["term_uid"]
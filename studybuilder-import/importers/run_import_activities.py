@@ -1622,8 +1622,7 @@ class Activities(BaseImporter):
         )
 
         timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.client_session(timeout) as session:
             if (
                 self._limit_import_to is None
                 or ACTIVITY_GROUPS in self._limit_import_to
@@ -458,8 +458,7 @@ class SponsorModels(BaseImporter):
 
     async def async_run(self):
         timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.client_session(timeout) as session:
             await self.handle_activity_instance_class_relations(
                 MDR_MIGRATION_ACTIVITY_INSTANCE_CLASS_MODEL_RELS,
                 session,
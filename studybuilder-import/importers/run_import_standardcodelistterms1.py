@@ -182,10 +182,8 @@ class StandardCodelistTerms1(BaseImporter):
         self.code_lists_uids = self.api.get_code_lists_uids()
         readCSV = csv.reader(csvfile, delimiter=",")
         headers = next(readCSV)
-        parent_type_terms = self.api.get_terms_for_codelist_name(
-            self.epoch_type_cl_name
-        )
-        all_epoch_terms = self.api.get_terms_for_codelist_name(self.epoch_cl_name)
+        parent_type_terms = self.codelist_terms(self.epoch_type_cl_name, refresh=True)
+        all_epoch_terms = self.codelist_terms(self.epoch_cl_name, refresh=True)
         for row in readCSV:
             parent_term_uid = find_term_by_name(
                 row[headers.index("GEN_EPOCH_TYPE")], parent_type_terms
@@ -325,10 +323,10 @@ class StandardCodelistTerms1(BaseImporter):
     def handle_epoch(self, csvfile):
         readCSV = csv.reader(csvfile, delimiter=",")
         headers = next(readCSV)
-        parent_sub_type_terms = self.api.get_terms_for_codelist_name(
-            self.epoch_subtype_cl_name
+        parent_sub_type_terms = self.codelist_terms(
+            self.epoch_subtype_cl_name, refresh=True
         )
-        all_epoch_terms = self.api.get_terms_for_codelist_name(self.epoch_cl_name)
+        all_epoch_terms = self.codelist_terms(self.epoch_cl_name, refresh=True)
         for row in readCSV:
             parent_term_uid = find_term_by_name(
                 row[headers.index("GEN_EPOCH_SUB_TYPE")], parent_sub_type_terms
@@ -764,8 +762,7 @@ class StandardCodelistTerms1(BaseImporter):
 
     async def async_run(self):
         timeout = aiohttp.ClientTimeout(None)
-        conn = aiohttp.TCPConnector(limit=4, force_close=True)
-        async with aiohttp.ClientSession(timeout=timeout, connector=conn) as session:
+        async with self.api.client_session(timeout) as session:
             await self.handle_codelist_definitions(
                 MDR_MIGRATION_SPONSOR_CODELIST_DEFINITIONS, session
             )
@@ -205,10 +205,7 @@ class StandardCodelistTerms2(BaseImporter):
             if self.limit_to_codelists and codelist_name not in self.limit_to_codelists:
                 self.log.info(f"Skipping codelist '{codelist_name}'")
                 continue
-            conn = aiohttp.TCPConnector(limit=4, force_close=True)
-            async with aiohttp.ClientSession(
-                timeout=timeout, connector=conn
-            ) as session:
+            async with self.api.client_session(timeout) as session:
                 await self.migrate_term(
                     file_path,
                     codelist_name=codelist_name,
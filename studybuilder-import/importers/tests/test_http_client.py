@@ -0,0 +1,62 @@
+from ..utils.http_client import AdaptiveLimiter, create_session, is_retryable
+from ..utils.metrics import Metrics
+
+
+def test_limit_grows_after_a_window_of_successes():
+    limiter = AdaptiveLimiter(initial=4, maximum=5)
+    for _ in range(4):
+        limiter.record("GET /ct/terms", 0.1, 200)
+    assert limiter.limit == 5
+    for _ in range(10):
+        limiter.record("GET /ct/terms", 0.1, 200)
+    assert limiter.limit == 5
+
+
+def test_limit_halves_once_per_window_when_overloaded():
+    limiter = AdaptiveLimiter(initial=8)
+    for _ in range(8):
+        limiter.record("POST /ct/terms", 0.1, 503)
+    assert limiter.limit == 4
+    limiter.record("POST /ct/terms", 0.1, 429)
+    assert limiter.limit == 4
+    for _ in range(3):
+        limiter.record("POST /ct/terms", 0.1, 429)
+    assert limiter.limit == 2
+
+
+def test_slow_endpoint_counts_as_overloaded():
+    limiter = AdaptiveLimiter(initial=2)
+    limiter.record("GET /studies", 0.1, 200)
+    limiter.record("GET /studies", 0.1, 200)
+    assert limiter.limit == 3
+    # Much slower than usual
+    limiter.record("GET /studies", 1.0, 200)
+    assert limiter.limit == 1
+    # Another endpoint has its own usual latency
+    limiter.record("GET /ct/packages", 1.0, 200)
+    assert limiter.limit == 2
+
+
+def test_metrics_record_requests_per_endpoint():
+    metrics = Metrics()
+    metrics.record_request("GET /studies/Study_000001/study-visits", 0.2)
+    metrics.record_request("GET /studies/Study_000002/study-visits", 0.4)
+
+    timing = metrics.timings["GET /studies/Study_NNNNNN/study-visits"]
+    assert timing.calls == 2
+    assert abs(timing.total_time - 0.6) < 1e-9
+
+
+def test_only_idempotent_requests_are_retried_on_503():
+    assert is_retryable("GET", 503)
+    assert is_retryable("get", 429)
+    assert is_retryable("POST", 429)
+    assert not is_retryable("POST", 503)
+    assert not is_retryable("PATCH", 503)
+    assert not is_retryable("GET", 500)
+    assert not is_retryable("GET", None)
+
+    retry = create_session().get_adapter("http://localhost").max_retries
+    assert retry.is_retry("PUT", 503)
+    assert not retry.is_retry("POST", 503)
+    assert retry.new(total=1).is_retry("POST", 429)
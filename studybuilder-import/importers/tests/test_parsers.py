@@ -0,0 +1,41 @@
+from ..functions.parsers import TermIndex, find_term_by_concept_id, find_term_by_name
+
+
+def make_term(uid, name, concept_id, code_submval=None, name_submval=None):
+    return {
+        "term_uid": uid,
+        "name": {"sponsor_preferred_name": name},
+        "attributes": {
+            "concept_id": concept_id,
+            "code_submission_value": code_submval,
+            "name_submission_value": name_submval,
+        },
+    }
+
+
+TERMS = [
+    make_term("Term_1", "Screening", "C48262", code_submval="SCREENING"),
+    make_term("Term_2", "Treatment", "C101526", name_submval="TREATMENT"),
+    make_term("Term_3", "Follow-up", "C99158", code_submval="FOLLOW-UP"),
+    make_term("Term_4", "treatment", "C00000", code_submval="TRT"),
+]
+
+
+def test_index_matches_scan_of_terms():
+    index = TermIndex(TERMS)
+    for name in ("screening", "TREATMENT", "Follow-Up", "trt", "missing"):
+        assert find_term_by_name(name, index) == find_term_by_name(name, TERMS)
+    for concept_id in ("C48262", "C99158", "C12345"):
+        assert find_term_by_concept_id(concept_id, index) == find_term_by_concept_id(
+            concept_id, TERMS
+        )
+
+
+def test_index_lookup_by_field():
+    index = TermIndex(TERMS)
+    assert index.find_uid("sponsor_preferred_name", "TREATMENT") == "Term_2"
+    assert index.find_uid("submission_value", "trt") == "Term_4"
+    assert index.find("concept_id", "c101526")["name"]["sponsor_preferred_name"] == (
+        "Treatment"
+    )
+    assert index.find("concept_id", None) is None
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 import json
 import logging
@@ -8,8 +7,8 @@ import time
 from typing import Sequence
 
 import aiohttp
-import requests
 
+from .http_client import AsyncRequester, create_client_session, create_session
 from .metrics import Metrics
 from .path_join import path_join
 
@@ -110,7 +109,9 @@ class ApiBinding:
             self.metrics = Metrics()
         else:
             self.metrics = metrics
-        self.sem = asyncio.Semaphore(8)
+        # Shared keep-alive connections for the sync calls, adaptive concurrency for the async calls
+        self.session = create_session(self.metrics)
+        self.requester = AsyncRequester(self.metrics)
         if logger is not None:
             self.log = logger
         else:
@@ -124,6 +125,12 @@ class ApiBinding:
     def update_headers(self, api_headers):
         self.api_headers = api_headers
 
+    def client_session(
+        self, timeout: aiohttp.ClientTimeout | None = None
+    ) -> aiohttp.ClientSession:
+        """Returns a session for the async calls, its connection pool is sized for the adaptive concurrency."""
+        return create_client_session(timeout)
+
     # ---------------------------------------------------------------
     # Verify connection to api (and database)
     # ---------------------------------------------------------------
@@ -132,7 +139,7 @@ class ApiBinding:
     # TODO Replace with api health check resource ...
     def verify_connection(self):
         try:
-            response = requests.get(
+            response = self.session.get(
                 path_join(self.api_base_url, "openapi.json"), headers=self.api_headers
             )
             response.raise_for_status()
@@ -170,7 +177,7 @@ class ApiBinding:
     def simple_delete(self, path, simple_path=None):
         if simple_path is None:
             simple_path = path
-        response = requests.delete(
+        response = self.session.delete(
             path_join(self.api_base_url, path), headers=self.api_headers
         )
         if response.ok:
@@ -186,7 +193,7 @@ class ApiBinding:
     def simple_post_to_api(self, path, body, simple_path=None, params=None):
         if simple_path is None:
             simple_path = path
-        response = requests.post(
+        response = self.session.post(
             path_join(self.api_base_url, path),
             headers=self.api_headers,
             json=body,
@@ -219,14 +226,14 @@ class ApiBinding:
 
     def post_to_api(self, object, body=None, path=None):
         if path is None:
-            response = requests.post(
+            response = self.session.post(
                 path_join(self.api_base_url, object["path"]),
                 headers=self.api_headers,
                 json=object["body"],
             )
             path = object["path"]
         else:
-            response = requests.post(
+            response = self.session.post(
                 path_join(self.api_base_url, path), headers=self.api_headers, json=body
             )
         short_path = "".join([i for i in path if not i.isdigit()])
@@ -263,7 +270,7 @@ class ApiBinding:
 
     def patch_to_api(self, body, path):
         url = path_join(self.api_base_url, path, body["uid"])
-        response = requests.patch(url, headers=self.api_headers, json=body)
+        response = self.session.patch(url, headers=self.api_headers, json=body)
         if response.ok:
             self.metrics.icrement(path + "--Patch")
             self.log.info("Patch %s %s", path, "success")
@@ -283,7 +290,7 @@ class ApiBinding:
 
     def approve_item(self, uid: str, url: str):
         full_url = path_join(self.api_base_url, url, uid, "approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning("Failed to approve %s %s", uid, response.content)
             return None
@@ -292,12 +299,12 @@ class ApiBinding:
 
     def approve_item_names_and_attributes(self, uid: str, url: str):
         full_url = path_join(self.api_base_url, url, uid, "names/approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning("Failed to approve names %s %s", uid, response.content)
             return False
         full_url = path_join(self.api_base_url, url, uid, "attributes/approvals")
-        response = requests.post(full_url, headers=self.api_headers)
+        response = self.session.post(full_url, headers=self.api_headers)
         if not response.ok:
             self.log.warning(
                 "Failed to approve attributes %s %s", uid, response.content
@@ -319,7 +326,7 @@ class ApiBinding:
             if "page_number" not in params:
                 params["page_number"] = 1
 
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), params=params, headers=self.api_headers
         )
 
@@ -431,7 +438,7 @@ class ApiBinding:
         return identifiers
 
     def get_libraries(self):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "libraries"), headers=self.api_headers
         )
         response.raise_for_status()
@@ -442,7 +449,7 @@ class ApiBinding:
 
     def create_library(self, object):
         self.metrics.icrement("/libraries")
-        response = requests.post(
+        response = self.session.post(
             path_join(self.api_base_url, "libraries"),
             headers=self.api_headers,
             json=object,
@@ -459,7 +466,7 @@ class ApiBinding:
             }
         else:
             params = {"codelist_name": codelist_name, "page_number": 1, "page_size": 0}
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "ct/terms"),
             params=params,
             headers=self.api_headers,
@@ -470,7 +477,7 @@ class ApiBinding:
 
     # Get all terms from a codelist identified by codelist uid
     def get_terms_for_codelist_uid(self, codelist_uid: str):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "ct/terms"),
             params={"codelist_uid": codelist_uid, "page_number": 1, "page_size": 0},
             headers=self.api_headers,
@@ -481,7 +488,7 @@ class ApiBinding:
 
     def get_filtered_terms(self, filters: dict):
         filters = json.dumps(filters)
-        response = requests.get(
+        response = self.session.get(
             self.api_base_url + "/ct/terms/attributes",
             params={
                 "page_number": 1,
@@ -507,7 +514,7 @@ class ApiBinding:
                 "op": "eq",
             }
         filters = json.dumps(filters_dict)
-        response = requests.get(
+        response = self.session.get(
             self.api_base_url + "/ct/terms/attributes",
             params={
                 "library_name": "CDISC",
@@ -523,7 +530,7 @@ class ApiBinding:
 
     # Get all dictionary mapping all codelist names to a uid
     def get_code_lists_uids(self):
-        response = requests.get(
+        response = self.session.get(
             path_join(
                 self.api_base_url, "ct/codelists/names?page_number=1&page_size=0"
             ),
@@ -585,7 +592,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "studies", study_uid, "study-objectives"),
             headers=self.api_headers,
             params=params,
@@ -602,7 +609,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), headers=self.api_headers, params=params
         )
         response.raise_for_status()
@@ -615,7 +622,7 @@ class ApiBinding:
 
     def find_object_by_key(self, name, path, key="name"):
         params = {"filters": '{"' + key + '":{"v":["' + name + '"],"op":"eq"}}'}
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path),
             params=params,
             headers=self.api_headers,
@@ -627,7 +634,7 @@ class ApiBinding:
 
     # Find the uid for a dictionary from its name
     def find_dictionary_uid(self, name):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "dictionaries/codelists"),
             params={"library_name": name},
             headers=self.api_headers,
@@ -640,7 +647,7 @@ class ApiBinding:
 
     # Find a term via its name from a dictionary
     def find_dictionary_item_uid_from_name(self, dict_uid, name):
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, "dictionaries/terms"),
             params={
                 "codelist_uid": dict_uid,
@@ -660,7 +667,7 @@ class ApiBinding:
             "page_number": 1,
             "page_size": 0,
         }
-        response = requests.get(
+        response = self.session.get(
             path_join(self.api_base_url, path), headers=self.api_headers, params=params
         )
         response.raise_for_status()
@@ -674,7 +681,7 @@ class ApiBinding:
 
     def simple_approve(self, path: str):
         path = path_join(self.api_base_url, path)
-        res = requests.post(path, headers=self.api_headers)
+        res = self.session.post(path, headers=self.api_headers)
         if not res.ok:
             self.log.warning("Failed to approve %s", path)
             return False
@@ -683,7 +690,9 @@ class ApiBinding:
 
     def simple_approve2(self, url: str, path: str, label=""):
         url = path_join(url, path)
-        res = requests.post(path_join(self.api_base_url, url), headers=self.api_headers)
+        res = self.session.post(
+            path_join(self.api_base_url, url), headers=self.api_headers
+        )
         if not res.ok:
             self.log.warning("Failed to approve %s", url)
             self.metrics.icrement(f"{url}--{label}ApproveError")
@@ -694,7 +703,7 @@ class ApiBinding:
 
     def simple_patch(self, body, url, path):
         full_url = path_join(self.api_base_url, url)
-        response = requests.patch(full_url, headers=self.api_headers, json=body)
+        response = self.session.patch(full_url, headers=self.api_headers, json=body)
         if response.ok:
             self.metrics.icrement(path + "--Patch")
             self.log.info("Patch %s %s", path, "success")
@@ -722,36 +731,44 @@ class ApiBinding:
     # ---------------------------------------------------------------
     #
     async def new_version_to_api_async(self, path: str, session: aiohttp.ClientSession):
-        async with session.post(
-            path_join(self.api_base_url, path), json={}, headers=self.api_headers
-        ) as response:
-            status = response.status
-            try:
-                result = await response.json()
-            except aiohttp.ContentTypeError:
-                textresult = await response.text()
-                result = {}
-                self.log.error(
-                    f"Failed to post to '{path}', status: {status}, message: {textresult}"
-                )
-            return status, result
+        response = await self.requester.request(
+            session,
+            "POST",
+            path_join(self.api_base_url, path),
+            json={},
+            headers=self.api_headers,
+        )
+        status = response.status
+        try:
+            result = await response.json()
+        except aiohttp.ContentTypeError:
+            textresult = await response.text()
+            result = {}
+            self.log.error(
+                f"Failed to post to '{path}', status: {status}, message: {textresult}"
+            )
+        return status, result
 
     async def patch_to_api_async(
         self, path: str, body: dict, session: aiohttp.ClientSession
     ):
-        async with session.patch(
-            path_join(self.api_base_url, path), json=body, headers=self.api_headers
-        ) as response:
-            status = response.status
-            try:
-                result = await response.json()
-            except aiohttp.ContentTypeError:
-                textresult = await response.text()
-                result = {}
-                self.log.error(
-                    f"Failed to patch to '{path}', status: {status}, message: {textresult}"
-                )
-            return status, result
+        response = await self.requester.request(
+            session,
+            "PATCH",
+            path_join(self.api_base_url, path),
+            json=body,
+            headers=self.api_headers,
+        )
+        status = response.status
+        try:
+            result = await response.json()
+        except aiohttp.ContentTypeError:
+            textresult = await response.text()
+            result = {}
+            self.log.error(
+                f"Failed to patch to '{path}', status: {status}, message: {textresult}"
+            )
+        return status, result
 
     # This gives reasonable waiting for lock on atomic incrementing of identifiers
     async def post_to_api_async(
@@ -761,75 +778,84 @@ class ApiBinding:
         session: aiohttp.ClientSession,
         logfile_name: str | None = None,
     ):
-        async with self.sem:
-            async with session.post(
-                path_join(self.api_base_url, url), json=body, headers=self.api_headers
-            ) as response:
-                status = response.status
-                try:
-                    result = await response.json()
-                    if logfile_name and status not in [200, 201]:
-                        with open(logfile_name, "a") as logfile:
-                            logfile.write(
-                                (
-                                    f"Failed to post to '{url}', status: {status}, "
-                                    f"message: {result['message'] if 'message' in result else result['detail']}, body: {body}\n"
-                                )
-                            )
-                except aiohttp.ContentTypeError:
-                    textresult = await response.text()
-                    result = {}
-                    self.log.error(
-                        f"Failed to post to '{url}', status: {status}, message: {textresult}"
+        response = await self.requester.request(
+            session,
+            "POST",
+            path_join(self.api_base_url, url),
+            json=body,
+            headers=self.api_headers,
+        )
+        status = response.status
+        try:
+            result = await response.json()
+            if logfile_name and status not in [200, 201]:
+                with open(logfile_name, "a") as logfile:
+                    logfile.write(
+                        (
+                            f"Failed to post to '{url}', status: {status}, "
+                            f"message: {result['message'] if 'message' in result else result['detail']}, body: {body}\n"
+                        )
                     )
-                return status, result
+        except aiohttp.ContentTypeError:
+            textresult = await response.text()
+            result = {}
+            self.log.error(
+                f"Failed to post to '{url}', status: {status}, message: {textresult}"
+            )
+        return status, result
 
     async def approve_async(self, url: str, session: aiohttp.ClientSession):
-        async with session.post(
-            path_join(self.api_base_url, url), json={}, headers=self.api_headers
-        ) as response:
-            status = response.status
-            if response.ok:
-                result = await response.json()
-            else:
-                try:
-                    error_result = await response.json()
-                    error_message = get_error_message(error_result)
-                except aiohttp.ContentTypeError:
-                    error_message = await response.text()
-                self.log.warning(
-                    f"Failed to approve {url}, status: {status}, message: {error_message}"
-                )
-                result = {}
-            return status, result
+        response = await self.requester.request(
+            session,
+            "POST",
+            path_join(self.api_base_url, url),
+            json={},
+            headers=self.api_headers,
+        )
+        status = response.status
+        if response.ok:
+            result = await response.json()
+        else:
+            try:
+                error_result = await response.json()
+                error_message = get_error_message(error_result)
+            except aiohttp.ContentTypeError:
+                error_message = await response.text()
+            self.log.warning(
+                f"Failed to approve {url}, status: {status}, message: {error_message}"
+            )
+            result = {}
+        return status, result
 
     async def approve_item_async(
         self, uid: str, url: str, session: aiohttp.ClientSession
     ):
         url = path_join(self.api_base_url, url, uid, "approvals")
-        async with session.post(
+        response = await self.requester.request(
+            session,
+            "POST",
             url,
             json={},
             headers=self.api_headers,
-        ) as response:
-            status = response.status
-            if response.ok:
-                result = await response.json()
-            else:
-                try:
-                    error_result = await response.json()
-                    error_message = get_error_message(error_result)
-                except aiohttp.ContentTypeError:
-                    error_message = await response.text()
-                self.log.warning(
-                    f"Failed to approve {url}, status: {status}, message: {error_message}"
-                )
-                result = {}
-            if not response.ok:
-                self.metrics.icrement(url + "--ApproveError")
-            else:
-                self.metrics.icrement(url + "--Approve")
-            return status, result
+        )
+        status = response.status
+        if response.ok:
+            result = await response.json()
+        else:
+            try:
+                error_result = await response.json()
+                error_message = get_error_message(error_result)
+            except aiohttp.ContentTypeError:
+                error_message = await response.text()
+            self.log.warning(
+                f"Failed to approve {url}, status: {status}, message: {error_message}"
+            )
+            result = {}
+        if not response.ok:
+            self.metrics.icrement(url + "--ApproveError")
+        else:
+            self.metrics.icrement(url + "--Approve")
+        return status, result
 
     async def post_then_approve(
         self, data: dict, session: aiohttp.ClientSession, approve: bool
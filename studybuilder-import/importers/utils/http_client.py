@@ -0,0 +1,226 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..functions.utils import load_env
+from .metrics import Metrics
+
+# Maximum number of concurrent async requests, and the initial concurrency
+API_MAX_CONCURRENCY = int(load_env("API_MAX_CONCURRENCY", "32"))
+API_INITIAL_CONCURRENCY = int(load_env("API_INITIAL_CONCURRENCY", "8"))
+# Number of retries of requests rejected by an overloaded server or failing to connect
+API_RETRIES = int(load_env("API_RETRIES", "5"))
+API_RETRY_BACKOFF = float(load_env("API_RETRY_BACKOFF", "0.5"))
+
+# The server is considered overloaded when the latency of an endpoint exceeds its usual latency
+# by this factor, ignoring slowdowns shorter than MIN_SLOWDOWN seconds
+LATENCY_TOLERANCE = 2.0
+MIN_SLOWDOWN = 0.05
+# Statuses returned by an overloaded server, see `is_retryable`
+RETRY_STATUSES = (429, 503)
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+def is_retryable(method: str, status: int | None) -> bool:
+    """
+    Tells whether a request rejected with the given status can be sent again.
+
+    Idempotent requests are retried on 429 and 503. Other requests, e.g. POST, are only retried on 429,
+    which is returned before the request is processed, while a 503 can come from a proxy
+    after the API started processing the request.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return status in RETRY_STATUSES
+    return status == 429
+
+
+class RejectedRequestRetry(Retry):
+    """`Retry` retrying the requests rejected by an overloaded server, see `is_retryable`."""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        return is_retryable(method, status_code)
+
+
+def create_session(metrics: Metrics | None = None) -> requests.Session:
+    """
+    Returns a `requests.Session` keeping the connections to the API alive.
+
+    Requests rejected by an overloaded server, see `is_retryable`, or failing to connect,
+    are retried with exponential backoff, honouring the `Retry-After` header. The calls are recorded in `metrics` when given.
+    """
+    retry = RejectedRequestRetry(
+        total=API_RETRIES,
+        connect=API_RETRIES,
+        read=0,
+        status=API_RETRIES,
+        backoff_factor=API_RETRY_BACKOFF,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=API_MAX_CONCURRENCY, max_retries=retry
+    )
+    session = MetricsSession(metrics) if metrics is not None else requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def create_client_session(
+    timeout: aiohttp.ClientTimeout | None = None,
+) -> aiohttp.ClientSession:
+    """Returns an `aiohttp.ClientSession` with a keep-alive connection pool sized for the adaptive concurrency."""
+    connector = aiohttp.TCPConnector(limit=API_MAX_CONCURRENCY)
+    return aiohttp.ClientSession(
+        timeout=timeout or aiohttp.ClientTimeout(None), connector=connector
+    )
+
+
+def endpoint(method: str, url) -> str:
+    return f"{method.upper()} {urlsplit(str(url)).path}"
+
+
+class MetricsSession(requests.Session):
+    """`requests.Session` recording the number of calls and latency of each endpoint."""
+
+    def __init__(self, metrics: Metrics):
+        super().__init__()
+        self.metrics = metrics
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.monotonic()
+        response = super().request(method, url, *args, **kwargs)
+        self.metrics.record_request(endpoint(method, url), time.monotonic() - start)
+        return response
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of concurrent async requests, adapting the limit to the server load.
+
+    The limit grows by one after a full window of successful requests,
+    and is halved when the server rejects a request with 429/503 or gets slow,
+    i.e. the latency of an endpoint exceeds `LATENCY_TOLERANCE` times its usual latency.
+    The limit is decreased at most once per window, so that the requests which were in flight
+    when the server got overloaded only count once.
+    """
+
+    def __init__(
+        self,
+        initial: int = API_INITIAL_CONCURRENCY,
+        minimum: int = 1,
+        maximum: int = API_MAX_CONCURRENCY,
+    ):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = min(max(initial, minimum), self.maximum)
+        self.in_flight = 0
+        # Usual latency of each endpoint, follows decreases at once and increases slowly
+        self.base_latencies: dict[str, float] = {}
+        self._successes = 0
+        self._since_decrease = 0
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # An importer runs its async steps in several event loops
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, key: str, latency: float, status: int | None):
+        async with self.condition:
+            self.in_flight -= 1
+            self.record(key, latency, status)
+            self.condition.notify_all()
+
+    def is_slow(self, key: str, latency: float) -> bool:
+        base = self.base_latencies.get(key)
+        if base is None or latency < base:
+            self.base_latencies[key] = latency
+            return False
+        self.base_latencies[key] = base + (latency - base) * 0.05
+        return latency > base * LATENCY_TOLERANCE and latency - base > MIN_SLOWDOWN
+
+    def record(self, key: str, latency: float, status: int | None):
+        self._since_decrease += 1
+        if status in RETRY_STATUSES:
+            overloaded = True
+        else:
+            overloaded = status is not None and self.is_slow(key, latency)
+        if overloaded:
+            self._successes = 0
+            if self._since_decrease >= self.limit:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._since_decrease = 0
+            return
+        self._successes += 1
+        if self._successes >= self.limit:
+            self.limit = min(self.maximum, self.limit + 1)
+            self._successes = 0
+
+    def retry_delay(self, attempt: int, response: aiohttp.ClientResponse) -> float:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        return API_RETRY_BACKOFF * 2**attempt
+
+
+class AsyncRequester:
+    """
+    Sends the async requests of an `ApiBinding` through an `AdaptiveLimiter`.
+
+    Requests rejected by an overloaded server, see `is_retryable`, are retried with backoff,
+    and all calls are recorded in the metrics.
+    """
+
+    def __init__(self, metrics: Metrics, limiter: AdaptiveLimiter | None = None):
+        self.metrics = metrics
+        self.limiter = limiter or AdaptiveLimiter()
+
+    async def request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        """
+        Sends a request and returns the response, with its body already read.
+
+        The body stays available through `response.json()` and `response.text()`,
+        while the connection is returned to the pool right away.
+        """
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            start = time.monotonic()
+            status = None
+            try:
+                response = await session.request(method, url, **kwargs)
+                status = response.status
+                await response.read()
+                response.release()
+            finally:
+                key = endpoint(method, url)
+                latency = time.monotonic() - start
+                await self.limiter.release(key, latency, status)
+                self.metrics.record_request(key, latency)
+            if not is_retryable(method, status) or attempt >= API_RETRIES:
+                return response
+            await asyncio.sleep(self.limiter.retry_delay(attempt, response))
+            attempt += 1
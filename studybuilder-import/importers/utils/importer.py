@@ -10,6 +10,7 @@ import aiohttp
 import requests
 
 from ..functions.caselessdict import CaselessDict
+from ..functions.parsers import TermIndex
 from ..functions.utils import create_logger, load_env
 from ..utils import import_templates
 from .api_bindings import (
@@ -34,8 +35,10 @@ API_BASE_URL = load_env("API_BASE_URL")
 
 
 class TermCache:
-    def __init__(self, api):
+    def __init__(self, api, codelists=None):
         self.api = api
+        # Index of the terms of each codelist, by codelist name, built on first use
+        self.codelists: dict[str, TermIndex] = {} if codelists is None else codelists
         self.all_terms_attributes = self.api.get_all_from_api_paged("/ct/terms/attributes")
         self.all_terms_name_submission_values = CaselessDict(
             self.api.get_all_identifiers(
@@ -122,6 +125,9 @@ class BaseImporter:
             self.api = api
 
         self.cache = cache
+        # The codelist term indexes are shared by all importers using the same cache
+        self.codelists = cache.codelists if cache is not None else {}
+        self._refreshed_codelists = set()
 
         self.visit_type_codelist_name = "VisitType"
         self.element_subtype_codelist_name = "Element Sub Type"
@@ -186,7 +192,7 @@ class BaseImporter:
     def ensure_cache(self):
         if self.cache is None:
             self.log.info("Creating term cache")
-            self.cache = TermCache(self.api)
+            self.cache = TermCache(self.api, self.codelists)
 
     def get_cache(self):
         self.ensure_cache()
@@ -446,6 +452,24 @@ class BaseImporter:
     def lookup_ct_term_uid(
         self, codelist_name, value, key="sponsor_preferred_name", uid_key="term_uid"
     ):
+        if key == "sponsor_preferred_name" and uid_key == "term_uid":
+            self.log.info(
+                f"Looking up term with '{key}' == '{value}' in codelist '{codelist_name}'"
+            )
+            term = self.find_codelist_term(codelist_name, key, value)
+            uid = term["term_uid"] if term is not None else None
+        else:
+            uid = self._query_ct_term_uid(codelist_name, value, key, uid_key)
+        if uid:
+            self.log.debug(
+                f"Found term with '{key}' == '{value}' in codelist '{codelist_name}', uid '{uid}'"
+            )
+            return uid
+        self.log.warning(
+            f"Could not find term with '{key}' == '{value}' in codelist '{codelist_name}'"
+        )
+
+    def _query_ct_term_uid(self, codelist_name, value, key, uid_key):
         filt = {key: {"v": [value], "op": "eq"}}
         if codelist_name in CODELIST_NAME_MAP:
             self.log.info(
@@ -470,15 +494,7 @@ class BaseImporter:
             identifier=key,
             value=uid_key,
         )
-        uid = data.get(value, None)
-        if uid:
-            self.log.debug(
-                f"Found term with '{key}' == '{value}' in codelist '{codelist_name}', uid '{uid}'"
-            )
-            return uid
-        self.log.warning(
-            f"Could not find term with '{key}' == '{value}' in codelist '{codelist_name}'"
-        )
+        return data.get(value, None)
 
     def lookup_unit_uid(self, name, subset=None):
         uid = self.lookup_concept_uid(name, "unit-definitions", subset=subset)
@@ -504,21 +520,44 @@ class BaseImporter:
         self.log.info(
             f"Looking up term with name '{sponsor_preferred_name}' from codelist '{codelist_name}'"
         )
-        terms = self.fetch_codelist_terms(codelist_name)
-        if terms is not None:
-            for term in terms:
-                if term["name"]["sponsor_preferred_name"] == sponsor_preferred_name:
-                    uid = term["term_uid"]
-                    self.log.debug(
-                        f"Found term with sponsor preferred name '{sponsor_preferred_name}' and uid '{uid}'"
-                    )
-                    return uid
+        term = self.find_codelist_term(
+            codelist_name, "sponsor_preferred_name", sponsor_preferred_name
+        )
+        if term is not None:
+            uid = term["term_uid"]
+            self.log.debug(
+                f"Found term with sponsor preferred name '{sponsor_preferred_name}' and uid '{uid}'"
+            )
+            return uid
         self.log.warning(
             f"Could not find term with sponsor preferred name '{sponsor_preferred_name}'"
         )
 
-    @lru_cache(maxsize=10000)
+    def codelist_terms(self, name, refresh=False) -> TermIndex:
+        """
+        Returns the index of the terms of the codelist with the given name.
+        The terms are fetched once, and the index is shared with the other importers using the same cache.
+        """
+        if refresh or name not in self.codelists:
+            self.codelists[name] = TermIndex(self._fetch_codelist_term_items(name))
+            self._refreshed_codelists.add(name)
+        return self.codelists[name]
+
+    def find_codelist_term(self, codelist_name, field, value):
+        """
+        Looks up a term of a codelist in its index, see `TermIndex` for the fields.
+        On a miss the terms are fetched again, once per importer,
+        since the codelist may have been extended after the index was built.
+        """
+        term = self.codelist_terms(codelist_name).find(field, value)
+        if term is None and codelist_name not in self._refreshed_codelists:
+            term = self.codelist_terms(codelist_name, refresh=True).find(field, value)
+        return term
+
     def fetch_codelist_terms(self, name):
+        return self.codelist_terms(name).terms
+
+    def _fetch_codelist_term_items(self, name):
         if name in CODELIST_NAME_MAP:
             self.log.info(
                 f"Fetching terms for codelist with name '{name}', id {CODELIST_NAME_MAP[name]}"
@@ -630,15 +669,13 @@ class BaseImporter:
         self.log.info(
             f"Looking up term with concept id '{concept_id}' from codelist '{codelist_name}'"
         )
-        terms = self.fetch_codelist_terms(codelist_name)
-        if terms is not None:
-            for term in terms:
-                if term["attributes"]["concept_id"] == concept_id:
-                    name = term["name"]["sponsor_preferred_name"]
-                    self.log.debug(
-                        f"Found term with concept id '{concept_id}' and name '{name}'"
-                    )
-                    return name
+        term = self.find_codelist_term(codelist_name, "concept_id", concept_id)
+        if term is not None:
+            name = term["name"]["sponsor_preferred_name"]
+            self.log.debug(
+                f"Found term with concept id '{concept_id}' and name '{name}'"
+            )
+            return name
         self.log.warning(
             f"Could not find term with concept id '{concept_id}' in codelist '{codelist_name}'"
         )
@@ -1,11 +1,22 @@
 import re
+import time
+
+
+class EndpointTiming:
+    def __init__(self, start: float):
+        self.calls = 0
+        self.total_time = 0.0
+        self.first_start = start
+        self.last_end = start
 
 
 class Metrics:
     metrics: dict
+    timings: dict
 
     def __init__(self):
         self.metrics = dict()
+        self.timings = dict()
 
     def simplify_path(self, path: str):
         parts = path.rsplit("--", 1)
@@ -23,6 +34,17 @@ class Metrics:
         key = self.simplify_path(key)
         self.metrics[key] = self.metrics.get(key, 0) + increment
 
+    def record_request(self, key: str, elapsed: float):
+        """Records a call to an endpoint, identified by method and path, which took `elapsed` seconds."""
+        key = self.simplify_path(key)
+        now = time.monotonic()
+        timing = self.timings.get(key)
+        if timing is None:
+            timing = self.timings[key] = EndpointTiming(now - elapsed)
+        timing.calls += 1
+        timing.total_time += elapsed
+        timing.last_end = now
+
     def print(self, sort_by_number=False):
         print("----------------------------------------")
         print("Metrics")
@@ -48,3 +70,22 @@ class Metrics:
         for kv in data:
             print("{}:{}".format(kv[0], kv[1]))
         print("----------------------------------------")
+
+    def print_throughput(self):
+        data = sorted(self.timings.items(), key=lambda x: x[1].total_time, reverse=True)
+        print("----------------------------------------")
+        print("Throughput, sorted by total time spent per endpoint")
+        print("endpoint:calls, calls/s, mean latency (ms), total time (s)")
+        print("----------------------------------------")
+        for key, timing in data:
+            span = max(timing.last_end - timing.first_start, 1e-6)
+            print(
+                "{}:{}, {:.1f}, {:.0f}, {:.1f}".format(
+                    key,
+                    timing.calls,
+                    timing.calls / span,
+                    1000 * timing.total_time / timing.calls,
+                    timing.total_time,
+                )
+            )
+        print("----------------------------------------")